@@ -0,0 +1,77 @@
+"""Benchmark of the binary game archive against PGN text.
+
+The same random games are stored as PGN and as an archive, then loaded back
+as moves in the notation of Board.legal_moves.
+
+Run with `uv run python benchmarks/bench_archive.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from chess.archive import GameArchive, pack_game, write_archive
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.pgn import format_game, game_from_moves, read_games, replay_games
+
+
+def _random_moves(rng: random.Random, plies: int) -> list[str]:
+    """Plays a random game and returns its moves."""
+    board, turn, moves = Board(), Colour.WHITE, []
+
+    for _ in range(plies):
+        if not (legal_moves := board.legal_moves(turn)):
+            break
+
+        moves.append(move := rng.choice(legal_moves))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return moves
+
+
+def main() -> None:
+    """Runs the benchmark and prints the size and load time of both formats."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2_000, help="games to store")
+    parser.add_argument("--plies", type=int, default=80, help="plies per game")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # a few distinct games repeated, as generating random games is slow
+    distinct = [_random_moves(rng, args.plies) for _ in range(50)]
+    games = [distinct[i % len(distinct)] for i in range(args.games)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pgn, archive = Path(directory) / "games.pgn", Path(directory) / "games.bin"
+        pgn.write_text("\n".join(format_game(game_from_moves(moves)) for moves in games))
+        write_archive((pack_game(moves) for moves in games), archive)
+
+        start = time.perf_counter()
+        with open(pgn) as file:
+            text_moves = [moves for _, moves in replay_games(read_games(file))]
+        text_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with GameArchive(archive) as games_archive:
+            binary_moves = [game.moves for game in games_archive]
+        binary_time = time.perf_counter() - start
+
+        assert text_moves == binary_moves
+
+        text_size, binary_size = pgn.stat().st_size, archive.stat().st_size
+        print(f"    PGN: {text_size / 2**10:8.0f} KiB, loaded in {text_time:7.3f} s")
+        print(f"archive: {binary_size / 2**10:8.0f} KiB, loaded in {binary_time:7.3f} s")
+        print(
+            f"  ratio: {text_size / binary_size:8.1f}x smaller, "
+            f"{text_time / binary_time:.0f}x faster to load"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark of opening book lookups.
+
+The book holds the positions of a few random games among many filler entries
+with random keys, so that the binary search runs over a book of a realistic
+size.
+
+Run with `uv run python benchmarks/bench_book.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from copy import deepcopy
+from pathlib import Path
+
+from chess.board import Board
+from chess.book import ENTRY, OpeningBook
+from chess.colour_and_aliases import Colour
+from chess.polyglot import encode_move, polyglot_key
+
+
+def _positions(games: int, plies: int, seed: int) -> list[tuple[Board, Colour, str]]:
+    """Returns the positions of random games with the moves played in them."""
+    rng = random.Random(seed)
+    positions = []
+
+    for _ in range(games):
+        board, turn = Board(), Colour.WHITE
+
+        for _ in range(plies):
+            move = rng.choice(board.legal_moves(turn))
+            positions.append((deepcopy(board), turn, move))
+            board.apply_move(move, turn)
+            turn = ~turn
+
+    return positions
+
+
+def main() -> None:
+    """Runs the benchmark and prints the cost of every kind of lookup."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1_000_000, help="filler entries")
+    parser.add_argument("--games", type=int, default=50, help="random games in the book")
+    parser.add_argument("--repeat", type=int, default=20, help="lookups per position")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    positions = _positions(args.games, plies=10, seed=0)
+    entries = [
+        (rng.getrandbits(64), rng.getrandbits(12), rng.randint(1, 100), 1)
+        for _ in range(args.entries)
+    ]
+    entries += [
+        (polyglot_key(board, turn), encode_move(move, turn), 1, 1)
+        for board, turn, move in positions
+    ]
+    entries.sort()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "book.bin"
+        path.write_bytes(b"".join(ENTRY.pack(*entry) for entry in entries))
+
+        start = time.perf_counter()
+        book = OpeningBook(path)
+        print(f"{len(book)} entries, opened in {(time.perf_counter() - start) * 1e6:.0f} µs")
+
+        lookups = len(positions) * args.repeat
+        for name, lookup in (
+            ("key", polyglot_key),
+            ("entries", book.entries),
+            ("best move", book.best_move),
+            ("weighted move", book.weighted_move),
+        ):
+            start = time.perf_counter()
+            for board, turn, _ in positions:
+                for _ in range(args.repeat):
+                    lookup(board, turn)
+
+            elapsed = time.perf_counter() - start
+            print(f"{name:>14}: {elapsed / lookups * 1e6:6.1f} µs per lookup")
+
+        book.close()
+
+
+if __name__ == "__main__":
+    main()
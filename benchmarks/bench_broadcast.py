@@ -0,0 +1,124 @@
+"""Benchmark of sending the moves of a game to its spectators.
+
+A game of random moves is sent to many spectators, after every move, as a
+delta encoded once by a chess.broadcast.Broadcaster and, for comparison,
+as the whole board rendered with Board.__str__ and as a FEN string for
+every spectator. The spectators only count the bytes they are sent.
+
+Run with `uv run python benchmarks/bench_broadcast.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING
+
+from chess.board import Board
+from chess.broadcast import Broadcaster, changed_squares, encode_delta, encode_snapshot
+from chess.chess_class import Chess
+from chess.colour_and_aliases import Colour
+from chess.fen import board_to_fen
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class _Transport(asyncio.WriteTransport):
+    """A transport with nothing waiting to be sent."""
+
+    def get_write_buffer_size(self) -> int:
+        return 0
+
+
+class _Spectator:
+    """A spectator counting the bytes sent to it."""
+
+    def __init__(self) -> None:
+        self.transport = _Transport()
+        self.received = 0
+
+    def write(self, data: bytes, /) -> None:
+        self.received += len(data)
+
+
+def _random_moves(rng: random.Random, plies: int) -> list[str]:
+    """Plays a random game and returns its moves."""
+    board, turn, moves = Board(), Colour.WHITE, []
+
+    for _ in range(plies):
+        if not (legal_moves := board.legal_moves(turn)):
+            break
+
+        moves.append(move := rng.choice(legal_moves))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return moves
+
+
+def _send_deltas(game: Chess, _spectators: list[_Spectator], broadcaster: Broadcaster) -> None:
+    """Sends the squares the last move changed, encoded once."""
+    if game.last_move is not None:
+        delta = encode_delta("g1", game, changed_squares(game.last_move))
+        broadcaster.publish("g1", delta, lambda: encode_snapshot("g1", game))
+
+
+def _send_boards(game: Chess, spectators: list[_Spectator], _broadcaster: Broadcaster) -> None:
+    """Sends the board rendered for every spectator."""
+    for spectator in spectators:
+        spectator.write(str(game.board).encode())
+
+
+def _send_fens(game: Chess, spectators: list[_Spectator], _broadcaster: Broadcaster) -> None:
+    """Sends the FEN string encoded for every spectator."""
+    for spectator in spectators:
+        spectator.write(board_to_fen(game.board, game.turn).encode())
+
+
+def _measure(
+    moves: list[str],
+    spectators: list[_Spectator],
+    send: Callable[[Chess, list[_Spectator], Broadcaster], None],
+) -> float:
+    """Plays the moves, sending each to the spectators, and returns the time spent sending."""
+    game, elapsed = Chess(), 0.0
+    broadcaster = Broadcaster()
+    for spectator in spectators:
+        broadcaster.subscribe("g1", spectator)
+
+    for move in moves:
+        game.push(move)
+
+        start = time.perf_counter()
+        send(game, spectators, broadcaster)
+        elapsed += time.perf_counter() - start
+
+    return elapsed
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time and the bytes per move and spectator."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spectators", type=int, default=10_000, help="spectators of the game")
+    parser.add_argument("--plies", type=int, default=60, help="plies of the game")
+    args = parser.parse_args()
+
+    moves = _random_moves(random.Random(0), args.plies)
+    count = len(moves) * args.spectators
+
+    for name, send in (("delta", _send_deltas), ("board", _send_boards), ("fen", _send_fens)):
+        spectators = [_Spectator() for _ in range(args.spectators)]
+        elapsed = _measure(moves, spectators, send)
+        sent = sum(spectator.received for spectator in spectators)
+
+        print(
+            f"{name}: {elapsed / count * 1e9:.0f} ns and {sent / count:.0f} bytes "
+            f"per move and spectator"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark of the chess clocks and of the scheduling of their flag-falls.
+
+Every move of a timed game presses its clock and moves its deadline. The
+deadlines of many games are rescheduled at random in a FlagScheduler and,
+for comparison, as a timer handle per game on an asyncio event loop.
+
+Run with `uv run python benchmarks/bench_clocks.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from chess.clock import ChessClock, FlagScheduler, TimeControl
+from chess.colour_and_aliases import Colour
+
+
+def main() -> None:
+    """Runs the benchmark and prints the cost of a press and of a reschedule."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=10_000, help="timed games")
+    parser.add_argument("--moves", type=int, default=200_000, help="moves played")
+    args = parser.parse_args()
+
+    clock, colour = ChessClock(TimeControl(300, 2)), Colour.WHITE
+    start = time.perf_counter_ns()
+    for _ in range(args.moves):
+        clock.press(colour)
+        clock.deadline_ns()
+        colour = ~colour
+    print(f"press: {(time.perf_counter_ns() - start) / args.moves:.0f} ns per move")
+
+    rng = random.Random(0)
+    moves = [(rng.randrange(args.games), rng.randrange(10**12)) for _ in range(args.moves)]
+
+    flags: FlagScheduler[int] = FlagScheduler()
+    start = time.perf_counter_ns()
+    for game, deadline in moves:
+        flags.schedule(game, deadline)
+    due = len(flags.pop_due(10**12))
+    elapsed = time.perf_counter_ns() - start
+    print(f"scheduler: {elapsed / args.moves:.0f} ns per move, {due} flag-falls")
+
+    async def timers() -> float:
+        loop = asyncio.get_running_loop()
+        handles: dict[int, asyncio.TimerHandle] = {}
+
+        start = time.perf_counter_ns()
+        for game, deadline in moves:
+            if (handle := handles.get(game)) is not None:
+                handle.cancel()
+            handles[game] = loop.call_at(loop.time() + 3600 + deadline / 10**9, print)
+        elapsed = time.perf_counter_ns() - start
+
+        for handle in handles.values():
+            handle.cancel()
+
+        return elapsed / len(moves)
+
+    print(f"timer per game: {asyncio.run(timers()):.0f} ns per move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of the position index.
+
+An archive of random games is indexed, then the positions of the games are
+looked up in the memory-mapped index.
+
+Run with `uv run python benchmarks/bench_explorer.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from chess.archive import pack_game, write_archive
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.explorer import PositionIndex, build_index
+from chess.fen import board_from_fen, board_to_fen
+
+
+def _random_moves(rng: random.Random, plies: int) -> list[str]:
+    """Plays a random game and returns its moves."""
+    board, turn, moves = Board(), Colour.WHITE, []
+
+    for _ in range(plies):
+        if not (legal_moves := board.legal_moves(turn)):
+            break
+
+        moves.append(move := rng.choice(legal_moves))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return moves
+
+
+def main() -> None:
+    """Runs the benchmark and prints the build and query throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=500, help="games to index")
+    parser.add_argument("--plies", type=int, default=60, help="plies per game")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    parser.add_argument("--run-size", type=int, default=20_000, help="positions per run")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    games = [_random_moves(rng, args.plies) for _ in range(args.games)]
+    results = ("1-0", "0-1", "1/2-1/2")
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive, path = Path(directory) / "games.bin", Path(directory) / "index.bin"
+        write_archive((pack_game(moves, rng.choice(results)) for moves in games), archive)
+
+        start = time.perf_counter()
+        stats = build_index(archive, path, workers=args.workers, run_size=args.run_size)
+        build_time = time.perf_counter() - start
+
+        positions = []
+        for moves in games[:50]:
+            board, turn = Board(), Colour.WHITE
+            for move in moves:
+                positions.append(board_from_fen(board_to_fen(board, turn)))
+                board.apply_move(move, turn)
+                turn = ~turn
+
+        with PositionIndex(path) as index:
+            start = time.perf_counter()
+            for board, turn in positions:
+                assert index.games(board, turn)
+                index.moves(board, turn)
+            query_time = time.perf_counter() - start
+
+        print(
+            f"built: {stats.positions} positions, {stats.moves} moves in {build_time:.2f} s "
+            f"({stats.positions / build_time:.0f} positions/s), "
+            f"{path.stat().st_size / 2**10:.0f} KiB"
+        )
+        print(
+            f"query: {len(positions)} positions in {query_time:.3f} s "
+            f"({len(positions) / query_time:.0f} lookups/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
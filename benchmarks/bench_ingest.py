@@ -0,0 +1,78 @@
+"""Benchmark of the parallel PGN ingestion.
+
+A file of random games is replayed with an increasing number of workers to
+show how the throughput scales with the cores.
+
+Run with `uv run python benchmarks/bench_ingest.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.ingest import ingest
+from chess.pgn import ReplayStats, format_game, game_from_moves
+
+
+def _random_game(rng: random.Random, plies: int) -> str:
+    """Plays a random game and returns it in PGN."""
+    board, turn, moves = Board(), Colour.WHITE, []
+
+    for _ in range(plies):
+        if not (legal_moves := board.legal_moves(turn)):
+            break
+
+        moves.append(move := rng.choice(legal_moves))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return format_game(game_from_moves(moves))
+
+
+def _count(_game: object, moves: list[str]) -> int:
+    """Returns the number of moves of a game."""
+    return len(moves)
+
+
+def main() -> None:
+    """Runs the benchmark and prints the throughput for every number of workers."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20_000, help="games in the file")
+    parser.add_argument("--plies", type=int, default=60, help="plies per game")
+    parser.add_argument("--chunk-size", type=int, default=2**20, help="bytes per range")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # a few distinct games repeated, as generating random games is slow
+    games = [_random_game(rng, args.plies) for _ in range(100)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "games.pgn"
+        path.write_text("\n".join(games[i % len(games)] for i in range(args.games)))
+
+        print(f"{args.games} games, {path.stat().st_size / 2**20:.1f} MiB")
+
+        workers, baseline = 1, None
+        while workers <= (os.cpu_count() or 1):
+            stats = ReplayStats()
+            for _ in ingest(
+                path, _count, workers=workers, chunk_size=args.chunk_size, stats=stats
+            ):
+                pass
+
+            baseline = baseline or stats.games_per_second
+            print(
+                f"{workers:>3} workers: {stats.games_per_second:8,.0f} games/s, "
+                f"speed-up {stats.games_per_second / baseline:4.1f}"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
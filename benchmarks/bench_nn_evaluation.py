@@ -0,0 +1,70 @@
+"""Benchmark of neural network evaluations per second at different batch sizes.
+
+Run with `uv run python benchmarks/bench_nn_evaluation.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from copy import deepcopy
+
+import numpy as np
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine.encoding import encode_position
+from chess.engine.nn import MLPEvaluator
+
+_BATCH_SIZES = [1, 4, 16, 64, 256, 1024]
+
+
+def _positions(count: int, seed: int) -> list[tuple[Board, Colour]]:
+    """Returns positions from random games."""
+    rng = random.Random(seed)
+    positions: list[tuple[Board, Colour]] = []
+
+    while len(positions) < count:
+        board, turn = Board(), Colour.WHITE
+
+        for _ in range(60):
+            if not (moves := board.legal_moves(turn)):
+                break
+
+            board.apply_move(rng.choice(moves), turn)
+            turn = ~turn
+            positions.append((deepcopy(board), turn))
+
+    return positions[:count]
+
+
+def main() -> None:
+    """Runs the benchmark and prints evaluations per second per batch size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--positions", type=int, default=4096, help="positions per batch size")
+    parser.add_argument("--hidden", type=int, nargs="+", default=[256, 32])
+    args = parser.parse_args()
+
+    evaluator = MLPEvaluator.random(args.hidden)
+    positions = _positions(args.positions, seed=0)
+    encoded = np.stack([encode_position(board, turn) for board, turn in positions])
+
+    print(f"{'batch':>6} {'evals/s':>12} {'network only':>14}")
+
+    for batch_size in _BATCH_SIZES:
+        start = time.perf_counter()
+        for index in range(0, len(positions), batch_size):
+            evaluator.evaluate_batch(positions[index : index + batch_size])
+        total = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index in range(0, len(encoded), batch_size):
+            evaluator.forward(encoded[index : index + batch_size])
+        network = time.perf_counter() - start
+
+        print(f"{batch_size:>6} {len(positions) / total:>12.0f} {len(encoded) / network:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
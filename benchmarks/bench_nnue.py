@@ -0,0 +1,99 @@
+"""Benchmark of incremental accumulator updates against full recomputation.
+
+Run with `uv run python benchmarks/bench_nnue.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from copy import deepcopy
+
+import numpy as np
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine.encoding import encode_position
+from chess.engine.nnue import NNUEEvaluator
+
+
+def _moves(count: int, seed: int) -> list[tuple[Board, str, Colour]]:
+    """Returns moves of random games with the positions they are played in."""
+    rng = random.Random(seed)
+    moves: list[tuple[Board, str, Colour]] = []
+
+    while len(moves) < count:
+        board, turn = Board(), Colour.WHITE
+
+        for _ in range(60):
+            if not (legal_moves := board.legal_moves(turn)):
+                break
+
+            move = rng.choice(legal_moves)
+            moves.append((deepcopy(board), move, turn))
+            board.apply_move(move, turn)
+            turn = ~turn
+
+    return moves[:count]
+
+
+def main() -> None:
+    """Runs the benchmark and prints the cost per node of every way to evaluate."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moves", type=int, default=2000, help="moves to measure")
+    parser.add_argument("--hidden", type=int, default=256, help="size of each accumulator")
+    args = parser.parse_args()
+
+    evaluator = NNUEEvaluator.random(args.hidden)
+    moves = _moves(args.moves, seed=0)
+    children = []
+    for board, move, turn in moves:
+        child = deepcopy(board)
+        child.apply_move(move, turn)
+        children.append((child, ~turn))
+
+    # dense forward pass: encode the child and multiply by the whole first layer
+    dense_scores = []
+    start = time.perf_counter()
+    for child, colour in children:
+        accumulators = [
+            evaluator.feature_bias
+            + np.unpackbits(encode_position(child, side)).astype(np.int16)
+            @ evaluator.feature_weights
+            for side in Colour
+        ]
+        dense_scores.append(evaluator._output(np.stack(accumulators), colour))  # noqa: SLF001
+    dense = (time.perf_counter() - start) / len(moves)
+
+    # sparse recomputation: sum the columns of all pieces of the child and evaluate
+    start = time.perf_counter()
+    full_scores = evaluator.evaluate_batch(children)
+    full = (time.perf_counter() - start) / len(moves)
+
+    # incremental: update from the parent, evaluate and take the move back
+    incremental_scores, incremental = [], 0.0
+    for board, move, turn in moves:
+        evaluator.reset(board)
+
+        start = time.perf_counter()
+        evaluator.push(board, move, turn)
+        incremental_scores.append(evaluator.evaluate(board, ~turn))
+        evaluator.pop()
+        incremental += time.perf_counter() - start
+    incremental /= len(moves)
+
+    if not dense_scores == full_scores == incremental_scores:
+        raise AssertionError("incremental updates do not match full recomputation")
+
+    print(f"{'dense forward pass':<22} {dense * 1e6:8.1f} us per node")
+    print(f"{'sparse recomputation':<22} {full * 1e6:8.1f} us per node")
+    print(f"{'incremental update':<22} {incremental * 1e6:8.1f} us per node")
+    print(
+        f"speed-up: {dense / incremental:.1f}x over the dense pass,"
+        f" {full / incremental:.1f}x over the sparse recomputation"
+    )
+
+
+if __name__ == "__main__":
+    main()
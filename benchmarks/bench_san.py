@@ -0,0 +1,68 @@
+"""Benchmark of the SAN conversion.
+
+The moves of random games are converted to SAN and back, as when games are
+exported to and read from PGN files.
+
+Run with `uv run python benchmarks/bench_san.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from copy import deepcopy
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+
+
+def _positions(games: int, plies: int, seed: int) -> list[tuple[Board, Colour, str]]:
+    """Returns the positions of random games with the moves played in them."""
+    rng = random.Random(seed)
+    positions = []
+
+    for _ in range(games):
+        board, turn = Board(), Colour.WHITE
+
+        for _ in range(plies):
+            if not (moves := board.legal_moves(turn)):
+                break
+
+            move = rng.choice(moves)
+            positions.append((deepcopy(board), turn, move))
+            board.apply_move(move, turn)
+            turn = ~turn
+
+    return positions
+
+
+def main() -> None:
+    """Runs the benchmark and prints the conversion rates."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20, help="random games")
+    parser.add_argument("--plies", type=int, default=80, help="plies per game")
+    parser.add_argument("--repeat", type=int, default=20, help="conversions per move")
+    args = parser.parse_args()
+
+    positions = _positions(args.games, args.plies, seed=0)
+    sans = [board.san(move, turn) for board, turn, move in positions]
+    conversions = len(positions) * args.repeat
+
+    start = time.perf_counter()
+    for board, turn, move in positions:
+        for _ in range(args.repeat):
+            board.san(move, turn)
+    elapsed = time.perf_counter() - start
+    print(f"move to SAN: {conversions / elapsed:9,.0f} moves/s")
+
+    start = time.perf_counter()
+    for (board, turn, _), san in zip(positions, sans, strict=True):
+        for _ in range(args.repeat):
+            board.parse_san(san, turn)
+    elapsed = time.perf_counter() - start
+    print(f"SAN to move: {conversions / elapsed:9,.0f} moves/s")
+
+
+if __name__ == "__main__":
+    main()
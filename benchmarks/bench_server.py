@@ -0,0 +1,153 @@
+"""Load test of the game server with many concurrent games.
+
+A server is started in this process and clients play random games on it
+over local TCP connections, every game waiting for the reply to its move
+before sending the next one, after an optional think time drawn from an
+exponential distribution. Without think time, the latency is mostly the
+time a move waits behind the moves of the other games. The latency of every move is measured from
+the time it is sent to the time its reply arrives.
+
+With `--shards N` the games are hosted by a chess.shards.ShardedServer
+in N worker processes instead, so that the throughput scales with the
+cores until the front process, which shares its core with the clients
+here, is the bottleneck.
+
+Run with `uv run python benchmarks/bench_server.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import deque
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.server import GameServer
+from chess.shards import ShardedServer
+
+
+class _Connection:
+    """A client connection matching the replies to the commands in order."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader, self._writer = reader, writer
+        self._pending: deque[asyncio.Future[str]] = deque()
+        self._task = asyncio.create_task(self._read())
+
+    async def request(self, command: str) -> str:
+        """Sends a command and waits for its reply."""
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._writer.write(f"{command}\n".encode())
+
+        return await future
+
+    async def close(self) -> None:
+        """Quits and waits for the server to close the connection."""
+        self._writer.write(b"quit\n")
+        await self._task
+        self._writer.close()
+
+    async def _read(self) -> None:
+        """Hands the replies to the commands waiting for them."""
+        while line := await self._reader.readline():
+            if not line.startswith(b"played"):
+                self._pending.popleft().set_result(line.decode())
+
+
+def _random_moves(rng: random.Random, plies: int) -> list[str]:
+    """Plays a random game and returns its moves."""
+    board, turn, moves = Board(), Colour.WHITE, []
+
+    for _ in range(plies):
+        if not (legal_moves := board.legal_moves(turn)):
+            break
+
+        moves.append(move := rng.choice(legal_moves))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return moves
+
+
+async def _play(
+    connection: _Connection, game_id: str, moves: list[str], latencies: list[float], think: float
+) -> None:
+    """Plays both sides of a game, thinking for think seconds on average before a move."""
+    await connection.request(f"new {game_id}")
+    await connection.request(f"join {game_id} white")
+    await connection.request(f"join {game_id} black")
+
+    for move in moves:
+        if think:
+            await asyncio.sleep(random.expovariate(1 / think))
+
+        start = time.perf_counter()
+        reply = await connection.request(f"move {game_id} {move}")
+        latencies.append(time.perf_counter() - start)
+
+        assert reply.startswith("ok"), reply
+
+
+async def _load_test(args: argparse.Namespace, games: list[list[str]]) -> None:
+    """Plays the games on a server and prints the throughput and latency."""
+    hosted = ShardedServer(args.shards) if args.shards else GameServer(args.workers)
+
+    async with hosted:
+        server = await hosted.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        connections = [
+            _Connection(*await asyncio.open_connection("127.0.0.1", port))
+            for _ in range(args.connections)
+        ]
+        latencies: list[float] = []
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _play(connections[i % len(connections)], f"g{i}", moves, latencies, args.think)
+                for i, moves in enumerate(games)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        for connection in connections:
+            await connection.close()
+
+        server.close()
+        await server.wait_closed()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{len(games)} concurrent games, {len(latencies)} moves in {elapsed:.1f} s: "
+        f"{len(latencies) / elapsed:.0f} moves/s"
+    )
+    print(f"move latency: p50 {percentiles[49] * 1e3:.1f} ms, p99 {percentiles[98] * 1e3:.1f} ms")
+
+
+def main() -> None:
+    """Runs the load test."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=10_000, help="concurrent games")
+    parser.add_argument("--plies", type=int, default=20, help="plies per game")
+    parser.add_argument("--connections", type=int, default=100, help="client connections")
+    parser.add_argument("--workers", type=int, default=1, help="threads checking moves")
+    parser.add_argument("--shards", type=int, default=0, help="worker processes, 0 for none")
+    parser.add_argument("--think", type=float, default=0.0, help="mean think time in seconds")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # a few distinct games repeated, as generating random games is slow
+    distinct = [_random_moves(rng, args.plies) for _ in range(50)]
+    games = [distinct[i % len(distinct)] for i in range(args.games)]
+
+    asyncio.run(_load_test(args, games))
+
+
+if __name__ == "__main__":
+    main()
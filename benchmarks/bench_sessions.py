@@ -0,0 +1,90 @@
+"""Benchmark of the session store.
+
+Games with a few random moves each are put in a dict and in a store
+holding a fraction of them in memory, and the memory they take is
+compared. Then games of the store are picked at random and played a move
+each, so that most of them are read back from disk.
+
+Run with `uv run python benchmarks/bench_sessions.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from chess.chess_class import Chess
+from chess.sessions import SessionStore, pack_session
+
+if TYPE_CHECKING:
+    from collections.abc import MutableMapping
+
+
+def _random_game(rng: random.Random, plies: int) -> Chess:
+    """Plays a game of random moves."""
+    game = Chess()
+
+    for _ in range(plies):
+        if not (legal_moves := game.legal_moves()):
+            break
+
+        game.push(rng.choice(legal_moves))
+
+    return game
+
+
+def main() -> None:
+    """Runs the benchmark and prints the memory per game and the eviction throughput."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=1_000, help="games in the store")
+    parser.add_argument("--capacity", type=int, default=100, help="games kept in memory")
+    parser.add_argument("--plies", type=int, default=30, help="plies per game")
+    parser.add_argument("--moves", type=int, default=2_000, help="moves played")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SessionStore(Path(directory) / "sessions", args.capacity)
+
+        stores: tuple[tuple[str, MutableMapping[str, Chess]], ...] = (
+            ("dict", {}),
+            ("store", store),
+        )
+        for name, games in stores:
+            rng = random.Random(0)
+            tracemalloc.start()
+            for game_id in range(args.games):
+                games[str(game_id)] = _random_game(rng, args.plies)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            # the memory of the games kept in memory included
+            print(f"{name}: {memory / args.games:.0f} B of memory per game")
+
+        del games
+        print(
+            f"store: {args.games - args.capacity} of {args.games} games idle, "
+            f"{len(pack_session(store['0']))} B on disk per game"
+        )
+
+        start = time.perf_counter()
+        for _ in range(args.moves):
+            game = store[str(rng.randrange(args.games))]
+            if legal_moves := game.legal_moves():
+                game.push(rng.choice(legal_moves))
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"moves: {args.moves} in {elapsed:.2f} s ({args.moves / elapsed:.0f} moves/s), "
+            f"{store.restores} restores, {store.evictions} evictions"
+        )
+
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
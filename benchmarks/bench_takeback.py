@@ -0,0 +1,92 @@
+"""Benchmark of taking moves back.
+
+A game of random moves is stepped through backwards one ply at a time and
+then sought to random plies, both with Chess.undo and Chess.seek and by
+replaying the moves on a new board, as was needed before.
+
+Run with `uv run python benchmarks/bench_takeback.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from chess.board import Board
+from chess.chess_class import Chess
+from chess.colour_and_aliases import Colour
+
+
+def _random_moves(rng: random.Random, plies: int) -> list[str]:
+    """Plays a random game and returns its moves."""
+    board, turn, moves = Board(), Colour.WHITE, []
+
+    for _ in range(plies):
+        if not (legal_moves := board.legal_moves(turn)):
+            break
+
+        moves.append(move := rng.choice(legal_moves))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return moves
+
+
+def _replay(moves: list[str]) -> Board:
+    """Replays moves on a new board."""
+    board, turn = Board(), Colour.WHITE
+
+    for move in moves:
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return board
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time per takeback and per seek."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plies", type=int, default=300, help="plies of the game")
+    parser.add_argument("--seeks", type=int, default=1_000, help="random seeks")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    moves = _random_moves(rng, args.plies)
+    targets = [rng.randrange(len(moves) + 1) for _ in range(args.seeks)]
+
+    game = Chess.from_moves(moves)
+    start = time.perf_counter()
+    while game.ply:
+        game.undo()
+    undo_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ply in range(len(moves), 0, -1):
+        _replay(moves[: ply - 1])
+    replay_time = time.perf_counter() - start
+
+    print(
+        f"takeback: {undo_time / len(moves) * 1e6:.1f} µs with undo, "
+        f"{replay_time / len(moves) * 1e6:.1f} µs replaying, over {len(moves)} plies"
+    )
+
+    game = Chess.from_moves(moves)
+    start = time.perf_counter()
+    for ply in targets:
+        game.seek(ply)
+    seek_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ply in targets:
+        _replay(moves[:ply])
+    replay_time = time.perf_counter() - start
+
+    print(
+        f"seek: {seek_time / args.seeks * 1e6:.1f} µs with seek, "
+        f"{replay_time / args.seeks * 1e6:.1f} µs replaying, over {args.seeks} random plies"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of how far the engine search overruns its time budget.
+
+Run with `uv run python benchmarks/bench_time_management.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from copy import deepcopy
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine import Searcher, SearchLimits, allocate_time
+
+_OPENING = ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6"]
+
+_LIMITS = {
+    "movetime 0.1s": SearchLimits(movetime=0.1),
+    "movetime 0.5s": SearchLimits(movetime=0.5),
+    "bullet 1+0": SearchLimits(white_time=1.0, black_time=1.0),
+    "blitz 3+2": SearchLimits(white_time=3.0, black_time=3.0, white_increment=2.0),
+    "clock 0.2s left": SearchLimits(white_time=0.2, black_time=0.2),
+}
+
+
+def _positions() -> list[tuple[Board, Colour]]:
+    """Returns the positions to search: every position of a short opening."""
+    positions = []
+    board, turn = Board(), Colour.WHITE
+
+    for move in _OPENING:
+        positions.append((board, turn))
+        board = deepcopy(board)
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return positions
+
+
+def main() -> None:
+    """Runs the benchmark and prints the overrun statistics per time control."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=2, help="searches per position")
+    parser.add_argument("--check-every", type=int, default=4, help="nodes between checks")
+    args = parser.parse_args()
+
+    searcher = Searcher(check_every=args.check_every)
+    positions = _positions()
+
+    print(f"{'limits':<16} {'searches':>8} {'mean ms':>8} {'p99 ms':>8} {'max ms':>8} {'over':>5}")
+
+    for name, limits in _LIMITS.items():
+        overruns = []
+
+        for board, turn in positions * args.runs:
+            budget = allocate_time(limits, turn)
+            if budget is None:
+                raise ValueError(f"{name} is not limited by time")
+
+            result = searcher.search(board, turn, limits)
+            overruns.append((result.elapsed - budget.hard) * 1000)
+
+        p99 = statistics.quantiles(overruns, n=100)[98] if len(overruns) > 1 else overruns[0]
+        print(
+            f"{name:<16} {len(overruns):>8} {statistics.fmean(overruns):>8.1f} {p99:>8.1f}"
+            f" {max(overruns):>8.1f} {sum(o > 0 for o in overruns):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """This is the main file to run chess."""
 
-from chess import Chess
+from chess.cli import main
 
 if __name__ == "__main__":
-    Chess().play()
+    main()
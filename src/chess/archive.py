@@ -0,0 +1,384 @@
+"""This module stores games in a compact binary archive.
+
+Every move takes 16 bits: the start square in bits 0-5, the end square in
+bits 6-11 and the promotion piece in bits 12-14. Castles set bit 15, with
+bit 12 telling the long castle from the short one. Squares are numbered
+rank * 8 + file from a1 = 0.
+
+A game is a 4-byte header, the result, flags and the number of plies, then
+the FEN of its starting position if it does not start from the starting
+position, prefixed with its length and padded to an even length, then the
+moves. The games are followed by an index of their offsets, aligned to 8
+bytes, and a 16-byte trailer with the offset of the index and the number of
+games, so any game is found without reading the others. All numbers are
+little-endian.
+
+Archives are memory mapped and games are decoded lazily, only when their
+moves are asked for.
+
+Run `python -m chess.archive --help` to convert PGN files into archives.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from chess.fen import board_from_fen
+from chess.ingest import ingest
+from chess.pgn import PGNWriter, ReplayStats, game_from_moves
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+    from chess.pgn import PGNGame
+
+RESULTS = ("*", "1-0", "0-1", "1/2-1/2")
+
+_MAGIC = b"CHGA"
+_HEADER = struct.Struct("<BBH")
+_TRAILER = struct.Struct("<QI4s")
+_HAS_FEN = 1
+_MAX_PLIES = 2**16 - 1
+
+_FILES = "abcdefgh"
+_PROMOTIONS = "nbrq"
+_CASTLE = 1 << 15
+_LONG_CASTLE = _CASTLE | 1 << 12
+
+
+def encode_move(move: str) -> int:
+    """Encodes a move in the notation of Board.legal_moves in 16 bits.
+
+    Args:
+        move (str): The move, e.g. 'g1f3', 'e7e8q' or 'o-o'.
+
+    Returns:
+        int: The encoded move.
+
+    """
+    if move in {"o-o", "o-o-o"}:
+        return _CASTLE if move == "o-o" else _LONG_CASTLE
+
+    start = (int(move[1]) - 1) * 8 + _FILES.index(move[0])
+    end = (int(move[3]) - 1) * 8 + _FILES.index(move[2])
+    promotion = _PROMOTIONS.index(move[4]) + 1 if len(move) == 5 else 0
+
+    return start | end << 6 | promotion << 12
+
+
+def decode_move(encoded: int) -> str:
+    """Decodes a move encoded by encode_move.
+
+    Args:
+        encoded (int): The encoded move.
+
+    Returns:
+        str: The move in the notation of Board.legal_moves.
+
+    """
+    if encoded & _CASTLE:
+        return "o-o-o" if encoded == _LONG_CASTLE else "o-o"
+
+    start, end, promotion = encoded & 63, encoded >> 6 & 63, encoded >> 12 & 7
+    move = f"{_FILES[start & 7]}{(start >> 3) + 1}{_FILES[end & 7]}{(end >> 3) + 1}"
+
+    return move + _PROMOTIONS[promotion - 1] if promotion else move
+
+
+def pack_game(moves: list[str], result: str = "*", fen: str | None = None) -> bytes:
+    """Encodes a game as an archive record.
+
+    Args:
+        moves (list[str]): The moves in the notation of Board.legal_moves.
+        result (str): The result token: '1-0', '0-1', '1/2-1/2' or '*'.
+        fen (str | None): The starting position, None for the starting position.
+
+    Returns:
+        bytes: The record.
+
+    Raises:
+        ValueError: If the game is too long or the result is unknown.
+
+    """
+    if len(moves) > _MAX_PLIES:
+        raise ValueError(f"Games are limited to {_MAX_PLIES} plies, not {len(moves)}.")
+
+    if result not in RESULTS:
+        raise ValueError(f"Unknown result: {result!r}")
+
+    words = array("H", map(encode_move, moves))
+    if sys.byteorder != "little":
+        words.byteswap()
+
+    header = _HEADER.pack(RESULTS.index(result), _HAS_FEN if fen else 0, len(moves))
+    position = bytes([len(fen)]) + fen.encode("ascii") if fen else b""
+    # the moves start at an even offset, so that they can be read as 16-bit words
+    position += b"\0" * (len(position) % 2)
+
+    return header + position + words.tobytes()
+
+
+@dataclass(frozen=True, slots=True)
+class ArchivedGame:
+    """A game read from an archive. Its moves are decoded when asked for.
+
+    Attributes:
+        result (str): The result token.
+        fen (str | None): The starting position, None for the starting position.
+
+    """
+
+    result: str
+    fen: str | None
+    _words: memoryview = field(repr=False)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def moves(self) -> list[str]:
+        """The moves in the notation of Board.legal_moves."""
+        return [decode_move(word) for word in self._words]
+
+    def pgn_game(self, tags: dict[str, str] | None = None) -> PGNGame:
+        """Converts the game to PGN.
+
+        Args:
+            tags (dict[str, str] | None): The tags of the game.
+
+        Returns:
+            PGNGame: The game with its moves in SAN.
+
+        """
+        if self.fen is None:
+            return game_from_moves(self.moves, self.result, tags)
+
+        board, turn = board_from_fen(self.fen)
+        return game_from_moves(self.moves, self.result, tags, board=board, turn=turn)
+
+
+class ArchiveWriter:
+    """Writes games to a new archive.
+
+    Used as a context manager, the archive is only moved to its path if the
+    block completes, and deleted if it raises.
+
+    Attributes:
+        games (int): The number of games written.
+
+    """
+
+    def __init__(self, path: str | Path, buffer_size: int = 2**16):
+        self._path = Path(path)
+        # the archive is written next to its path and moved there once complete
+        self._file = open(f"{path}.tmp", "wb", buffering=buffer_size)  # noqa: SIM115
+        self._offsets: array[int] = array("Q")
+        self.games: int = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, record: bytes) -> None:
+        """Appends a game.
+
+        Args:
+            record (bytes): The game, encoded by pack_game.
+
+        """
+        self._offsets.append(self._file.tell())
+        self._file.write(record)
+        self.games += 1
+
+    def close(self) -> None:
+        """Writes the index and moves the archive to its path."""
+        if self._file.closed:
+            return
+
+        self._file.write(b"\0" * (-self._file.tell() % 8))
+        index = self._file.tell()
+        if sys.byteorder != "little":
+            self._offsets.byteswap()
+
+        self._file.write(self._offsets.tobytes())
+        self._file.write(_TRAILER.pack(index, self.games, _MAGIC))
+        self._file.close()
+
+        os.replace(self._file.name, self._path)
+
+    def abort(self) -> None:
+        """Deletes the incomplete archive, leaving any previous one at its path."""
+        if self._file.closed:
+            return
+
+        self._file.close()
+        os.unlink(self._file.name)
+
+
+class GameArchive:
+    """A memory-mapped archive of games."""
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _TRAILER.size:
+                raise ValueError(f"{path} is not a game archive: it is too short.")
+
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index, games, magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if magic != _MAGIC or index + 8 * games != size - _TRAILER.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a game archive.")
+
+        self._view = memoryview(self._map)
+        self._index: memoryview | array[int] = self._view[index : index + 8 * games].cast("Q")
+        if sys.byteorder != "little":
+            self._index = array("Q", self._index)
+            self._index.byteswap()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, index: int) -> ArchivedGame:
+        return unpack_game(self._view, self._index[index])
+
+    def __iter__(self) -> Iterator[ArchivedGame]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps the file, or lets the games still in use unmap it once they are freed."""
+        if isinstance(self._index, memoryview):
+            self._index.release()
+        self._view.release()
+
+        with suppress(BufferError):
+            self._map.close()
+
+
+def write_archive(records: Iterable[bytes], path: str | Path) -> int:
+    """Writes games to a new archive.
+
+    Args:
+        records (Iterable[bytes]): The games, encoded by pack_game.
+        path (str | Path): The path of the archive. It is replaced atomically.
+
+    Returns:
+        int: The number of games written.
+
+    """
+    with ArchiveWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+
+    return writer.games
+
+
+def unpack_game(record: bytes | memoryview, offset: int = 0) -> ArchivedGame:
+    """Decodes a game encoded by pack_game.
+
+    Args:
+        record (bytes | memoryview): The record, or a buffer holding it.
+        offset (int): The offset of the record in the buffer.
+
+    Returns:
+        ArchivedGame: The game. Its moves are decoded when asked for.
+
+    """
+    view = memoryview(record)
+    result, flags, plies = _HEADER.unpack_from(view, offset)
+    offset += _HEADER.size
+
+    fen = None
+    if flags & _HAS_FEN:
+        length = view[offset]
+        fen = bytes(view[offset + 1 : offset + 1 + length]).decode("ascii")
+        offset += 1 + length + (1 + length) % 2
+
+    words = view[offset : offset + 2 * plies].cast("H")
+    if sys.byteorder != "little":
+        words = memoryview(_swapped(words))
+
+    return ArchivedGame(RESULTS[result], fen, words)
+
+
+def _swapped(words: memoryview) -> array[int]:
+    """Converts little-endian 16-bit words to the byte order of the machine."""
+    swapped = array("H", words)
+    swapped.byteswap()
+
+    return swapped
+
+
+def _pack_pgn_game(game: PGNGame, moves: list[str]) -> bytes:
+    """Encodes a replayed PGN game as an archive record."""
+    result = game.result if game.result in RESULTS else "*"
+    return pack_game(moves[:_MAX_PLIES], result, game.tags.get("FEN"))
+
+
+def main() -> None:
+    """Converts PGN files to archives and back from the command line."""
+    parser = argparse.ArgumentParser(description="Compact binary game archives.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="convert a PGN file to an archive")
+    convert.add_argument("pgn", type=Path, help="PGN file")
+    convert.add_argument("--output", "-o", type=Path, required=True, help="archive file")
+    convert.add_argument("--workers", type=int, default=None, help="number of processes")
+
+    export = commands.add_parser("export", help="append the games of an archive to a PGN file")
+    export.add_argument("archive", type=Path, help="archive file")
+    export.add_argument("--output", "-o", type=Path, required=True, help="PGN file")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        stats = ReplayStats()
+        games = write_archive(
+            ingest(args.pgn, _pack_pgn_game, workers=args.workers, stats=stats), args.output
+        )
+        print(
+            f"{games} games archived, {stats.errors} with errors: "
+            f"{args.output.stat().st_size / max(args.pgn.stat().st_size, 1):.1%} of the PGN size",
+            file=sys.stderr,
+        )
+        return
+
+    with GameArchive(args.archive) as archive, PGNWriter(args.output) as writer:
+        for game in archive:
+            writer.write(game.pgn_game())
+
+
+if __name__ == "__main__":
+    main()
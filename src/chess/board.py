@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import Enum, Flag, StrEnum, auto
 from itertools import product
 from typing import TYPE_CHECKING, override
 
 from chess.colour_and_aliases import Colour
 from chess.pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
-from chess.user_interaction import request_input
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from chess.colour_and_aliases import Square
+    from chess.tablebase import Tablebases
 
 
 class MoveOutcome(Flag):
@@ -22,7 +27,8 @@ class MoveOutcome(Flag):
     CHECK = auto()
     CHECKMATE = auto()
     STALEMATE = auto()
-    GAME_OVER = CHECKMATE | STALEMATE
+    DRAW = auto()
+    GAME_OVER = CHECKMATE | STALEMATE | DRAW
 
     def __str__(self) -> str:
         if (name := self.name) is None:
@@ -31,6 +37,85 @@ class MoveOutcome(Flag):
         return name.lower().replace("_", " ")
 
 
+class MoveError(StrEnum):
+    """Enum class for the reasons a move is rejected."""
+
+    INVALID_NOTATION = "invalid notation"
+    NO_PIECE = "no piece"
+    WRONG_TURN = "wrong turn"
+    ILLEGAL_MOVE = "illegal move"
+    CASTLING_RIGHTS = "castling rights"
+    CASTLING_IN_CHECK = "castling in check"
+    CASTLING_BLOCKED = "castling blocked"
+    CASTLING_THROUGH_CHECK = "castling through check"
+    PROMOTION_REQUIRED = "promotion required"
+    INVALID_PROMOTION = "invalid promotion"
+    GAME_OVER = "game over"
+
+
+@dataclass(frozen=True, slots=True)
+class MoveRejection:
+    """Why a move cannot be played.
+
+    Attributes:
+        error (MoveError): The reason.
+        message (str): The reason, worded for players.
+
+    """
+
+    error: MoveError
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class MoveRecord:
+    """A move played on a board, with the state it takes to take it back.
+
+    Attributes:
+        move (str): The move in the notation of legal_moves.
+        piece (Piece): The piece moved, the King when castling.
+        start (Square): The square the piece moved from.
+        end (Square): The square the piece moved to.
+        promotion (Piece | None): The piece the Pawn promoted to.
+        captured (Piece | None): The piece captured.
+        captured_square (Square | None): The square of the piece captured,
+            which is not `end` for a capture en passant.
+        piece_moved (bool): Whether the piece had moved before, which the
+            castling rights depend on.
+        en_passant_pawn (Pawn | None): The pawn that could be captured en
+            passant before the move.
+
+    """
+
+    move: str
+    piece: Pawn | King | Knight | Rook | Bishop | Queen
+    start: Square
+    end: Square
+    promotion: Pawn | King | Knight | Rook | Bishop | Queen | None = None
+    captured: Pawn | King | Knight | Rook | Bishop | Queen | None = None
+    captured_square: Square | None = None
+    piece_moved: bool = False
+    en_passant_pawn: Pawn | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BoardSnapshot:
+    """The state of a board, to be restored with Board.restore.
+
+    Attributes:
+        state (tuple[tuple[Pawn | King | Knight | Rook | Bishop | Queen | None, ...], ...]):
+            The pieces on the board.
+        moved (tuple[bool, ...]): Whether each piece on the board had moved,
+            in the order of `state`.
+        en_passant_pawn (Pawn | None): The pawn that could be captured en passant.
+
+    """
+
+    state: tuple[tuple[Pawn | King | Knight | Rook | Bishop | Queen | None, ...], ...]
+    moved: tuple[bool, ...]
+    en_passant_pawn: Pawn | None
+
+
 class _MoveCommand(StrEnum):
     """Enum class for moves."""
 
@@ -51,13 +136,6 @@ class _PromotionOption(StrEnum):
     ROOK = "r"
     KNIGHT = "n"
     BISHOP = "b"
-    HELP = "help"
-    INVALID = "invalid"  # Default value for invalid commands
-
-    @classmethod
-    @override
-    def _missing_(cls, value: object) -> _PromotionOption:
-        return cls.INVALID
 
 
 class _PromotionPiece(Enum):
@@ -69,6 +147,88 @@ class _PromotionPiece(Enum):
     QUEEN = Queen
 
 
+_PROMOTION_OPTIONS = (
+    _PromotionOption.QUEEN,
+    _PromotionOption.ROOK,
+    _PromotionOption.BISHOP,
+    _PromotionOption.KNIGHT,
+)
+
+_FILES = "abcdefgh"
+
+_KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_KING_STEPS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+# the directions of the sliding pieces with the pieces that slide along them
+_SLIDERS: tuple[tuple[tuple[Square, ...], tuple[type[Piece], ...]], ...] = (
+    (((1, 0), (0, 1), (-1, 0), (0, -1)), (Rook, Queen)),
+    (((1, 1), (-1, 1), (-1, -1), (1, -1)), (Bishop, Queen)),
+)
+
+# the squares a Knight or a King jumps to from every square
+_KNIGHT_LEAPS, _KING_LEAPS = (
+    {
+        (rank, file): [
+            (rank + rank_step, file + file_step)
+            for rank_step, file_step in steps
+            if 0 <= rank + rank_step < 8 and 0 <= file + file_step < 8
+        ]
+        for rank, file in product(range(8), range(8))
+    }
+    for steps in (_KNIGHT_STEPS, _KING_STEPS)
+)
+# the squares from which the Knights, the King and the Pawns of a player
+# attack every square, with the type of the piece that has to stand there
+_JUMPERS: dict[Colour, dict[Square, list[tuple[int, int, type[Piece]]]]] = {
+    colour: {
+        (rank, file): [
+            *((*origin, Knight) for origin in _KNIGHT_LEAPS[rank, file]),
+            *((*origin, King) for origin in _KING_LEAPS[rank, file]),
+            *(
+                (rank - pawn_step, file + file_step, Pawn)
+                for file_step in (-1, 1)
+                if 0 <= rank - pawn_step < 8 and 0 <= file + file_step < 8
+            ),
+        ]
+        for rank, file in product(range(8), range(8))
+    }
+    for colour, pawn_step in ((Colour.WHITE, 1), (Colour.BLACK, -1))
+}
+
+# the squares along every ray from every square, nearest first, with the
+# pieces that slide along the ray
+_RAYS: dict[Square, list[tuple[list[Square], tuple[type[Piece], ...]]]] = {
+    (rank, file): [
+        (ray, piece_types)
+        for directions, piece_types in _SLIDERS
+        for rank_step, file_step in directions
+        if (
+            ray := [
+                (rank + rank_step * i, file + file_step * i)
+                for i in range(1, 8)
+                if 0 <= rank + rank_step * i < 8 and 0 <= file + file_step * i < 8
+            ]
+        )
+    ]
+    for rank, file in product(range(8), range(8))
+}
+
+_SAN_PATTERN = re.compile(
+    r"(?P<piece>[KQRBN])?(?P<file>[a-h])?(?P<rank>[1-8])?x?"
+    r"(?P<end>[a-h][1-8])(?:=?(?P<promotion>[QRBN]))?"
+)
+_SAN_PIECES: dict[str, type[Piece]] = {
+    "K": King,
+    "Q": Queen,
+    "R": Rook,
+    "B": Bishop,
+    "N": Knight,
+    "": Pawn,
+}
+_SAN_LETTERS = {piece_type: letter for letter, piece_type in _SAN_PIECES.items()}
+_SAN_CASTLES = {"O-O": "o-o", "O-O-O": "o-o-o", "0-0": "o-o", "0-0-0": "o-o-o"}
+
+
 class Board:
     """Class used to manage the state of the chess board.
 
@@ -80,6 +240,26 @@ class Board:
     Methods:
         make_move(raw_input: str, turn: Colour): Performs a move and returns
             the outcome of the move as a member of the MoveOutcome class.
+        attempt_move(raw_input: str, turn: Colour): Performs a move and returns
+            its outcome, or why it was rejected.
+        move_error(raw_input: str, turn: Colour): Tells why a move cannot be
+            played, without modifying the board.
+        legal_moves(colour: Colour): Lists the legal moves of a player.
+        is_legal_move(move: str, colour: Colour): Checks a move in the notation
+            of legal_moves.
+        castling_rights(): The castling rights in FEN notation.
+        apply_move(move: str, colour: Colour): Plays a move taken from legal_moves
+            without any checks or console I/O.
+        play(move: str, colour: Colour): Plays a move like apply_move and
+            records it, so that take_back can take it back.
+        take_back(record: MoveRecord): Takes back the last move played.
+        move_outcome(colour: Colour): The outcome of a move just played.
+        snapshot(): Saves the state of the board.
+        restore(snapshot: BoardSnapshot): Restores a saved state of the board.
+        parse_san(san: str, colour: Colour): Converts a move in SAN to the
+            notation of legal_moves.
+        san(move: str, colour: Colour): Converts a move in the notation of
+            legal_moves to SAN.
 
     Glossary:
         - Possible move is a move that is technically possible, meaning that
@@ -89,14 +269,20 @@ class Board:
         - Legal move is a move that is possible and does not put the king in check.
 
     Notes:
-        The only method that should be called from outside the class is make_move.
-        It processes user input, performs necessary checks, calls the
-        appropriate method to make the move, and returns the outcome of the move.
-
-        The only 3 protected methods that modify the state of the board inplace are:
+        make_move is the method to call with user input. It processes the input,
+        performs necessary checks, calls the appropriate method to make the move,
+        and returns the outcome of the move. attempt_move does the same and tells
+        why a move was rejected. Neither prints nor prompts anything: a pawn
+        reaching the last rank needs the promotion suffix, e.g. 'e7e8q'.
+        legal_moves and apply_move are meant for programs, e.g. the engine,
+        that only ever play legal moves.
+
+        The only protected methods that modify the state of the board inplace are:
             - _move_piece: Moves a piece from one square to another.
+            - _play_piece_move: Moves a piece without checking legality.
             - _short_castle: Performs a short castle.
             - _long_castle: Performs a long castle.
+            - _castle: Castles without checking legality.
 
         All other methods either perform checks or are helper methods.
 
@@ -132,70 +318,517 @@ class Board:
             ],
         ]
         self.en_passant_pawn: Pawn | None = None
+        # where the kings were last found, checked before it is trusted
+        self._kings: dict[Colour, Square] = {}
 
-    def make_move(self, raw_input: str, turn: Colour) -> MoveOutcome:
+    def make_move(
+        self, raw_input: str, turn: Colour, *, tablebases: Tablebases | None = None
+    ) -> MoveOutcome:
         """Makes a move and processes the result.
 
         Args:
             raw_input (Square): The move to make.
             turn (Colour): The colour of the pieces of the player making the move.
+            tablebases (Tablebases | None): Endgame tablebases to end the game
+                with a draw as soon as the position is a known draw.
 
         Returns:
             MoveOutcome: The outcome of the move.
 
         """
-        res = False
-        if (move := _MoveCommand(raw_input)) == _MoveCommand.SHORT_CASTLE:
-            res = self._short_castle(turn)
+        outcome = self.attempt_move(raw_input, turn, tablebases=tablebases)
 
-        elif move == _MoveCommand.LONG_CASTLE:
-            res = self._long_castle(turn)
+        return outcome if isinstance(outcome, MoveOutcome) else MoveOutcome.FAILURE
 
-        elif coordinates := self._user_input_notation_to_coordinates(raw_input):
-            res = self._move_piece(coordinates, turn)
+    def attempt_move(
+        self, raw_input: str, turn: Colour, *, tablebases: Tablebases | None = None
+    ) -> MoveOutcome | MoveRejection:
+        """Makes a move, or tells why it cannot be made.
 
-        if not res:
-            return MoveOutcome.FAILURE
+        Args:
+            raw_input (str): The move to make.
+            turn (Colour): The colour of the pieces of the player making the move.
+            tablebases (Tablebases | None): Endgame tablebases to end the game
+                with a draw as soon as the position is a known draw.
+
+        Returns:
+            MoveOutcome | MoveRejection: The outcome of the move, or why it
+                was rejected, in which case the board is left unchanged.
+
+        """
+        if (rejection := self.move_error(raw_input, turn)) is not None:
+            return rejection
+
+        if (move := _MoveCommand(raw_input)) != _MoveCommand.PIECE_MOVE:
+            self._castle(turn, move)
+
+        elif coordinates := self._user_input_notation_to_coordinates(raw_input[:4]):
+            promotion = _PromotionOption(raw_input[4]) if len(raw_input) == 5 else None
+            self._play_piece_move(*coordinates, promotion)
+
+        return self.move_outcome(turn, tablebases=tablebases)
+
+    def move_error(self, raw_input: str, turn: Colour) -> MoveRejection | None:
+        """Checks whether a move input can be played, without modifying the board.
+
+        Args:
+            raw_input (str): The move, e.g. 'e2e4', 'e7e8q' or 'o-o'. A pawn
+                reaching the last rank needs the piece it promotes to as a suffix.
+            turn (Colour): The colour of the pieces of the player making the move.
+
+        Returns:
+            MoveRejection | None: Why the move cannot be played. None if it can.
+
+        """
+        if (move := _MoveCommand(raw_input)) != _MoveCommand.PIECE_MOVE:
+            return self._castling_error(turn, move)
+
+        if (
+            coordinates := self._user_input_notation_to_coordinates(raw_input[:4])
+        ) is None or raw_input[4:] not in {"", *_PROMOTION_OPTIONS}:
+            return MoveRejection(
+                MoveError.INVALID_NOTATION,
+                f"Invalid Move: {raw_input} is not a valid move. Type 'help' for help message.",
+            )
+
+        promotion = _PromotionOption(raw_input[4]) if len(raw_input) == 5 else None
+
+        return self._piece_move_error(coordinates, turn, promotion)
+
+    def legal_moves(self, colour: Colour) -> list[str]:
+        """Lists all legal moves of a player.
+
+        Piece moves are given as start square + end square, e.g. 'e2e4',
+        promotions carry the promotion option as a suffix, e.g. 'e7e8q',
+        and castles are given as 'o-o' and 'o-o-o'.
+
+        Args:
+            colour (Colour): The colour of the pieces of the player.
+
+        Returns:
+            list[str]: The legal moves of the player.
+
+        """
+        moves: list[str] = []
+        last_rank = 7 if colour == Colour.WHITE else 0
+
+        for start in product(range(8), range(8)):
+            if not (piece := self.state[start[0]][start[1]]) or piece.colour != colour:
+                continue
+
+            for end in piece.moves_to_consider(start):
+                if not self._legal_move(start, end):
+                    continue
+
+                move = self._square_to_notation(start) + self._square_to_notation(end)
+
+                if isinstance(piece, Pawn) and end[0] == last_rank:
+                    moves.extend(move + option for option in _PROMOTION_OPTIONS)
+                else:
+                    moves.append(move)
+
+        for castle in (_MoveCommand.SHORT_CASTLE, _MoveCommand.LONG_CASTLE):
+            if self._castling_error(colour, castle) is None:
+                moves.append(castle.value)
+
+        return moves
+
+    def is_legal_move(self, move: str, colour: Colour) -> bool:
+        """Checks whether a move in the notation of legal_moves is legal.
+
+        Args:
+            move (str): The move to check.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        Returns:
+            bool: Whether the move is legal.
+
+        """
+        if (command := _MoveCommand(move)) != _MoveCommand.PIECE_MOVE:
+            return self._castling_error(colour, command) is None
+
+        files = "abcdefgh"
+        if (
+            len(move) not in {4, 5}
+            or not {move[0], move[2]}.issubset(files)
+            or not {move[1], move[3]}.issubset("12345678")
+        ):
+            return False
+
+        start = (int(move[1]) - 1, files.index(move[0]))
+        end = (int(move[3]) - 1, files.index(move[2]))
+
+        if not (piece := self.state[start[0]][start[1]]) or piece.colour != colour:
+            return False
+
+        promotes = isinstance(piece, Pawn) and end[0] == (7 if colour == Colour.WHITE else 0)
+        if promotes != (len(move) == 5) or (promotes and move[4] not in _PROMOTION_OPTIONS):
+            return False
+
+        return self._legal_move(start, end)
+
+    def castling_rights(self) -> str:
+        """Lists the castling rights in FEN notation, e.g. 'KQkq'.
+
+        A right is kept as long as neither the King nor the Rook has moved.
+
+        Returns:
+            str: The castling rights. '-' if neither player can castle anymore.
+
+        """
+        rights = ""
+
+        for colour, rank in ((Colour.WHITE, 0), (Colour.BLACK, 7)):
+            king = self.state[rank][4]
+            if not isinstance(king, King) or king.colour != colour or king.moved:
+                continue
 
-        if self._has_legal_move(~turn):
-            return MoveOutcome.CHECK if self._king_checked(~turn) else MoveOutcome.SUCCESS
+            for file_, right in ((7, "k"), (0, "q")):
+                rook = self.state[rank][file_]
+                if isinstance(rook, Rook) and rook.colour == colour and not rook.moved:
+                    rights += right.upper() if colour == Colour.WHITE else right
 
-        return MoveOutcome.CHECKMATE if self._king_checked(~turn) else MoveOutcome.STALEMATE
+        return rights or "-"
 
-    def _move_piece(self, coordinates: tuple[Square, Square], turn: Colour) -> bool:
+    def apply_move(self, move: str, colour: Colour) -> None:
+        """Plays a legal move without any checks or console I/O.
+
+        Args:
+            move (str): A move in the notation of legal_moves.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        """
+        if (command := _MoveCommand(move)) != _MoveCommand.PIECE_MOVE:
+            self._castle(colour, command)
+            return
+
+        files = "abcdefgh"
+        start = (int(move[1]) - 1, files.index(move[0]))
+        end = (int(move[3]) - 1, files.index(move[2]))
+        promotion = _PromotionOption(move[4]) if len(move) == 5 else None
+
+        self._play_piece_move(start, end, promotion)
+
+    def play(self, move: str, colour: Colour) -> MoveRecord:
+        """Plays a legal move like apply_move and records it.
+
+        Args:
+            move (str): A move in the notation of legal_moves.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        Returns:
+            MoveRecord: The move, with what take_back needs to take it back.
+
+        Raises:
+            ValueError: If the move is not in the notation of legal_moves.
+
+        """
+        en_passant_pawn = self.en_passant_pawn
+
+        if (command := _MoveCommand(move)) != _MoveCommand.PIECE_MOVE:
+            rank = 0 if colour == Colour.WHITE else 7
+            if (king := self.state[rank][4]) is None:
+                raise TypeError
+
+            self._castle(colour, command)
+            king_end = (rank, 6 if command == _MoveCommand.SHORT_CASTLE else 2)
+
+            return MoveRecord(move, king, (rank, 4), king_end, en_passant_pawn=en_passant_pawn)
+
+        if (coordinates := self._user_input_notation_to_coordinates(move[:4])) is None:
+            raise ValueError(f"Invalid move: {move!r}")
+
+        start, end = coordinates
+        if (piece := self.state[start[0]][start[1]]) is None:
+            raise TypeError
+
+        captured_square = end
+        if type(piece) is Pawn and start[1] != end[1] and self.state[end[0]][end[1]] is None:
+            captured_square = start[0], end[1]
+
+        captured = self.state[captured_square[0]][captured_square[1]]
+        piece_moved = piece.moved
+
+        promotion = _PromotionOption(move[4]) if len(move) == 5 else None
+        self._play_piece_move(start, end, promotion)
+
+        return MoveRecord(
+            move,
+            piece,
+            start,
+            end,
+            self.state[end[0]][end[1]] if promotion is not None else None,
+            captured,
+            captured_square if captured is not None else None,
+            piece_moved,
+            en_passant_pawn,
+        )
+
+    def take_back(self, record: MoveRecord) -> None:
+        """Takes back the last move played.
+
+        Args:
+            record (MoveRecord): The record of the move, as returned by play.
+
+        """
+        (rank, start_file), (_, end_file) = record.start, record.end
+        state = self.state
+
+        if _MoveCommand(record.move) != _MoveCommand.PIECE_MOVE:
+            rook_start, rook_end = (7, 5) if end_file == 6 else (0, 3)
+            rook = state[rank][rook_end]
+
+            state[rank][end_file] = state[rank][rook_end] = None
+            state[rank][start_file], state[rank][rook_start] = record.piece, rook
+
+            # only a King and a Rook that had not moved could castle
+            record.piece.moved = False
+            if rook is not None:
+                rook.moved = False
+
+        else:
+            state[record.end[0]][end_file] = None
+            state[rank][start_file] = record.piece
+            record.piece.moved = record.piece_moved
+
+            if record.captured_square is not None:
+                state[record.captured_square[0]][record.captured_square[1]] = record.captured
+
+        self.en_passant_pawn = record.en_passant_pawn
+
+    def move_outcome(self, colour: Colour, *, tablebases: Tablebases | None = None) -> MoveOutcome:
+        """Finds the outcome of a move a player just played.
+
+        Args:
+            colour (Colour): The colour of the pieces of the player who moved.
+            tablebases (Tablebases | None): Endgame tablebases to end the game
+                with a draw as soon as the position is a known draw.
+
+        Returns:
+            MoveOutcome: The outcome of the move, never FAILURE.
+
+        """
+        if self._has_legal_move(~colour):
+            if (
+                tablebases is not None
+                and (result := tablebases.probe(self, ~colour))
+                and result.wdl == 0
+            ):
+                return MoveOutcome.DRAW
+
+            return MoveOutcome.CHECK if self._king_checked(~colour) else MoveOutcome.SUCCESS
+
+        return MoveOutcome.CHECKMATE if self._king_checked(~colour) else MoveOutcome.STALEMATE
+
+    def snapshot(self) -> BoardSnapshot:
+        """Saves the state of the board.
+
+        Returns:
+            BoardSnapshot: The state, to be restored with restore.
+
+        """
+        return BoardSnapshot(
+            tuple(tuple(row) for row in self.state),
+            tuple(piece.moved for row in self.state for piece in row if piece is not None),
+            self.en_passant_pawn,
+        )
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """Restores a saved state of the board.
+
+        Args:
+            snapshot (BoardSnapshot): The state, as returned by snapshot.
+
+        """
+        for row, saved in zip(self.state, snapshot.state, strict=True):
+            row[:] = saved
+
+        pieces = (piece for row in self.state for piece in row if piece is not None)
+        for piece, moved in zip(pieces, snapshot.moved, strict=True):
+            piece.moved = moved
+
+        self.en_passant_pawn = snapshot.en_passant_pawn
+
+    def parse_san(self, san: str, colour: Colour) -> str:
+        """Converts a move in Standard Algebraic Notation (SAN) to the notation of legal_moves.
+
+        Only the pieces that can reach the target square are considered, and
+        their legality is decided from the pins and checks of the position,
+        so no move is generated or played on the way.
+
+        Check and annotation suffixes such as '+', '#', '!?' and 'e.p.' are ignored.
+
+        Args:
+            san (str): The move in SAN, e.g. 'Nbd7', 'exd6' or 'e8=Q+'.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        Returns:
+            str: The move, e.g. 'b8d7'.
+
+        Raises:
+            ValueError: If the move is invalid, illegal or ambiguous.
+
+        """
+        text = san.rstrip("+#!?").removesuffix("e.p.").strip()
+
+        if (castle := _SAN_CASTLES.get(text)) is not None:
+            if self._castling_error(colour, _MoveCommand(castle)) is not None:
+                raise ValueError(f"Illegal move: {san!r}")
+            return castle
+
+        if (match := _SAN_PATTERN.fullmatch(text)) is None:
+            raise ValueError(f"Invalid SAN move: {san!r}")
+
+        end = (int(match["end"][1]) - 1, _FILES.index(match["end"][0]))
+        piece_type = _SAN_PIECES[match["piece"] or ""]
+        promotion = (match["promotion"] or "").lower()
+
+        if (piece_type is Pawn and end[0] == (7 if colour == Colour.WHITE else 0)) != bool(
+            promotion
+        ):
+            raise ValueError(f"Illegal move: {san!r}")
+
+        starts = [
+            start
+            for start in self._origins(end, colour, piece_type)
+            if (match["file"] is None or _FILES[start[1]] == match["file"])
+            and (match["rank"] is None or start[0] == int(match["rank"]) - 1)
+        ]
+
+        if len(starts := self._legal_origins(starts, end, colour)) != 1:
+            raise ValueError(f"{'Ambiguous' if starts else 'Illegal'} move: {san!r}")
+
+        return self._square_to_notation(starts[0]) + match["end"] + promotion
+
+    def san(self, move: str, colour: Colour) -> str:
+        """Converts a legal move in the notation of legal_moves to SAN.
+
+        Whether the move checks is found by moving the piece between its two
+        squares and back, and only a checking move is played in full to find
+        out whether it mates. The other pieces that can reach the target
+        square are only looked at to disambiguate the move.
+
+        Args:
+            move (str): The move, e.g. 'g1f3'.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        Returns:
+            str: The move in SAN with a check or mate suffix, e.g. 'Nf3+'.
+
+        """
+        san = move.upper() if move in {"o-o", "o-o-o"} else self._piece_move_san(move, colour)
+
+        if self._gives_check(move, colour):
+            with self._played(move, colour):
+                san += "+" if self._has_legal_move(~colour) else "#"
+
+        return san
+
+    def _move_piece(
+        self,
+        coordinates: tuple[Square, Square],
+        turn: Colour,
+        promotion: _PromotionOption | None = None,
+    ) -> bool:
         """The function to move a piece.
 
         Args:
             coordinates (tuple[Square, Square]): The coordinates of the move.
             turn (Colour): The colour of the pieces of the player making the move.
+            promotion (_PromotionOption | None): The piece to promote a pawn to.
 
         Returns:
             bool: Whether the move was played. False otherwise.
 
         """
-        start, end = coordinates[0], coordinates[1]
-        start_rank, start_file = start
-        end_rank, end_file = end
+        if self._piece_move_error(coordinates, turn, promotion) is not None:
+            return False
 
-        piece = self.state[start_rank][start_file]
+        self._play_piece_move(*coordinates, promotion)
+
+        return True
+
+    def _piece_move_error(
+        self,
+        coordinates: tuple[Square, Square],
+        turn: Colour,
+        promotion: _PromotionOption | None = None,
+    ) -> MoveRejection | None:
+        """Checks whether a piece move is legal without modifying the board.
+
+        Args:
+            coordinates (tuple[Square, Square]): The coordinates of the move.
+            turn (Colour): The colour of the pieces of the player making the move.
+            promotion (_PromotionOption | None): The piece to promote a pawn to.
+
+        Returns:
+            MoveRejection | None: Why the move is illegal. None if it is legal.
+
+        """
+        start, end = coordinates
+        piece = self.state[start[0]][start[1]]
 
         if not piece:
-            print(
+            return MoveRejection(
+                MoveError.NO_PIECE,
                 f"Invalid Move: There is no piece at {self._square_to_notation(start)}.",
-                end="\n\n",
             )
-            return False
 
         if piece.colour != turn:
-            print(f"Invalid Move: It is {turn}'s turn.", end="\n\n")
-            return False
+            return MoveRejection(MoveError.WRONG_TURN, f"Invalid Move: It is {turn}'s turn.")
 
         if not self._legal_move(start, end):
-            print(
+            return MoveRejection(
+                MoveError.ILLEGAL_MOVE,
                 f"Invalid Move: {piece.name} cannot move to {self._square_to_notation(end)}.",
-                end="\n\n",
             )
-            return False
+
+        promotes = type(piece) is Pawn and end[0] == (7 if turn == Colour.WHITE else 0)
+
+        if promotes and promotion is None:
+            move = self._square_to_notation(start) + self._square_to_notation(end)
+            return MoveRejection(
+                MoveError.PROMOTION_REQUIRED,
+                f"Invalid Move: Pick a piece to promote to, e.g. {move}q (Q/R/B/N).",
+            )
+
+        if not promotes and promotion is not None:
+            return MoveRejection(
+                MoveError.INVALID_PROMOTION,
+                "Invalid Move: Only a Pawn reaching the last rank promotes.",
+            )
+
+        return None
+
+    def _play_piece_move(
+        self, start: Square, end: Square, promotion: _PromotionOption | None = None
+    ) -> None:
+        """Moves a piece without checking whether the move is legal.
+
+        Args:
+            start (Square): The square to move from.
+            end (Square): The square to move to.
+            promotion (_PromotionOption | None): The piece to promote a pawn to.
+
+        Raises:
+            ValueError: If a pawn reaches the last rank without a promotion.
+
+        """
+        start_rank, start_file = start
+        end_rank, end_file = end
+
+        piece = self.state[start_rank][start_file]
+
+        if not isinstance(piece, Piece):
+            raise TypeError
+
+        promoted = None
+        if type(piece) is Pawn and end_rank == (7 if piece.colour == Colour.WHITE else 0):
+            if promotion is None:
+                raise ValueError("A Pawn reaching the last rank needs a piece to promote to.")
+
+            promoted = _PromotionPiece[promotion.name].value(piece.colour)
+            promoted.moved = True
 
         self.state[start_rank][start_file], self.state[end_rank][end_file] = None, piece
 
@@ -210,15 +843,11 @@ class Board:
         piece.moved = True
         self.en_passant_pawn = None
 
-        if isinstance(piece, Pawn):
-            if end_rank == 7 if turn == Colour.WHITE else 0:
-                option = self._request_pawn_promotion_option()
-                self.state[end_rank][end_file] = _PromotionPiece[option.name].value(turn)
-
-            elif abs(start_rank - end_rank) == 2:
-                self.en_passant_pawn = piece
+        if promoted is not None:
+            self.state[end_rank][end_file] = promoted
 
-        return True
+        elif isinstance(piece, Pawn) and abs(start_rank - end_rank) == 2:
+            self.en_passant_pawn = piece
 
     def _legal_move(self, start: Square, end: Square) -> bool:
         """Checks whether a move is legal.
@@ -271,7 +900,8 @@ class Board:
         """Checks whether a player has any legal moves.
 
         Iteratively checks every possible combination of the player's
-        moves to see if at least one of them is legal.
+        moves to see if at least one of them is legal. A player in check
+        only has to look at the moves that can get out of it.
 
         Args:
             colour (Colour): The colour of the pieces of the player to check.
@@ -280,6 +910,10 @@ class Board:
             bool: Whether the player has any legal move.
 
         """
+        king = self._find_king(colour)
+        if checkers := self._attackers(king, ~colour):
+            return self._can_escape_check(king, checkers, colour)
+
         for start_rank, start_file in product(range(8), range(8)):
             if not (piece := self.state[start_rank][start_file]) or piece.colour != colour:
                 continue
@@ -513,17 +1147,7 @@ class Board:
             bool: Whether the king is checked.
 
         """
-        king_coordinates = self._find_king(colour)
-
-        for rank_, file_ in product(range(8), range(8)):
-            if (
-                (piece := self.state[rank_][file_])
-                and piece.colour != colour
-                and self._possible_move((rank_, file_), king_coordinates)
-            ):
-                return True
-
-        return False
+        return bool(self._attackers(self._find_king(colour), ~colour))
 
     def _short_castle(self, colour: Colour) -> bool:
         """Performs a short castle.
@@ -535,140 +1159,413 @@ class Board:
             bool: Whether the move was played. False if the move was illegal.
 
         """
-        rank = 0 if colour == Colour.WHITE else 7
-
-        king = self.state[rank][4]
-        rook = self.state[rank][7]
-        in_between_squares = [(rank, 5), (rank, 6)]
-
-        if not isinstance(king, King) or not isinstance(rook, Rook) or king.moved or rook.moved:
-            print("Invalid Move: King or Rook has been moved.", end="\n\n")
+        if self._castling_error(colour, _MoveCommand.SHORT_CASTLE) is not None:
             return False
 
-        if self._king_checked(colour):
-            print("Invalid Move: Cannot castle under check.", end="\n\n")
-            return False
+        self._castle(colour, _MoveCommand.SHORT_CASTLE)
 
-        for rank_, file_ in in_between_squares:
-            if self.state[rank_][file_]:
-                print("Invalid Move: Cannot castle through another piece.", end="\n\n")
-                return False
+        return True
 
-            self.state[rank_][file_] = king
+    def _long_castle(self, colour: Colour) -> bool:
+        """Performs a long castle.
 
-            if self._king_checked(colour):
-                print("Invalid Move: Cannot castle through check.", end="\n\n")
-                self.state[rank_][file_] = None
-                return False
+        Args:
+            colour (Colour): The colour of the pieces of the player making the move.
 
-            self.state[rank_][file_] = None
+        Returns:
+            bool: Whether the move was played. False if the move was illegal.
 
-        self.state[rank][4] = None
-        self.state[rank][5] = rook
-        self.state[rank][6] = king
-        self.state[rank][7] = None
+        """
+        if self._castling_error(colour, _MoveCommand.LONG_CASTLE) is not None:
+            return False
+
+        self._castle(colour, _MoveCommand.LONG_CASTLE)
 
         return True
 
-    def _long_castle(self, colour: Colour) -> bool:
-        """Performs a long castle.
+    def _castling_error(self, colour: Colour, castle: _MoveCommand) -> MoveRejection | None:
+        """Checks whether a castle is legal without modifying the board.
 
         Args:
-            colour (Colour): The colour of the pieces of the player making the move.
+            colour (Colour): The colour of the pieces to castle.
+            castle (_MoveCommand): Either SHORT_CASTLE or LONG_CASTLE.
 
         Returns:
-            bool: Whether the move was played. False if the move was illegal.
+            MoveRejection | None: Why the castle is illegal. None if it is legal.
 
         """
         rank = 0 if colour == Colour.WHITE else 7
+        short = castle == _MoveCommand.SHORT_CASTLE
 
         king = self.state[rank][4]
-        rook = self.state[rank][0]
-        in_between_squares = [(rank, 2), (rank, 3)]
-        check_for_pieces = [*in_between_squares, (rank, 1)]
+        rook = self.state[rank][7 if short else 0]
+        king_path = [(rank, 5), (rank, 6)] if short else [(rank, 3), (rank, 2)]
+        check_for_pieces = king_path if short else [*king_path, (rank, 1)]
 
         if not isinstance(king, King) or not isinstance(rook, Rook) or king.moved or rook.moved:
-            print("Invalid Move: King or Rook has been moved.", end="\n\n")
-            return False
+            return MoveRejection(
+                MoveError.CASTLING_RIGHTS, "Invalid Move: King or Rook has been moved."
+            )
 
         if self._king_checked(colour):
-            print("Invalid Move: Cannot castle under check.", end="\n\n")
-            return False
-
-        for rank_, file_ in check_for_pieces:
-            if self.state[rank_][file_]:
-                print("Invalid Move: Cannot castle through another piece.", end="\n\n")
-                return False
+            return MoveRejection(
+                MoveError.CASTLING_IN_CHECK, "Invalid Move: Cannot castle under check."
+            )
 
-        for rank_, file_ in in_between_squares:
-            self.state[rank_][file_] = king
+        if any(self.state[rank_][file_] for rank_, file_ in check_for_pieces):
+            return MoveRejection(
+                MoveError.CASTLING_BLOCKED, "Invalid Move: Cannot castle through another piece."
+            )
 
-            if self._king_checked(colour):
-                print("Invalid Move: Cannot castle through check.", end="\n\n")
+        # walk the king along its path to see whether any square is attacked
+        self.state[rank][4] = None
+        try:
+            for rank_, file_ in king_path:
+                self.state[rank_][file_] = king
+                checked = self._king_checked(colour)
                 self.state[rank_][file_] = None
-                return False
 
-            self.state[rank_][file_] = None
+                if checked:
+                    return MoveRejection(
+                        MoveError.CASTLING_THROUGH_CHECK,
+                        "Invalid Move: Cannot castle through check.",
+                    )
 
-        self.state[rank][0] = None
-        self.state[rank][2] = king
-        self.state[rank][3] = rook
-        self.state[rank][4] = None
+        finally:
+            self.state[rank][4] = king
 
-        return True
+        return None
 
-    def _find_king(self, colour: Colour) -> Square:
-        """Finds the position of the king of the player.
+    def _castle(self, colour: Colour, castle: _MoveCommand) -> None:
+        """Moves the King and the Rook to castle without checking legality.
 
         Args:
-            colour (Colour): The colour of the king to search for.
+            colour (Colour): The colour of the pieces to castle.
+            castle (_MoveCommand): Either SHORT_CASTLE or LONG_CASTLE.
+
+        """
+        rank = 0 if colour == Colour.WHITE else 7
+        rook_start, king_end, rook_end = (
+            (7, 6, 5) if castle == _MoveCommand.SHORT_CASTLE else (0, 2, 3)
+        )
+
+        king, rook = self.state[rank][4], self.state[rank][rook_start]
+
+        if not isinstance(king, King) or not isinstance(rook, Rook):
+            raise TypeError
+
+        self.state[rank][4] = self.state[rank][rook_start] = None
+        self.state[rank][king_end], self.state[rank][rook_end] = king, rook
+        king.moved = rook.moved = True
+        self.en_passant_pawn = None
+
+    def _attackers(
+        self, square: Square, colour: Colour, ignore: Square | None = None
+    ) -> list[Square]:
+        """Finds the pieces of a player that attack a square.
+
+        Args:
+            square (Square): The attacked square.
+            colour (Colour): The colour of the attacking pieces.
+            ignore (Square | None): A square to treat as empty, e.g. the square
+                of a King that moves along the line of a sliding piece.
 
         Returns:
-            Square: The coordinates of the king.
+            list[Square]: The squares of the attacking pieces.
 
-        Raises:
-            ValueError: If the king was not found.
+        """
+        state = self.state
+        attackers = [
+            (rank, file)
+            for rank, file, piece_type in _JUMPERS[colour][square]
+            if (piece := state[rank][file]) is not None
+            and type(piece) is piece_type
+            and piece.colour is colour
+        ]
+
+        for ray, piece_types in _RAYS[square]:
+            for rank, file in ray:
+                if (piece := state[rank][file]) is None or (rank, file) == ignore:
+                    continue
+
+                if type(piece) in piece_types and piece.colour is colour:
+                    attackers.append((rank, file))
+                break
+
+        return attackers
+
+    def _can_escape_check(self, king: Square, checkers: list[Square], colour: Colour) -> bool:
+        """Checks whether a player in check has a legal move.
+
+        Args:
+            king (Square): The square of the King in check.
+            checkers (list[Square]): The squares of the checking pieces.
+            colour (Colour): The colour of the King.
+
+        Returns:
+            bool: Whether the King can move away or the check can be captured or blocked.
 
         """
-        for rank_, file_ in product(range(8), range(8)):
-            piece = self.state[rank_][file_]
-            if isinstance(piece, King) and piece.colour == colour:
-                return rank_, file_
+        state = self.state
+        if any(
+            ((piece := state[rank][file]) is None or piece.colour != colour)
+            and not self._attackers((rank, file), ~colour, ignore=king)
+            for rank, file in _KING_LEAPS[king]
+        ):
+            return True
 
-        raise ValueError("King not found.")
+        if len(checkers) > 1:
+            return False
 
-    @staticmethod
-    def _request_pawn_promotion_option() -> _PromotionOption:
-        """Requests the user to select a promotion option.
+        checker = checkers[0]
+        targets = [checker, *_between(king, checker)]
+        if state[checker[0]][checker[1]] is self.en_passant_pawn:
+            targets.append((checker[0] + (1 if colour == Colour.WHITE else -1), checker[1]))
+
+        for target in targets:
+            starts = [
+                start
+                for start in self._attackers(target, colour)
+                if type(state[start[0]][start[1]]) not in {King, Pawn}
+            ]
+            starts += self._origins(target, colour, Pawn)
+
+            if self._legal_origins(starts, target, colour):
+                return True
+
+        return False
+
+    def _pin_direction(self, king: Square, square: Square, colour: Colour) -> Square | None:
+        """Finds the direction in which a piece is pinned to its King.
+
+        Args:
+            king (Square): The square of the King.
+            square (Square): The square of a piece of the same colour.
+            colour (Colour): The colour of the King.
 
         Returns:
-            _PromotionOption: The option selected by the user.
+            Square | None: The direction from the King to the piece. None if
+                the piece is not pinned.
 
         """
-        while True:
-            option = _PromotionOption(request_input("Pick a piece to promote to (Q/R/B/N): "))
+        rank_diff, file_diff = square[0] - king[0], square[1] - king[1]
+        if (rank_diff and file_diff and abs(rank_diff) != abs(file_diff)) or any(
+            self.state[rank][file] for rank, file in _between(king, square)
+        ):
+            return None
 
-            if option == _PromotionOption.INVALID:
-                print(
-                    "Please select a valid promotion option.Type 'help' for help message.",
-                    sep="\n",
-                    end="\n\n",
-                )
-                continue
+        direction = ((rank_diff > 0) - (rank_diff < 0), (file_diff > 0) - (file_diff < 0))
+        piece_types = (Bishop, Queen) if all(direction) else (Rook, Queen)
+        rank, file = square[0] + direction[0], square[1] + direction[1]
+
+        while 0 <= rank < 8 and 0 <= file < 8:
+            if (piece := self.state[rank][file]) is not None:
+                pinned = type(piece) in piece_types and piece.colour != colour
+                return direction if pinned else None
+            rank, file = rank + direction[0], file + direction[1]
 
-            if option == _PromotionOption.HELP:
-                print(
-                    "Promotion options:",
-                    "- 'Q': to promoted to a Queen.",
-                    "- 'R': to promoted to a Rook.",
-                    "- 'B': to promoted to a Bishop.",
-                    "- 'N': to promoted to a Knight.",
-                    sep="\n",
-                    end="\n\n",
+        return None
+
+    def _origins(self, end: Square, colour: Colour, piece_type: type[Piece]) -> list[Square]:
+        """Finds the pieces of a type that can move to a square, ignoring checks and pins.
+
+        Args:
+            end (Square): The square to move to.
+            colour (Colour): The colour of the pieces.
+            piece_type (type[Piece]): The type of the pieces.
+
+        Returns:
+            list[Square]: The squares of the pieces.
+
+        """
+        if piece_type is Pawn:
+            behind = -1 if colour == Colour.WHITE else 1
+            squares = [(end[0] + behind, end[1] + file_step) for file_step in (-1, 0, 1)]
+            squares.append((end[0] + 2 * behind, end[1]))
+
+            return [
+                (rank, file)
+                for rank, file in squares
+                if 0 <= rank < 8
+                and 0 <= file < 8
+                and isinstance(piece := self.state[rank][file], Pawn)
+                and piece.colour == colour
+                and self._possible_pawn_move((rank, file), end)
+            ]
+
+        if (target := self.state[end[0]][end[1]]) is not None and target.colour == colour:
+            return []
+
+        return [
+            start
+            for start in self._attackers(end, colour)
+            if isinstance(self.state[start[0]][start[1]], piece_type)
+        ]
+
+    def _legal_origins(self, starts: list[Square], end: Square, colour: Colour) -> list[Square]:
+        """Keeps the possible moves to a square that do not leave the King in check.
+
+        Args:
+            starts (list[Square]): The squares of the pieces that can move to
+                the square, as found by _origins.
+            end (Square): The square to move to.
+            colour (Colour): The colour of the pieces.
+
+        Returns:
+            list[Square]: The squares of the pieces that can legally move to the square.
+
+        """
+        if not starts:
+            return starts
+
+        king = self._find_king(colour)
+        checkers = self._attackers(king, ~colour)
+        legal = []
+
+        for start in starts:
+            piece = self.state[start[0]][start[1]]
+
+            if type(piece) is King:
+                legal_move = not self._attackers(end, ~colour, ignore=king)
+
+            elif type(piece) is Pawn and start[1] != end[1] and not self.state[end[0]][end[1]]:
+                # capturing en passant empties two squares of a rank, which is
+                # rare enough to be checked by playing it
+                legal_move = self._legal_move(start, end)
+
+            else:
+                pin = self._pin_direction(king, start, colour)
+                legal_move = (pin is None or _on_ray(king, end, pin)) and (
+                    not checkers
+                    or (
+                        len(checkers) == 1
+                        and (end == checkers[0] or end in _between(king, checkers[0]))
+                    )
                 )
-                continue
 
-            return option
+            if legal_move:
+                legal.append(start)
+
+        return legal
+
+    def _piece_move_san(self, move: str, colour: Colour) -> str:
+        """Converts a move other than a castle to SAN without the check suffix."""
+        start = (int(move[1]) - 1, _FILES.index(move[0]))
+        end = (int(move[3]) - 1, _FILES.index(move[2]))
+        piece = self.state[start[0]][start[1]]
+
+        if not isinstance(piece, Piece):
+            raise TypeError
+
+        if isinstance(piece, Pawn):
+            # a pawn changing file captures, en passant when the target square is empty
+            capture = f"{move[0]}x" if start[1] != end[1] else ""
+            promotion = f"={move[4].upper()}" if len(move) == 5 else ""
+            return f"{capture}{move[2:4]}{promotion}"
+
+        piece_type = type(piece)
+        rivals = [other for other in self._origins(end, colour, piece_type) if other != start]
+        rivals = self._legal_origins(rivals, end, colour)
+
+        if not rivals:
+            disambiguation = ""
+        elif all(other[1] != start[1] for other in rivals):
+            disambiguation = move[0]
+        elif all(other[0] != start[0] for other in rivals):
+            disambiguation = move[1]
+        else:
+            disambiguation = move[:2]
+
+        capture = "x" if self.state[end[0]][end[1]] is not None else ""
+        return f"{_SAN_LETTERS[piece_type]}{disambiguation}{capture}{move[2:4]}"
+
+    def _gives_check(self, move: str, colour: Colour) -> bool:
+        """Checks whether a legal move checks the King of the opponent.
+
+        Args:
+            move (str): The move in the notation of legal_moves.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        Returns:
+            bool: Whether the move checks.
+
+        """
+        if move in {"o-o", "o-o-o"} or (
+            move[0] != move[2]
+            and type(self.state[int(move[1]) - 1][_FILES.index(move[0])]) is Pawn
+            and self.state[int(move[3]) - 1][_FILES.index(move[2])] is None
+        ):
+            # castles and captures en passant move more than one piece
+            with self._played(move, colour):
+                return self._king_checked(~colour)
+
+        start = (int(move[1]) - 1, _FILES.index(move[0]))
+        end = (int(move[3]) - 1, _FILES.index(move[2]))
+        piece, captured = self.state[start[0]][start[1]], self.state[end[0]][end[1]]
+        moved = (
+            _PromotionPiece[_PromotionOption(move[4]).name].value(colour)
+            if len(move) == 5
+            else piece
+        )
+
+        self.state[start[0]][start[1]], self.state[end[0]][end[1]] = None, moved
+        try:
+            return self._king_checked(~colour)
+
+        finally:
+            self.state[start[0]][start[1]], self.state[end[0]][end[1]] = piece, captured
+
+    @contextmanager
+    def _played(self, move: str, colour: Colour) -> Iterator[None]:
+        """Plays a legal move for the duration of the context, then takes it back.
+
+        Args:
+            move (str): The move in the notation of legal_moves.
+            colour (Colour): The colour of the pieces of the player making the move.
+
+        """
+        rows = [row[:] for row in self.state]
+        # only the pieces on the rank the move starts from can change whether they moved
+        rank = int(move[1]) - 1 if move[1].isdigit() else 0 if colour == Colour.WHITE else 7
+        moved = [(piece, piece.moved) for piece in rows[rank] if piece is not None]
+        en_passant_pawn = self.en_passant_pawn
+
+        self.apply_move(move, colour)
+        try:
+            yield
+
+        finally:
+            for row, saved in zip(self.state, rows, strict=True):
+                row[:] = saved
+            for piece, piece_moved in moved:
+                piece.moved = piece_moved
+            self.en_passant_pawn = en_passant_pawn
+
+    def _find_king(self, colour: Colour) -> Square:
+        """Finds the position of the king of the player.
+
+        Args:
+            colour (Colour): The colour of the king to search for.
+
+        Returns:
+            Square: The coordinates of the king.
+
+        Raises:
+            ValueError: If the king was not found.
+
+        """
+        if (square := self._kings.get(colour)) is not None:
+            piece = self.state[square[0]][square[1]]
+            if type(piece) is King and piece.colour == colour:
+                return square
+
+        for rank_, row in enumerate(self.state):
+            for file_, piece in enumerate(row):
+                if type(piece) is King and piece.colour == colour:
+                    self._kings[colour] = rank_, file_
+                    return rank_, file_
+
+        raise ValueError("King not found.")
 
     @staticmethod
     def _user_input_notation_to_coordinates(notation: str) -> tuple[Square, Square] | None:
@@ -683,37 +1580,16 @@ class Board:
                 None if the move is invalid.
 
         """
-        if len(notation) != 4:
-            print(f"Invalid Move: {notation} is not a valid move.", end="\n\n")
-            return None
-
-        files = ["a", "b", "c", "d", "e", "f", "g", "h"]
-
-        file_start, file_end = notation[0], notation[2]
-        rank_start, rank_end = notation[1], notation[3]
-
-        # Check if the start and end files are valid
-        if not {file_start, file_end}.issubset(set(files)):
-            print(
-                "Invalid Move: File selection is invalid.Type 'help' for help message.",
-                sep="\n",
-                end="\n\n",
-            )
+        if (
+            len(notation) != 4
+            or not {notation[0], notation[2]}.issubset(_FILES)
+            or not {notation[1], notation[3]}.issubset("12345678")
+        ):
             return None
 
-        # Check if the start and end ranks are valid
-        for rank in {rank_start, rank_end}:
-            if not rank.isdigit() or int(rank) not in range(1, 9):
-                print(
-                    "Invalid Move: Rank selection is invalid.Type 'help' for help message.",
-                    sep="\n",
-                    end="\n\n",
-                )
-                return None
-
         return (
-            (int(rank_start) - 1, files.index(file_start)),
-            (int(rank_end) - 1, files.index(file_end)),
+            (int(notation[1]) - 1, _FILES.index(notation[0])),
+            (int(notation[3]) - 1, _FILES.index(notation[2])),
         )
 
     @staticmethod
@@ -754,3 +1630,23 @@ class Board:
             + "  ".join(["a", "b", "c", "d", "e", "f", "g", "h"])
             + "\n"
         )
+
+
+def _on_ray(origin: Square, square: Square, direction: Square) -> bool:
+    """Checks whether a square lies on the ray from another square in a direction."""
+    rank_diff, file_diff = square[0] - origin[0], square[1] - origin[1]
+    distance = max(abs(rank_diff), abs(file_diff))
+
+    return (rank_diff, file_diff) == (direction[0] * distance, direction[1] * distance)
+
+
+def _between(start: Square, end: Square) -> list[Square]:
+    """Lists the squares strictly between two squares on a line, if they are on one."""
+    rank_diff, file_diff = end[0] - start[0], end[1] - start[1]
+    distance = max(abs(rank_diff), abs(file_diff))
+
+    if distance < 2 or (rank_diff and file_diff and abs(rank_diff) != abs(file_diff)):
+        return []
+
+    rank_step, file_step = rank_diff // distance, file_diff // distance
+    return [(start[0] + rank_step * i, start[1] + file_step * i) for i in range(1, distance)]
@@ -0,0 +1,329 @@
+"""This module builds and probes opening books in the Polyglot format.
+
+A book is a file of 16-byte entries sorted by position key: the 64-bit
+Polyglot key of the position, the move, its weight and, in the 32 'learn'
+bits, the number of games the move was played in. All numbers are big-endian.
+The weight of a move is the number of points it scored, two for a win and
+one for a draw, so that moves are picked in proportion to their results.
+
+Books are memory mapped and binary searched, so opening one reads nothing
+and probing a position touches a handful of pages.
+
+Run `python -m chess.book --help` to build books from PGN files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.pgn import read_games, replay
+from chess.polyglot import decode_move, encode_move, polyglot_key
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+    from chess.pgn import PGNGame
+
+ENTRY = struct.Struct(">QHHI")
+
+_KEY = struct.Struct(">Q")
+_MAX_WEIGHT = 2**16 - 1
+_MAX_COUNT = 2**32 - 1
+
+# the points of a result for White and for Black
+_POINTS = {"1-0": (2, 0), "0-1": (0, 2), "1/2-1/2": (1, 1), "*": (1, 1)}
+
+
+@dataclass(frozen=True, slots=True)
+class BookEntry:
+    """A move of a position in the book.
+
+    Attributes:
+        move (str): The move in the notation of Board.legal_moves.
+        weight (int): How often the move should be picked relative to the others.
+        count (int): The number of games the move was played in.
+
+    """
+
+    move: str
+    weight: int
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class BookStats:
+    """Statistics of a built book.
+
+    Attributes:
+        games (int): The number of games read.
+        errors (int): The number of games with an invalid FEN tag or move.
+            Their moves before the invalid one are kept.
+        positions (int): The number of distinct positions in the book.
+        entries (int): The number of entries in the book.
+
+    """
+
+    games: int
+    errors: int
+    positions: int
+    entries: int
+
+
+class OpeningBook:
+    """A memory-mapped opening book."""
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size % ENTRY.size:
+                raise ValueError(
+                    f"{path} is not an opening book: its size is not a multiple of 16."
+                )
+
+            # an empty file cannot be memory mapped
+            self._map: mmap.mmap | bytes = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+
+        self._size: int = size // ENTRY.size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def entries(self, board: Board, turn: Colour) -> list[BookEntry]:
+        """Looks up the moves of a position.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+
+        Returns:
+            list[BookEntry]: The moves of the position in the order of the
+                book, best first in books built here. Empty if the position
+                is not in the book.
+
+        """
+        key = polyglot_key(board, turn)
+        entries = []
+        index = self._first_index(key)
+
+        while index < self._size:
+            entry_key, move, weight, count = ENTRY.unpack_from(self._map, index * ENTRY.size)
+            if entry_key != key:
+                break
+
+            entries.append(BookEntry(decode_move(move, board), weight, count))
+            index += 1
+
+        return entries
+
+    def weighted_move(
+        self, board: Board, turn: Colour, rng: random.Random | None = None
+    ) -> str | None:
+        """Picks a move of a position at random, in proportion to the weights.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+            rng (random.Random | None): The random number generator.
+
+        Returns:
+            str | None: The move. None if the position is not in the book or
+                all of its moves have zero weight.
+
+        """
+        if not (entries := [entry for entry in self.entries(board, turn) if entry.weight]):
+            return None
+
+        weights = [entry.weight for entry in entries]
+        return (rng or random).choices(entries, weights)[0].move
+
+    def best_move(self, board: Board, turn: Colour) -> str | None:
+        """Picks the move of a position with the highest weight.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+
+        Returns:
+            str | None: The move. None if the position is not in the book.
+
+        """
+        entries = self.entries(board, turn)
+        return max(entries, key=lambda entry: entry.weight).move if entries else None
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def _first_index(self, key: int) -> int:
+        """Finds the index of the first entry with a key, or where it would be."""
+        low, high = 0, self._size
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if _KEY.unpack_from(self._map, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+
+def build_book(
+    games: Iterable[PGNGame], path: str | Path, *, plies: int = 20, min_count: int = 1
+) -> BookStats:
+    """Builds an opening book from games.
+
+    Args:
+        games (Iterable[PGNGame]): The games. Games with a 'FEN' tag start
+            from that position.
+        path (str | Path): The path of the book file. It is replaced atomically.
+        plies (int): The number of plies of every game to add to the book.
+        min_count (int): The number of games a move has to be played in to be
+            added to the book.
+
+    Returns:
+        BookStats: Statistics of the book.
+
+    """
+    # weight and count of every move of every position
+    moves: defaultdict[int, defaultdict[int, list[int]]] = defaultdict(
+        lambda: defaultdict(lambda: [0, 0])
+    )
+    game_count = errors = 0
+
+    for game in games:
+        game_count += 1
+        points = _POINTS.get(game.result, _POINTS["*"])
+
+        try:
+            for board, turn, move in islice(replay(game), plies):
+                stats = moves[polyglot_key(board, turn)][encode_move(move, turn)]
+                stats[0] += points[turn == Colour.BLACK]
+                stats[1] += 1
+
+        except ValueError:
+            errors += 1
+
+    entries = _book_entries(moves, min_count)
+    _write_book(path, entries)
+
+    return BookStats(game_count, errors, len({entry[0] for entry in entries}), len(entries))
+
+
+def _book_entries(
+    moves: dict[int, defaultdict[int, list[int]]], min_count: int
+) -> list[tuple[int, int, int, int]]:
+    """Sorts the moves into book entries, scaling the weights into 16 bits.
+
+    Args:
+        moves (dict[int, defaultdict[int, list[int]]]): The weight and count
+            of every move of every position.
+        min_count (int): The number of games a move has to be played in.
+
+    Returns:
+        list[tuple[int, int, int, int]]: The entries, by key and then by
+            decreasing weight.
+
+    """
+    entries = [
+        (key, move, weight, count)
+        for key, position_moves in moves.items()
+        for move, (weight, count) in position_moves.items()
+        if count >= min_count
+    ]
+
+    heaviest = max((entry[2] for entry in entries), default=0)
+    if heaviest > _MAX_WEIGHT:
+        # moves that scored keep a weight of at least 1
+        entries = [
+            (key, move, max(weight * _MAX_WEIGHT // heaviest, weight > 0), count)
+            for key, move, weight, count in entries
+        ]
+
+    entries.sort(key=lambda entry: (entry[0], -entry[2], entry[1]))
+
+    return [(key, move, weight, min(count, _MAX_COUNT)) for key, move, weight, count in entries]
+
+
+def _write_book(path: str | Path, entries: list[tuple[int, int, int, int]]) -> None:
+    """Writes book entries, replacing the file atomically."""
+    temporary = Path(f"{path}.tmp")
+
+    with open(temporary, "wb") as file:
+        for entry in entries:
+            file.write(ENTRY.pack(*entry))
+
+    os.replace(temporary, path)
+
+
+def main() -> None:
+    """Builds and probes books from the command line."""
+    parser = argparse.ArgumentParser(description="Polyglot opening books.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build a book from PGN files")
+    build.add_argument("files", type=Path, nargs="+", help="PGN files")
+    build.add_argument("--output", "-o", type=Path, required=True, help="book file")
+    build.add_argument("--plies", type=int, default=20, help="plies of every game to add")
+    build.add_argument("--min-count", type=int, default=1, help="games a move needs")
+
+    probe = commands.add_parser("probe", help="list the book moves of a position")
+    probe.add_argument("book", type=Path, help="book file")
+    probe.add_argument("--fen", default=None, help="position, defaults to the start")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_book(
+            _read_files(args.files), args.output, plies=args.plies, min_count=args.min_count
+        )
+        print(
+            f"{stats.games} games, {stats.errors} with errors: "
+            f"{stats.entries} entries in {stats.positions} positions",
+            file=sys.stderr,
+        )
+        return
+
+    board, turn = board_from_fen(args.fen) if args.fen else (Board(), Colour.WHITE)
+    with OpeningBook(args.book) as book:
+        for entry in book.entries(board, turn):
+            print(f"{entry.move}\tweight {entry.weight}\tgames {entry.count}")
+
+
+def _read_files(paths: list[Path]) -> Iterator[PGNGame]:
+    """Reads the games of PGN files one after the other."""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            yield from read_games(file)
+
+
+if __name__ == "__main__":
+    main()
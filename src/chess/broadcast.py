@@ -0,0 +1,250 @@
+"""This module sends the moves of games to their spectators as board diffs.
+
+A spectator is sent a snapshot of the game when it starts watching, and
+then a delta after every move, with only the squares the move changed:
+
+    snapshot GAME PLY FEN STATUS RESULT
+    delta GAME PLY SQUARES STATUS RESULT
+
+SQUARES lists the changed squares separated by commas, each followed by
+the FEN letter of its piece or '-' if it is empty, e.g. 'e2-,e4P', or is
+'-' if no square changed, e.g. after a resignation. The status has its
+spaces replaced with '-', as in the replies of chess.server.
+
+Every delta is encoded once and the same bytes are written to all the
+spectators. A spectator whose connection has more than `max_backlog`
+bytes waiting to be sent is skipped, and is sent a new snapshot instead
+of the deltas it missed once it catches up, so that a slow spectator
+neither holds up the others nor makes the server buffer every move for it.
+The spectators that caught up are also looked for every
+CATCH_UP_INTERVAL seconds, so that one that missed the last deltas of a
+game, e.g. the mate, is sent its final state although no delta follows.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+from chess.fen import board_to_fen, piece_letter
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+
+    from chess.board import MoveRecord
+    from chess.chess_class import Chess
+    from chess.colour_and_aliases import Square
+
+_FILES = "abcdefgh"
+
+# the seconds between two looks for the slow spectators that caught up
+CATCH_UP_INTERVAL = 0.1
+
+
+class Subscriber(Protocol):
+    """Where the lines of a spectator go, e.g. the asyncio.StreamWriter of its connection."""
+
+    @property
+    def transport(self) -> asyncio.WriteTransport:
+        """The transport whose buffer tells how far behind the spectator is."""
+
+    def write(self, data: bytes, /) -> None:
+        """Sends lines to the spectator."""
+
+
+def changed_squares(record: MoveRecord) -> list[Square]:
+    """The squares a move changed.
+
+    Args:
+        record (MoveRecord): The move.
+
+    Returns:
+        list[Square]: The squares, the Rook's included when castling and the
+            captured Pawn's when capturing en passant.
+
+    """
+    squares = [record.start, record.end]
+
+    if (captured := record.captured_square) is not None and captured != record.end:
+        squares.append(captured)
+
+    if record.move.startswith("o-o"):
+        rank = record.start[0]
+        squares += [(rank, 7), (rank, 5)] if record.move == "o-o" else [(rank, 0), (rank, 3)]
+
+    return squares
+
+
+def encode_delta(game_id: str, game: Chess, squares: list[Square]) -> bytes:
+    """Encodes the delta of a game after a move or another change of status.
+
+    Args:
+        game_id (str): The id of the game.
+        game (Chess): The game.
+        squares (list[Square]): The squares that changed.
+
+    Returns:
+        bytes: The line.
+
+    """
+    state = game.board.state
+    changes = ",".join(
+        f"{_FILES[file_]}{rank + 1}"
+        + (piece_letter(piece) if (piece := state[rank][file_]) is not None else "-")
+        for rank, file_ in squares
+    )
+
+    return (
+        f"delta {game_id} {game.ply} {changes or '-'} "
+        f"{game.status.replace(' ', '-')} {game.result}\n"
+    ).encode()
+
+
+def describe(game_id: str, game: Chess) -> str:
+    """The fields of the snapshot of a game: its id, ply, FEN, status and result.
+
+    Args:
+        game_id (str): The id of the game.
+        game (Chess): The game.
+
+    Returns:
+        str: The fields, separated by spaces.
+
+    """
+    fen = board_to_fen(game.board, game.turn, fullmove_number=game.move_number)
+
+    return f"{game_id} {game.ply} {fen} {game.status.replace(' ', '-')} {game.result}"
+
+
+def encode_snapshot(game_id: str, game: Chess) -> bytes:
+    """Encodes the snapshot of a game.
+
+    Args:
+        game_id (str): The id of the game.
+        game (Chess): The game.
+
+    Returns:
+        bytes: The line.
+
+    """
+    return f"snapshot {describe(game_id, game)}\n".encode()
+
+
+class Broadcaster:
+    """The spectators of games, keyed by game id.
+
+    Attributes:
+        max_backlog (int): The number of bytes waiting to be sent to a
+            spectator above which it is skipped.
+        skipped (int): The number of deltas not sent to slow spectators.
+
+    """
+
+    def __init__(self, max_backlog: int = 64 * 1024):
+        self.max_backlog: int = max_backlog
+        self.skipped: int = 0
+        self._spectators: dict[str, set[Subscriber]] = {}
+        self._watched: dict[Subscriber, set[str]] = {}
+        # the spectators that missed deltas, by game id
+        self._lagging: dict[str, set[Subscriber]] = {}
+
+    def subscribe(self, game_id: str, spectator: Subscriber) -> None:
+        """Sends the deltas of a game to a spectator, which already has its snapshot.
+
+        Args:
+            game_id (str): The id of the game.
+            spectator (Subscriber): The spectator.
+
+        """
+        self._spectators.setdefault(game_id, set()).add(spectator)
+        self._watched.setdefault(spectator, set()).add(game_id)
+
+    def unsubscribe(self, game_id: str, spectator: Subscriber) -> None:
+        """Stops sending the deltas of a game to a spectator.
+
+        Args:
+            game_id (str): The id of the game.
+            spectator (Subscriber): The spectator.
+
+        """
+        if (games := self._watched.get(spectator)) is not None:
+            games.discard(game_id)
+            if not games:
+                del self._watched[spectator]
+
+        if (spectators := self._spectators.get(game_id)) is not None:
+            spectators.discard(spectator)
+            if not spectators:
+                del self._spectators[game_id]
+
+        if (lagging := self._lagging.get(game_id)) is not None:
+            lagging.discard(spectator)
+            if not lagging:
+                del self._lagging[game_id]
+
+    def unsubscribe_all(self, spectator: Subscriber) -> None:
+        """Stops sending the deltas of every game to a spectator, e.g. once it left.
+
+        Args:
+            spectator (Subscriber): The spectator.
+
+        """
+        for game_id in list(self._watched.get(spectator, ())):
+            self.unsubscribe(game_id, spectator)
+
+    def publish(self, game_id: str, delta: bytes, snapshot: Callable[[], bytes]) -> None:
+        """Sends a delta of a game to its spectators.
+
+        Args:
+            game_id (str): The id of the game.
+            delta (bytes): The delta, see encode_delta.
+            snapshot (Callable[[], bytes]): Encodes the snapshot of the game,
+                called at most once if a spectator that missed deltas caught up.
+
+        """
+        if not (spectators := self._spectators.get(game_id)):
+            return
+
+        lagging = self._lagging.setdefault(game_id, set())
+        resync = None
+
+        for spectator in spectators:
+            if spectator.transport.get_write_buffer_size() > self.max_backlog:
+                lagging.add(spectator)
+                self.skipped += 1
+
+            elif spectator in lagging:
+                resync = resync or snapshot()
+                spectator.write(resync)
+                lagging.discard(spectator)
+
+            else:
+                spectator.write(delta)
+
+        if not lagging:
+            del self._lagging[game_id]
+
+    def catch_up(self, snapshot: Callable[[str], bytes | None]) -> None:
+        """Sends a snapshot to the spectators that missed deltas and caught up since.
+
+        Args:
+            snapshot (Callable[[str], bytes | None]): Encodes the snapshot of
+                the game with the given id, called at most once per game.
+                None if it cannot be read yet, to try again later.
+
+        """
+        for game_id, lagging in list(self._lagging.items()):
+            caught_up = [
+                spectator
+                for spectator in lagging
+                if spectator.transport.get_write_buffer_size() <= self.max_backlog
+            ]
+            if not caught_up or (line := snapshot(game_id)) is None:
+                continue
+
+            for spectator in caught_up:
+                spectator.write(line)
+                lagging.discard(spectator)
+
+            if not lagging:
+                del self._lagging[game_id]
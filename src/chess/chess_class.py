@@ -1,207 +1,445 @@
-"""This module provides the game class used to run the chess game."""
+"""This module provides the game class used to run the chess game.
+
+The game is headless: it never prints, prompts or exits, and tells why a
+move was rejected instead. The console interface is in chess.cli.
+
+The moves played are recorded, so that they can be taken back and played
+again one at a time. The position is also saved every 32 plies, so that a
+seek to a distant ply starts from the closest saved position.
+"""
 
 from __future__ import annotations
 
-import sys
+from dataclasses import dataclass
+from datetime import date
 from enum import StrEnum
-from typing import override
+from typing import TYPE_CHECKING
 
-from chess.board import Board, MoveOutcome
+from chess.board import Board, MoveError, MoveOutcome, MoveRejection
 from chess.colour_and_aliases import Colour
-from chess.user_interaction import request_input
+from chess.fen import STARTING_FEN, board_from_fen, board_to_fen
+from chess.pgn import game_from_moves
+from chess.pieces import Bishop, Knight
 
+if TYPE_CHECKING:
+    from chess.board import BoardSnapshot, MoveRecord
+    from chess.clock import ChessClock
+    from chess.pgn import PGNGame
+    from chess.tablebase import Tablebases
 
-class _GameCommand(StrEnum):
-    """Enum class for commands."""
 
-    YES = "yes"
-    NO = "no"
-    EXIT = "exit"
-    SAVE_MOVE_HISTORY = "save move history"
-    RESET = "reset"
-    RESIGN = "resign"
-    DRAW = "draw"
-    PRINT_BOARD = "print board"
-    ABORT = "abort"
-    HELP = "help"
-    MOVE = "move"  # Default command to play a move
-    LOAD = "load"  # Implement in the future
+class GameStatus(StrEnum):
+    """Enum class for the state of a game."""
 
-    @classmethod
-    @override
-    def _missing_(cls, value: object) -> _GameCommand:
-        return cls.MOVE
+    ONGOING = "ongoing"
+    CHECKMATE = "checkmate"
+    STALEMATE = "stalemate"
+    DRAW = "draw"  # a known draw according to the tablebases
+    RESIGNATION = "resignation"
+    AGREED_DRAW = "agreed draw"
+    TIME_FORFEIT = "time forfeit"
 
 
-class Chess:
-    """Handles the whole game."""
+_OUTCOME_STATUSES = {
+    MoveOutcome.CHECKMATE: GameStatus.CHECKMATE,
+    MoveOutcome.STALEMATE: GameStatus.STALEMATE,
+    MoveOutcome.DRAW: GameStatus.DRAW,
+}
+
+# the plies between two saved positions
+_SNAPSHOT_INTERVAL = 32
+
+
+@dataclass(frozen=True, slots=True)
+class MoveResult:
+    """The result of a move pushed to a game.
 
-    def __init__(self, board: Board | None = None):
+    Attributes:
+        outcome (MoveOutcome): The outcome of the move, FAILURE if it was rejected.
+        move (str | None): The move played, in the notation of Board.legal_moves.
+            None if it was rejected.
+        rejection (MoveRejection | None): Why the move was rejected.
+
+    """
+
+    outcome: MoveOutcome
+    move: str | None = None
+    rejection: MoveRejection | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the move was played."""
+        return self.rejection is None
+
+
+class Chess:
+    """Handles the whole game.
+
+    Moves taken back with undo or seek are kept until a new move is
+    pushed, so that seek can play them again. A game that ended without a
+    move, e.g. by a resignation, is over again once seek goes back to the
+    position it ended in.
+
+    Attributes:
+        tablebases (Tablebases | None): Endgame tablebases that end the game in
+            a draw once the position is a known draw.
+        result (str): The result of the game in PGN notation, '*' while it is
+            in progress.
+        status (GameStatus): Whether the game is in progress or how it ended.
+        start_fen (str): The FEN of the position the game started from.
+        clock (ChessClock | None): The clocks of the players, pressed after
+            every move. A player whose time runs out loses on time, or draws
+            if the opponent has too little material to mate. Moves taken
+            back do not turn the clocks back, but the clock of the player
+            to move runs from then on.
+
+    """
+
+    def __init__(
+        self,
+        board: Board | None = None,
+        tablebases: Tablebases | None = None,
+        turn: Colour = Colour.WHITE,
+        clock: ChessClock | None = None,
+    ):
         self.board: Board = board or Board()
-        self.turn: Colour = Colour.WHITE
+        self.tablebases: Tablebases | None = tablebases
+        self.turn: Colour = turn
         self.move_number: int = 1
-        self.move_history: list[str] = []
+        self.result: str = "*"
+        self.status: GameStatus = GameStatus.ONGOING
+        self.start_fen: str = board_to_fen(self.board, turn)
+        self.clock: ChessClock | None = clock
+        # the moves played and taken back, and the number of them played
+        self._line: list[MoveRecord] = []
+        self._ply = 0
+        # the positions every _SNAPSHOT_INTERVAL plies with the turn and the move number
+        self._snapshots: dict[int, tuple[BoardSnapshot, Colour, int]] = {}
+        # the ply, status and result of an ending without a move
+        self._ending: tuple[int, GameStatus, str] | None = None
 
-    def play(self) -> None:
-        """Launch a new game."""
-        print("A game of chess begins.", end="\n\n")
-        print(self.board)
+    @classmethod
+    def from_moves(
+        cls, moves: list[str], start_fen: str = STARTING_FEN, tablebases: Tablebases | None = None
+    ) -> Chess:
+        """Replays moves known to be legal, e.g. read back from a record, without checking them.
 
-        while True:
-            raw_input = request_input(
-                f"{self.turn} to move on move {self.move_number}.\nEnter your move: "
-            )
+        Args:
+            moves (list[str]): The moves in the notation of Board.legal_moves.
+            start_fen (str): The FEN of the position the game started from.
+            tablebases (Tablebases | None): The tablebases of the game.
 
-            if (command := _GameCommand(raw_input)) != _GameCommand.MOVE:
-                self._handle_game_command(command)
-                continue
-
-            if (outcome := self.board.make_move(raw_input, self.turn)) == MoveOutcome.FAILURE:
-                continue
-
-            self.move_history.append(f"{self.move_number}. {raw_input}")
-            self._handle_move_outcome(outcome)
-
-            # End of turn actions
-            self.move_number += 1 if self.turn == Colour.BLACK else 0
-            self.turn = ~self.turn
-
-            print(self.board)
-
-    def _handle_game_command(self, command: _GameCommand) -> None:
-        """Handles a command input."""
-        if command == _GameCommand.HELP:
-            print(
-                "Input Options:",
-                "- a move in the format 'start_square + end_square', e.g. 'e2e4' to move a piece.",
-                "- 'o-o' to short castle.",
-                "- 'o-o-o' to long castle.",
-                "- 'exit' to exit the game.",
-                "- 'reset' to start a new game.",
-                "- 'resign' to resign from the game.",
-                "- 'draw' to end the game in a draw.",
-                "- 'print board' to print the board.",
-                sep="\n",
-                end="\n\n",
-            )
+        Returns:
+            Chess: The game after the moves, over if the last move ended it.
 
-        elif command == _GameCommand.RESIGN:
-            print(f"{self.turn} resigned. {~self.turn} wins.")
-            self._after_match()
+        """
+        board, turn = board_from_fen(start_fen)
+        game = cls(board, tablebases, turn)
+        game.start_fen = start_fen
 
-        elif command == _GameCommand.DRAW:
-            print("The match ends in a draw.")
-            self._after_match()
+        for move in moves:
+            game._advance(move)
 
-        elif command == _GameCommand.RESET:
-            Chess().play()
-            sys.exit(1)
+        game._update_status()
 
-        elif command == _GameCommand.PRINT_BOARD:
-            print(self.board)
+        return game
 
-        elif command == _GameCommand.EXIT:
-            print("Exiting game...")
-            sys.exit(0)
+    @property
+    def ply(self) -> int:
+        """The number of moves played."""
+        return self._ply
 
-        else:
-            print("Invalid input.", "For a list of commands, type 'help'.", sep="\n", end="\n\n")
-
-    def _after_match(self) -> None:
-        """Prompts the user end of the game options."""
-        while True:
-            command = _GameCommand(
-                request_input(
-                    "Would you like to play again? [yes/no].\nFor other options, type 'help': "
-                )
+    @property
+    def moves(self) -> list[MoveRecord]:
+        """The records of the moves played."""
+        return self._line[: self._ply]
+
+    @property
+    def last_move(self) -> MoveRecord | None:
+        """The record of the last move played, None before the first."""
+        return self._line[self._ply - 1] if self._ply else None
+
+    @property
+    def move_history(self) -> list[str]:
+        """The moves played, in the notation of Board.legal_moves."""
+        return [record.move for record in self._line[: self._ply]]
+
+    @property
+    def line(self) -> list[str]:
+        """The moves played followed by the moves taken back, which seek can play again."""
+        return [record.move for record in self._line]
+
+    @property
+    def is_over(self) -> bool:
+        """Whether the game has ended."""
+        return self.status != GameStatus.ONGOING
+
+    def legal_moves(self) -> list[str]:
+        """Lists the legal moves of the player to move.
+
+        Returns:
+            list[str]: The moves in the notation of Board.legal_moves, none
+                once the game is over.
+
+        """
+        return [] if self.is_over else self.board.legal_moves(self.turn)
+
+    def push(self, move: str, promotion: str | None = None) -> MoveResult:
+        """Plays a move of the player to move.
+
+        Args:
+            move (str): The move, e.g. 'e2e4', 'e7e8q' or 'o-o'.
+            promotion (str | None): The piece a pawn promotes to, 'q', 'r', 'b'
+                or 'n', if the move does not carry it as a suffix.
+
+        Returns:
+            MoveResult: The outcome of the move, or why it was rejected, in
+                which case the game is left unchanged but for a flag-fall.
+
+        """
+        self.check_time()
+
+        if self.is_over:
+            return MoveResult(
+                MoveOutcome.FAILURE,
+                rejection=MoveRejection(
+                    MoveError.GAME_OVER, f"The game is over: it ended by {self.status}."
+                ),
             )
 
-            if command == _GameCommand.YES:
-                Chess().play()
-                sys.exit(1)
+        if promotion is not None:
+            move += promotion.lower()
+
+        if (rejection := self.board.move_error(move, self.turn)) is not None:
+            return MoveResult(MoveOutcome.FAILURE, rejection=rejection)
+
+        # the moves taken back are replaced by the new one, and so is any ending after them
+        self._ending = None
+        if self._ply < len(self._line):
+            del self._line[self._ply :]
+            for ply in [ply for ply in self._snapshots if ply > self._ply]:
+                del self._snapshots[ply]
+
+        self._advance(move)
+        if self.clock is not None:
+            self.clock.press(~self.turn)
+
+        outcome = self.board.move_outcome(~self.turn, tablebases=self.tablebases)
+        self._set_outcome(outcome)
 
-            elif command == _GameCommand.NO:
-                print("Exiting game...")
-                sys.exit(0)
+        return MoveResult(outcome, move)
+
+    def check_time(self) -> bool:
+        """Ends the game if the time of the player to move ran out.
+
+        Returns:
+            bool: Whether the game ended on time.
+
+        """
+        if self.clock is None or self.is_over or not self.clock.flagged(self.turn):
+            return False
+
+        result = "1/2-1/2" if _cannot_mate(self.board, ~self.turn) else _win_for(~self.turn)
+        self.end(GameStatus.TIME_FORFEIT, result)
+
+        return True
+
+    def undo(self) -> MoveRecord:
+        """Takes back the last move played.
+
+        The game is in progress again, however it had ended.
+
+        Returns:
+            MoveRecord: The record of the move taken back.
+
+        Raises:
+            ValueError: If no move was played.
+
+        """
+        if not self._ply:
+            raise ValueError("There is no move to take back.")
 
-            elif command == _GameCommand.SAVE_MOVE_HISTORY:
-                self._save_move_history()
-                continue
+        record = self._retreat()
+        self.status, self.result = GameStatus.ONGOING, "*"
+        self._hand_clock_over()
 
-            elif command == _GameCommand.HELP:
-                print(
-                    "Input Options:",
-                    "- 'yes' to play again.",
-                    "- 'no' to exit the game.",
-                    "- 'save move history' to save the move history.",
-                    sep="\n",
-                    end="\n\n",
-                )
-                continue
+        return record
 
-            else:
-                print("Invalid input.For a list of commands, type 'help'.", sep="\n", end="\n\n")
-                continue
+    def seek(self, ply: int) -> None:
+        """Goes to the position after a number of moves of the line.
 
-    def _handle_move_outcome(self, outcome: MoveOutcome) -> None:
-        """Handles the outcome of a move.
+        The moves are taken back or played again one at a time from the
+        current position or the closest saved position, whichever is closer.
 
         Args:
-            outcome (MoveOutcome): The outcome of the move.
+            ply (int): The number of moves, up to the length of `line`.
+
+        Raises:
+            ValueError: If the line has fewer moves.
 
         """
-        if outcome in MoveOutcome.GAME_OVER:
-            print(f"The game has ended in a {outcome}.")
+        if not 0 <= ply <= len(self._line):
+            raise ValueError(f"The ply must be between 0 and {len(self._line)}, not {ply}.")
+
+        closest = min((self._ply, *self._snapshots), key=lambda start: abs(ply - start))
+        if closest != self._ply:
+            snapshot, self.turn, self.move_number = self._snapshots[closest]
+            self.board.restore(snapshot)
+            self._ply = closest
+
+        while self._ply > ply:
+            self._retreat()
+
+        while self._ply < ply:
+            self._advance(self._line[self._ply].move)
+
+        self._update_status()
+        self._hand_clock_over()
+
+    def resign(self, colour: Colour | None = None) -> None:
+        """Ends the game with a resignation.
+
+        Args:
+            colour (Colour | None): The player who resigns. Defaults to the
+                player to move.
+
+        Raises:
+            ValueError: If the game is over.
+
+        """
+        self.end(GameStatus.RESIGNATION, _win_for(~(colour or self.turn)))
+
+    def agree_draw(self) -> None:
+        """Ends the game in a draw agreed by the players.
+
+        Raises:
+            ValueError: If the game is over.
+
+        """
+        self.end(GameStatus.AGREED_DRAW, "1/2-1/2")
+
+    def end(self, status: GameStatus, result: str) -> None:
+        """Ends the game without a move.
+
+        Args:
+            status (GameStatus): How the game ended, e.g. RESIGNATION.
+            result (str): The result in PGN notation.
+
+        Raises:
+            ValueError: If the game is over.
+
+        """
+        if self.is_over:
+            raise ValueError(f"The game is over: it ended by {self.status}.")
+
+        self.status, self.result = status, result
+        self._ending = self._ply, status, result
+
+        if self.clock is not None:
+            self.clock.stop()
 
-            if outcome == MoveOutcome.CHECKMATE:
-                print(f"{~self.turn}'s King got checkmated. {self.turn} wins.", end="\n\n")
+    def reset(self) -> None:
+        """Starts the game again from its start position.
 
-            self._after_match()
+        The board and its pieces are reused, as saved before the first move,
+        so that a long session of games holds no more than one of each.
 
-        if outcome == MoveOutcome.CHECK:
-            print(f"{~self.turn}'s King is in check.", end="\n\n")
+        """
+        if self._line:
+            self.seek(0)
+
+        self._line.clear()
+        self._snapshots.clear()
+        self._ending = None
+        self.status, self.result = GameStatus.ONGOING, "*"
+
+        if self.clock is not None:
+            self.clock.reset()
+
+    def pgn_game(self) -> PGNGame:
+        """Builds the PGN record of the game.
+
+        Returns:
+            PGNGame: The game with the Seven Tag Roster, its moves in SAN and its result.
+
+        """
+        tags = {"Event": "Casual game", "Date": date.today().strftime("%Y.%m.%d"), "Round": "-"}
+        if self.clock is not None:
+            tags["TimeControl"] = str(self.clock.control)
+
+        board, turn = board_from_fen(self.start_fen)
+        return game_from_moves(self.move_history, self.result, tags, board=board, turn=turn)
+
+    def _advance(self, move: str) -> None:
+        """Plays a legal move and records it, in place of a move taken back if any."""
+        if self._ply % _SNAPSHOT_INTERVAL == 0 and self._ply not in self._snapshots:
+            self._snapshots[self._ply] = (self.board.snapshot(), self.turn, self.move_number)
+
+        record = self.board.play(move, self.turn)
+        if self._ply < len(self._line):
+            self._line[self._ply] = record
+        else:
+            self._line.append(record)
+
+        self._ply += 1
+        self.move_number += 1 if self.turn == Colour.BLACK else 0
+        self.turn = ~self.turn
 
-    def _save_move_history(self) -> None:
-        """Saves the move history in a `.txt` file."""
-        if not self.move_history:
-            print("There is no move history to save.")
+    def _retreat(self) -> MoveRecord:
+        """Takes back the last move played, keeping its record."""
+        self._ply -= 1
+        self.turn = ~self.turn
+        self.move_number -= 1 if self.turn == Colour.BLACK else 0
+
+        record = self._line[self._ply]
+        self.board.take_back(record)
+
+        return record
+
+    def _hand_clock_over(self) -> None:
+        """Runs the clock of the player to move, once moves were taken back or played again."""
+        if self.clock is not None and self.clock.running not in (None, self.turn):
+            self.clock.start(self.turn)
+
+    def _update_status(self) -> None:
+        """Finds whether the last move played ended the game, or it ended without a move."""
+        self.status, self.result = GameStatus.ONGOING, "*"
+
+        if self._ending is not None and self._ending[0] == self._ply:
+            _, self.status, self.result = self._ending
             return
 
-        while True:
-            file_name = request_input("Enter the file name: ")
-
-            if file_name.endswith(".txt"):
-                break
-
-            if (command := _GameCommand(file_name)) == _GameCommand.HELP:
-                print(
-                    "Input Options:",
-                    "- a file name with the '.txt' extension.",
-                    "- 'abort' to abort the operation.",
-                    "- 'exit' to exit the game.",
-                    sep="\n",
-                    end="\n\n",
-                )
-                continue
-
-            if command == _GameCommand.ABORT:
-                return
-
-            if command == _GameCommand.EXIT:
-                print("Exiting game...")
-                sys.exit(0)
-
-            print(
-                "The file extension must be '.txt'.",
-                "For other options, type 'help'.",
-                sep="\n",
-                end="\n\n",
-            )
+        # a move was played after any position but the last one of the line
+        if self._ply and self._ply == len(self._line):
+            self._set_outcome(self.board.move_outcome(~self.turn, tablebases=self.tablebases))
+
+    def _set_outcome(self, outcome: MoveOutcome) -> None:
+        """Ends the game if the last move did, once the turn has passed."""
+        if outcome in MoveOutcome.GAME_OVER:
+            self.status = _OUTCOME_STATUSES[outcome]
+            self.result = _win_for(~self.turn) if outcome == MoveOutcome.CHECKMATE else "1/2-1/2"
+
+            if self.clock is not None:
+                self.clock.stop()
+
+
+def _win_for(colour: Colour) -> str:
+    """The result token of a win for a player."""
+    return "1-0" if colour == Colour.WHITE else "0-1"
+
 
-        grouped_list = [self.move_history[i : i + 2] for i in range(0, len(self.move_history), 2)]
-        formatted_moves = "\n".join("; ".join(pair) for pair in grouped_list)
+def _cannot_mate(board: Board, colour: Colour) -> bool:
+    """Whether a player has no more than a King, or a King and a minor piece against a King."""
+    pieces = {
+        other: [piece for row in board.state for piece in row if piece and piece.colour == other]
+        for other in Colour
+    }
 
-        with open(file_name, "w") as file:
-            file.write(formatted_moves)
+    if len(pieces[colour]) == 1:
+        return True
 
-        print(f"Move history saved in {file_name}.")
+    return (
+        len(pieces[colour]) == 2
+        and len(pieces[~colour]) == 1
+        and any(isinstance(piece, Bishop | Knight) for piece in pieces[colour])
+    )
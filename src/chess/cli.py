@@ -0,0 +1,289 @@
+"""This module provides the console interface of the game.
+
+It is a thin shell over the headless Chess class: it reads the commands and
+moves of the players, hands them to the game and prints what happened.
+
+Run `python -m chess.cli` to play.
+"""
+
+from __future__ import annotations
+
+import sys
+from enum import StrEnum
+from typing import override
+
+from chess.board import MoveError, MoveOutcome
+from chess.chess_class import Chess
+from chess.pgn import PGNWriter
+from chess.user_interaction import request_input
+
+_PROMOTIONS = ("q", "r", "b", "n")
+
+
+class _GameCommand(StrEnum):
+    """Enum class for commands."""
+
+    YES = "yes"
+    NO = "no"
+    EXIT = "exit"
+    SAVE_MOVE_HISTORY = "save move history"
+    RESET = "reset"
+    RESIGN = "resign"
+    DRAW = "draw"
+    PRINT_BOARD = "print board"
+    ABORT = "abort"
+    HELP = "help"
+    MOVE = "move"  # Default command to play a move
+    LOAD = "load"  # Implement in the future
+
+    @classmethod
+    @override
+    def _missing_(cls, value: object) -> _GameCommand:
+        return cls.MOVE
+
+
+class Shell:
+    """Plays games on the console, one after another, until a player exits.
+
+    Every game is played by the same Chess instance, reset in place, so
+    that a session of any number of games holds a single game and board.
+
+    Attributes:
+        game (Chess): The game being played.
+
+    """
+
+    def __init__(self, game: Chess | None = None):
+        self.game: Chess = game or Chess()
+
+    def play(self) -> None:
+        """Plays games until a player exits, which exits the program."""
+        while True:
+            self._play_game()
+            self.game.reset()
+
+    def _play_game(self) -> None:
+        """Plays a game until a new one is to start."""
+        print("A game of chess begins.", end="\n\n")
+        print(self.game.board)
+
+        while True:
+            raw_input = request_input(
+                f"{self.game.turn} to move on move {self.game.move_number}.\nEnter your move: "
+            )
+
+            if (command := _GameCommand(raw_input)) != _GameCommand.MOVE:
+                if self._handle_game_command(command):
+                    return
+
+                continue
+
+            result = self.game.push(raw_input)
+
+            # the piece a pawn promotes to is only asked for when the move lacks it
+            if (
+                result.rejection is not None
+                and result.rejection.error == MoveError.PROMOTION_REQUIRED
+            ):
+                result = self.game.push(raw_input, self._request_promotion())
+
+            if result.rejection is not None:
+                print(result.rejection.message, end="\n\n")
+                continue
+
+            if self._handle_move_outcome(result.outcome):
+                return
+
+            print(self.game.board)
+
+    def _handle_game_command(self, command: _GameCommand) -> bool:
+        """Handles a command input.
+
+        Returns:
+            bool: Whether a new game is to start.
+
+        """
+        if command == _GameCommand.RESET:
+            return True
+
+        if command in {_GameCommand.RESIGN, _GameCommand.DRAW}:
+            if command == _GameCommand.RESIGN:
+                print(f"{self.game.turn} resigned. {~self.game.turn} wins.")
+                self.game.resign()
+
+            else:
+                print("The match ends in a draw.")
+                self.game.agree_draw()
+
+            self._after_match()
+            return True
+
+        if command == _GameCommand.HELP:
+            print(
+                "Input Options:",
+                "- a move in the format 'start_square + end_square', e.g. 'e2e4' to move a piece.",
+                "- a move with the piece to promote to, e.g. 'e7e8q', to promote a pawn.",
+                "- 'o-o' to short castle.",
+                "- 'o-o-o' to long castle.",
+                "- 'exit' to exit the game.",
+                "- 'reset' to start a new game.",
+                "- 'resign' to resign from the game.",
+                "- 'draw' to end the game in a draw.",
+                "- 'print board' to print the board.",
+                sep="\n",
+                end="\n\n",
+            )
+
+        elif command == _GameCommand.PRINT_BOARD:
+            print(self.game.board)
+
+        elif command == _GameCommand.EXIT:
+            print("Exiting game...")
+            sys.exit(0)
+
+        else:
+            print("Invalid input.", "For a list of commands, type 'help'.", sep="\n", end="\n\n")
+
+        return False
+
+    def _after_match(self) -> None:
+        """Prompts the user end of the game options until they play again or exit."""
+        while True:
+            command = _GameCommand(
+                request_input(
+                    "Would you like to play again? [yes/no].\nFor other options, type 'help': "
+                )
+            )
+
+            if command == _GameCommand.YES:
+                return
+
+            if command == _GameCommand.NO:
+                print("Exiting game...")
+                sys.exit(0)
+
+            elif command == _GameCommand.SAVE_MOVE_HISTORY:
+                self._save_move_history()
+                continue
+
+            elif command == _GameCommand.HELP:
+                print(
+                    "Input Options:",
+                    "- 'yes' to play again.",
+                    "- 'no' to exit the game.",
+                    "- 'save move history' to save the move history.",
+                    sep="\n",
+                    end="\n\n",
+                )
+                continue
+
+            else:
+                print("Invalid input.For a list of commands, type 'help'.", sep="\n", end="\n\n")
+                continue
+
+    def _handle_move_outcome(self, outcome: MoveOutcome) -> bool:
+        """Handles the outcome of a move, once the turn has passed to the opponent.
+
+        Args:
+            outcome (MoveOutcome): The outcome of the move.
+
+        Returns:
+            bool: Whether the game ended and a new one is to start.
+
+        """
+        if outcome in MoveOutcome.GAME_OVER:
+            print(f"The game has ended in a {outcome}.")
+
+            if outcome == MoveOutcome.CHECKMATE:
+                print(
+                    f"{self.game.turn}'s King got checkmated. {~self.game.turn} wins.", end="\n\n"
+                )
+
+            self._after_match()
+            return True
+
+        if outcome == MoveOutcome.CHECK:
+            print(f"{self.game.turn}'s King is in check.", end="\n\n")
+
+        return False
+
+    @staticmethod
+    def _request_promotion() -> str:
+        """Requests the user to pick the piece a pawn promotes to.
+
+        Returns:
+            str: The piece, 'q', 'r', 'b' or 'n'.
+
+        """
+        while True:
+            if (option := request_input("Pick a piece to promote to (Q/R/B/N): ")) in _PROMOTIONS:
+                return option
+
+            if option == _GameCommand.HELP:
+                print(
+                    "Promotion options:",
+                    "- 'Q': to promoted to a Queen.",
+                    "- 'R': to promoted to a Rook.",
+                    "- 'B': to promoted to a Bishop.",
+                    "- 'N': to promoted to a Knight.",
+                    sep="\n",
+                    end="\n\n",
+                )
+                continue
+
+            print(
+                "Please select a valid promotion option.Type 'help' for help message.",
+                sep="\n",
+                end="\n\n",
+            )
+
+    def _save_move_history(self) -> None:
+        """Appends the game to a `.pgn` file."""
+        if not self.game.move_history:
+            print("There is no move history to save.")
+            return
+
+        while True:
+            file_name = request_input("Enter the file name: ")
+
+            if file_name.endswith(".pgn"):
+                break
+
+            if (command := _GameCommand(file_name)) == _GameCommand.HELP:
+                print(
+                    "Input Options:",
+                    "- a file name with the '.pgn' extension.",
+                    "- 'abort' to abort the operation.",
+                    "- 'exit' to exit the game.",
+                    sep="\n",
+                    end="\n\n",
+                )
+                continue
+
+            if command == _GameCommand.ABORT:
+                return
+
+            if command == _GameCommand.EXIT:
+                print("Exiting game...")
+                sys.exit(0)
+
+            print(
+                "The file extension must be '.pgn'.",
+                "For other options, type 'help'.",
+                sep="\n",
+                end="\n\n",
+            )
+
+        with PGNWriter(file_name) as writer:
+            writer.write(self.game.pgn_game())
+
+        print(f"Move history saved in {file_name}.")
+
+
+def main() -> None:
+    """Plays a game on the console."""
+    Shell().play()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""This module provides chess clocks and a scheduler of their flag-falls.
+
+A clock counts down the time of the player to move, read with
+time.monotonic_ns, and is pressed once a move is played. After a move the
+time control gives the player some time back:
+
+    fischer     the increment, however long the move took
+    bronstein   the time the move took, up to the increment
+    delay       nothing, but the clock only starts counting down once the
+                increment has passed
+
+A server hosting many timed games does not need a timer per game: it
+schedules the moment each running clock runs out in a FlagScheduler, a
+single heap, and checks the games that are due.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from chess.colour_and_aliases import Colour
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_NS_PER_SECOND = 1_000_000_000
+
+
+class IncrementMode(StrEnum):
+    """Enum class for the ways a clock gives time back after a move."""
+
+    FISCHER = "fischer"
+    BRONSTEIN = "bronstein"
+    DELAY = "delay"
+
+
+@dataclass(frozen=True, slots=True)
+class TimeControl:
+    """The time of a game. Times are given in seconds.
+
+    Attributes:
+        base (float): The time of each player at the start of the game.
+        increment (float): The increment or the delay of every move.
+        mode (IncrementMode): How the increment is given.
+
+    """
+
+    base: float
+    increment: float = 0.0
+    mode: IncrementMode = IncrementMode.FISCHER
+
+    def __post_init__(self) -> None:
+        if self.base <= 0 or self.increment < 0:
+            raise ValueError(f"Invalid time control: {self.base}+{self.increment}")
+
+    @classmethod
+    def parse(cls, text: str, mode: IncrementMode = IncrementMode.FISCHER) -> TimeControl:
+        """Parses a time control in the notation of the PGN TimeControl tag, e.g. '300+2'.
+
+        Args:
+            text (str): The base time in seconds, optionally followed by '+'
+                and the increment in seconds.
+            mode (IncrementMode): How the increment is given.
+
+        Returns:
+            TimeControl: The time control.
+
+        Raises:
+            ValueError: If the time control is invalid.
+
+        """
+        base, _, increment = text.partition("+")
+
+        return cls(float(base), float(increment or 0), mode)
+
+    def __str__(self) -> str:
+        return f"{self.base:g}+{self.increment:g}" if self.increment else f"{self.base:g}"
+
+
+class ChessClock:
+    """The clocks of both players of a game.
+
+    Only the clock of the player to move runs. The clocks start once the
+    first move is played, so that the first move is not timed.
+
+    Attributes:
+        control (TimeControl): The time control.
+        remaining_ns (dict[Colour, int]): The time of each player in
+            nanoseconds, as of the start of the turn for the player to move.
+        running (Colour | None): The player whose clock runs. None before
+            the first move and once the game is over.
+        turn_start_ns (int): When the turn of the running player started.
+        timer (Callable[[], int]): The monotonic time in nanoseconds.
+
+    """
+
+    def __init__(self, control: TimeControl, timer: Callable[[], int] = time.monotonic_ns):
+        base_ns = round(control.base * _NS_PER_SECOND)
+
+        self.control: TimeControl = control
+        self.remaining_ns: dict[Colour, int] = {Colour.WHITE: base_ns, Colour.BLACK: base_ns}
+        self.running: Colour | None = None
+        self.turn_start_ns: int = 0
+        self.timer: Callable[[], int] = timer
+        self._increment_ns = round(control.increment * _NS_PER_SECOND)
+
+    def press(self, colour: Colour) -> None:
+        """Ends the turn of a player and starts the clock of the opponent.
+
+        Args:
+            colour (Colour): The player who moved.
+
+        """
+        now = self.timer()
+
+        if self.running is not None:
+            elapsed = now - self.turn_start_ns
+            self.remaining_ns[colour] += self._time_back(elapsed) - elapsed
+
+        self.running, self.turn_start_ns = ~colour, now
+
+    def start(self, colour: Colour) -> None:
+        """Stops the running clock and starts the clock of a player, without an increment.
+
+        Args:
+            colour (Colour): The player whose clock runs, e.g. the player to
+                move once a move is taken back.
+
+        """
+        self.stop()
+        self.running, self.turn_start_ns = colour, self.timer()
+
+    def reset(self) -> None:
+        """Sets the clocks back to the base time, stopped."""
+        base_ns = round(self.control.base * _NS_PER_SECOND)
+
+        self.remaining_ns = {Colour.WHITE: base_ns, Colour.BLACK: base_ns}
+        self.running = None
+
+    def stop(self) -> None:
+        """Stops the clocks, e.g. once the game is over."""
+        if self.running is not None:
+            self.remaining_ns[self.running] = self.remaining(self.running)
+            self.running = None
+
+    def remaining(self, colour: Colour) -> int:
+        """The time of a player in nanoseconds, negative once it ran out.
+
+        Args:
+            colour (Colour): The player.
+
+        Returns:
+            int: The time left.
+
+        """
+        if colour != self.running:
+            return self.remaining_ns[colour]
+
+        elapsed = self.timer() - self.turn_start_ns
+        if self.control.mode == IncrementMode.DELAY:
+            elapsed = max(elapsed - self._increment_ns, 0)
+
+        return self.remaining_ns[colour] - elapsed
+
+    def flagged(self, colour: Colour) -> bool:
+        """Whether the time of a player ran out."""
+        return self.remaining(colour) <= 0
+
+    def deadline_ns(self) -> int | None:
+        """When the time of the running player runs out, in the time of `timer`.
+
+        Returns:
+            int | None: The deadline. None if no clock runs.
+
+        """
+        if self.running is None:
+            return None
+
+        delay = self._increment_ns if self.control.mode == IncrementMode.DELAY else 0
+
+        return self.turn_start_ns + self.remaining_ns[self.running] + delay
+
+    def _time_back(self, elapsed: int) -> int:
+        """The time a move that took `elapsed` nanoseconds gives back."""
+        if self.control.mode == IncrementMode.FISCHER:
+            return self._increment_ns
+
+        # a delay gives back as much as a Bronstein increment, only in advance
+        return min(self._increment_ns, elapsed)
+
+
+class FlagScheduler[K]:
+    """The deadlines of many clocks in a single heap.
+
+    A key has at most one deadline: scheduling it again replaces the one
+    before, which is only dropped from the heap once it is due.
+
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int, int, K]] = []
+        self._deadlines: dict[K, int] = {}
+        # breaks the ties between deadlines, so that the keys are never compared
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: K, deadline_ns: int | None) -> None:
+        """Sets the deadline of a key.
+
+        Args:
+            key (K): The key, e.g. a game id.
+            deadline_ns (int | None): The deadline, None to cancel it.
+
+        """
+        if deadline_ns is None:
+            self._deadlines.pop(key, None)
+            return
+
+        self._deadlines[key] = deadline_ns
+        heapq.heappush(self._heap, (deadline_ns, next(self._counter), key))
+
+        # the replaced deadlines are rebuilt away before they outnumber the others
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [
+                (deadline, next(self._counter), other)
+                for other, deadline in self._deadlines.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def next_deadline(self) -> int | None:
+        """The earliest deadline. None if there is none."""
+        self._drop_stale()
+
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_ns: int) -> list[K]:
+        """Removes the keys whose deadline has passed.
+
+        Args:
+            now_ns (int): The current time.
+
+        Returns:
+            list[K]: The keys, by deadline.
+
+        """
+        due = []
+
+        while self._heap and self._heap[0][0] <= now_ns:
+            deadline_ns, _, key = heapq.heappop(self._heap)
+
+            if self._deadlines.get(key) == deadline_ns:
+                del self._deadlines[key]
+                due.append(key)
+
+        return due
+
+    def _drop_stale(self) -> None:
+        """Drops the replaced and cancelled deadlines from the top of the heap."""
+        heap = self._heap
+
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
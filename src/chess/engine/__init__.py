@@ -0,0 +1,17 @@
+from chess.engine.evaluation import Evaluator, MaterialEvaluator
+from chess.engine.mate import MateSolver
+from chess.engine.search import MATE_SCORE, Searcher, SearchResult
+from chess.engine.time_management import SearchController, SearchLimits, TimeBudget, allocate_time
+
+__all__ = [
+    "MATE_SCORE",
+    "Evaluator",
+    "MateSolver",
+    "MaterialEvaluator",
+    "SearchController",
+    "SearchLimits",
+    "SearchResult",
+    "Searcher",
+    "TimeBudget",
+    "allocate_time",
+]
@@ -0,0 +1,117 @@
+"""This module provides the encoding of positions and moves for neural networks.
+
+Positions are encoded from the point of view of the player to move: their
+pieces come first and the board is flipped for Black, so a network never has
+to know whose turn it is. Requires NumPy, installed with the 'nn' extra.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from chess.colour_and_aliases import Colour
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from chess.board import Board
+
+PIECE_PLANES: dict[type, int] = {Pawn: 0, Knight: 1, Bishop: 2, Rook: 3, Queen: 4, King: 5}
+
+PLANES = 2 * len(PIECE_PLANES)
+ENCODED_SIZE = PLANES * 64 // 8
+POLICY_SIZE = 64 * 64
+
+
+def encode_position(board: Board, turn: Colour) -> NDArray[np.uint8]:
+    """Encodes a position as bit-packed piece planes.
+
+    There is one 8x8 plane per piece type and colour, the player's pieces
+    first. Ranks are flipped when Black is to move.
+
+    Args:
+        board (Board): The board to encode.
+        turn (Colour): The colour of the player to move.
+
+    Returns:
+        NDArray[np.uint8]: The packed planes, ENCODED_SIZE bytes.
+
+    """
+    planes = np.zeros((PLANES, 8, 8), dtype=np.bool_)
+    flip = turn == Colour.BLACK
+
+    for rank, row in enumerate(board.state):
+        for file_, piece in enumerate(row):
+            if piece is None:
+                continue
+
+            plane = PIECE_PLANES[type(piece)] + (0 if piece.colour == turn else len(PIECE_PLANES))
+            planes[plane, 7 - rank if flip else rank, file_] = True
+
+    return np.packbits(planes)
+
+
+def decode_planes(encoded: NDArray[np.uint8]) -> NDArray[np.bool_]:
+    """Unpacks encoded positions back into piece planes.
+
+    Args:
+        encoded (NDArray[np.uint8]): Packed planes with ENCODED_SIZE bytes in
+            the last axis, e.g. a single position or a batch of them.
+
+    Returns:
+        NDArray[np.bool_]: The planes, shaped (..., PLANES, 8, 8).
+
+    """
+    planes = np.unpackbits(encoded, axis=-1).astype(np.bool_)
+    return planes.reshape(*encoded.shape[:-1], PLANES, 8, 8)
+
+
+def encode_castling(board: Board, turn: Colour) -> int:
+    """Encodes the castling rights from the point of view of the player to move.
+
+    Args:
+        board (Board): The board.
+        turn (Colour): The colour of the player to move.
+
+    Returns:
+        int: Bits 0 and 1 for the player's short and long castling, bits 2
+            and 3 for the opponent's.
+
+    """
+    rights = board.castling_rights()
+    own, other = ("KQ", "kq") if turn == Colour.WHITE else ("kq", "KQ")
+
+    return sum(1 << bit for bit, right in enumerate(own + other) if right in rights)
+
+
+def move_index(move: str, turn: Colour) -> int:
+    """Maps a move to its index in a policy over (from, to) square pairs.
+
+    Squares are flipped for Black like in encode_position. Castling is encoded
+    as the King's move and promotions share the index of the pawn's move.
+
+    Args:
+        move (str): The move in the notation of Board.legal_moves.
+        turn (Colour): The colour of the player making the move.
+
+    Returns:
+        int: The index, below POLICY_SIZE.
+
+    """
+    if move in {"o-o", "o-o-o"}:
+        rank = "1" if turn == Colour.WHITE else "8"
+        move = f"e{rank}{'g' if move == 'o-o' else 'c'}{rank}"
+
+    start, end = _square_index(move[:2], turn), _square_index(move[2:4], turn)
+
+    return start * 64 + end
+
+
+def _square_index(square: str, turn: Colour) -> int:
+    """The index of a square from the point of view of the player to move."""
+    rank = int(square[1]) - 1
+
+    return (7 - rank if turn == Colour.BLACK else rank) * 8 + "abcdefgh".index(square[0])
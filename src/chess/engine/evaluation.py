@@ -0,0 +1,119 @@
+"""This module provides the static evaluation used by the engine search."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, ClassVar, override
+
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from chess.board import Board
+    from chess.colour_and_aliases import Colour
+
+PIECE_VALUES: dict[type, int] = {
+    Pawn: 100,
+    Knight: 320,
+    Bishop: 330,
+    Rook: 500,
+    Queen: 900,
+    King: 0,
+}
+
+
+def evaluate_material(board: Board, colour: Colour) -> int:
+    """Evaluates a position by counting material.
+
+    Args:
+        board (Board): The board to evaluate.
+        colour (Colour): The colour of the player to evaluate the position for.
+
+    Returns:
+        int: The material balance in centipawns from the player's point of view.
+
+    """
+    score = 0
+
+    for row in board.state:
+        for piece in row:
+            if piece is None:
+                continue
+
+            value = PIECE_VALUES[type(piece)]
+            score += value if piece.colour == colour else -value
+
+    return score
+
+
+class Evaluator(ABC):
+    """Abstract base class for static evaluations the search can plug in.
+
+    Attributes:
+        batched (bool): Whether evaluating many positions at once is cheaper
+            than evaluating them one by one. The search then collects the
+            leaves below a node and evaluates them in a single batch.
+
+    """
+
+    batched: ClassVar[bool] = False
+
+    def reset(self, board: Board) -> None:  # noqa: B027
+        """Called with the root position before every search.
+
+        Evaluators that keep state along the searched line, e.g. incrementally
+        updated accumulators, rebuild it here.
+
+        Args:
+            board (Board): The root position.
+
+        """
+
+    def push(self, board: Board, move: str, turn: Colour) -> None:  # noqa: B027
+        """Called before the search plays a move, with the board before the move.
+
+        Args:
+            board (Board): The position the move is played in.
+            move (str): The move in the notation of Board.legal_moves.
+            turn (Colour): The colour of the player making the move.
+
+        """
+
+    def pop(self) -> None:  # noqa: B027
+        """Called once the search has taken the last pushed move back."""
+
+    @abstractmethod
+    def evaluate(self, board: Board, colour: Colour) -> int:
+        """Evaluates a position.
+
+        Args:
+            board (Board): The board to evaluate.
+            colour (Colour): The colour of the player to evaluate the position for.
+
+        Returns:
+            int: The score in centipawns from the player's point of view.
+
+        """
+        raise NotImplementedError
+
+    def evaluate_batch(self, positions: Sequence[tuple[Board, Colour]]) -> list[int]:
+        """Evaluates many positions.
+
+        Args:
+            positions (Sequence[tuple[Board, Colour]]): The boards and the colours
+                of the players to evaluate them for.
+
+        Returns:
+            list[int]: The scores in centipawns, in the order of the positions.
+
+        """
+        return [self.evaluate(board, colour) for board, colour in positions]
+
+
+class MaterialEvaluator(Evaluator):
+    """Evaluates positions by counting material."""
+
+    @override
+    def evaluate(self, board: Board, colour: Colour) -> int:
+        return evaluate_material(board, colour)
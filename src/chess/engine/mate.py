@@ -0,0 +1,180 @@
+"""This module provides a solver for forced mates, e.g. to validate puzzles."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+from chess.zobrist import zobrist_key
+
+if TYPE_CHECKING:
+    from chess.board import Board
+    from chess.colour_and_aliases import Colour
+
+# rough size of a table entry in a dict, in bytes
+_TABLE_ENTRY_SIZE = 150
+
+
+class MateSolver:
+    """Depth-limited AND/OR search for forced mates.
+
+    By default the attacker tries only checking moves; the defender tries all
+    replies. Proven and refuted positions are kept in a table of the solver's
+    own, so transpositions and the iterations over the mate length are
+    searched once.
+
+    Attributes:
+        checks_only (bool): Whether the attacker only tries checking moves.
+            Mates that start with a quiet move are not found then.
+        hash_size (int): The size of the table in megabytes.
+        nodes (int): The number of positions searched by the last solve().
+
+    """
+
+    def __init__(self, *, checks_only: bool = True, hash_size: int = 16):
+        self.checks_only: bool = checks_only
+        self.hash_size: int = hash_size
+        self.nodes: int = 0
+        self._table: dict[tuple[int, int], bool] = {}
+
+    def solve(self, board: Board, turn: Colour, moves: int) -> dict[str, int]:
+        """Finds every first move that forces mate.
+
+        Args:
+            board (Board): The position. It is not modified.
+            turn (Colour): The colour of the attacker, who is to move.
+            moves (int): The maximum number of the attacker's moves to mate in.
+
+        Returns:
+            dict[str, int]: The number of moves to mate after each mating first
+                move, in the notation of Board.legal_moves. Empty if there is
+                no forced mate.
+
+        """
+        self.nodes = 0
+        solutions = {}
+
+        for move, child in self._attacking_moves(board, turn):
+            for length in range(1, moves + 1):
+                if self._defender_loses(child, ~turn, length - 1):
+                    solutions[move] = length
+                    break
+
+        return solutions
+
+    def mate_in(self, board: Board, turn: Colour, moves: int) -> int | None:
+        """Finds the length of the shortest forced mate.
+
+        Args:
+            board (Board): The position. It is not modified.
+            turn (Colour): The colour of the attacker, who is to move.
+            moves (int): The maximum number of the attacker's moves to mate in.
+
+        Returns:
+            int | None: The number of moves to mate. None if there is no forced mate.
+
+        """
+        self.nodes = 0
+
+        for length in range(1, moves + 1):
+            if self._attacker_mates(board, turn, length):
+                return length
+
+        return None
+
+    def clear_hash(self) -> None:
+        """Clears the table, e.g. to free its memory."""
+        self._table.clear()
+
+    def _attacker_mates(self, board: Board, turn: Colour, moves: int) -> bool:
+        """Checks whether the attacker to move mates in at most a number of moves.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the attacker.
+            moves (int): The number of moves left to mate in.
+
+        Returns:
+            bool: Whether the attacker has a forced mate.
+
+        """
+        key = (zobrist_key(board, turn), moves)
+        if (known := self._table.get(key)) is not None:
+            return known
+
+        mates = any(
+            self._defender_loses(child, ~turn, moves - 1)
+            for _, child in self._attacking_moves(board, turn)
+        )
+        self._store(key, mates=mates)
+
+        return mates
+
+    def _defender_loses(self, board: Board, turn: Colour, moves: int) -> bool:
+        """Checks whether every reply of the defender runs into mate.
+
+        Args:
+            board (Board): The position after the attacker's move.
+            turn (Colour): The colour of the defender.
+            moves (int): The number of moves the attacker has left after this one.
+
+        Returns:
+            bool: Whether the defender is mated or cannot avoid mate.
+
+        """
+        self.nodes += 1
+
+        if not (replies := board.legal_moves(turn)):
+            return board._king_checked(turn)
+
+        if moves == 0:
+            return False
+
+        for reply in replies:
+            child = deepcopy(board)
+            child.apply_move(reply, turn)
+
+            if not self._attacker_mates(child, ~turn, moves):
+                return False
+
+        return True
+
+    def _attacking_moves(self, board: Board, turn: Colour) -> list[tuple[str, Board]]:
+        """Plays the moves the attacker tries.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the attacker.
+
+        Returns:
+            list[tuple[str, Board]]: The moves with the positions after them.
+
+        """
+        self.nodes += 1
+        children = []
+
+        for move in board.legal_moves(turn):
+            child = deepcopy(board)
+            child.apply_move(move, turn)
+
+            if not self.checks_only or child._king_checked(~turn):
+                children.append((move, child))
+
+        return children
+
+    def _store(self, key: tuple[int, int], *, mates: bool) -> None:
+        """Stores a result, dropping the oldest entry once the table is full.
+
+        Args:
+            key (tuple[int, int]): The Zobrist key of the position and the
+                number of moves left.
+            mates (bool): Whether the attacker has a forced mate.
+
+        """
+        if len(self._table) >= self.hash_size * 2**20 // _TABLE_ENTRY_SIZE:
+            if not self._table:
+                return
+
+            del self._table[next(iter(self._table))]
+
+        self._table[key] = mates
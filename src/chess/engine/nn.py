@@ -0,0 +1,150 @@
+"""This module provides a neural network evaluation for the engine search.
+
+The network is a small multilayer perceptron over the piece planes of
+chess.engine.encoding. Calling it on one position at a time is dominated by
+Python overhead, so it evaluates batches: every layer of a batch is a single
+matrix multiplication. Requires NumPy, installed with the 'nn' extra.
+"""
+
+from __future__ import annotations
+
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any, ClassVar, override
+
+import numpy as np
+
+from chess.engine.encoding import PLANES, encode_position
+from chess.engine.evaluation import Evaluator
+from chess.engine.search import MATE_SCORE, MAX_DEPTH
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from chess.board import Board
+    from chess.colour_and_aliases import Colour
+
+INPUT_SIZE = PLANES * 64
+
+# scores of the network must never be mistaken for mate scores
+_MAX_SCORE = MATE_SCORE - MAX_DEPTH - 1
+
+
+class MLPEvaluator(Evaluator):
+    """Evaluates positions with a multilayer perceptron.
+
+    Hidden layers use ReLU. The single output is the score in centipawns from
+    the point of view of the player to move.
+
+    Attributes:
+        weights (list[NDArray[np.float32]]): The weight matrix of every layer,
+            shaped (inputs, outputs).
+        biases (list[NDArray[np.float32]]): The bias vector of every layer.
+
+    """
+
+    batched: ClassVar[bool] = True
+
+    def __init__(
+        self, weights: Sequence[NDArray[np.floating]], biases: Sequence[NDArray[np.floating]]
+    ):
+        if len(weights) != len(biases) or not weights:
+            raise ValueError("The network needs a bias vector for each of its layers.")
+
+        self.weights: list[NDArray[np.float32]] = [np.asarray(w, np.float32) for w in weights]
+        self.biases: list[NDArray[np.float32]] = [np.asarray(b, np.float32) for b in biases]
+
+        inputs = INPUT_SIZE
+        for weight, bias in zip(self.weights, self.biases, strict=True):
+            if weight.ndim != 2 or weight.shape[0] != inputs or bias.shape != weight.shape[1:]:
+                raise ValueError(f"Layer of shape {weight.shape} does not fit {inputs} inputs.")
+            inputs = weight.shape[1]
+
+        if inputs != 1:
+            raise ValueError("The last layer must have a single output.")
+
+    @classmethod
+    def random(cls, hidden: Sequence[int] = (256, 32), seed: int = 0) -> MLPEvaluator:
+        """Creates a network with random weights, e.g. to start training from.
+
+        Args:
+            hidden (Sequence[int]): The sizes of the hidden layers.
+            seed (int): The seed of the random weights.
+
+        Returns:
+            MLPEvaluator: The network.
+
+        """
+        rng = np.random.default_rng(seed)
+        sizes = [INPUT_SIZE, *hidden, 1]
+
+        weights = [
+            rng.normal(0, np.sqrt(2 / inputs), (inputs, outputs))
+            for inputs, outputs in pairwise(sizes)
+        ]
+        return cls(weights, [np.zeros(outputs) for outputs in sizes[1:]])
+
+    @classmethod
+    def load(cls, path: str | Path) -> MLPEvaluator:
+        """Loads a network saved with save().
+
+        Args:
+            path (str | Path): The path of the '.npz' file.
+
+        Returns:
+            MLPEvaluator: The network.
+
+        """
+        with np.load(path) as data:
+            layers = len(data.files) // 2
+            return cls(
+                [data[f"weight{layer}"] for layer in range(layers)],
+                [data[f"bias{layer}"] for layer in range(layers)],
+            )
+
+    def save(self, path: str | Path) -> None:
+        """Saves the network to an '.npz' file.
+
+        Args:
+            path (str | Path): The path of the file.
+
+        """
+        arrays: dict[str, Any] = {
+            f"weight{layer}": weight for layer, weight in enumerate(self.weights)
+        }
+        arrays |= {f"bias{layer}": bias for layer, bias in enumerate(self.biases)}
+        np.savez(path, **arrays)
+
+    @override
+    def evaluate(self, board: Board, colour: Colour) -> int:
+        return self.evaluate_batch([(board, colour)])[0]
+
+    @override
+    def evaluate_batch(self, positions: Sequence[tuple[Board, Colour]]) -> list[int]:
+        if not positions:
+            return []
+
+        encoded = np.stack([encode_position(board, colour) for board, colour in positions])
+        scores = np.clip(np.rint(self.forward(encoded)), -_MAX_SCORE, _MAX_SCORE)
+
+        return [int(score) for score in scores]
+
+    def forward(self, encoded: NDArray[np.uint8]) -> NDArray[np.float32]:
+        """Runs the network on a batch of encoded positions.
+
+        Args:
+            encoded (NDArray[np.uint8]): The positions encoded by encode_position,
+                shaped (batch, ENCODED_SIZE).
+
+        Returns:
+            NDArray[np.float32]: The scores in centipawns, shaped (batch,).
+
+        """
+        activations = np.unpackbits(encoded, axis=-1).astype(np.float32)
+
+        for weight, bias in zip(self.weights[:-1], self.biases[:-1], strict=True):
+            activations = np.maximum(activations @ weight + bias, 0)
+
+        return (activations @ self.weights[-1] + self.biases[-1])[:, 0]
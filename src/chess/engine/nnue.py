@@ -0,0 +1,318 @@
+"""This module provides an efficiently updatable neural network (NNUE) evaluation.
+
+The first layer of the network maps every (piece, square) pair seen from a
+side to a column of weights. Its output, the accumulator, is the sum of the
+columns of the pieces on the board. A move changes only a few pieces, so the
+accumulator is updated by adding and subtracting a few columns instead of
+being recomputed. Taking a move back restores the previous accumulator from a
+stack.
+
+There is an accumulator for each side, both int16 like in NNUE engines; the
+arithmetic wraps around exactly like a full recomputation would. Requires
+NumPy, installed with the 'nn' extra.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, override
+
+import numpy as np
+
+from chess.colour_and_aliases import Colour
+from chess.engine.encoding import PIECE_PLANES
+from chess.engine.evaluation import Evaluator
+from chess.engine.search import MATE_SCORE, MAX_DEPTH
+from chess.pieces import Bishop, Knight, Pawn, Queen, Rook
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from chess.board import Board
+    from chess.colour_and_aliases import Square
+
+FEATURES = 2 * len(PIECE_PLANES) * 64
+
+# activations of the first layer are clipped to [0, _CLIP]
+_CLIP = 127
+
+_MAX_SCORE = MATE_SCORE - MAX_DEPTH - 1
+
+_PROMOTIONS: dict[str, type] = {"q": Queen, "r": Rook, "b": Bishop, "n": Knight}
+
+_FILES = "abcdefgh"
+
+# a piece on a square, seen by no side in particular
+type _Feature = tuple[type, Colour, Square]
+
+
+class NNUEEvaluator(Evaluator):
+    """Evaluates positions with an incrementally updated accumulator.
+
+    The search calls reset() with the root position, push() before every
+    move and pop() after taking it back, so evaluate() only has to run the
+    small output layer on the current accumulator.
+
+    Attributes:
+        feature_weights (NDArray[np.int16]): The weight column of every feature,
+            shaped (FEATURES, hidden).
+        feature_bias (NDArray[np.int16]): The bias of the accumulator.
+        output_weights (NDArray[np.int32]): The weights of the output layer,
+            shaped (2 * hidden,): first for the player to move, then for the opponent.
+        output_bias (int): The bias of the output layer.
+        scale (int): The output is divided by this to get centipawns.
+
+    """
+
+    def __init__(
+        self,
+        feature_weights: NDArray[np.integer],
+        feature_bias: NDArray[np.integer],
+        output_weights: NDArray[np.integer],
+        output_bias: int = 0,
+        scale: int = 64,
+    ):
+        hidden = feature_bias.shape[0]
+        if feature_weights.shape != (FEATURES, hidden) or output_weights.shape != (2 * hidden,):
+            raise ValueError(f"The layers do not fit {FEATURES} features and {hidden} neurons.")
+
+        self.feature_weights: NDArray[np.int16] = feature_weights.astype(np.int16)
+        self.feature_bias: NDArray[np.int16] = feature_bias.astype(np.int16)
+        self.output_weights: NDArray[np.int32] = output_weights.astype(np.int32)
+        self.output_bias: int = output_bias
+        self.scale: int = scale
+        # the output weights in the order of the accumulators for each player to move
+        self._output_weights_for: dict[Colour, NDArray[np.int32]] = {
+            Colour.WHITE: self.output_weights,
+            Colour.BLACK: np.roll(self.output_weights, hidden),
+        }
+        # the weight columns of every piece for White's and Black's accumulator side by
+        # side, so that a piece is added to both with a single cheap row operation
+        self._piece_columns: NDArray[np.int16] = np.stack(
+            [
+                self.feature_weights[[_feature_index(*piece, side) for piece in _PIECES]]
+                for side in Colour
+            ],
+            axis=1,
+        )
+        self._accumulator: NDArray[np.int16] = np.tile(self.feature_bias, (2, 1))
+        self._stack: list[NDArray[np.int16]] = []
+
+    @classmethod
+    def random(cls, hidden: int = 256, seed: int = 0) -> NNUEEvaluator:
+        """Creates a network with small random weights, e.g. to start training from.
+
+        Args:
+            hidden (int): The size of each accumulator.
+            seed (int): The seed of the random weights.
+
+        Returns:
+            NNUEEvaluator: The network.
+
+        """
+        rng = np.random.default_rng(seed)
+
+        return cls(
+            rng.integers(-64, 65, (FEATURES, hidden)),
+            rng.integers(0, 32, hidden),
+            rng.integers(-64, 65, 2 * hidden),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> NNUEEvaluator:
+        """Loads a network saved with save().
+
+        Args:
+            path (str | Path): The path of the '.npz' file.
+
+        Returns:
+            NNUEEvaluator: The network.
+
+        """
+        with np.load(path) as data:
+            return cls(
+                data["feature_weights"],
+                data["feature_bias"],
+                data["output_weights"],
+                int(data["output_bias"]),
+                int(data["scale"]),
+            )
+
+    def save(self, path: str | Path) -> None:
+        """Saves the network to an '.npz' file.
+
+        Args:
+            path (str | Path): The path of the file.
+
+        """
+        arrays: dict[str, Any] = {
+            "feature_weights": self.feature_weights,
+            "feature_bias": self.feature_bias,
+            "output_weights": self.output_weights,
+            "output_bias": self.output_bias,
+            "scale": self.scale,
+        }
+        np.savez(path, **arrays)
+
+    @property
+    def accumulator(self) -> NDArray[np.int16]:
+        """The current accumulators, shaped (2, hidden): White's view, then Black's."""
+        return self._accumulator
+
+    def accumulate(self, board: Board) -> NDArray[np.int16]:
+        """Computes the accumulators of a position from scratch.
+
+        Args:
+            board (Board): The position.
+
+        Returns:
+            NDArray[np.int16]: The accumulators, shaped (2, hidden).
+
+        """
+        pieces = [
+            (type(piece), piece.colour, (rank, file_))
+            for rank, row in enumerate(board.state)
+            for file_, piece in enumerate(row)
+            if piece is not None
+        ]
+
+        columns = self._piece_columns[[_PIECES[piece] for piece in pieces]]
+
+        return self.feature_bias + columns.sum(axis=0, dtype=np.int16)
+
+    @override
+    def reset(self, board: Board) -> None:
+        self._accumulator = self.accumulate(board)
+        self._stack.clear()
+
+    @override
+    def push(self, board: Board, move: str, turn: Colour) -> None:
+        removed, added = _move_features(board, move, turn)
+        columns = self._piece_columns
+
+        accumulator = self._accumulator + columns[_PIECES[added[0]]]
+        for piece in added[1:]:
+            accumulator += columns[_PIECES[piece]]
+        for piece in removed:
+            accumulator -= columns[_PIECES[piece]]
+
+        self._stack.append(self._accumulator)
+        self._accumulator = accumulator
+
+    @override
+    def pop(self) -> None:
+        self._accumulator = self._stack.pop()
+
+    @override
+    def evaluate(self, board: Board, colour: Colour) -> int:
+        """Evaluates the current position of the searched line.
+
+        The board is not read: the accumulator must be in sync with it
+        through reset(), push() and pop().
+
+        Args:
+            board (Board): The board to evaluate.
+            colour (Colour): The colour of the player to evaluate the position for.
+
+        Returns:
+            int: The score in centipawns from the player's point of view.
+
+        """
+        return self._output(self._accumulator, colour)
+
+    @override
+    def evaluate_batch(self, positions: Sequence[tuple[Board, Colour]]) -> list[int]:
+        return [self._output(self.accumulate(board), colour) for board, colour in positions]
+
+    def _output(self, accumulator: NDArray[np.int16], colour: Colour) -> int:
+        """Runs the output layer on the accumulators.
+
+        Args:
+            accumulator (NDArray[np.int16]): The accumulators, shaped (2, hidden).
+            colour (Colour): The colour of the player to evaluate the position for.
+
+        Returns:
+            int: The score in centipawns from the player's point of view.
+
+        """
+        # cheaper than np.clip on arrays this small
+        activations = np.minimum(np.maximum(accumulator, 0), _CLIP).ravel()
+        score = (int(activations @ self._output_weights_for[colour]) + self.output_bias) // (
+            self.scale
+        )
+
+        return min(max(score, -_MAX_SCORE), _MAX_SCORE)
+
+
+def _feature_index(piece_type: type, colour: Colour, square: Square, side: Colour) -> int:
+    """The index of a piece on a square as seen by a side.
+
+    Args:
+        piece_type (type): The type of the piece.
+        colour (Colour): The colour of the piece.
+        square (Square): The square of the piece.
+        side (Colour): The side whose accumulator the feature belongs to.
+
+    Returns:
+        int: The index of the feature, below FEATURES.
+
+    """
+    plane = PIECE_PLANES[piece_type] + (0 if colour == side else len(PIECE_PLANES))
+    rank, file_ = square
+
+    return (plane * 8 + (7 - rank if side == Colour.BLACK else rank)) * 8 + file_
+
+
+# every piece on every square, numbered
+_PIECES: dict[_Feature, int] = {
+    (piece_type, colour, (rank, file_)): index
+    for index, (piece_type, colour, rank, file_) in enumerate(
+        (piece_type, colour, rank, file_)
+        for piece_type in PIECE_PLANES
+        for colour in Colour
+        for rank in range(8)
+        for file_ in range(8)
+    )
+}
+
+
+def _move_features(board: Board, move: str, turn: Colour) -> tuple[list[_Feature], list[_Feature]]:
+    """Finds the pieces a move removes from and adds to the board.
+
+    Args:
+        board (Board): The position before the move.
+        move (str): The move in the notation of Board.legal_moves.
+        turn (Colour): The colour of the player making the move.
+
+    Returns:
+        tuple[list[_Feature], list[_Feature]]: The removed and the added pieces.
+
+    """
+    if move in {"o-o", "o-o-o"}:
+        rank = 0 if turn == Colour.WHITE else 7
+        king = board.state[rank][4]
+        rook_file, king_to, rook_to = (7, 6, 5) if move == "o-o" else (0, 2, 3)
+        rook = board.state[rank][rook_file]
+        return (
+            [(type(king), turn, (rank, 4)), (type(rook), turn, (rank, rook_file))],
+            [(type(king), turn, (rank, king_to)), (type(rook), turn, (rank, rook_to))],
+        )
+
+    start = int(move[1]) - 1, _FILES.index(move[0])
+    end = int(move[3]) - 1, _FILES.index(move[2])
+    piece_type = type(board.state[start[0]][start[1]])
+    removed: list[_Feature] = [(piece_type, turn, start)]
+
+    if (target := board.state[end[0]][end[1]]) is not None:
+        removed.append((type(target), target.colour, end))
+
+    elif piece_type is Pawn and start[1] != end[1]:
+        # en passant: the captured pawn is next to the moving one
+        removed.append((Pawn, ~turn, (start[0], end[1])))
+
+    if piece_type is Pawn and end[0] in {0, 7}:
+        piece_type = _PROMOTIONS[move[4:5] or "q"]
+
+    return removed, [(piece_type, turn, end)]
@@ -0,0 +1,460 @@
+"""This module provides the engine search."""
+
+from __future__ import annotations
+
+import asyncio
+from copy import deepcopy
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import TYPE_CHECKING
+
+from chess.engine.evaluation import PIECE_VALUES, MaterialEvaluator
+from chess.engine.time_management import SearchController, SearchLimits, allocate_time
+from chess.zobrist import zobrist_key
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from chess.board import Board, MoveRecord
+    from chess.colour_and_aliases import Colour
+    from chess.engine.evaluation import Evaluator
+    from chess.tablebase import Tablebases
+
+MATE_SCORE = 100_000
+MAX_DEPTH = 64
+
+# rough size of a transposition table entry in a dict, in bytes
+_TABLE_ENTRY_SIZE = 200
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """Result of a search.
+
+    Attributes:
+        best_move (str | None): The best move found, in the notation of
+            Board.legal_moves. None if there are no legal moves.
+        score (int): The score of the best move in centipawns.
+        depth (int): The depth of the last completed iteration.
+        nodes (int): The number of nodes searched.
+        elapsed (float): The time the search took in seconds.
+
+    """
+
+    best_move: str | None
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+
+class _Bound(Enum):
+    """Enum class for the kind of score stored in the transposition table."""
+
+    EXACT = auto()
+    LOWER = auto()
+    UPPER = auto()
+
+
+class _SearchAbortedError(Exception):
+    """Raised to unwind the search once it has to stop."""
+
+
+class Searcher:
+    """Iterative deepening alpha-beta search.
+
+    The search always answers with the best move of the last completed
+    iteration, so it can be stopped at any time.
+
+    Attributes:
+        check_every (int): The number of nodes between deadline checks.
+        hash_size (int): The size of the transposition table in megabytes.
+        evaluator (Evaluator): The static evaluation of the leaves.
+        tablebases (Tablebases | None): Endgame tablebases probed below the root.
+        nodes (int): The number of nodes searched by the current search.
+
+    """
+
+    def __init__(
+        self,
+        check_every: int = 4,
+        hash_size: int = 16,
+        evaluator: Evaluator | None = None,
+        tablebases: Tablebases | None = None,
+    ):
+        self.check_every: int = check_every
+        self.hash_size: int = hash_size
+        self.evaluator: Evaluator = evaluator or MaterialEvaluator()
+        self.tablebases: Tablebases | None = tablebases
+        self.nodes: int = 0
+        self._controller: SearchController = SearchController(check_every=check_every)
+        self._table: dict[int, tuple[int, int, _Bound, str | None]] = {}
+
+    def resize_hash(self, hash_size: int) -> None:
+        """Resizes the transposition table, dropping its entries.
+
+        Args:
+            hash_size (int): The new size in megabytes.
+
+        """
+        self.hash_size = hash_size
+        self.clear_hash()
+
+    def clear_hash(self) -> None:
+        """Clears the transposition table, e.g. before a new game."""
+        self._table.clear()
+
+    def search(
+        self,
+        board: Board,
+        turn: Colour,
+        limits: SearchLimits | None = None,
+        controller: SearchController | None = None,
+        on_iteration: Callable[[SearchResult], None] | None = None,
+    ) -> SearchResult:
+        """Searches for the best move. The board is not modified.
+
+        Args:
+            board (Board): The position to search.
+            turn (Colour): The colour of the player to move.
+            limits (SearchLimits | None): The limits of the search.
+            controller (SearchController | None): The controller to stop the search
+                with. Created from the limits if not given.
+            on_iteration (Callable[[SearchResult], None] | None): Called with the
+                result of every completed iteration.
+
+        Returns:
+            SearchResult: The result of the search.
+
+        """
+        limits = limits or SearchLimits()
+        self._controller = controller or SearchController(
+            allocate_time(limits, turn), self.check_every
+        )
+        self.nodes = 0
+        self.evaluator.reset(board)
+        # the moves are played on a copy, which an aborted search leaves with moves still on it
+        board = deepcopy(board)
+
+        moves = self._order_moves(board, board.legal_moves(turn))
+        if not moves:
+            score = -MATE_SCORE if board._king_checked(turn) else 0
+            return SearchResult(None, score, 0, 0, self._controller.elapsed)
+
+        best_move, best_score, completed_depth = moves[0], 0, 0
+
+        for depth in range(1, (limits.depth or MAX_DEPTH) + 1):
+            if depth > 1 and not self._controller.can_start_iteration():
+                break
+
+            try:
+                best_score, best_move = self._search_root(board, turn, moves, depth)
+
+            except _SearchAbortedError:
+                break
+
+            completed_depth = depth
+
+            if on_iteration is not None:
+                on_iteration(
+                    SearchResult(
+                        best_move, best_score, depth, self.nodes, self._controller.elapsed
+                    )
+                )
+
+            # search the best move first in the next iteration
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+            if abs(best_score) >= MATE_SCORE - MAX_DEPTH:
+                break
+
+        return SearchResult(
+            best_move, best_score, completed_depth, self.nodes, self._controller.elapsed
+        )
+
+    async def search_async(
+        self, board: Board, turn: Colour, limits: SearchLimits | None = None
+    ) -> SearchResult:
+        """Searches for the best move in a worker thread.
+
+        Cancelling the awaiting task stops the search.
+
+        Args:
+            board (Board): The position to search. Must not be modified during the search.
+            turn (Colour): The colour of the player to move.
+            limits (SearchLimits | None): The limits of the search.
+
+        Returns:
+            SearchResult: The result of the search.
+
+        """
+        limits = limits or SearchLimits()
+        controller = SearchController(allocate_time(limits, turn), self.check_every)
+
+        try:
+            return await asyncio.to_thread(self.search, board, turn, limits, controller)
+
+        except asyncio.CancelledError:
+            controller.stop()
+            raise
+
+    def stop(self) -> None:
+        """Stops the running search. Safe to call from any thread."""
+        self._controller.stop()
+
+    def _search_root(
+        self, board: Board, turn: Colour, moves: list[str], depth: int
+    ) -> tuple[int, str]:
+        """Searches the root moves to a given depth.
+
+        Args:
+            board (Board): The position to search.
+            turn (Colour): The colour of the player to move.
+            moves (list[str]): The legal moves of the position, best guess first.
+            depth (int): The depth to search to.
+
+        Returns:
+            tuple[int, str]: The best score and the best move.
+
+        """
+        alpha, beta = -MATE_SCORE - 1, MATE_SCORE + 1
+        best_move = moves[0]
+
+        for move in moves:
+            record = self._play(board, move, turn)
+            score = -self._negamax(board, ~turn, depth - 1, -beta, -alpha, ply=1)
+            self._take_back(board, record)
+
+            if score > alpha:
+                alpha, best_move = score, move
+
+        return alpha, best_move
+
+    def _negamax(
+        self, board: Board, turn: Colour, depth: int, alpha: int, beta: int, *, ply: int
+    ) -> int:
+        """Searches a position with alpha-beta pruning.
+
+        Args:
+            board (Board): The position to search.
+            turn (Colour): The colour of the player to move.
+            depth (int): The remaining depth.
+            alpha (int): The lower bound of the search window.
+            beta (int): The upper bound of the search window.
+            ply (int): The distance from the root.
+
+        Returns:
+            int: The score of the position from the player's point of view.
+
+        Raises:
+            _SearchAbortedError: If the search has to stop.
+
+        """
+        self.nodes += 1
+        if self._controller.should_abort(self.nodes):
+            raise _SearchAbortedError
+
+        if (score := self._static_score(board, turn, depth, ply=ply)) is not None:
+            return score
+
+        key = zobrist_key(board, turn)
+        table_move = None
+
+        if (entry := self._table.get(key)) is not None:
+            entry_depth, entry_score, bound, table_move = entry
+            score = self._score_from_table(entry_score, ply)
+
+            if entry_depth >= depth and (
+                bound == _Bound.EXACT
+                or (bound == _Bound.LOWER and score >= beta)
+                or (bound == _Bound.UPPER and score <= alpha)
+            ):
+                return score
+
+        if not (moves := board.legal_moves(turn)):
+            return -(MATE_SCORE - ply) if board._king_checked(turn) else 0
+
+        original_alpha, best_move = alpha, None
+        moves = self._order_moves(board, moves, table_move)
+        leaf_scores = (
+            self._evaluate_leaves(board, turn, moves)
+            if depth == 1 and self.evaluator.batched
+            else None
+        )
+
+        for index, move in enumerate(moves):
+            if leaf_scores is not None:
+                score = leaf_scores[index]
+            else:
+                record = self._play(board, move, turn)
+                score = -self._negamax(board, ~turn, depth - 1, -beta, -alpha, ply=ply + 1)
+                self._take_back(board, record)
+
+            if score >= beta:
+                self._store(key, depth, beta, _Bound.LOWER, move, ply=ply)
+                return beta
+
+            if score > alpha:
+                alpha, best_move = score, move
+
+        bound = _Bound.EXACT if alpha > original_alpha else _Bound.UPPER
+        self._store(key, depth, alpha, bound, best_move, ply=ply)
+
+        return alpha
+
+    def _static_score(self, board: Board, turn: Colour, depth: int, *, ply: int) -> int | None:
+        """Scores a position without searching it, at the leaves or from the tablebases.
+
+        Tablebase scores are exact and scored like the mates of the search. The
+        root is never probed, so that the search still picks a move.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+            depth (int): The remaining depth.
+            ply (int): The distance from the root.
+
+        Returns:
+            int | None: The score from the player's point of view. None if the
+                position has to be searched.
+
+        """
+        if ply > 0 and self.tablebases is not None:
+            result = self.tablebases.probe(board, turn)
+
+            if result is not None:
+                return 0 if result.dtm is None else result.wdl * (MATE_SCORE - ply - result.dtm)
+
+        return self.evaluator.evaluate(board, turn) if depth == 0 else None
+
+    def _play(self, board: Board, move: str, turn: Colour) -> MoveRecord:
+        """Plays a move on the board and tells the evaluator about it.
+
+        The caller takes the move back with _take_back once the position is searched.
+
+        Args:
+            board (Board): The position the move is played in.
+            move (str): The move to play.
+            turn (Colour): The colour of the player making the move.
+
+        Returns:
+            MoveRecord: The move, to take it back with.
+
+        """
+        self.evaluator.push(board, move, turn)
+
+        return board.play(move, turn)
+
+    def _take_back(self, board: Board, record: MoveRecord) -> None:
+        """Takes back the last move played with _play, on the board and in the evaluator."""
+        board.take_back(record)
+        self.evaluator.pop()
+
+    def _evaluate_leaves(self, board: Board, turn: Colour, moves: list[str]) -> list[int]:
+        """Evaluates the positions after every move in a single batch.
+
+        Args:
+            board (Board): The position the moves are played in.
+            turn (Colour): The colour of the player to move.
+            moves (list[str]): The moves to play.
+
+        Returns:
+            list[int]: The scores of the moves from the player's point of view.
+
+        Raises:
+            _SearchAbortedError: If the search has to stop.
+
+        """
+        leaves = []
+
+        for move in moves:
+            self.nodes += 1
+            if self._controller.should_abort(self.nodes):
+                raise _SearchAbortedError
+
+            # the batch is evaluated once every leaf exists, so each one is a board of its own
+            child = deepcopy(board)
+            child.apply_move(move, turn)
+            leaves.append((child, ~turn))
+
+        return [-score for score in self.evaluator.evaluate_batch(leaves)]
+
+    def _store(
+        self, key: int, depth: int, score: int, bound: _Bound, move: str | None, *, ply: int
+    ) -> None:
+        """Stores a search result in the transposition table.
+
+        The oldest entry is dropped once the table is full.
+
+        Args:
+            key (int): The Zobrist key of the position.
+            depth (int): The depth the position was searched to.
+            score (int): The score of the position.
+            bound (_Bound): Whether the score is exact or a bound.
+            move (str | None): The best move found, if any.
+            ply (int): The distance from the root.
+
+        """
+        if key not in self._table and len(self._table) >= (
+            self.hash_size * 2**20 // _TABLE_ENTRY_SIZE
+        ):
+            if not self._table:
+                return
+
+            del self._table[next(iter(self._table))]
+
+        # mate scores are stored relative to the position, not the root
+        if score >= MATE_SCORE - MAX_DEPTH:
+            score += ply
+        elif score <= -MATE_SCORE + MAX_DEPTH:
+            score -= ply
+
+        self._table[key] = (depth, score, bound, move)
+
+    @staticmethod
+    def _score_from_table(score: int, ply: int) -> int:
+        """Converts a stored score back to a score relative to the root.
+
+        Args:
+            score (int): The stored score.
+            ply (int): The distance from the root.
+
+        Returns:
+            int: The score relative to the root.
+
+        """
+        if score >= MATE_SCORE - MAX_DEPTH:
+            return score - ply
+
+        if score <= -MATE_SCORE + MAX_DEPTH:
+            return score + ply
+
+        return score
+
+    @staticmethod
+    def _order_moves(board: Board, moves: list[str], first: str | None = None) -> list[str]:
+        """Orders moves so that captures of the most valuable pieces come first.
+
+        Args:
+            board (Board): The position the moves are played in.
+            moves (list[str]): The moves to order.
+            first (str | None): A move to search before all others, e.g. the best
+                move found by an earlier search.
+
+        Returns:
+            list[str]: The ordered moves.
+
+        """
+
+        def victim_value(move: str) -> int:
+            if move == first:
+                return MATE_SCORE
+
+            if len(move) < 4 or move[1] not in "12345678":
+                return 0
+
+            victim = board.state[int(move[3]) - 1]["abcdefgh".index(move[2])]
+            return PIECE_VALUES[type(victim)] if victim else 0
+
+        return sorted(moves, key=victim_value, reverse=True)
@@ -0,0 +1,178 @@
+"""This module provides time allocation and deadline checks for the engine search."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from chess.colour_and_aliases import Colour
+
+_NS_PER_SECOND = 1_000_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class SearchLimits:
+    """Limits of a single search. Times are given in seconds.
+
+    Attributes:
+        depth (int | None): The maximum depth to search to.
+        movetime (float | None): The exact time to spend on the move.
+        white_time (float | None): White's remaining time on the clock.
+        black_time (float | None): Black's remaining time on the clock.
+        white_increment (float): White's increment per move.
+        black_increment (float): Black's increment per move.
+        moves_to_go (int | None): Moves left until the next time control.
+        infinite (bool): Whether to search until stopped.
+
+    """
+
+    depth: int | None = None
+    movetime: float | None = None
+    white_time: float | None = None
+    black_time: float | None = None
+    white_increment: float = 0.0
+    black_increment: float = 0.0
+    moves_to_go: int | None = None
+    infinite: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class TimeBudget:
+    """Time allotted to a move.
+
+    Attributes:
+        soft (float): No new iteration is started once this much time has passed.
+        hard (float): The search is aborted once this much time has passed.
+
+    """
+
+    soft: float
+    hard: float
+
+
+def allocate_time(
+    limits: SearchLimits,
+    turn: Colour,
+    *,
+    move_overhead: float = 0.05,
+    default_moves_to_go: int = 30,
+) -> TimeBudget | None:
+    """Allocates time for a move from the limits of the search.
+
+    Args:
+        limits (SearchLimits): The limits of the search.
+        turn (Colour): The colour of the player to move.
+        move_overhead (float): Time reserved for communication lag.
+        default_moves_to_go (int): Moves expected until the end of the game
+            when the time control does not say.
+
+    Returns:
+        TimeBudget | None: The time budget of the move. None if the search
+            is not limited by time.
+
+    """
+    if limits.infinite:
+        return None
+
+    if limits.movetime is not None:
+        movetime = max(limits.movetime - move_overhead, 0.0)
+        return TimeBudget(soft=movetime, hard=movetime)
+
+    remaining = limits.white_time if turn == Colour.WHITE else limits.black_time
+    if remaining is None:
+        return None
+
+    increment = limits.white_increment if turn == Colour.WHITE else limits.black_increment
+    moves_to_go = max(limits.moves_to_go or default_moves_to_go, 1)
+
+    # never plan to use more than what is left on the clock after the overhead
+    available = max(remaining - move_overhead, 0.0)
+    soft = min(available / moves_to_go + 0.75 * increment, available)
+    hard = min(soft * 4, available / 2 + increment, available)
+
+    return TimeBudget(soft=min(soft, hard), hard=hard)
+
+
+class SearchController:
+    """Decides when a running search has to stop.
+
+    The deadline is checked only every `check_every` nodes to keep the
+    per-node cost down. The controller can be stopped from any thread.
+
+    Attributes:
+        budget (TimeBudget | None): The time budget of the search.
+        check_every (int): The number of nodes between deadline checks.
+            Rounded up to a power of two.
+
+    """
+
+    def __init__(self, budget: TimeBudget | None = None, check_every: int = 4):
+        self.budget: TimeBudget | None = budget
+        self.check_every: int = 1 << max(check_every - 1, 0).bit_length()
+        self._mask: int = self.check_every - 1
+        self._stop_event: threading.Event = threading.Event()
+        self._start_ns: int = time.monotonic_ns()
+        self._soft_deadline_ns: int | None = None
+        self._hard_deadline_ns: int | None = None
+        self.start()
+
+    def start(self) -> None:
+        """Starts the clock of the search and clears a previous stop request."""
+        self._stop_event.clear()
+        self._start_ns = time.monotonic_ns()
+
+        if self.budget is None:
+            self._soft_deadline_ns = self._hard_deadline_ns = None
+            return
+
+        self._soft_deadline_ns = self._start_ns + int(self.budget.soft * _NS_PER_SECOND)
+        self._hard_deadline_ns = self._start_ns + int(self.budget.hard * _NS_PER_SECOND)
+
+    def stop(self) -> None:
+        """Requests the search to stop. Safe to call from any thread."""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the search was requested to stop."""
+        return self._stop_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the search started."""
+        return (time.monotonic_ns() - self._start_ns) / _NS_PER_SECOND
+
+    def should_abort(self, nodes: int) -> bool:
+        """Checks whether the search has to be aborted mid-iteration.
+
+        Args:
+            nodes (int): The number of nodes searched so far.
+
+        Returns:
+            bool: Whether the search has to be aborted.
+
+        """
+        if nodes & self._mask:
+            return False
+
+        if self._stop_event.is_set():
+            return True
+
+        if self._hard_deadline_ns is not None and time.monotonic_ns() >= self._hard_deadline_ns:
+            self._stop_event.set()
+            return True
+
+        return False
+
+    def can_start_iteration(self) -> bool:
+        """Checks whether there is enough time to start another iteration.
+
+        Returns:
+            bool: Whether another iteration can be started.
+
+        """
+        if self._stop_event.is_set():
+            return False
+
+        return self._soft_deadline_ns is None or time.monotonic_ns() < self._soft_deadline_ns
@@ -0,0 +1,445 @@
+"""This module indexes the positions of archived games for an opening explorer.
+
+The index maps the Polyglot key of every position of every game to the game
+and the ply it was reached at, and every move played from a position to the
+number of games it was played in and their results. Games are referred to
+by their number in the archive they were indexed from, see chess.archive.
+
+An index file is a 24-byte header with the number of entries of both
+tables, then the position table of 14-byte entries (key, game, ply) sorted
+by key, then the move table of 26-byte entries (key, move, games, White
+wins, draws, Black wins) sorted by key and move. Moves are encoded as in the
+archive. All numbers are little-endian.
+
+The index is built in parallel: every worker replays a share of the games
+and writes sorted runs of bounded size to temporary files, which are then
+merged into the index file without loading them. Queries binary search the
+memory-mapped file.
+
+Run `python -m chess.explorer --help` to build and query indexes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import groupby, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from chess.archive import GameArchive, decode_move, encode_move
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.polyglot import polyglot_key
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+POSITION = struct.Struct("<QIH")
+MOVE = struct.Struct("<QHIIII")
+
+_MAGIC = b"CHPI"
+_HEADER = struct.Struct("<4sxxxxQQ")
+_KEY = struct.Struct("<Q")
+
+# the column of the move table counting every result
+_RESULT_COLUMNS = {"1-0": 0, "1/2-1/2": 1, "0-1": 2}
+
+_RUN_SIZE = 2_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class MoveStats:
+    """The games in which a move was played from a position.
+
+    Attributes:
+        move (str): The move in the notation of Board.legal_moves.
+        games (int): The number of games.
+        white (int): The number of games White won.
+        draws (int): The number of drawn games.
+        black (int): The number of games Black won.
+
+    """
+
+    move: str
+    games: int
+    white: int
+    draws: int
+    black: int
+
+
+@dataclass(frozen=True, slots=True)
+class IndexStats:
+    """Statistics of a built index.
+
+    Attributes:
+        games (int): The number of games indexed.
+        errors (int): The number of games with an invalid starting position.
+        positions (int): The number of entries of the position table.
+        moves (int): The number of entries of the move table.
+
+    """
+
+    games: int
+    errors: int
+    positions: int
+    moves: int
+
+
+class PositionIndex:
+    """A memory-mapped position index."""
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is not a position index: it is too short.")
+
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, positions, moves = _HEADER.unpack_from(self._map)
+        self._positions: int = positions
+        self._moves: int = moves
+        if (
+            magic != _MAGIC
+            or _HEADER.size + self._positions * POSITION.size + self._moves * MOVE.size != size
+        ):
+            self._map.close()
+            raise ValueError(f"{path} is not a position index.")
+
+        self._moves_offset: int = _HEADER.size + self._positions * POSITION.size
+
+    def __len__(self) -> int:
+        return self._positions
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def games(self, board: Board, turn: Colour, limit: int | None = None) -> list[tuple[int, int]]:
+        """Looks up the games that reached a position.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+            limit (int | None): The maximum number of games to return.
+
+        Returns:
+            list[tuple[int, int]]: The number of every game in the archive
+                and the ply it reached the position at, by game.
+
+        """
+        key = polyglot_key(board, turn)
+        entries = self._entries(key, _HEADER.size, self._positions, POSITION)
+
+        return [(game, ply) for _, game, ply in islice(entries, limit)]
+
+    def moves(self, board: Board, turn: Colour) -> list[MoveStats]:
+        """Looks up the moves played from a position.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+
+        Returns:
+            list[MoveStats]: The moves, the most played first.
+
+        """
+        key = polyglot_key(board, turn)
+        moves = [
+            MoveStats(decode_move(move), games, white, draws, black)
+            for _, move, games, white, draws, black in self._entries(
+                key, self._moves_offset, self._moves, MOVE
+            )
+        ]
+
+        return sorted(moves, key=lambda stats: -stats.games)
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._map.close()
+
+    def _entries(
+        self, key: int, offset: int, count: int, record: struct.Struct
+    ) -> Iterator[tuple[int, ...]]:
+        """Binary searches a table for the entries of a key.
+
+        Args:
+            key (int): The key.
+            offset (int): The offset of the table.
+            count (int): The number of entries of the table.
+            record (struct.Struct): The layout of the entries.
+
+        Yields:
+            tuple[int, ...]: The entries with the key, in the order of the table.
+
+        """
+        low, high = 0, count
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if _KEY.unpack_from(self._map, offset + middle * record.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        while (
+            low < count
+            and (entry := record.unpack_from(self._map, offset + low * record.size))[0] == key
+        ):
+            yield entry
+            low += 1
+
+
+def build_index(
+    archive: str | Path,
+    path: str | Path,
+    *,
+    plies: int | None = None,
+    workers: int | None = None,
+    run_size: int = _RUN_SIZE,
+) -> IndexStats:
+    """Builds a position index of the games of an archive.
+
+    Args:
+        archive (str | Path): The path of the archive.
+        path (str | Path): The path of the index file. It is replaced atomically.
+        plies (int | None): The number of plies of every game to index.
+            Defaults to the whole game.
+        workers (int | None): The number of processes. Defaults to the CPU count.
+        run_size (int): The number of positions a worker sorts in memory
+            before it writes them to a run.
+
+    Returns:
+        IndexStats: Statistics of the index.
+
+    """
+    with GameArchive(archive) as games:
+        game_count = len(games)
+
+    workers = workers or os.cpu_count() or 1
+    # a few tasks per worker, so that the workers finish at about the same time
+    step = max(1, -(-game_count // (4 * workers)))
+
+    with (
+        tempfile.TemporaryDirectory(dir=Path(path).parent) as directory,
+        ProcessPoolExecutor(max_workers=workers) as executor,
+    ):
+        task = partial(
+            _index_games, archive, directory=Path(directory), plies=plies, run_size=run_size
+        )
+        position_runs: list[Path] = []
+        move_runs: list[Path] = []
+        errors = 0
+
+        for runs, task_errors in executor.map(
+            task, range(0, game_count, step), range(step, game_count + step, step)
+        ):
+            position_runs += runs[0]
+            move_runs += runs[1]
+            errors += task_errors
+
+        positions, moves = _merge_runs(position_runs, move_runs, path)
+
+    return IndexStats(game_count, errors, positions, moves)
+
+
+def _index_games(
+    archive: str | Path,
+    start: int,
+    stop: int,
+    *,
+    directory: Path,
+    plies: int | None,
+    run_size: int,
+) -> tuple[tuple[list[Path], list[Path]], int]:
+    """Replays a share of the games of an archive into sorted runs.
+
+    Args:
+        archive (str | Path): The path of the archive.
+        start (int): The number of the first game.
+        stop (int): The number after the last game.
+        directory (Path): The directory to write the runs to.
+        plies (int | None): The number of plies of every game to index.
+        run_size (int): The number of positions of a run.
+
+    Returns:
+        tuple[tuple[list[Path], list[Path]], int]: The position runs, the
+            move runs and the number of games with an invalid starting position.
+
+    """
+    positions: list[tuple[int, int, int]] = []
+    moves: dict[tuple[int, int], list[int]] = {}
+    runs: tuple[list[Path], list[Path]] = ([], [])
+    errors = 0
+
+    with GameArchive(archive) as games:
+        for number in range(start, min(stop, len(games))):
+            game = games[number]
+            try:
+                board, turn = board_from_fen(game.fen) if game.fen else (Board(), Colour.WHITE)
+
+            except ValueError:
+                errors += 1
+                continue
+
+            column = _RESULT_COLUMNS.get(game.result)
+            played = game.moves[:plies]
+
+            for ply, move in enumerate(played):
+                key = polyglot_key(board, turn)
+                positions.append((key, number, ply))
+
+                counts = moves.setdefault((key, encode_move(move)), [0, 0, 0, 0])
+                counts[0] += 1
+                if column is not None:
+                    counts[column + 1] += 1
+
+                board.apply_move(move, turn)
+                turn = ~turn
+
+            # the last position, which no move was played from
+            positions.append((polyglot_key(board, turn), number, len(played)))
+
+            if len(positions) >= run_size:
+                _write_runs(positions, moves, directory, runs)
+
+    _write_runs(positions, moves, directory, runs)
+
+    return runs, errors
+
+
+def _write_runs(
+    positions: list[tuple[int, int, int]],
+    moves: dict[tuple[int, int], list[int]],
+    directory: Path,
+    runs: tuple[list[Path], list[Path]],
+) -> None:
+    """Writes the positions and moves collected so far to sorted runs and clears them."""
+    if not positions:
+        return
+
+    position_run = _write_run(directory, POSITION, sorted(positions))
+    move_run = _write_run(
+        directory, MOVE, ((*key, *counts) for key, counts in sorted(moves.items()))
+    )
+
+    runs[0].append(position_run)
+    runs[1].append(move_run)
+    positions.clear()
+    moves.clear()
+
+
+def _write_run(directory: Path, record: struct.Struct, entries: Iterable[tuple[int, ...]]) -> Path:
+    """Writes sorted entries to a new run file in a directory."""
+    with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as file:
+        for entry in entries:
+            file.write(record.pack(*entry))
+
+    return Path(file.name)
+
+
+def _read_run(path: Path, record: struct.Struct) -> Iterator[tuple[int, ...]]:
+    """Reads the entries of a run file a block at a time."""
+    with open(path, "rb") as file:
+        while block := file.read(record.size * 4096):
+            yield from record.iter_unpack(block)
+
+
+def _merge_runs(
+    position_runs: list[Path], move_runs: list[Path], path: str | Path
+) -> tuple[int, int]:
+    """Merges sorted runs into an index file, replacing it atomically.
+
+    The moves of a position found in several runs are added up.
+
+    Args:
+        position_runs (list[Path]): The position runs.
+        move_runs (list[Path]): The move runs.
+        path (str | Path): The path of the index file.
+
+    Returns:
+        tuple[int, int]: The number of entries of the position and move tables.
+
+    """
+    temporary = Path(f"{path}.tmp")
+    positions = moves = 0
+
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, 0, 0))
+
+        for entry in heapq.merge(*(_read_run(run, POSITION) for run in position_runs)):
+            file.write(POSITION.pack(*entry))
+            positions += 1
+
+        merged = heapq.merge(*(_read_run(run, MOVE) for run in move_runs))
+        for (key, move), entries in groupby(merged, key=lambda entry: entry[:2]):
+            counts = [
+                sum(column) for column in zip(*(entry[2:] for entry in entries), strict=True)
+            ]
+            file.write(MOVE.pack(key, move, *counts))
+            moves += 1
+
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, positions, moves))
+
+    os.replace(temporary, path)
+
+    return positions, moves
+
+
+def main() -> None:
+    """Builds and queries position indexes from the command line."""
+    parser = argparse.ArgumentParser(description="Position index for an opening explorer.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="index the games of an archive")
+    build.add_argument("archive", type=Path, help="archive file, see chess.archive")
+    build.add_argument("--output", "-o", type=Path, required=True, help="index file")
+    build.add_argument("--plies", type=int, default=None, help="plies of every game to index")
+    build.add_argument("--workers", type=int, default=None, help="number of processes")
+
+    probe = commands.add_parser("probe", help="list the moves and games of a position")
+    probe.add_argument("index", type=Path, help="index file")
+    probe.add_argument("--fen", default=None, help="position, defaults to the start")
+    probe.add_argument("--games", type=int, default=10, help="games to list")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_index(args.archive, args.output, plies=args.plies, workers=args.workers)
+        print(
+            f"{stats.games} games, {stats.errors} with errors: "
+            f"{stats.positions} positions and {stats.moves} moves indexed",
+            file=sys.stderr,
+        )
+        return
+
+    board, turn = board_from_fen(args.fen) if args.fen else (Board(), Colour.WHITE)
+    with PositionIndex(args.index) as index:
+        for move in index.moves(board, turn):
+            print(f"{move.move}\tgames {move.games}\t+{move.white} ={move.draws} -{move.black}")
+
+        for game, ply in index.games(board, turn, args.games):
+            print(f"game {game}, ply {ply}")
+
+
+if __name__ == "__main__":
+    main()
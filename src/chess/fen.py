@@ -0,0 +1,254 @@
+"""This module provides conversion between boards and FEN strings."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+if TYPE_CHECKING:
+    from chess.colour_and_aliases import Square
+    from chess.pieces import Piece
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+_PIECE_TYPES: dict[str, type[Pawn | King | Knight | Rook | Bishop | Queen]] = {
+    "p": Pawn,
+    "k": King,
+    "n": Knight,
+    "r": Rook,
+    "b": Bishop,
+    "q": Queen,
+}
+
+_PIECE_LETTERS = {piece_type: letter for letter, piece_type in _PIECE_TYPES.items()}
+
+
+def board_from_fen(fen: str) -> tuple[Board, Colour]:
+    """Creates a board from a FEN string.
+
+    The halfmove clock and the fullmove number are optional and ignored.
+
+    Args:
+        fen (str): The FEN string.
+
+    Returns:
+        tuple[Board, Colour]: The board and the colour of the player to move.
+
+    Raises:
+        ValueError: If the FEN string is invalid.
+
+    """
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ValueError(f"FEN must have at least 4 fields: {fen!r}")
+
+    placement, side, castling, en_passant = fields[:4]
+
+    board = Board()
+    board.state = _parse_placement(placement)
+
+    if side not in {"w", "b"}:
+        raise ValueError(f"Invalid side to move: {side!r}")
+    turn = Colour.WHITE if side == "w" else Colour.BLACK
+
+    _set_moved_flags(board, castling)
+
+    if en_passant != "-":
+        board.en_passant_pawn = _en_passant_pawn(board, en_passant, turn)
+
+    return board, turn
+
+
+def board_to_fen(
+    board: Board, turn: Colour, halfmove_clock: int = 0, fullmove_number: int = 1
+) -> str:
+    """Converts a board to a FEN string.
+
+    Args:
+        board (Board): The board to convert.
+        turn (Colour): The colour of the player to move.
+        halfmove_clock (int): Halfmoves since the last capture or pawn move.
+        fullmove_number (int): The number of the current move.
+
+    Returns:
+        str: The FEN string.
+
+    """
+    rows = []
+    for row in board.state[::-1]:
+        fen_row, empty = "", 0
+
+        for piece in row:
+            if piece is None:
+                empty += 1
+                continue
+
+            fen_row += (str(empty) if empty else "") + piece_letter(piece)
+            empty = 0
+
+        rows.append(fen_row + (str(empty) if empty else ""))
+
+    en_passant = "-"
+    if (pawn := board.en_passant_pawn) is not None and (square := _find_piece(board, pawn)):
+        rank, file_ = square
+        en_passant = "abcdefgh"[file_] + str(rank + (0 if pawn.colour == Colour.WHITE else 2))
+
+    side = "w" if turn == Colour.WHITE else "b"
+
+    return (
+        f"{'/'.join(rows)} {side} {board.castling_rights()} {en_passant}"
+        f" {halfmove_clock} {fullmove_number}"
+    )
+
+
+def piece_letter(piece: Pawn | King | Knight | Rook | Bishop | Queen) -> str:
+    """The letter of a piece in FEN, uppercase for White.
+
+    Args:
+        piece (Pawn | King | Knight | Rook | Bishop | Queen): The piece.
+
+    Returns:
+        str: The letter.
+
+    """
+    letter = _PIECE_LETTERS[type(piece)]
+
+    return letter.upper() if piece.colour == Colour.WHITE else letter
+
+
+def _parse_placement(
+    placement: str,
+) -> list[list[Pawn | King | Knight | Rook | Bishop | Queen | None]]:
+    """Parses the piece placement field of a FEN string.
+
+    Args:
+        placement (str): The piece placement field.
+
+    Returns:
+        list[list[Pawn | King | Knight | Rook | Bishop | Queen | None]]: The board state.
+
+    Raises:
+        ValueError: If the field is invalid.
+
+    """
+    fen_rows = placement.split("/")
+    if len(fen_rows) != 8:
+        raise ValueError(f"Piece placement must have 8 ranks: {placement!r}")
+
+    state: list[list[Pawn | King | Knight | Rook | Bishop | Queen | None]] = []
+
+    for fen_row in fen_rows[::-1]:
+        row: list[Pawn | King | Knight | Rook | Bishop | Queen | None] = []
+
+        for char in fen_row:
+            if char.isdigit():
+                row.extend([None] * int(char))
+
+            elif (piece_type := _PIECE_TYPES.get(char.lower())) is not None:
+                row.append(piece_type(Colour.WHITE if char.isupper() else Colour.BLACK))
+
+            else:
+                raise ValueError(f"Invalid piece: {char!r}")
+
+        if len(row) != 8:
+            raise ValueError(f"Rank must have 8 squares: {fen_row!r}")
+
+        state.append(row)
+
+    for colour in Colour:
+        kings = sum(
+            isinstance(piece, King) and piece.colour == colour for row in state for piece in row
+        )
+        if kings != 1:
+            raise ValueError(f"{colour} must have exactly one King.")
+
+    return state
+
+
+def _set_moved_flags(board: Board, castling: str) -> None:
+    """Marks pieces as moved unless the castling rights or pawn ranks say otherwise.
+
+    Args:
+        board (Board): The board to update.
+        castling (str): The castling rights field of a FEN string.
+
+    Raises:
+        ValueError: If the castling rights do not match the board.
+
+    """
+    if castling != "-" and not set(castling).issubset("KQkq"):
+        raise ValueError(f"Invalid castling rights: {castling!r}")
+
+    for rank, row in enumerate(board.state):
+        for piece in row:
+            if isinstance(piece, Pawn):
+                piece.moved = rank != (1 if piece.colour == Colour.WHITE else 6)
+
+            elif isinstance(piece, King | Rook):
+                piece.moved = True
+
+    for right in castling.replace("-", ""):
+        rank = 0 if right.isupper() else 7
+        colour = Colour.WHITE if right.isupper() else Colour.BLACK
+        king, rook = board.state[rank][4], board.state[rank][7 if right.lower() == "k" else 0]
+
+        if (
+            not isinstance(king, King)
+            or not isinstance(rook, Rook)
+            or king.colour != colour
+            or rook.colour != colour
+        ):
+            raise ValueError(f"Castling right {right!r} does not match the board.")
+
+        king.moved = rook.moved = False
+
+
+def _en_passant_pawn(board: Board, square: str, turn: Colour) -> Pawn:
+    """Finds the pawn that can be captured en passant.
+
+    Args:
+        board (Board): The board.
+        square (str): The en passant target square of a FEN string.
+        turn (Colour): The colour of the player to move.
+
+    Returns:
+        Pawn: The pawn that has just moved two squares.
+
+    Raises:
+        ValueError: If there is no such pawn.
+
+    """
+    target_rank = 5 if turn == Colour.WHITE else 2
+
+    if len(square) != 2 or square[0] not in "abcdefgh" or square[1] != str(target_rank + 1):
+        raise ValueError(f"Invalid en passant square: {square!r}")
+
+    rank = target_rank - 1 if turn == Colour.WHITE else target_rank + 1
+    pawn = board.state[rank]["abcdefgh".index(square[0])]
+
+    if not isinstance(pawn, Pawn) or pawn.colour == turn:
+        raise ValueError(f"No pawn to capture en passant on {square}.")
+
+    return pawn
+
+
+def _find_piece(board: Board, piece: Piece) -> Square | None:
+    """Finds the square of a piece object.
+
+    Args:
+        board (Board): The board.
+        piece (Piece): The piece to look for.
+
+    Returns:
+        Square | None: The square of the piece. None if it is not on the board.
+
+    """
+    for rank, row in enumerate(board.state):
+        for file_, square in enumerate(row):
+            if square is piece:
+                return rank, file_
+
+    return None
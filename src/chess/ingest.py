@@ -0,0 +1,196 @@
+"""This module ingests large PGN files in parallel.
+
+The file is memory mapped and split at game boundaries into byte ranges of
+about the same size. Every worker process maps the file itself, then parses
+and replays the games of its ranges. Only the results of the games and the
+statistics are sent back, never the text.
+
+Run `python -m chess.ingest FILE...` to replay PGN files on all cores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import mmap
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from chess.pgn import ReplayStats, read_games, replay_games
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from concurrent.futures import Future
+
+    from chess.pgn import PGNGame
+
+# a game starts with a tag after an empty line
+_GAME_START = re.compile(rb"\r?\n[ \t]*\r?\n(?=\[)")
+
+_CHUNK_SIZE = 2**22
+
+
+def game_ranges(path: str | Path, chunk_size: int = _CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Splits a PGN file at game boundaries into byte ranges.
+
+    A range ends at the first game that starts after chunk_size bytes, so
+    ranges are at least that long except for the last one. A game starts
+    with a tag line after an empty line, which a comment spanning empty
+    lines could fake.
+
+    Args:
+        path (str | Path): The path of the file.
+        chunk_size (int): The number of bytes of a range.
+
+    Returns:
+        list[tuple[int, int]]: The start and end offsets of the ranges,
+            covering the whole file.
+
+    """
+    with open(path, "rb") as file:
+        if not (size := os.fstat(file.fileno()).st_size):
+            return []
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as pgn:
+            ranges = []
+            start = 0
+
+            while start < size:
+                match = _GAME_START.search(pgn, start + chunk_size)
+                end = match.end() if match is not None else size
+                ranges.append((start, end))
+                start = end
+
+    return ranges
+
+
+def ingest[T](
+    path: str | Path,
+    function: Callable[[PGNGame, list[str]], T],
+    *,
+    workers: int | None = None,
+    chunk_size: int = _CHUNK_SIZE,
+    ordered: bool = True,
+    stats: ReplayStats | None = None,
+) -> Iterator[T]:
+    """Parses, replays and processes the games of a PGN file in parallel.
+
+    At most two ranges per worker are in flight, so the results of a huge
+    file never pile up in memory.
+
+    Args:
+        path (str | Path): The path of the file.
+        function (Callable[[PGNGame, list[str]], T]): Called in the workers
+            with every valid game and its moves in the notation of
+            Board.legal_moves. It has to be picklable, e.g. a module function.
+        workers (int | None): The number of processes. Defaults to the CPU count.
+        chunk_size (int): The number of bytes of the ranges handed to the workers.
+        ordered (bool): Whether the results come in the order of the file.
+            Otherwise they come as soon as their range is done.
+        stats (ReplayStats | None): Statistics to update as the ranges are done.
+
+    Yields:
+        T: The result of every valid game.
+
+    """
+    stats = stats if stats is not None else ReplayStats()
+    start = time.perf_counter() - stats.elapsed
+    ranges = iter(game_ranges(path, chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        task = partial(_ingest_range, path, function=function)
+        pending: deque[Future[tuple[list[T], ReplayStats]]] = deque()
+
+        while True:
+            while len(pending) < 2 * workers and (byte_range := next(ranges, None)):
+                pending.append(executor.submit(task, *byte_range))
+
+            if not pending:
+                break
+
+            if ordered:
+                future = pending.popleft()
+            else:
+                future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                pending.remove(future)
+
+            results, range_stats = future.result()
+            stats.games += range_stats.games
+            stats.errors += range_stats.errors
+            stats.positions += range_stats.positions
+            stats.elapsed = time.perf_counter() - start
+
+            yield from results
+
+
+def _ingest_range[T](
+    path: str | Path, start: int, end: int, function: Callable[[PGNGame, list[str]], T]
+) -> tuple[list[T], ReplayStats]:
+    """Parses, replays and processes the games of a byte range of a PGN file.
+
+    Args:
+        path (str | Path): The path of the file.
+        start (int): The offset of the first byte.
+        end (int): The offset after the last byte.
+        function (Callable[[PGNGame, list[str]], T]): The function to call
+            with every valid game and its moves.
+
+    Returns:
+        tuple[list[T], ReplayStats]: The results of the valid games and the
+            statistics of the range.
+
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as pgn:
+        text = pgn[start:end].decode("utf-8", errors="replace")
+
+    stats = ReplayStats()
+    results = [
+        function(game, moves) for game, moves in replay_games(read_games(io.StringIO(text)), stats)
+    ]
+
+    return results, stats
+
+
+def _nothing(game: PGNGame, moves: list[str]) -> None:
+    """Ignores a game, to only collect the statistics."""
+
+
+def main() -> None:
+    """Replays PGN files in parallel and reports the throughput and errors."""
+    parser = argparse.ArgumentParser(description="Replay PGN files on all cores.")
+    parser.add_argument("files", type=Path, nargs="+", help="PGN files")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    parser.add_argument(
+        "--chunk-size", type=int, default=_CHUNK_SIZE, help="bytes handed to a worker at once"
+    )
+    args = parser.parse_args()
+
+    stats = ReplayStats()
+    for path in args.files:
+        for _ in ingest(
+            path,
+            _nothing,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=False,
+            stats=stats,
+        ):
+            pass
+
+    print(
+        f"{stats.games} games, {stats.errors} with errors, {stats.positions} positions "
+        f"in {stats.elapsed:.1f} s: {stats.games_per_second:.0f} games/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
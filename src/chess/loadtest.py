@@ -0,0 +1,441 @@
+"""This module drives many simulated games to measure the throughput of the rules.
+
+The games are either random, every move drawn from the legal moves, or
+replayed from a PGN file. They are played in this process, where many
+games are kept going at once and take turns to move, or on a server of
+chess.server or chess.shards, from many concurrent connections.
+
+The time of every move is recorded in a histogram of the outcome of the
+move, e.g. 'success', 'check' or 'checkmate': in this process the time
+Chess.push takes, which checks the move and then whether it gives check
+or ends the game, and on a server the time until its reply arrives. The
+report is written as a line of JSON, so that runs can be compared:
+
+    {"target": "in-process", "games": 1000, "moves": 79456,
+     "elapsed_s": 12.3, "moves_per_second": 6459.8,
+     "latency_us": {"all": {"count": 79456, "mean": 154.2, "p50": 152.2,
+                            "p90": 215.3, "p99": 304.4, "max": 2040.1,
+                            "buckets": [[107.6, 5071], [128.0, 15007], ...]},
+                    "success": {...}, "check": {...}, ...}}
+
+A bucket gives its upper bound and its count. The bounds grow by a factor
+of 2 ** (1 / 4), so that a percentile is read to within about 19%.
+
+Run `python -m chess.loadtest --help` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from chess.chess_class import Chess
+from chess.fen import board_from_fen
+from chess.pgn import read_games, replay_games
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+_BUCKETS_PER_OCTAVE = 4
+_NS_PER_US = 1_000
+
+
+@dataclass(slots=True)
+class LoadGame:
+    """A game to play.
+
+    Attributes:
+        moves (list[str]): The moves in the notation of Board.legal_moves.
+        start_fen (str | None): The FEN of the position the game starts
+            from, None for the starting position.
+
+    """
+
+    moves: list[str]
+    start_fen: str | None = None
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Latencies counted in buckets on a logarithmic scale.
+
+    Attributes:
+        count (int): The number of latencies recorded.
+        total_ns (int): Their sum in nanoseconds.
+        max_ns (int): The largest one in nanoseconds.
+        buckets (dict[int, int]): The number of latencies in every bucket, by index.
+
+    """
+
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    buckets: dict[int, int] = field(default_factory=dict)
+
+    def record(self, latency_ns: int) -> None:
+        """Records a latency.
+
+        Args:
+            latency_ns (int): The latency in nanoseconds.
+
+        """
+        index = math.floor(math.log2(max(latency_ns, 1)) * _BUCKETS_PER_OCTAVE)
+
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ns += latency_ns
+        self.max_ns = max(self.max_ns, latency_ns)
+
+    def percentile(self, percent: float) -> float:
+        """The latency below which a percentage of the latencies fall.
+
+        Args:
+            percent (float): The percentage, from 0 to 100.
+
+        Returns:
+            float: The upper bound of the bucket of the latency in
+                nanoseconds, at most the largest latency. 0 if there are none.
+
+        """
+        rank, seen = math.ceil(self.count * percent / 100), 0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= max(rank, 1):
+                return min(_upper_bound(index), self.max_ns)
+
+        return 0.0
+
+    def to_dict(self) -> dict[str, object]:
+        """The statistics of the latencies in microseconds, for JSON."""
+        return {
+            "count": self.count,
+            "mean": round(self.total_ns / self.count / _NS_PER_US, 1) if self.count else 0.0,
+            **{
+                f"p{percent}": round(self.percentile(percent) / _NS_PER_US, 1)
+                for percent in (50, 90, 99)
+            },
+            "max": round(self.max_ns / _NS_PER_US, 1),
+            "buckets": [
+                [round(_upper_bound(index) / _NS_PER_US, 1), self.buckets[index]]
+                for index in sorted(self.buckets)
+            ],
+        }
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """The results of a load test.
+
+    Attributes:
+        target (str): Where the games were played, 'in-process' or the
+            address of the server.
+        games (int): The number of games played to the end of their moves.
+        moves (int): The number of moves played.
+        elapsed (float): The time spent in seconds.
+        latencies (dict[str, LatencyHistogram]): The latencies of the
+            moves, by outcome.
+
+    """
+
+    target: str
+    games: int = 0
+    moves: int = 0
+    elapsed: float = 0.0
+    latencies: dict[str, LatencyHistogram] = field(default_factory=dict)
+
+    def record(self, outcome: str, latency_ns: int) -> None:
+        """Records the latency of a move.
+
+        Args:
+            outcome (str): The outcome of the move, e.g. 'check'.
+            latency_ns (int): The latency in nanoseconds.
+
+        """
+        self.moves += 1
+
+        if (histogram := self.latencies.get(outcome)) is None:
+            histogram = self.latencies[outcome] = LatencyHistogram()
+        histogram.record(latency_ns)
+
+    def to_json(self) -> str:
+        """The report as JSON, the latencies of all the moves under 'all'."""
+        total = LatencyHistogram()
+        for histogram in self.latencies.values():
+            total.count += histogram.count
+            total.total_ns += histogram.total_ns
+            total.max_ns = max(total.max_ns, histogram.max_ns)
+            for index, count in histogram.buckets.items():
+                total.buckets[index] = total.buckets.get(index, 0) + count
+
+        return json.dumps(
+            {
+                "target": self.target,
+                "games": self.games,
+                "moves": self.moves,
+                "elapsed_s": round(self.elapsed, 3),
+                "moves_per_second": round(self.moves / self.elapsed, 1) if self.elapsed else 0.0,
+                "latency_us": {
+                    "all": total.to_dict(),
+                    **{
+                        outcome: histogram.to_dict()
+                        for outcome, histogram in sorted(self.latencies.items())
+                    },
+                },
+            }
+        )
+
+
+def random_games(count: int, plies: int, seed: int = 0) -> list[LoadGame]:
+    """Plays games of random legal moves.
+
+    Args:
+        count (int): The number of games.
+        plies (int): The number of plies of a game, fewer if it ends before.
+        seed (int): The seed of the moves.
+
+    Returns:
+        list[LoadGame]: The games.
+
+    """
+    rng, games = random.Random(seed), []
+
+    for _ in range(count):
+        game = Chess()
+
+        while game.ply < plies and not game.is_over:
+            game.push(rng.choice(game.legal_moves()))
+
+        games.append(LoadGame(game.move_history))
+
+    return games
+
+
+def pgn_games(path: str | Path, count: int | None = None) -> list[LoadGame]:
+    """Reads the valid games of a PGN file.
+
+    Args:
+        path (str | Path): The path of the file.
+        count (int | None): The maximum number of games, all of them if None.
+
+    Returns:
+        list[LoadGame]: The games.
+
+    """
+    games = []
+
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for game, moves in replay_games(read_games(file)):
+            games.append(LoadGame(moves, game.tags.get("FEN")))
+
+            if len(games) == count:
+                break
+
+    return games
+
+
+def run_in_process(games: list[LoadGame], concurrency: int = 100) -> LoadReport:
+    """Plays games in this process, `concurrency` games at once taking turns to move.
+
+    Args:
+        games (list[LoadGame]): The games.
+        concurrency (int): The number of games in progress at once.
+
+    Returns:
+        LoadReport: The results.
+
+    """
+    report = LoadReport("in-process")
+    waiting = iter(games)
+    playing = deque(_start(game) for game in _take(waiting, concurrency))
+
+    start = time.perf_counter()
+    while playing:
+        chess, moves = playing.popleft()
+
+        if (move := next(moves, None)) is None:
+            report.games += 1
+            playing.extend(_start(game) for game in _take(waiting, 1))
+            continue
+
+        move_start = time.perf_counter_ns()
+        result = chess.push(move)
+        report.record(str(result.outcome), time.perf_counter_ns() - move_start)
+
+        playing.append((chess, moves))
+
+    report.elapsed = time.perf_counter() - start
+
+    return report
+
+
+def _start(game: LoadGame) -> tuple[Chess, Iterator[str]]:
+    """Sets up a game to play."""
+    if game.start_fen is None:
+        return Chess(), iter(game.moves)
+
+    board, turn = board_from_fen(game.start_fen)
+
+    return Chess(board, turn=turn), iter(game.moves)
+
+
+def _take(games: Iterator[LoadGame], count: int) -> list[LoadGame]:
+    """Takes the next games to start."""
+    return [game for _, game in zip(range(count), games, strict=False)]
+
+
+async def run_against_server(
+    games: list[LoadGame],
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    concurrency: int = 100,
+    connections: int = 10,
+) -> LoadReport:
+    """Plays games on a server, `concurrency` games at once, both sides of each.
+
+    A game waits for the reply to a move before sending the next one. The
+    games starting from a FEN are skipped, as the server only starts games
+    from the starting position.
+
+    Args:
+        games (list[LoadGame]): The games.
+        host (str): The address of the server.
+        port (int): The port of the server.
+        concurrency (int): The number of games in progress at once.
+        connections (int): The number of connections the games are spread over.
+
+    Returns:
+        LoadReport: The results.
+
+    Raises:
+        RuntimeError: If the server refuses to create or join a game.
+
+    """
+    report = LoadReport(f"{host}:{port}")
+    clients = [_Connection(*await asyncio.open_connection(host, port)) for _ in range(connections)]
+    limit = asyncio.Semaphore(concurrency)
+    # the ids of the games of different runs differ, as games outlive their connections
+    run = uuid.uuid4().hex[:8]
+
+    async def play(index: int, game: LoadGame) -> None:
+        async with limit:
+            await _play_on_server(
+                clients[index % connections], f"load-{run}-{index}", game, report
+            )
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(play(index, game) for index, game in enumerate(games) if game.start_fen is None)
+        )
+
+    finally:
+        report.elapsed = time.perf_counter() - start
+        for client in clients:
+            await client.close()
+
+    return report
+
+
+class _Connection:
+    """A client connection matching the replies to the commands in order."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader, self._writer = reader, writer
+        self._pending: deque[asyncio.Future[str]] = deque()
+        self._task = asyncio.create_task(self._read())
+
+    async def request(self, command: str) -> str:
+        """Sends a command and waits for its reply."""
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._writer.write(f"{command}\n".encode())
+
+        return await future
+
+    async def close(self) -> None:
+        """Quits and waits for the server to close the connection."""
+        self._writer.write(b"quit\n")
+        await self._task
+        self._writer.close()
+
+    async def _read(self) -> None:
+        """Hands the replies to the commands waiting for them, skipping the events."""
+        while line := await self._reader.readline():
+            if not line.startswith((b"played", b"delta", b"snapshot")):
+                self._pending.popleft().set_result(line.decode())
+
+
+async def _play_on_server(
+    client: _Connection, game_id: str, game: LoadGame, report: LoadReport
+) -> None:
+    """Creates a game on a server, takes both of its seats and plays its moves."""
+    for command in (f"new {game_id}", f"join {game_id} white", f"join {game_id} black"):
+        if not (reply := await client.request(command)).startswith("ok"):
+            raise RuntimeError(f"The server refused {command!r}: {reply.strip()}")
+
+    for move in game.moves:
+        start = time.perf_counter_ns()
+        words = (await client.request(f"move {game_id} {move}")).split()
+        # the replies are 'ok GAME MOVE OUTCOME RESULT' and 'error GAME REASON'
+        report.record(words[3] if words[0] == "ok" else "failure", time.perf_counter_ns() - start)
+
+    report.games += 1
+
+
+def _upper_bound(index: int) -> float:
+    """The upper bound of a bucket in nanoseconds."""
+    return 2 ** ((index + 1) / _BUCKETS_PER_OCTAVE)
+
+
+def main() -> None:
+    """Runs a load test from the command line and prints its report."""
+    parser = argparse.ArgumentParser(description="Measure the throughput of simulated games.")
+    parser.add_argument("--pgn", help="PGN file of the games, random games if not given")
+    parser.add_argument("--games", type=int, default=1_000, help="number of games")
+    parser.add_argument("--plies", type=int, default=80, help="plies of a random game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random games")
+    parser.add_argument("--concurrency", type=int, default=100, help="games in progress at once")
+    parser.add_argument("--server", help="HOST:PORT of a server, in this process if not given")
+    parser.add_argument("--connections", type=int, default=10, help="connections to the server")
+    parser.add_argument("--output", help="file the JSON report is written to, else stdout")
+    args = parser.parse_args()
+
+    games = (
+        pgn_games(args.pgn, args.games)
+        if args.pgn
+        else random_games(args.games, args.plies, args.seed)
+    )
+
+    if args.server is None:
+        report = run_in_process(games, args.concurrency)
+    else:
+        host, _, port = args.server.rpartition(":")
+        report = asyncio.run(
+            run_against_server(games, host, int(port), args.concurrency, args.connections)
+        )
+
+    if args.output is None:
+        print(report.to_json())
+        return
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        file.write(report.to_json() + "\n")
+
+    print(
+        f"{report.moves} moves in {report.elapsed:.1f} s, report in {args.output}", file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""This module provides reading and writing of games in Portable Game Notation (PGN).
+
+Games are parsed one line at a time and replayed without any console I/O, so
+files of millions of games are processed in bounded memory.
+
+Run `python -m chess.pgn FILE...` to check PGN files and measure the throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import textwrap
+import time
+from copy import deepcopy
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import STARTING_FEN, board_from_fen, board_to_fen
+from chess.san import move_to_san, parse_san
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+    from typing import TextIO
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+# the tags every game has, in the order they are exported in
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+_DEFAULT_TAGS = {"Date": "????.??.??", "Result": "*"}
+
+# export format lines are at most 80 characters long
+_LINE_LENGTH = 80
+
+_TAG_PATTERN = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_ESCAPE_PATTERN = re.compile(r"\\(.)")
+# a comment can be left open at the end of the line, ';' comments run to its end
+_TOKEN_PATTERN = re.compile(r"\{[^}]*\}?|;.*|\$\d+|[()]|\d+\.+|[^\s(){};$]+")
+
+
+@dataclass(slots=True)
+class Line:
+    """A variation: moves with their annotations and sub-variations.
+
+    Attributes:
+        moves (list[str]): The moves in SAN.
+        comments (dict[int, str]): The comment after the move at each index,
+            -1 for a comment before the first move.
+        nags (dict[int, list[int]]): The Numeric Annotation Glyphs of the move
+            at each index, e.g. 1 for '!'.
+        variations (dict[int, list[Line]]): The alternatives to the move at each index.
+
+    """
+
+    moves: list[str] = field(default_factory=list)
+    comments: dict[int, str] = field(default_factory=dict)
+    nags: dict[int, list[int]] = field(default_factory=dict)
+    variations: dict[int, list[Line]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class PGNGame:
+    """A game read from a PGN file.
+
+    Attributes:
+        tags (dict[str, str]): The tag pairs, e.g. {'White': 'Carlsen, Magnus'}.
+        moves (list[str]): The moves of the main line in SAN.
+        result (str): The result token: '1-0', '0-1', '1/2-1/2' or '*'.
+        comments (dict[int, str]): The comment after the move at each index,
+            -1 for a comment before the first move.
+        nags (dict[int, list[int]]): The Numeric Annotation Glyphs of the move
+            at each index, e.g. 1 for '!'.
+        variations (dict[int, list[Line]]): The alternatives to the move at each index.
+
+    """
+
+    tags: dict[str, str] = field(default_factory=dict)
+    moves: list[str] = field(default_factory=list)
+    result: str = "*"
+    comments: dict[int, str] = field(default_factory=dict)
+    nags: dict[int, list[int]] = field(default_factory=dict)
+    variations: dict[int, list[Line]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    """Statistics of replaying games.
+
+    Attributes:
+        games (int): The number of games read.
+        errors (int): The number of games with an invalid FEN tag or move.
+        positions (int): The number of positions replayed in valid games.
+        elapsed (float): The time spent in seconds.
+
+    """
+
+    games: int = 0
+    errors: int = 0
+    positions: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """The number of games read per second."""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+
+def read_games(stream: Iterable[str]) -> Iterator[PGNGame]:
+    """Reads the games of a PGN file one at a time.
+
+    The text is parsed line by line, so only the game being read is held in
+    memory. A game is complete at its result token; a game without one ends
+    where the tags of the next game start.
+
+    Args:
+        stream (Iterable[str]): The lines of the PGN text, e.g. an open file.
+
+    Yields:
+        PGNGame: The games in the order of the file.
+
+    """
+    parser = _GameParser()
+
+    for line in stream:
+        yield from parser.feed(line)
+
+    if (game := parser.finish()) is not None:
+        yield game
+
+
+def replay(game: PGNGame) -> Iterator[tuple[Board, Colour, str]]:
+    """Replays the main line of a game without any console I/O.
+
+    Args:
+        game (PGNGame): The game. Games with a 'FEN' tag start from that position.
+
+    Yields:
+        tuple[Board, Colour, str]: The position before every move, the colour
+            of the player to move and the move in the notation of
+            Board.legal_moves. The same board is updated in place once the
+            next position is requested, so copy it to keep it.
+
+    Raises:
+        ValueError: If the FEN tag or a move is invalid.
+
+    """
+    board, turn = (
+        board_from_fen(game.tags["FEN"]) if "FEN" in game.tags else (Board(), Colour.WHITE)
+    )
+
+    for san in game.moves:
+        move = parse_san(board, san, turn)
+        yield board, turn, move
+
+        board.apply_move(move, turn)
+        turn = ~turn
+
+
+def replay_games(
+    games: Iterable[PGNGame], stats: ReplayStats | None = None
+) -> Iterator[tuple[PGNGame, list[str]]]:
+    """Replays games, skipping the ones with an invalid FEN tag or move.
+
+    Args:
+        games (Iterable[PGNGame]): The games, e.g. from read_games().
+        stats (ReplayStats | None): Statistics to update as the games are replayed.
+
+    Yields:
+        tuple[PGNGame, list[str]]: Every valid game with its moves in the
+            notation of Board.legal_moves.
+
+    """
+    stats = stats if stats is not None else ReplayStats()
+    start = time.perf_counter() - stats.elapsed
+
+    for game in games:
+        stats.games += 1
+
+        try:
+            moves = [move for _, _, move in replay(game)]
+
+        except ValueError:
+            stats.errors += 1
+            stats.elapsed = time.perf_counter() - start
+            continue
+
+        stats.positions += len(moves)
+        stats.elapsed = time.perf_counter() - start
+        yield game, moves
+
+
+class _GameParser:
+    """Builds games from the lines of a PGN file, one token at a time."""
+
+    def __init__(self) -> None:
+        self._game: PGNGame = PGNGame()
+        # the main line and the variations being read, innermost last
+        self._lines: list[PGNGame | Line] = [self._game]
+        # the parts of a comment that spans lines, None outside of one
+        self._comment: list[str] | None = None
+        self._started: bool = False
+
+    def feed(self, line: str) -> list[PGNGame]:
+        """Parses a line of the file.
+
+        Args:
+            line (str): The line.
+
+        Returns:
+            list[PGNGame]: The games the line completes.
+
+        """
+        if self._comment is not None:
+            if (end := line.find("}")) < 0:
+                self._comment.append(line)
+                return []
+
+            self._add_comment("".join(self._comment) + line[:end])
+            self._comment, line = None, line[end + 1 :]
+
+        elif line.startswith("%"):
+            return []
+
+        if (match := _TAG_PATTERN.fullmatch(line.strip())) is not None and len(self._lines) == 1:
+            # a tag after the movetext starts the next game
+            finished = [self._next_game()] if self._game.moves else []
+            self._game.tags[match[1]] = _ESCAPE_PATTERN.sub(r"\1", match[2])
+            self._started = True
+            return finished
+
+        return [game for token in _TOKEN_PATTERN.findall(line) if (game := self._token(token))]
+
+    def finish(self) -> PGNGame | None:
+        """Completes the last game at the end of the file.
+
+        Returns:
+            PGNGame | None: The game. None if the file ended after a complete game.
+
+        """
+        if self._comment is not None:
+            self._add_comment("".join(self._comment))
+            self._comment = None
+
+        return self._next_game() if self._started else None
+
+    def _token(self, token: str) -> PGNGame | None:
+        """Processes a token of the movetext, returning the game it completes."""
+        self._started = True
+        line = self._lines[-1]
+
+        if token[0] in "{;$":
+            self._annotation(token)
+
+        elif token == "(":
+            variation = Line()
+            line.variations.setdefault(len(line.moves) - 1, []).append(variation)
+            self._lines.append(variation)
+
+        elif token == ")":
+            if len(self._lines) > 1:
+                self._lines.pop()
+
+        elif token in RESULTS:
+            if len(self._lines) == 1:
+                self._game.result = token
+                return self._next_game()
+
+        elif token.startswith("0-0"):
+            # castling written with zeros, which are not a move number
+            line.moves.append(token.replace("0", "O"))
+
+        elif not token[0].isdigit():
+            line.moves.append(token)
+
+        return None
+
+    def _annotation(self, token: str) -> None:
+        """Processes a comment or a Numeric Annotation Glyph."""
+        if token[0] == "$":
+            line = self._lines[-1]
+            line.nags.setdefault(len(line.moves) - 1, []).append(int(token[1:]))
+
+        elif token[0] == ";":
+            self._add_comment(token[1:])
+
+        elif len(token) > 1 and token[-1] == "}":
+            self._add_comment(token[1:-1])
+
+        else:
+            self._comment = [token[1:]]
+
+    def _add_comment(self, text: str) -> None:
+        """Attaches a comment to the last move of the current line."""
+        line = self._lines[-1]
+        index = len(line.moves) - 1
+        text = " ".join(text.split())
+
+        line.comments[index] = f"{line.comments[index]} {text}" if index in line.comments else text
+
+    def _next_game(self) -> PGNGame:
+        """Completes the current game and starts the next one."""
+        game = self._game
+
+        if game.result == "*" and "Result" in game.tags:
+            game.result = game.tags["Result"]
+
+        self._game, self._lines, self._started = PGNGame(), [], False
+        self._lines.append(self._game)
+
+        return game
+
+
+class PGNWriter:
+    """Appends games to a PGN file through a write buffer.
+
+    The file is opened once, so thousands of games are written with a few
+    large writes instead of a file open per game.
+
+    Attributes:
+        games (int): The number of games written.
+
+    """
+
+    def __init__(self, path: str | Path, buffer_size: int = 2**16):
+        self._file: TextIO = open(path, "a", encoding="utf-8", buffering=buffer_size)  # noqa: SIM115
+        self.games: int = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write(self, game: PGNGame) -> None:
+        """Appends a game, followed by an empty line.
+
+        Args:
+            game (PGNGame): The game.
+
+        """
+        self._file.write(format_game(game) + "\n")
+        self.games += 1
+
+    def flush(self) -> None:
+        """Writes the buffered games to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Writes the buffered games and closes the file."""
+        self._file.close()
+
+
+def format_game(game: PGNGame) -> str:
+    """Formats a game in the PGN export format.
+
+    The Seven Tag Roster comes first, with '?' for unknown values, then the
+    other tags, the moves wrapped at 80 characters and the result.
+
+    Args:
+        game (PGNGame): The game.
+
+    Returns:
+        str: The game, ending with a newline.
+
+    """
+    tags = {name: _DEFAULT_TAGS.get(name, "?") for name in SEVEN_TAG_ROSTER} | game.tags
+    tags["Result"] = game.result
+    header = "".join(f'[{name} "{_escape(value)}"]\n' for name, value in tags.items())
+
+    fields = tags.get("FEN", STARTING_FEN).split()
+    move_number = int(fields[5]) if len(fields) > 5 else 1
+    black_first = len(fields) > 1 and fields[1] == "b"
+
+    tokens = []
+    for index, san in enumerate(game.moves):
+        if (ply := index + black_first) % 2 == 0:
+            tokens.append(f"{move_number + ply // 2}.")
+        elif index == 0:
+            tokens.append(f"{move_number}...")
+        tokens.append(san)
+    tokens.append(game.result)
+
+    return f"{header}\n{textwrap.fill(' '.join(tokens), _LINE_LENGTH)}\n"
+
+
+def game_from_moves(
+    moves: Iterable[str],
+    result: str = "*",
+    tags: dict[str, str] | None = None,
+    *,
+    board: Board | None = None,
+    turn: Colour = Colour.WHITE,
+) -> PGNGame:
+    """Builds a game from moves in the notation of Board.legal_moves.
+
+    Games that do not start from the starting position get the 'SetUp' and
+    'FEN' tags.
+
+    Args:
+        moves (Iterable[str]): The legal moves of the game.
+        result (str): The result token.
+        tags (dict[str, str] | None): The tags of the game.
+        board (Board | None): The starting position. It is not modified.
+            Defaults to the starting position.
+        turn (Colour): The colour of the player to move first.
+
+    Returns:
+        PGNGame: The game with its moves in SAN.
+
+    """
+    game = PGNGame(dict(tags or {}), result=result)
+    board = deepcopy(board) if board is not None else Board()
+
+    if (fen := board_to_fen(board, turn)) != STARTING_FEN:
+        game.tags |= {"SetUp": "1", "FEN": fen}
+
+    for move in moves:
+        game.moves.append(move_to_san(board, move, turn))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return game
+
+
+def _escape(value: str) -> str:
+    """Escapes backslashes and quotes in a tag value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def main() -> None:
+    """Replays the games of PGN files and reports the throughput and errors."""
+    parser = argparse.ArgumentParser(description="Check PGN files by replaying their games.")
+    parser.add_argument("files", type=Path, nargs="+", help="PGN files")
+    args = parser.parse_args()
+
+    stats = ReplayStats()
+    for path in args.files:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            for _ in replay_games(read_games(file), stats):
+                pass
+
+    print(
+        f"{stats.games} games, {stats.errors} with errors, {stats.positions} positions "
+        f"in {stats.elapsed:.1f} s: {stats.games_per_second:.0f} games/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""This module validates mate puzzles in batch.
+
+A puzzle is valid if it has exactly one first move that forces mate within
+the given number of moves. Puzzles are solved concurrently in a process pool.
+
+Puzzle files have one puzzle per line: a FEN string, optionally followed by
+';' and the number of moves to mate in. Empty lines and lines starting with
+'#' are skipped.
+
+Run it with `python -m chess.puzzles --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from chess.engine import MateSolver
+from chess.fen import board_from_fen
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+@dataclass(frozen=True, slots=True)
+class Puzzle:
+    """A mate puzzle.
+
+    Attributes:
+        fen (str): The position, with the attacker to move.
+        moves (int): The number of moves to mate in.
+        source (str): Where the puzzle comes from, e.g. 'puzzles.txt:12'.
+
+    """
+
+    fen: str
+    moves: int
+    source: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class PuzzleReport:
+    """The solutions of a puzzle.
+
+    Attributes:
+        puzzle (Puzzle): The puzzle.
+        solutions (dict[str, int]): The number of moves to mate after each
+            mating first move.
+        nodes (int): The number of positions searched.
+        error (str | None): Why the puzzle could not be solved, e.g. an invalid FEN.
+
+    """
+
+    puzzle: Puzzle
+    solutions: dict[str, int]
+    nodes: int
+    error: str | None = None
+
+    @property
+    def unique(self) -> bool:
+        """Whether exactly one first move forces mate."""
+        return len(self.solutions) == 1
+
+
+def load_puzzles(path: str | Path, default_moves: int = 2) -> list[Puzzle]:
+    """Loads puzzles from a file.
+
+    Args:
+        path (str | Path): The path of the file.
+        default_moves (int): The number of moves to mate in for puzzles
+            that do not give one.
+
+    Returns:
+        list[Puzzle]: The puzzles.
+
+    Raises:
+        ValueError: If the number of moves of a puzzle is not a number.
+
+    """
+    puzzles = []
+
+    with open(path) as file:
+        for line_number, line in enumerate(file, 1):
+            if not (line := line.strip()) or line.startswith("#"):
+                continue
+
+            fen, _, moves = line.partition(";")
+            if moves.strip() and not moves.strip().isdigit():
+                raise ValueError(f"{path}:{line_number}: invalid number of moves {moves!r}")
+
+            puzzles.append(
+                Puzzle(
+                    fen.strip(),
+                    int(moves) if moves.strip() else default_moves,
+                    f"{path}:{line_number}",
+                )
+            )
+
+    return puzzles
+
+
+def solve_puzzle(puzzle: Puzzle, *, checks_only: bool = True) -> PuzzleReport:
+    """Finds every first move that mates in a puzzle.
+
+    Args:
+        puzzle (Puzzle): The puzzle.
+        checks_only (bool): Whether the attacker only tries checking moves.
+
+    Returns:
+        PuzzleReport: The solutions of the puzzle.
+
+    """
+    try:
+        board, turn = board_from_fen(puzzle.fen)
+
+    except ValueError as error:
+        return PuzzleReport(puzzle, {}, 0, str(error))
+
+    solver = MateSolver(checks_only=checks_only)
+    solutions = solver.solve(board, turn, puzzle.moves)
+
+    return PuzzleReport(puzzle, solutions, solver.nodes)
+
+
+def validate_puzzles(
+    puzzles: Iterable[Puzzle], *, workers: int | None = None, checks_only: bool = True
+) -> Iterator[PuzzleReport]:
+    """Solves puzzles in parallel.
+
+    Args:
+        puzzles (Iterable[Puzzle]): The puzzles.
+        workers (int | None): The number of processes. Defaults to the CPU count.
+        checks_only (bool): Whether the attacker only tries checking moves.
+
+    Yields:
+        PuzzleReport: The report of every puzzle, in the order of the puzzles.
+
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(partial(solve_puzzle, checks_only=checks_only), puzzles)
+
+
+def main() -> None:
+    """Validates puzzle files from the command line."""
+    parser = argparse.ArgumentParser(description="Mate puzzle validation.")
+    parser.add_argument("files", type=Path, nargs="+", help="puzzle files")
+    parser.add_argument("--moves", type=int, default=2, help="default number of moves to mate")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    parser.add_argument(
+        "--all-moves", action="store_true", help="let the attacker try quiet moves too"
+    )
+    args = parser.parse_args()
+
+    puzzles = [puzzle for path in args.files for puzzle in load_puzzles(path, args.moves)]
+    invalid = 0
+
+    for report in validate_puzzles(puzzles, workers=args.workers, checks_only=not args.all_moves):
+        invalid += not report.unique
+        print(json.dumps(asdict(report) | {"unique": report.unique}))
+
+    print(
+        f"{len(puzzles) - invalid}/{len(puzzles)} puzzles have a unique solution", file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
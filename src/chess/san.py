@@ -0,0 +1,47 @@
+"""This module provides conversion of moves in Standard Algebraic Notation (SAN).
+
+The conversion itself lives on the Board, see Board.parse_san and Board.san.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from chess.board import Board
+    from chess.colour_and_aliases import Colour
+
+
+def parse_san(board: Board, san: str, turn: Colour) -> str:
+    """Converts a move in SAN to the notation of Board.legal_moves.
+
+    Check and annotation suffixes such as '+', '#', '!?' and 'e.p.' are ignored.
+
+    Args:
+        board (Board): The position the move is played in.
+        san (str): The move in SAN, e.g. 'Nbd7', 'exd6' or 'e8=Q+'.
+        turn (Colour): The colour of the player making the move.
+
+    Returns:
+        str: The move, e.g. 'b8d7'.
+
+    Raises:
+        ValueError: If the move is invalid, illegal or ambiguous.
+
+    """
+    return board.parse_san(san, turn)
+
+
+def move_to_san(board: Board, move: str, turn: Colour) -> str:
+    """Converts a legal move in the notation of Board.legal_moves to SAN.
+
+    Args:
+        board (Board): The position the move is played in. It is left unchanged.
+        move (str): The move, e.g. 'g1f3'.
+        turn (Colour): The colour of the player making the move.
+
+    Returns:
+        str: The move in SAN with a check or mate suffix, e.g. 'Nf3+'.
+
+    """
+    return board.san(move, turn)
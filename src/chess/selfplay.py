@@ -0,0 +1,380 @@
+"""This module generates training data for a neural network engine by self-play.
+
+Every worker process plays games against itself and records one sample per
+searched position: the encoded position, the move the search chose as the
+policy target and the result of the game from the point of view of the player
+to move. Samples are streamed into fixed-size `.npy` shards through memory
+maps, so memory use does not grow with the amount of data.
+
+Each worker keeps a small JSON manifest next to its shards, updated after
+every game. Running the generation again with the same output directory
+resumes where it stopped. Requires NumPy, installed with the 'nn' extra.
+
+Run it with `python -m chess.selfplay --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine import Searcher, SearchLimits
+from chess.engine.encoding import ENCODED_SIZE, encode_castling, encode_position, move_index
+from chess.tournament import Adjudication, GameResult, GameState
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import NDArray
+
+SAMPLE_DTYPE = np.dtype(
+    [
+        ("planes", np.uint8, (ENCODED_SIZE,)),
+        ("castling", np.uint8),
+        ("policy", np.uint16),
+        ("result", np.int8),
+    ]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SelfPlayConfig:
+    """Settings of a self-play run.
+
+    Attributes:
+        output (Path): The directory to write shards and manifests to.
+        games_per_worker (int): The number of games every worker plays in total,
+            including games played by earlier runs.
+        limits (SearchLimits): The limits of every search.
+        random_plies (int): The number of random plies at the start of every
+            game, so that games differ. These plies are not recorded.
+        shard_size (int): The number of samples per shard.
+        hash_size (int): The size of the transposition table in megabytes.
+        seed (int): The seed of the random openings.
+        adjudication (Adjudication): The rules to end games early.
+
+    """
+
+    output: Path
+    games_per_worker: int = 100
+    limits: SearchLimits = field(default_factory=lambda: SearchLimits(depth=1))
+    random_plies: int = 8
+    shard_size: int = 2**16
+    hash_size: int = 16
+    seed: int = 0
+    adjudication: Adjudication = field(default_factory=Adjudication)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerStats:
+    """Statistics of a worker in a self-play run.
+
+    Attributes:
+        worker_id (int): The number of the worker.
+        games (int): The number of games played in this run.
+        positions (int): The number of samples written in this run.
+        elapsed (float): The time the worker took in seconds.
+
+    """
+
+    worker_id: int
+    games: int
+    positions: int
+    elapsed: float
+
+    @property
+    def positions_per_second(self) -> float:
+        """The number of samples written per second."""
+        return self.positions / self.elapsed if self.elapsed else 0.0
+
+
+class ShardWriter:
+    """Streams samples into fixed-size `.npy` shards of a single writer.
+
+    Shards are named '<prefix>-<index>.npy'. The manifest '<prefix>.json'
+    records the current shard, how much of it is filled and the totals. It is
+    only updated by commit(), so samples written after the last commit are
+    overwritten when a writer resumes.
+
+    Attributes:
+        directory (Path): The directory of the shards.
+        prefix (str): The prefix of the file names of the writer.
+        shard_size (int): The number of samples per shard.
+        games (int): The number of committed games.
+        positions (int): The number of committed samples.
+
+    """
+
+    def __init__(self, directory: str | Path, prefix: str, shard_size: int = 2**16):
+        self.directory: Path = Path(directory)
+        self.prefix: str = prefix
+        self.shard_size: int = shard_size
+        self.games: int = 0
+        self.positions: int = 0
+        self._shard_index: int = 0
+        self._filled: int = 0
+        self._shard: np.memmap | None = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if (manifest := self._manifest_path()).exists():
+            state = json.loads(manifest.read_text())
+            self.shard_size = state["shard_size"]
+            self.games, self.positions = state["games"], state["positions"]
+            self._shard_index, self._filled = state["shard"], state["filled"]
+
+    def write(self, samples: NDArray[np.void]) -> None:
+        """Appends samples, starting a new shard whenever the current one is full.
+
+        Args:
+            samples (NDArray[np.void]): The samples, of SAMPLE_DTYPE.
+
+        """
+        written = 0
+
+        while written < len(samples):
+            shard = self._current_shard()
+            count = min(len(samples) - written, self.shard_size - self._filled)
+
+            shard[self._filled : self._filled + count] = samples[written : written + count]
+            self._filled += count
+            self.positions += count
+            written += count
+
+            if self._filled == self.shard_size:
+                shard.flush()
+                self._shard, self._shard_index, self._filled = None, self._shard_index + 1, 0
+
+    def commit(self, games: int = 1) -> None:
+        """Flushes the written samples and records them in the manifest.
+
+        Args:
+            games (int): The number of games the samples since the last commit
+                belong to.
+
+        """
+        if self._shard is not None:
+            self._shard.flush()
+
+        self.games += games
+        state = {
+            "shard_size": self.shard_size,
+            "shard": self._shard_index,
+            "filled": self._filled,
+            "games": self.games,
+            "positions": self.positions,
+        }
+
+        # replace the manifest atomically, so a crash never leaves a broken one
+        temporary = self._manifest_path().with_suffix(".tmp")
+        temporary.write_text(json.dumps(state))
+        os.replace(temporary, self._manifest_path())
+
+    def close(self) -> None:
+        """Flushes and closes the current shard."""
+        if self._shard is not None:
+            self._shard.flush()
+            self._shard = None
+
+    def _current_shard(self) -> np.memmap:
+        """Opens the current shard, creating it if needed."""
+        if self._shard is not None:
+            return self._shard
+
+        path = self.directory / f"{self.prefix}-{self._shard_index:05}.npy"
+
+        if path.exists():
+            self._shard = np.load(path, mmap_mode="r+")
+        else:
+            self._shard = np.lib.format.open_memmap(
+                path, mode="w+", dtype=SAMPLE_DTYPE, shape=(self.shard_size,)
+            )
+
+        return self._shard
+
+    def _manifest_path(self) -> Path:
+        return self.directory / f"{self.prefix}.json"
+
+
+def load_samples(directory: str | Path) -> Iterator[NDArray[np.void]]:
+    """Reads the committed samples of all writers in a directory.
+
+    Shards are memory mapped read-only, so they are not loaded into memory.
+
+    Args:
+        directory (str | Path): The directory of the shards.
+
+    Yields:
+        NDArray[np.void]: The committed samples of a shard, of SAMPLE_DTYPE.
+
+    """
+    for manifest in sorted(Path(directory).glob("*.json")):
+        state = json.loads(manifest.read_text())
+
+        for index in range(state["shard"] + 1):
+            path = manifest.with_name(f"{manifest.stem}-{index:05}.npy")
+            count = state["filled"] if index == state["shard"] else state["shard_size"]
+
+            if count and path.exists():
+                yield np.load(path, mmap_mode="r")[:count]
+
+
+def generate_selfplay(config: SelfPlayConfig, workers: int | None = None) -> list[WorkerStats]:
+    """Generates self-play training data in parallel.
+
+    Every worker writes its own shards and plays up to config.games_per_worker
+    games, counting the games committed by earlier runs.
+
+    Args:
+        config (SelfPlayConfig): The settings of the run.
+        workers (int | None): The number of processes. Defaults to the CPU count.
+
+    Returns:
+        list[WorkerStats]: The statistics of every worker.
+
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_worker, [config] * workers, range(workers)))
+
+
+def run_worker(config: SelfPlayConfig, worker_id: int) -> WorkerStats:
+    """Plays self-play games and writes their samples to the worker's shards.
+
+    Args:
+        config (SelfPlayConfig): The settings of the run.
+        worker_id (int): The number of the worker.
+
+    Returns:
+        WorkerStats: The statistics of the worker.
+
+    """
+    writer = ShardWriter(config.output, f"worker{worker_id:03}", config.shard_size)
+    searcher = Searcher(hash_size=config.hash_size)
+    start, first_game, positions = time.monotonic(), writer.games, writer.positions
+
+    try:
+        for game_number in range(writer.games, config.games_per_worker):
+            # the seed depends only on the game, so a resumed run plays the same games
+            rng = random.Random(f"{config.seed}-{worker_id}-{game_number}")
+            writer.write(play_selfplay_game(config, searcher, rng))
+            writer.commit()
+            searcher.clear_hash()
+
+    finally:
+        writer.close()
+
+    return WorkerStats(
+        worker_id,
+        writer.games - first_game,
+        writer.positions - positions,
+        time.monotonic() - start,
+    )
+
+
+def play_selfplay_game(
+    config: SelfPlayConfig, searcher: Searcher, rng: random.Random
+) -> NDArray[np.void]:
+    """Plays a self-play game.
+
+    Args:
+        config (SelfPlayConfig): The settings of the run.
+        searcher (Searcher): The search to choose moves with.
+        rng (random.Random): The source of the random opening plies.
+
+    Returns:
+        NDArray[np.void]: A sample for every searched position, of SAMPLE_DTYPE.
+
+    """
+    game = GameState(Board(), Colour.WHITE, config.adjudication)
+    samples = []
+    turns = []
+
+    while (outcome := game.draw_by_rule() or game.known_result()) is None:
+        if len(game.moves) < config.random_plies:
+            if not (moves := game.board.legal_moves(game.turn)):
+                outcome = game.no_legal_moves()
+                break
+
+            game.play(rng.choice(moves))
+            continue
+
+        search = searcher.search(game.board, game.turn, config.limits)
+
+        if search.best_move is None:
+            outcome = game.no_legal_moves()
+            break
+
+        samples.append(
+            (
+                encode_position(game.board, game.turn),
+                encode_castling(game.board, game.turn),
+                move_index(search.best_move, game.turn),
+                0,
+            )
+        )
+        turns.append(game.turn)
+
+        if (outcome := game.adjudicate(search.score)) is not None:
+            break
+
+        game.play(search.best_move)
+
+    records = np.array(samples, dtype=SAMPLE_DTYPE)
+    records["result"] = [_result_for(outcome[0], turn) for turn in turns]
+
+    return records
+
+
+def _result_for(result: GameResult, colour: Colour) -> int:
+    """The result of a game for a player: 1 for a win, 0 for a draw, -1 for a loss."""
+    if result == GameResult.DRAW:
+        return 0
+
+    winner = Colour.WHITE if result == GameResult.WHITE_WINS else Colour.BLACK
+    return 1 if winner == colour else -1
+
+
+def main() -> None:
+    """Generates self-play data from the command line."""
+    parser = argparse.ArgumentParser(description="Self-play training data generation.")
+    parser.add_argument("output", type=Path, help="directory for shards and manifests")
+    parser.add_argument("--games", type=int, default=100, help="games per worker")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--movetime", type=float, default=None, help="seconds per move")
+    parser.add_argument("--random-plies", type=int, default=8)
+    parser.add_argument("--shard-size", type=int, default=2**16, help="samples per shard")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = SelfPlayConfig(
+        args.output,
+        games_per_worker=args.games,
+        limits=SearchLimits(depth=args.depth, movetime=args.movetime),
+        random_plies=args.random_plies,
+        shard_size=args.shard_size,
+        seed=args.seed,
+    )
+
+    for stats in generate_selfplay(config, args.workers):
+        print(
+            f"Worker {stats.worker_id}: {stats.games} games, {stats.positions} positions,"
+            f" {stats.positions_per_second:.1f} positions/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
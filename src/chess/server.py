@@ -0,0 +1,489 @@
+"""This module hosts many games at once over a local TCP line protocol.
+
+Clients send one command per line and get one reply per command, a line
+starting with 'ok' or 'error' followed by the game id. The players of a
+game are also sent a 'played' line for every move of the game:
+
+    new GAME [TIME [MODE]]
+                          creates a game, timed if given a time control,
+                          e.g. '300+2', with a 'fischer', 'bronstein' or
+                          'delay' increment
+    join GAME COLOUR      takes the seat of 'white' or 'black'
+    move GAME MOVE        plays a move for the seat of the player to move
+    resign GAME           resigns for the seat of the player to move
+    state GAME            replies with the FEN, the status and the result
+    watch GAME            replies with the ply, the FEN, the status and the
+                          result, then sends the moves of the game as
+                          board diffs, see chess.broadcast
+    unwatch GAME          stops sending the moves of the game
+    quit                  closes the connection
+
+    ok GAME MOVE OUTCOME RESULT       the reply to a move
+    played GAME MOVE OUTCOME RESULT   a move played by a player of the game
+    played GAME flag STATUS RESULT    the time of the player to move ran out
+    delta GAME PLY SQUARES STATUS RESULT
+                                      a change of a watched game
+    snapshot GAME PLY FEN STATUS RESULT
+                                      a watched game, once a slow spectator
+                                      caught up with it
+    error GAME REASON                 e.g. 'error g1 not your turn'
+
+A connection may hold any number of seats, both seats of a game included.
+The moves are checked in a worker thread, so that an expensive check, e.g.
+whether the move mates, never holds up the other games. The games may be
+kept in a chess.sessions.SessionStore, which moves the idle ones to disk.
+The flag-falls of all the timed games are found by a single task waiting
+for the earliest deadline of a chess.clock.FlagScheduler.
+
+Run `python -m chess.server --help` to start a server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import TYPE_CHECKING, Protocol, Self
+
+from chess.broadcast import (
+    CATCH_UP_INTERVAL,
+    Broadcaster,
+    changed_squares,
+    describe,
+    encode_delta,
+    encode_snapshot,
+)
+from chess.chess_class import Chess
+from chess.clock import ChessClock, FlagScheduler, IncrementMode, TimeControl
+from chess.colour_and_aliases import Colour
+from chess.fen import board_to_fen
+from chess.sessions import SessionStore
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, MutableMapping
+    from types import TracebackType
+
+    from chess.chess_class import MoveResult
+    from chess.colour_and_aliases import Square
+
+_HOST = "127.0.0.1"
+_PORT = 8765
+_NS_PER_SECOND = 1_000_000_000
+
+
+class Client(Protocol):
+    """Where the replies and the events of a client go, e.g. its asyncio.StreamWriter."""
+
+    @property
+    def transport(self) -> asyncio.WriteTransport:
+        """The transport of the lines, whose buffer tells how far behind the client is."""
+
+    def write(self, data: bytes, /) -> None:
+        """Sends lines to the client."""
+
+
+class GameServer:
+    """Hosts games keyed by their id for the clients of a TCP server.
+
+    Moves are checked in `workers` threads, or on the event loop if it is 0,
+    which is faster as long as no check is slow. More than one thread only
+    helps the latency of the other games, as the checks hold the GIL.
+
+    The games are kept in `store`, e.g. a SessionStore, or in a dict if it
+    is None. Only the seats of the games are kept apart from it. A game is
+    neither read nor changed while a move of it is checked: the commands on
+    it are rejected with 'move pending' until the move is done.
+
+    """
+
+    def __init__(self, workers: int = 1, store: MutableMapping[str, Chess] | None = None):
+        self._games: MutableMapping[str, Chess] = {} if store is None else store
+        # the connections holding the seats of a game, by game id
+        self._game_seats: dict[str, dict[Colour, Client]] = {}
+        self._client_seats: dict[Client, list[tuple[str, Colour]]] = {}
+        # the games with a move being checked
+        self._busy: set[str] = set()
+        # the deadlines of the running clocks, and an event set on an earlier one
+        self._flags: FlagScheduler[str] = FlagScheduler()
+        self._rescheduled = asyncio.Event()
+        self._flag_task: asyncio.Task[None] | None = None
+        self._catch_up_task: asyncio.Task[None] | None = None
+        self._executor = ThreadPoolExecutor(workers) if workers else None
+        self._spectators = Broadcaster()
+        self._commands: dict[str, Callable[[Client, list[str]], Awaitable[str]]] = {
+            "new": self._new,
+            "join": self._join,
+            "move": self._move,
+            "resign": self._resign,
+            "state": self._state,
+            "watch": self._watch,
+            "unwatch": self._unwatch,
+        }
+
+    @property
+    def games(self) -> MutableMapping[str, Chess]:
+        """The games by id."""
+        return self._games
+
+    async def __aenter__(self) -> Self:
+        self._start_tasks()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    async def start(self, host: str = _HOST, port: int = _PORT) -> asyncio.Server:
+        """Starts listening for clients.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+
+        Returns:
+            asyncio.Server: The TCP server, e.g. to find its port or close it.
+
+        """
+        self._start_tasks()
+
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves the commands of a client until it quits or disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The stream of the commands.
+            writer (asyncio.StreamWriter): The stream of the replies.
+
+        """
+        try:
+            while line := await reader.readline():
+                if (words := line.decode().split()) == ["quit"]:
+                    break
+
+                writer.write(f"{await self.execute(writer, words)}\n".encode())
+                await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            self.disconnect(writer)
+            writer.close()
+
+    async def execute(self, client: Client, words: list[str]) -> str:
+        """Runs a command.
+
+        Args:
+            client (Client): The client, e.g. the stream of its connection,
+                which holds the seats it joined.
+            words (list[str]): The command and its arguments.
+
+        Returns:
+            str: The reply.
+
+        """
+        if not words or (command := self._commands.get(words[0])) is None:
+            return "error - unknown command"
+
+        if len(words) < 2:
+            return "error - no game"
+
+        return await command(client, words[1:])
+
+    def disconnect(self, client: Client) -> None:
+        """Frees the seats of a client that left, so that they can be joined again.
+
+        Args:
+            client (Client): The client.
+
+        """
+        for game_id, colour in self._client_seats.pop(client, []):
+            seats = self._game_seats.get(game_id, {})
+            if seats.get(colour) is client:
+                del seats[colour]
+
+            if not seats:
+                self._game_seats.pop(game_id, None)
+
+        self._spectators.unsubscribe_all(client)
+
+    def close(self) -> None:
+        """Stops the worker threads, the flag-fall checks and the resyncs of slow spectators."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+        for task in (self._flag_task, self._catch_up_task):
+            if task is not None:
+                task.cancel()
+
+    async def _new(self, _client: Client, args: list[str]) -> str:
+        """Creates a game."""
+        if (game_id := args[0]) in self._games:
+            return f"error {game_id} game exists"
+
+        clock = None
+        if len(args) > 1:
+            try:
+                mode = IncrementMode(args[2]) if len(args) > 2 else IncrementMode.FISCHER
+                clock = ChessClock(TimeControl.parse(args[1], mode))
+
+            except ValueError:
+                return f"error {game_id} invalid time control"
+
+        self._games[game_id] = Chess(clock=clock)
+
+        return f"ok {game_id}"
+
+    async def _join(self, client: Client, args: list[str]) -> str:
+        """Takes a seat in a game."""
+        if (game_id := args[0]) not in self._games:
+            return f"error {game_id} unknown game"
+
+        if len(args) < 2 or args[1] not in {Colour.WHITE, Colour.BLACK}:
+            return f"error {game_id} unknown colour"
+
+        seats = self._game_seats.setdefault(game_id, {})
+        if (colour := Colour(args[1])) in seats:
+            return f"error {game_id} seat taken"
+
+        seats[colour] = client
+        self._client_seats.setdefault(client, []).append((game_id, colour))
+
+        return f"ok {game_id} {colour.value}"
+
+    async def _move(self, client: Client, args: list[str]) -> str:
+        """Plays a move and sends it to the players of the game."""
+        if (error := self._seat_error(client, args[0])) is not None:
+            return error
+
+        if len(args) < 2:
+            return f"error {args[0]} no move"
+
+        chess = self._games[game_id := args[0]]
+        self._busy.add(game_id)
+        try:
+            result = await self._push(chess, args[1])
+
+        finally:
+            self._busy.discard(game_id)
+
+        # the store may have evicted the game while the move was checked
+        self._games[game_id] = chess
+        self._schedule(game_id, chess)
+
+        if result.rejection is not None:
+            return f"error {game_id} {result.rejection.error}"
+
+        event = f"{game_id} {result.move} {result.outcome} {chess.result}"
+        self._broadcast(client, game_id, event)
+        if chess.last_move is not None:
+            self._publish(game_id, chess, changed_squares(chess.last_move))
+
+        return f"ok {event}"
+
+    async def _resign(self, client: Client, args: list[str]) -> str:
+        """Resigns a game for the player to move."""
+        if (error := self._seat_error(client, args[0])) is not None:
+            return error
+
+        chess = self._games[game_id := args[0]]
+        chess.resign()
+        self._games[game_id] = chess
+        self._schedule(game_id, chess)
+
+        event = f"{game_id} resign {chess.status} {chess.result}"
+        self._broadcast(client, game_id, event)
+        self._publish(game_id, chess, [])
+
+        return f"ok {event}"
+
+    async def _state(self, _client: Client, args: list[str]) -> str:
+        """Describes a game."""
+        if (game_id := args[0]) in self._busy:
+            return f"error {game_id} move pending"
+
+        if (chess := self._games.get(game_id)) is None:
+            return f"error {game_id} unknown game"
+
+        self._check_time(game_id, chess)
+        fen = board_to_fen(chess.board, chess.turn, fullmove_number=chess.move_number)
+        reply = f"ok {game_id} {fen} {chess.status.replace(' ', '-')} {chess.result}"
+
+        if chess.clock is not None:
+            reply += "".join(
+                f" {max(chess.clock.remaining(colour), 0) // 1_000_000}" for colour in Colour
+            )
+
+        return reply
+
+    def _start_tasks(self) -> None:
+        """Starts the flag-fall checks and the resyncs of slow spectators, unless they run."""
+        if self._flag_task is None:
+            self._flag_task = asyncio.create_task(self._watch_flags())
+
+        if self._catch_up_task is None:
+            self._catch_up_task = asyncio.create_task(self._catch_up())
+
+    async def _watch(self, client: Client, args: list[str]) -> str:
+        """Sends the moves of a game to a spectator, replying with its snapshot."""
+        if (game_id := args[0]) in self._busy:
+            return f"error {game_id} move pending"
+
+        if (chess := self._games.get(game_id)) is None:
+            return f"error {game_id} unknown game"
+
+        self._check_time(game_id, chess)
+        self._spectators.subscribe(game_id, client)
+
+        return f"ok {describe(game_id, chess)}"
+
+    async def _unwatch(self, client: Client, args: list[str]) -> str:
+        """Stops sending the moves of a game to a spectator."""
+        self._spectators.unsubscribe(game_id := args[0], client)
+
+        return f"ok {game_id}"
+
+    def _seat_error(self, client: Client, game_id: str) -> str | None:
+        """Checks that a client holds the seat of the player to move in a game."""
+        # the game is changed by the move being checked, and may not be read before it is done
+        if game_id in self._busy:
+            return f"error {game_id} move pending"
+
+        if (chess := self._games.get(game_id)) is None:
+            return f"error {game_id} unknown game"
+
+        self._check_time(game_id, chess)
+        if chess.is_over:
+            return f"error {game_id} game over"
+
+        if self._game_seats.get(game_id, {}).get(chess.turn) is not client:
+            return f"error {game_id} not your turn"
+
+        return None
+
+    def _broadcast(self, client: Client | None, game_id: str, event: str) -> None:
+        """Sends an event of a game to its players but the client who caused it, if any."""
+        for seat in set(self._game_seats.get(game_id, {}).values()) - {client}:
+            seat.write(f"played {event}\n".encode())
+
+    def _publish(self, game_id: str, chess: Chess, squares: list[Square]) -> None:
+        """Sends the squares a change of a game changed to its spectators."""
+        self._spectators.publish(
+            game_id, encode_delta(game_id, chess, squares), lambda: encode_snapshot(game_id, chess)
+        )
+
+    def _check_time(self, game_id: str, chess: Chess) -> None:
+        """Ends a game if the time of the player to move ran out, and tells its players."""
+        if chess.check_time():
+            self._games[game_id] = chess
+            self._broadcast(
+                None, game_id, f"{game_id} flag {chess.status.replace(' ', '-')} {chess.result}"
+            )
+            self._publish(game_id, chess, [])
+
+    def _schedule(self, game_id: str, chess: Chess) -> None:
+        """Schedules the flag-fall of a game, waking up the checks if it comes first."""
+        if chess.clock is None:
+            return
+
+        deadline, earliest = chess.clock.deadline_ns(), self._flags.next_deadline()
+        if deadline is not None and (earliest is None or deadline < earliest):
+            self._rescheduled.set()
+
+        self._flags.schedule(game_id, deadline)
+
+    async def _watch_flags(self) -> None:
+        """Ends the games whose time ran out, as soon as it does."""
+        while True:
+            timeout = None
+            if (deadline := self._flags.next_deadline()) is not None:
+                timeout = max(deadline - time.monotonic_ns(), 0) / _NS_PER_SECOND
+
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._rescheduled.wait(), timeout)
+            self._rescheduled.clear()
+
+            for game_id in self._flags.pop_due(time.monotonic_ns()):
+                # a game with a move being checked is scheduled again after it
+                if game_id in self._busy or (chess := self._games.get(game_id)) is None:
+                    continue
+
+                self._check_time(game_id, chess)
+                self._schedule(game_id, chess)
+
+    async def _catch_up(self) -> None:
+        """Sends a snapshot to the slow spectators that caught up, however idle their games."""
+        while True:
+            await asyncio.sleep(CATCH_UP_INTERVAL)
+            self._spectators.catch_up(self._snapshot)
+
+    def _snapshot(self, game_id: str) -> bytes | None:
+        """Encodes the snapshot of a game, None while a move of it is checked."""
+        if game_id in self._busy or (chess := self._games.get(game_id)) is None:
+            return None
+
+        return encode_snapshot(game_id, chess)
+
+    async def _push(self, chess: Chess, move: str) -> MoveResult:
+        """Plays a move in the worker threads, or on the loop if there are none."""
+        if self._executor is None:
+            return chess.push(move)
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, chess.push, move)
+
+
+async def serve(
+    host: str = _HOST,
+    port: int = _PORT,
+    workers: int = 1,
+    store: MutableMapping[str, Chess] | None = None,
+) -> None:
+    """Hosts games until cancelled.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        workers (int): The number of threads checking moves.
+        store (MutableMapping[str, Chess] | None): Where the games are kept,
+            a dict if None.
+
+    """
+    async with GameServer(workers, store) as games:
+        server = await games.start(host, port)
+
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    """Hosts games from the command line."""
+    parser = argparse.ArgumentParser(description="Host games over a local TCP line protocol.")
+    parser.add_argument("--host", default=_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=_PORT, help="port to listen on")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="threads checking moves, 0 for none"
+    )
+    parser.add_argument("--store", help="database the idle games are moved to")
+    parser.add_argument(
+        "--capacity", type=int, default=10_000, help="games kept in memory with --store"
+    )
+    args = parser.parse_args()
+
+    if args.store is None:
+        with suppress(KeyboardInterrupt):
+            asyncio.run(serve(args.host, args.port, args.workers))
+        return
+
+    with SessionStore(args.store, args.capacity) as store, suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.host, args.port, args.workers, store))
+
+
+if __name__ == "__main__":
+    main()
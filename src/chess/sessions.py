@@ -0,0 +1,254 @@
+"""This module keeps the most recently used games in memory and the others on disk.
+
+Games are kept in least recently used order. Once more than `capacity`
+games are in memory, the least recently used one is written to a dbm
+database and dropped, so an idle game takes no memory at all. It is read
+back the next time it is asked for, e.g. when a player makes a move.
+
+A stored game is a 7-byte header with the format version, the status,
+the number of moves played and whether the game is timed, then its clocks
+if it is, then the moves of its line, taken back ones included, as an
+archive record, see chess.archive. The game is restored by replaying the
+moves without checking them, so that they can be taken back again.
+
+The monotonic time of a clock means nothing to another process, so a
+running clock is stored with the wall time it was stored at and the time
+its player had spent on the move, and goes on from there once restored.
+"""
+
+from __future__ import annotations
+
+import dbm
+import struct
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Self
+
+from chess.archive import pack_game, unpack_game
+from chess.chess_class import Chess, GameStatus
+from chess.clock import ChessClock, IncrementMode, TimeControl
+from chess.colour_and_aliases import Colour
+from chess.fen import STARTING_FEN
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import TracebackType
+
+    from chess.tablebase import Tablebases
+
+_VERSION = 3
+_HEADER = struct.Struct("<BBI?")
+# the time control, the time of each player, the running clock (0 if none,
+# 1 for White, 2 for Black), the time spent on the move and the wall time
+_CLOCK = struct.Struct("<BddqqBqq")
+_STATUSES = tuple(GameStatus)
+_MODES = tuple(IncrementMode)
+_RUNNING = (None, Colour.WHITE, Colour.BLACK)
+
+
+def pack_session(game: Chess) -> bytes:
+    """Encodes a game with its moves.
+
+    Args:
+        game (Chess): The game.
+
+    Returns:
+        bytes: The record.
+
+    """
+    start_fen = game.start_fen if game.start_fen != STARTING_FEN else None
+    clock = game.clock
+
+    return b"".join(
+        (
+            _HEADER.pack(_VERSION, _STATUSES.index(game.status), game.ply, clock is not None),
+            b"" if clock is None else _pack_clock(clock),
+            pack_game(game.line, game.result, start_fen),
+        )
+    )
+
+
+def unpack_session(record: bytes, tablebases: Tablebases | None = None) -> Chess:
+    """Decodes a game encoded by pack_session.
+
+    Args:
+        record (bytes): The record.
+        tablebases (Tablebases | None): The tablebases of the game.
+
+    Returns:
+        Chess: The game, as it was when it was encoded.
+
+    Raises:
+        ValueError: If the record has an unknown format version.
+
+    """
+    version, status, ply, timed = _HEADER.unpack_from(record)
+    if version != _VERSION:
+        raise ValueError(f"Unknown session format version: {version}")
+
+    offset = _HEADER.size + (_CLOCK.size if timed else 0)
+    archived = unpack_game(record, offset)
+
+    game = Chess.from_moves(archived.moves, archived.fen or STARTING_FEN, tablebases)
+    game.seek(ply)
+    # a resignation, an agreed draw or a flag-fall is not told by the moves
+    if game.status != _STATUSES[status]:
+        game.end(_STATUSES[status], archived.result)
+
+    if timed:
+        game.clock = _unpack_clock(record, _HEADER.size)
+
+    return game
+
+
+def _pack_clock(clock: ChessClock) -> bytes:
+    """Encodes the clocks of a game."""
+    control, stored_at = clock.control, time.time_ns()
+    elapsed = clock.timer() - clock.turn_start_ns if clock.running is not None else 0
+
+    return _CLOCK.pack(
+        _MODES.index(control.mode),
+        control.base,
+        control.increment,
+        clock.remaining_ns[Colour.WHITE],
+        clock.remaining_ns[Colour.BLACK],
+        _RUNNING.index(clock.running),
+        elapsed,
+        stored_at,
+    )
+
+
+def _unpack_clock(record: bytes, offset: int) -> ChessClock:
+    """Decodes the clocks of a game, counting the time they were stored for."""
+    mode, base, increment, white, black, running, elapsed, stored_at = _CLOCK.unpack_from(
+        record, offset
+    )
+
+    clock = ChessClock(TimeControl(base, increment, _MODES[mode]))
+    clock.remaining_ns = {Colour.WHITE: white, Colour.BLACK: black}
+    clock.running = _RUNNING[running]
+    clock.turn_start_ns = clock.timer() - elapsed - max(time.time_ns() - stored_at, 0)
+
+    return clock
+
+
+class SessionStore(MutableMapping[str, Chess]):
+    """Games by id, the most recently used in memory and the others on disk.
+
+    A game is in exactly one place that counts: in memory if it is there,
+    else on disk. A game in memory may also have a copy on disk, written by
+    a checkpoint or before it was read back, which is out of date once the
+    game changed and is replaced when the game is written again.
+
+    Attributes:
+        capacity (int): The maximum number of games in memory.
+        tablebases (Tablebases | None): The tablebases given to restored games.
+        evictions (int): The number of games written to disk.
+        restores (int): The number of games read back from disk.
+
+    """
+
+    def __init__(
+        self, path: str | Path, capacity: int = 10_000, tablebases: Tablebases | None = None
+    ):
+        if capacity < 1:
+            raise ValueError(f"The capacity must be positive, not {capacity}.")
+
+        self.capacity: int = capacity
+        self.tablebases: Tablebases | None = tablebases
+        self.evictions: int = 0
+        self.restores: int = 0
+        self._games: OrderedDict[str, Chess] = OrderedDict()
+        # the games in memory with a copy on disk
+        self._on_disk: set[str] = set()
+        # the database stays open for the lifetime of the store
+        self._disk = dbm.open(str(path), "c")  # noqa: SIM115
+
+    def __getitem__(self, game_id: str) -> Chess:
+        if (game := self._games.get(game_id)) is not None:
+            self._games.move_to_end(game_id)
+            return game
+
+        game = unpack_session(self._disk[game_id], self.tablebases)
+        self.restores += 1
+        self._on_disk.add(game_id)
+        self._keep(game_id, game)
+
+        return game
+
+    def __setitem__(self, game_id: str, game: Chess) -> None:
+        if game_id not in self._games and game_id in self._disk:
+            self._on_disk.add(game_id)
+
+        self._keep(game_id, game)
+
+    def __delitem__(self, game_id: str) -> None:
+        if self._games.pop(game_id, None) is None or game_id in self._on_disk:
+            del self._disk[game_id]
+            self._on_disk.discard(game_id)
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._games or (isinstance(game_id, str) and game_id in self._disk)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._games)
+        for key in self._disk.keys():  # noqa: SIM118
+            if (game_id := key.decode() if isinstance(key, bytes) else key) not in self._games:
+                yield game_id
+
+    def __len__(self) -> int:
+        return len(self._games) + len(self._disk) - len(self._on_disk)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def in_memory(self) -> int:
+        """The number of games in memory."""
+        return len(self._games)
+
+    def checkpoint(self) -> None:
+        """Writes the games in memory to disk, keeping them in memory."""
+        for game_id, game in self._games.items():
+            self._disk[game_id] = pack_session(game)
+
+        self._on_disk.update(self._games)
+
+    def flush(self) -> None:
+        """Writes the games in memory to disk and drops them.
+
+        The games are read back from disk the next time they are asked for.
+
+        """
+        while self._games:
+            self._evict()
+
+    def close(self) -> None:
+        """Writes the games in memory to disk and closes the database."""
+        self.flush()
+        self._disk.close()
+
+    def _keep(self, game_id: str, game: Chess) -> None:
+        """Keeps a game in memory as the most recently used, evicting the least recently used."""
+        self._games[game_id] = game
+        self._games.move_to_end(game_id)
+
+        while len(self._games) > self.capacity:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Writes the least recently used game to disk and drops it."""
+        game_id, game = self._games.popitem(last=False)
+        self._disk[game_id] = pack_session(game)
+        self._on_disk.discard(game_id)
+        self.evictions += 1
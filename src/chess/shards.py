@@ -0,0 +1,461 @@
+"""This module hosts games in several processes, each owning a shard of them.
+
+A single process checks every move on one core. Here a front process
+speaks the protocol of chess.server to the clients and forwards every
+command to the worker process owning its game, chosen by a hash of the
+game id, so that the moves of different shards are checked in parallel.
+
+The front and every worker are linked by a local TCP connection carrying
+the lines of all the clients, each prefixed with the id the front gave to
+its client:
+
+    CLIENT COMMAND        a command of a client, 'quit' once it left
+    CLIENT REPLY          the reply to it, or an event for the client
+    CLIENT resync GAME    asks for a snapshot of a game the client watches
+
+Every worker hosts its games in a chess.server.GameServer of its own and
+may keep them in a chess.sessions.SessionStore of its own, which it writes
+to disk every `checkpoint` seconds and once it stops.
+
+The front holds the connections of the clients, so it is the front that
+skips the deltas of a spectator whose connection has more than
+`max_backlog` bytes waiting to be sent, as chess.broadcast does in a
+single process. Once the spectator caught up, on the next delta or the
+next look for the spectators that caught up, the front asks the worker for
+a snapshot of the game and drops the older deltas still on the link.
+
+Run `python -m chess.shards --help` to start a server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from chess.broadcast import CATCH_UP_INTERVAL
+from chess.server import GameServer
+from chess.sessions import SessionStore
+
+if TYPE_CHECKING:
+    from collections.abc import MutableMapping
+    from types import TracebackType
+
+    from chess.chess_class import Chess
+
+_HOST = "127.0.0.1"
+_PORT = 8765
+# the lines that are not replies to a command
+_EVENTS = (b"played", b"delta", b"snapshot")
+_RESYNC = b"resync"
+
+
+def shard_of(game_id: str, shards: int) -> int:
+    """The shard owning a game, the same in every process.
+
+    Args:
+        game_id (str): The id of the game.
+        shards (int): The number of shards.
+
+    Returns:
+        int: The index of the shard.
+
+    """
+    return zlib.crc32(game_id.encode()) % shards
+
+
+class ShardedServer:
+    """Hosts games in `shards` worker processes for the clients of a TCP server.
+
+    The games of the shards are kept in `store`, a directory holding a
+    SessionStore database for every shard which keeps at most `capacity`
+    games in memory, or in dicts if it is None. The games in memory are
+    written to the databases every `checkpoint` seconds.
+
+    Attributes:
+        max_backlog (int): The number of bytes waiting to be sent to a
+            spectator above which it is skipped.
+        skipped (int): The number of deltas not sent to slow spectators.
+
+    """
+
+    def __init__(
+        self,
+        shards: int | None = None,
+        store: str | Path | None = None,
+        capacity: int = 10_000,
+        checkpoint: float = 60.0,
+        max_backlog: int = 64 * 1024,
+    ):
+        self.shards: int = shards or os.cpu_count() or 1
+        self.max_backlog: int = max_backlog
+        self.skipped: int = 0
+        self._store = store
+        self._capacity = capacity
+        self._checkpoint = checkpoint
+        self._links: list[asyncio.StreamWriter | None] = [None] * self.shards
+        self._linked: asyncio.Future[None] | None = None
+        self._workers: list[asyncio.Future[None]] = []
+        # the connections of the clients, and the shard, game and reply each one waits for
+        self._clients: dict[int, asyncio.StreamWriter] = {}
+        self._pending: dict[int, tuple[int, bytes, asyncio.Future[bytes]]] = {}
+        # the clients and games whose deltas were skipped, and those waiting for a snapshot
+        self._lagging: set[tuple[int, bytes]] = set()
+        self._resyncing: set[tuple[int, bytes]] = set()
+        self._catch_up_task: asyncio.Task[None] | None = None
+        self._ids = itertools.count()
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def start(self, host: str = _HOST, port: int = _PORT) -> asyncio.Server:
+        """Starts the workers and, once they are linked, listens for clients.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+
+        Returns:
+            asyncio.Server: The TCP server, e.g. to find its port or close it.
+
+        Raises:
+            RuntimeError: If a worker stopped before it was linked.
+
+        """
+        self._linked = linked = asyncio.get_running_loop().create_future()
+        links = await asyncio.start_server(self._link, _HOST, 0)
+        link_port = links.sockets[0].getsockname()[1]
+
+        # the front runs an event loop, which forked workers would inherit
+        self._executor = ProcessPoolExecutor(
+            self.shards, mp_context=multiprocessing.get_context("spawn")
+        )
+        for index in range(self.shards):
+            path = None if self._store is None else Path(self._store) / f"shard-{index}.db"
+            task = partial(_serve_shard, link_port, index, path, self._capacity, self._checkpoint)
+            self._workers.append(asyncio.wrap_future(self._executor.submit(task)))
+
+        await asyncio.wait([linked, *self._workers], return_when=asyncio.FIRST_COMPLETED)
+        links.close()
+
+        if not linked.done():
+            for worker in self._workers:
+                if worker.done():
+                    worker.result()
+            raise RuntimeError("A shard stopped before it was linked.")
+
+        self._catch_up_task = asyncio.create_task(self._catch_up())
+
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Forwards the commands of a client to their shards until it quits or disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The stream of the commands.
+            writer (asyncio.StreamWriter): The stream of the replies.
+
+        """
+        client_id = next(self._ids)
+        self._clients[client_id] = writer
+
+        try:
+            while line := await reader.readline():
+                if (words := line.split()) == [b"quit"]:
+                    break
+
+                writer.write(await self._forward(client_id, words))
+                await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            del self._clients[client_id]
+            self._lagging = {key for key in self._lagging if key[0] != client_id}
+            self._resyncing = {key for key in self._resyncing if key[0] != client_id}
+            for link in self._links:
+                if link is not None:
+                    link.write(b"%d quit\n" % client_id)
+
+            writer.close()
+
+    async def close(self) -> None:
+        """Stops the workers, which write their games to disk."""
+        if self._catch_up_task is not None:
+            self._catch_up_task.cancel()
+
+        for link in self._links:
+            if link is not None:
+                link.close()
+
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown)
+
+    async def _forward(self, client_id: int, words: list[bytes]) -> bytes:
+        """Sends a command to the shard of its game and waits for the reply."""
+        # the commands without a game get their error from any shard
+        game_id = words[1] if len(words) > 1 else b"-"
+        index = shard_of(game_id.decode(), self.shards) if len(words) > 1 else 0
+        if (link := self._links[index]) is None:
+            return b"error %s shard unavailable\n" % game_id
+
+        if words[:1] == [_RESYNC]:
+            return b"error - unknown command\n"
+
+        # no snapshot may be asked for once the client stopped watching
+        if words[:1] == [b"unwatch"]:
+            self._lagging.discard((client_id, game_id))
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._pending[client_id] = (index, game_id, future)
+        link.write(b"%d %s\n" % (client_id, b" ".join(words)))
+
+        return await future
+
+    async def _link(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Takes the link of a worker and hands its lines to the clients until it stops."""
+        index = int((await reader.readline()).split()[1])
+        self._links[index] = writer
+        if all(link is not None for link in self._links) and self._linked is not None:
+            self._linked.set_result(None)
+
+        with suppress(ConnectionError):
+            while line := await reader.readline():
+                prefix, _, message = line.partition(b" ")
+
+                if message.startswith(_EVENTS):
+                    self._send_event(writer, int(prefix), message)
+
+                elif (pending := self._pending.pop(int(prefix), None)) is not None:
+                    _reply(pending[2], message)
+
+        # the clients waiting for the shard are told it is gone
+        self._links[index] = None
+        for client_id, (shard, game_id, future) in list(self._pending.items()):
+            if shard == index:
+                del self._pending[client_id]
+                _reply(future, b"error %s shard unavailable\n" % game_id)
+
+    def _send_event(self, link: asyncio.StreamWriter, client_id: int, message: bytes) -> None:
+        """Sends an event to a client, skipping the deltas while its connection lags behind."""
+        if (client := self._clients.get(client_id)) is None:
+            return
+
+        kind, game_id, _ = message.split(b" ", 2)
+        key = (client_id, game_id)
+
+        if kind == b"snapshot":
+            self._resyncing.discard(key)
+
+        elif kind == b"delta":
+            # the deltas sent before the snapshot asked for are older than it
+            if key in self._resyncing:
+                return
+
+            if client.transport.get_write_buffer_size() > self.max_backlog:
+                self._lagging.add(key)
+                self.skipped += 1
+                return
+
+            if key in self._lagging:
+                self._resync(key, link)
+                return
+
+        client.write(message)
+
+    async def _catch_up(self) -> None:
+        """Resyncs the slow spectators that caught up, however idle their games."""
+        while True:
+            await asyncio.sleep(CATCH_UP_INTERVAL)
+
+            for key in list(self._lagging):
+                client = self._clients.get(key[0])
+                link = self._links[shard_of(key[1].decode(), self.shards)]
+
+                if (
+                    client is not None
+                    and link is not None
+                    and client.transport.get_write_buffer_size() <= self.max_backlog
+                ):
+                    self._resync(key, link)
+
+    def _resync(self, key: tuple[int, bytes], link: asyncio.StreamWriter) -> None:
+        """Asks the worker for a snapshot of a game for a client that caught up with it."""
+        self._lagging.discard(key)
+        self._resyncing.add(key)
+        link.write(b"%d %s %s\n" % (key[0], _RESYNC, key[1]))
+
+
+def _reply(future: asyncio.Future[bytes], reply: bytes) -> None:
+    """Hands a reply to the client waiting for it, unless it left."""
+    if not future.done():
+        future.set_result(reply)
+
+
+class _RoutedClient:
+    """A client of the front process, whose lines go back over the link with its id."""
+
+    __slots__ = ("_link", "_prefix")
+
+    def __init__(self, link: asyncio.StreamWriter, client_id: bytes):
+        self._link = link
+        self._prefix = client_id + b" "
+
+    @property
+    def transport(self) -> asyncio.WriteTransport:
+        """A transport with nothing to send, as the front skips the deltas of slow clients."""
+        return _UNBUFFERED
+
+    def write(self, data: bytes, /) -> None:
+        """Sends lines to the client."""
+        self._link.write(self._prefix + data)
+
+
+class _Unbuffered(asyncio.WriteTransport):
+    """A transport whose buffer is always empty, so that no spectator is skipped."""
+
+    def get_write_buffer_size(self) -> int:
+        """The number of bytes waiting to be sent, none."""
+        return 0
+
+
+_UNBUFFERED = _Unbuffered()
+
+
+def _serve_shard(
+    port: int, index: int, path: Path | None, capacity: int, checkpoint: float
+) -> None:
+    """Hosts the games of a shard until its link closes, in a worker process.
+
+    Args:
+        port (int): The port the front process takes the links on.
+        index (int): The index of the shard.
+        path (Path | None): The database of the games of the shard, if kept on disk.
+        capacity (int): The number of games kept in memory with a database.
+        checkpoint (float): The seconds between two writes of the games to disk.
+
+    """
+    if path is None:
+        asyncio.run(_host_shard(port, index, {}))
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with SessionStore(path, capacity) as store:
+        asyncio.run(_host_shard(port, index, store, checkpoint))
+
+
+async def _host_shard(
+    port: int, index: int, store: MutableMapping[str, Chess], checkpoint: float | None = None
+) -> None:
+    """Serves the commands forwarded by the front process until it closes the link."""
+    reader, link = await asyncio.open_connection(_HOST, port)
+    link.write(b"shard %d\n" % index)
+    clients: dict[bytes, _RoutedClient] = {}
+
+    # each process checks its moves on its own core, so on its own event loop
+    async with GameServer(workers=0, store=store) as games:
+        checkpoints = None
+        if isinstance(store, SessionStore) and checkpoint:
+            checkpoints = asyncio.create_task(_checkpoint(store, checkpoint))
+
+        while line := await reader.readline():
+            client_id, _, command = line.partition(b" ")
+
+            if (words := command.decode().split()) == ["quit"]:
+                if (client := clients.pop(client_id, None)) is not None:
+                    games.disconnect(client)
+                continue
+
+            if (client := clients.get(client_id)) is None:
+                client = clients[client_id] = _RoutedClient(link, client_id)
+
+            if words[:1] == [_RESYNC.decode()]:
+                # a watch of a game the client already watches replies with its snapshot
+                reply = await games.execute(client, ["watch", *words[1:]])
+                client.write(f"snapshot {reply.removeprefix('ok ')}\n".encode())
+            else:
+                client.write(f"{await games.execute(client, words)}\n".encode())
+
+            await link.drain()
+
+        if checkpoints is not None:
+            checkpoints.cancel()
+
+    link.close()
+
+
+async def _checkpoint(store: SessionStore, interval: float) -> None:
+    """Writes the games in memory to disk every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        store.checkpoint()
+
+
+async def serve(
+    host: str = _HOST,
+    port: int = _PORT,
+    shards: int | None = None,
+    store: str | Path | None = None,
+    capacity: int = 10_000,
+    checkpoint: float = 60.0,
+) -> None:
+    """Hosts games in worker processes until cancelled.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        shards (int | None): The number of worker processes. Defaults to the CPU count.
+        store (str | Path | None): The directory of the databases of the
+            shards, the games are kept in memory if None.
+        capacity (int): The number of games kept in memory by each shard with a store.
+        checkpoint (float): The seconds between two writes of the games to disk.
+
+    """
+    async with ShardedServer(shards, store, capacity, checkpoint) as games:
+        server = await games.start(host, port)
+
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    """Hosts games in worker processes from the command line."""
+    parser = argparse.ArgumentParser(description="Host games in several worker processes.")
+    parser.add_argument("--host", default=_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=_PORT, help="port to listen on")
+    parser.add_argument("--shards", type=int, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--store", help="directory of the databases of the shards")
+    parser.add_argument(
+        "--capacity", type=int, default=10_000, help="games kept in memory by each shard"
+    )
+    parser.add_argument(
+        "--checkpoint", type=float, default=60.0, help="seconds between writes to disk"
+    )
+    args = parser.parse_args()
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(
+            serve(args.host, args.port, args.shards, args.store, args.capacity, args.checkpoint)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,623 @@
+"""This module generates and probes endgame tablebases.
+
+A tablebase stores the value of every position of a piece set with the
+distance to mate: KQK, KRK and KPK, i.e. the King and a Queen, a Rook or a
+Pawn against a bare King. Tables are built by retrograde analysis: starting
+from the checkmates, positions are solved backwards one ply at a time by
+generating the moves that lead into already solved positions.
+
+Tables cover White as the stronger side with either side to move; positions
+with Black as the stronger side are probed by mirroring the board. Each table
+is a file of one byte per position, read through `mmap` so that probing never
+loads a whole table into memory.
+
+Run `python -m chess.tablebase --help` to generate the tables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from chess.colour_and_aliases import Colour
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from chess.board import Board
+    from chess.pieces import Piece
+
+TABLES = ("KQK", "KRK", "KPK")
+
+_MAGIC = b"CHTB"
+_VERSION = 1
+_HEADER_SIZE = 8
+_POSITIONS = 2 * 64 * 64 * 64
+_UNKNOWN = 255
+
+# the side to move in the index of a position
+_WHITE, _BLACK = 0, 1
+
+# the stronger side's piece of every table, by the letter in its name
+_PIECE_TYPES: dict[str, type] = {"Q": Queen, "R": Rook, "P": Pawn}
+_LETTERS = {piece_type: letter for letter, piece_type in _PIECE_TYPES.items()}
+
+_ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _rays(directions: tuple[tuple[int, int], ...]) -> list[list[list[int]]]:
+    """The squares along every direction from every square, nearest first."""
+    rays = []
+
+    for square in range(64):
+        rank, file_ = divmod(square, 8)
+        square_rays = []
+
+        for rank_step, file_step in directions:
+            ray, ray_rank, ray_file = [], rank + rank_step, file_ + file_step
+
+            while 0 <= ray_rank < 8 and 0 <= ray_file < 8:
+                ray.append(ray_rank * 8 + ray_file)
+                ray_rank, ray_file = ray_rank + rank_step, ray_file + file_step
+
+            square_rays.append(ray)
+
+        rays.append(square_rays)
+
+    return rays
+
+
+_RAYS = {"Q": _rays(_ROOK_DIRECTIONS + _BISHOP_DIRECTIONS), "R": _rays(_ROOK_DIRECTIONS)}
+
+_KING_MOVES = [
+    [
+        rank * 8 + file_
+        for rank, file_ in product(range(8), range(8))
+        if max(abs(rank - square // 8), abs(file_ - square % 8)) == 1
+    ]
+    for square in range(64)
+]
+
+
+@dataclass(frozen=True, slots=True)
+class TablebaseResult:
+    """The value of a position from the point of view of the player to move.
+
+    Attributes:
+        wdl (int): 1 for a win, 0 for a draw and -1 for a loss.
+        dtm (int | None): The number of plies to mate. None for a draw.
+
+    """
+
+    wdl: int
+    dtm: int | None
+
+
+class Tablebase:
+    """A single table, memory mapped from its file.
+
+    Attributes:
+        name (str): The piece set of the table, e.g. 'KQK'.
+
+    """
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as file:
+            self._map: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = self._map[:_HEADER_SIZE]
+        if (
+            header[:4] != _MAGIC
+            or header[4] != _VERSION
+            or len(self._map) != (_HEADER_SIZE + _POSITIONS)
+        ):
+            self._map.close()
+            raise ValueError(f"{path} is not a tablebase file.")
+
+        self.name: str = f"K{chr(header[5])}K"
+
+    def value(self, index: int) -> int:
+        """Reads the stored value of a position.
+
+        Args:
+            index (int): The index of the position.
+
+        Returns:
+            int: 0 for a draw, n > 0 if the player to move mates in n plies,
+                -n - 1 if the player to move is mated in n plies.
+
+        """
+        value = self._map[_HEADER_SIZE + index]
+        return value - 256 if value > 127 else value
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._map.close()
+
+
+class Tablebases:
+    """The tables of a directory, probed with boards.
+
+    Tables missing from the directory are skipped, so probing their piece
+    sets returns None.
+
+    """
+
+    def __init__(self, directory: str | Path):
+        self._tables: dict[str, Tablebase] = {}
+
+        for name in TABLES:
+            if (path := Path(directory) / f"{name}.tb").exists():
+                self._tables[name[1]] = Tablebase(path)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def names(self) -> list[str]:
+        """The piece sets of the loaded tables."""
+        return [f"K{letter}K" for letter in self._tables]
+
+    def probe(self, board: Board, turn: Colour) -> TablebaseResult | None:
+        """Looks up the value of a position.
+
+        Positions with two bare Kings or a single minor piece are draws
+        without a table.
+
+        Args:
+            board (Board): The position.
+            turn (Colour): The colour of the player to move.
+
+        Returns:
+            TablebaseResult | None: The value of the position. None if no
+                table covers it.
+
+        """
+        kings, others = _pieces(board)
+
+        if len(others) > 1:
+            return None
+
+        if not others or isinstance(others[0][0], Bishop | Knight):
+            return TablebaseResult(0, None)
+
+        piece, square = others[0]
+        if (table := self._tables.get(_LETTERS[type(piece)])) is None:
+            return None
+
+        # castling is not covered, e.g. with the King and the Rook unmoved
+        if board.castling_rights() != "-":
+            return None
+
+        if piece.colour == Colour.WHITE:
+            index = _index(
+                int(turn == Colour.BLACK), kings[Colour.WHITE], kings[Colour.BLACK], square
+            )
+        else:
+            index = _index(
+                int(turn == Colour.WHITE),
+                _mirror(kings[Colour.BLACK]),
+                _mirror(kings[Colour.WHITE]),
+                _mirror(square),
+            )
+
+        if (value := table.value(index)) > 0:
+            return TablebaseResult(1, value)
+
+        return TablebaseResult(-1, -value - 1) if value < 0 else TablebaseResult(0, None)
+
+    def close(self) -> None:
+        """Unmaps all tables."""
+        for table in self._tables.values():
+            table.close()
+
+
+def _pieces(board: Board) -> tuple[dict[Colour, int], list[tuple[Piece, int]]]:
+    """The squares of the Kings by colour and the other pieces with their squares."""
+    kings: dict[Colour, int] = {}
+    others: list[tuple[Piece, int]] = []
+
+    for rank, row in enumerate(board.state):
+        for file_, piece in enumerate(row):
+            if isinstance(piece, King):
+                kings[piece.colour] = rank * 8 + file_
+            elif piece is not None:
+                others.append((piece, rank * 8 + file_))
+
+    return kings, others
+
+
+def generate_tablebases(
+    directory: str | Path, names: tuple[str, ...] = TABLES, workers: int | None = None
+) -> None:
+    """Generates tables into a directory.
+
+    KPK needs KQK and KRK for the positions after a promotion, so they are
+    generated first if they are missing.
+
+    Args:
+        directory (str | Path): The directory to write the tables to.
+        names (tuple[str, ...]): The piece sets to generate.
+        workers (int | None): The number of processes. Defaults to the CPU count.
+
+    Raises:
+        ValueError: If a piece set is not supported.
+
+    """
+    if unknown := set(names) - set(TABLES):
+        raise ValueError(f"Unsupported piece sets: {sorted(unknown)}")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if "KPK" in names:
+        names = tuple(
+            name for name in TABLES if name in names or not (directory / f"{name}.tb").exists()
+        )
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for name in names:
+            values = _solve(name[1], directory, executor)
+            _write_table(directory / f"{name}.tb", name[1], values)
+
+
+def _solve(letter: str, directory: Path, executor: ProcessPoolExecutor) -> bytearray:
+    """Solves every position of a table by retrograde analysis.
+
+    Counting the moves of every position is split across the processes, one
+    task per side to move and square of the stronger King. Solving backwards
+    from the checkmates then runs in this process.
+
+    Args:
+        letter (str): The letter of the stronger side's piece.
+        directory (Path): The directory of the tables needed after a promotion.
+        executor (ProcessPoolExecutor): The process pool.
+
+    Returns:
+        bytearray: The value of every position, as stored in the table file.
+
+    """
+    legal, moves_left = bytearray(_POSITIONS), bytearray(_POSITIONS)
+    distance = bytearray([_UNKNOWN]) * _POSITIONS
+    buckets: list[list[int]] = [[]]
+
+    chunks = executor.map(_count_moves, [letter] * 128, range(128), [str(directory)] * 128)
+    for chunk, (chunk_legal, chunk_moves, mates, wins) in enumerate(chunks):
+        start = chunk * 4096
+        legal[start : start + 4096] = chunk_legal
+        moves_left[start : start + 4096] = chunk_moves
+        buckets[0].extend(mates)
+
+        # wins by promoting into a won position of another table
+        for index, plies in wins:
+            if plies < distance[index]:
+                distance[index] = plies
+                buckets.extend([] for _ in range(plies + 1 - len(buckets)))
+                buckets[plies].append(index)
+
+    for index in buckets[0]:
+        distance[index] = 0
+
+    _retrograde(letter, legal, moves_left, distance, buckets)
+
+    return _values(distance)
+
+
+def _retrograde(
+    letter: str,
+    legal: bytearray,
+    moves_left: bytearray,
+    distance: bytearray,
+    buckets: list[list[int]],
+) -> None:
+    """Solves positions backwards from the solved ones, in order of distance.
+
+    White, the stronger side, wins a position once one of its moves leads to
+    a lost position. Black loses a position once all of its moves lead to won
+    positions. Every solved position is expanded once, at its final distance.
+
+    Args:
+        letter (str): The letter of the stronger side's piece.
+        legal (bytearray): Whether every position is legal.
+        moves_left (bytearray): Black's moves not yet known to lose, updated in place.
+        distance (bytearray): The plies to mate of every position, updated in place.
+        buckets (list[list[int]]): The positions to expand by distance.
+
+    """
+    done = bytearray(_POSITIONS)
+    plies = 0
+
+    while plies < len(buckets):
+        if plies + 1 == len(buckets) and buckets[plies]:
+            buckets.append([])
+
+        for index in buckets[plies]:
+            if done[index] or distance[index] != plies:
+                continue
+
+            done[index] = 1
+            black_to_move, white_king, black_king, square = _decode(index)
+
+            if black_to_move:
+                solved = [
+                    previous
+                    for previous in _white_unmoves(letter, white_king, black_king, square)
+                    if legal[previous] and plies + 1 < distance[previous]
+                ]
+            else:
+                solved = _lost_predecessors(
+                    _black_unmoves(white_king, black_king, square), legal, done, moves_left
+                )
+
+            for previous in solved:
+                distance[previous] = plies + 1
+                buckets[plies + 1].append(previous)
+
+        plies += 1
+
+
+def _lost_predecessors(
+    predecessors: Iterator[int], legal: bytearray, done: bytearray, moves_left: bytearray
+) -> list[int]:
+    """Counts down Black's moves into a won position and finds the newly lost positions.
+
+    Args:
+        predecessors (Iterator[int]): The positions from which Black reaches the position.
+        legal (bytearray): Whether every position is legal.
+        done (bytearray): Whether every position has been expanded.
+        moves_left (bytearray): Black's moves not yet known to lose, updated in place.
+
+    Returns:
+        list[int]: The positions whose moves all lead to won positions now.
+
+    """
+    lost = []
+
+    for previous in predecessors:
+        if legal[previous] and not done[previous]:
+            moves_left[previous] -= 1
+
+            if moves_left[previous] == 0:
+                lost.append(previous)
+
+    return lost
+
+
+def _count_moves(
+    letter: str, chunk: int, directory: str
+) -> tuple[bytes, bytes, list[int], list[tuple[int, int]]]:
+    """Counts the moves of the positions with one side to move and White King square.
+
+    Args:
+        letter (str): The letter of the stronger side's piece.
+        chunk (int): The side to move times 64 plus the square of the White King.
+        directory (str): The directory of the tables needed after a promotion.
+
+    Returns:
+        tuple[bytes, bytes, list[int], list[tuple[int, int]]]: Whether every
+            position is legal, the number of moves of Black (255 if Black can
+            capture), the checkmates, and White's wins by promotion with their
+            plies to mate.
+
+    """
+    black_to_move, white_king = divmod(chunk, 64)
+    legal, moves = bytearray(4096), bytearray(4096)
+    mates: list[int] = []
+    wins: list[tuple[int, int]] = []
+    promotions = (
+        [Tablebase(Path(directory) / f"K{piece}K.tb") for piece in "QR"] if letter == "P" else None
+    )
+
+    for offset, (black_king, square) in enumerate(product(range(64), range(64))):
+        if not _is_legal(
+            letter,
+            black_to_move=bool(black_to_move),
+            kings=(white_king, black_king),
+            square=square,
+        ):
+            continue
+
+        legal[offset] = 1
+        index = chunk * 4096 + offset
+
+        if not black_to_move:
+            if promotions is not None and (
+                plies := _promotion_win(promotions, white_king, black_king, square)
+            ):
+                wins.append((index, plies))
+            continue
+
+        count = _black_moves(letter, white_king, black_king, square)
+        moves[offset] = count
+
+        if count == 0 and _attacks(letter, square, black_king, white_king):
+            mates.append(index)
+
+    for table in promotions or []:
+        table.close()
+
+    return bytes(legal), bytes(moves), mates, wins
+
+
+def _is_legal(letter: str, *, black_to_move: bool, kings: tuple[int, int], square: int) -> bool:
+    """Checks whether a position of a table can occur in a game."""
+    white_king, black_king = kings
+
+    if len({white_king, black_king, square}) < 3 or black_king in _KING_MOVES[white_king]:
+        return False
+
+    if letter == "P" and not 8 <= square < 56:
+        return False
+
+    # the player who has just moved cannot be in check
+    return black_to_move or not _attacks(letter, square, black_king, white_king)
+
+
+def _attacks(letter: str, square: int, target: int, blocker: int) -> bool:
+    """Checks whether the stronger side's piece attacks a square.
+
+    Args:
+        letter (str): The letter of the piece.
+        square (int): The square of the piece.
+        target (int): The attacked square.
+        blocker (int): The square of the White King, which can block the piece.
+
+    Returns:
+        bool: Whether the piece attacks the target.
+
+    """
+    if letter == "P":
+        return target // 8 == square // 8 + 1 and abs(target % 8 - square % 8) == 1
+
+    for ray in _RAYS[letter][square]:
+        for ray_square in ray:
+            if ray_square == target:
+                return True
+            if ray_square == blocker:
+                break
+
+    return False
+
+
+def _black_moves(letter: str, white_king: int, black_king: int, square: int) -> int:
+    """Counts Black's moves. A capture counts as 255: Black can never lose then."""
+    count = 0
+
+    for target in _KING_MOVES[black_king]:
+        if target in _KING_MOVES[white_king]:
+            continue
+
+        if target == square:
+            return 255
+
+        if not _attacks(letter, square, target, white_king):
+            count += 1
+
+    return count
+
+
+def _promotion_win(
+    tables: list[Tablebase], white_king: int, black_king: int, square: int
+) -> int | None:
+    """The plies to mate of White's fastest winning promotion to a Queen or a Rook, if any."""
+    target = square + 8
+    if square < 48 or target in {white_king, black_king}:
+        return None
+
+    best = None
+
+    for table in tables:
+        value = table.value(_index(_BLACK, white_king, black_king, target))
+
+        if value < 0 and (best is None or -value < best):
+            best = -value
+
+    return best
+
+
+def _white_unmoves(letter: str, white_king: int, black_king: int, square: int) -> Iterator[int]:
+    """The positions with White to move from which White reaches a position."""
+    for origin in _KING_MOVES[white_king]:
+        if origin not in {black_king, square}:
+            yield _index(_WHITE, origin, black_king, square)
+
+    if letter == "P":
+        if square >= 16 and (origin := square - 8) not in {white_king, black_king}:
+            yield _index(_WHITE, white_king, black_king, origin)
+
+            if square // 8 == 3 and square - 16 not in {white_king, black_king}:
+                yield _index(_WHITE, white_king, black_king, square - 16)
+        return
+
+    for ray in _RAYS[letter][square]:
+        for origin in ray:
+            if origin in {white_king, black_king}:
+                break
+            yield _index(_WHITE, white_king, black_king, origin)
+
+
+def _black_unmoves(white_king: int, black_king: int, square: int) -> Iterator[int]:
+    """The positions with Black to move from which Black reaches a position."""
+    for origin in _KING_MOVES[black_king]:
+        if origin not in {white_king, square}:
+            yield _index(_BLACK, white_king, origin, square)
+
+
+def _values(distance: bytearray) -> bytearray:
+    """Converts the distances of the solved positions to the stored values."""
+    values = bytearray(_POSITIONS)
+    half = _POSITIONS // 2
+
+    for index, plies in enumerate(distance):
+        if plies == _UNKNOWN:
+            continue
+
+        # White's solved positions are wins, Black's are losses
+        values[index] = plies if index < half else (-plies - 1) & 0xFF
+
+    return values
+
+
+def _write_table(path: Path, letter: str, values: bytearray) -> None:
+    """Writes a table file, replacing it atomically."""
+    temporary = path.with_suffix(".tmp")
+
+    with open(temporary, "wb") as file:
+        file.write(_MAGIC + bytes([_VERSION]) + letter.encode() + bytes(2))
+        file.write(values)
+
+    os.replace(temporary, path)
+
+
+def _index(side: int, white_king: int, black_king: int, square: int) -> int:
+    """The index of a position in a table, with the side to move as _WHITE or _BLACK."""
+    return ((side * 64 + white_king) * 64 + black_king) * 64 + square
+
+
+def _decode(index: int) -> tuple[bool, int, int, int]:
+    """The side to move and the squares of a position from its index."""
+    rest, square = divmod(index, 64)
+    rest, black_king = divmod(rest, 64)
+    black_to_move, white_king = divmod(rest, 64)
+
+    return bool(black_to_move), white_king, black_king, square
+
+
+def _mirror(square: int) -> int:
+    """The square on the same file and the opposite rank."""
+    return square ^ 56
+
+
+def main() -> None:
+    """Generates tables from the command line."""
+    parser = argparse.ArgumentParser(description="Endgame tablebase generation.")
+    parser.add_argument("directory", type=Path, help="directory to write the tables to")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=list(TABLES))
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    args = parser.parse_args()
+
+    generate_tablebases(args.directory, tuple(args.tables), args.workers)
+
+    with Tablebases(args.directory) as tablebases:
+        print(f"Tables in {args.directory}: {', '.join(tablebases.names)}")
+
+
+if __name__ == "__main__":
+    main()
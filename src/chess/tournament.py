@@ -0,0 +1,756 @@
+"""This module provides a self-play tournament runner to compare engine settings.
+
+Games are played concurrently in a process pool. Every result is written to
+a JSON lines file as soon as it arrives, and optionally to a PGN file, and
+fed to a sequential probability ratio test (SPRT), which stops the tournament
+once it is decided.
+
+Run it with `python -m chess.tournament --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine import Searcher, SearchLimits
+from chess.fen import board_from_fen
+from chess.pgn import PGNWriter, game_from_moves
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+from chess.zobrist import zobrist_key
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from concurrent.futures import Future
+
+    from chess.pgn import PGNGame
+
+
+class GameResult(StrEnum):
+    """Enum class for game results in PGN notation."""
+
+    WHITE_WINS = "1-0"
+    BLACK_WINS = "0-1"
+    DRAW = "1/2-1/2"
+
+
+@dataclass(frozen=True, slots=True)
+class EngineConfig:
+    """Settings of an engine taking part in a tournament.
+
+    Attributes:
+        name (str): The name of the engine.
+        limits (SearchLimits): The limits of every search.
+        hash_size (int): The size of the transposition table in megabytes.
+
+    """
+
+    name: str
+    limits: SearchLimits
+    hash_size: int = 16
+
+
+@dataclass(frozen=True, slots=True)
+class Adjudication:
+    """Rules to end games early. Scores are given in centipawns.
+
+    Attributes:
+        win_score (int): Score above which a game is adjudicated as won.
+        win_plies (int): Consecutive plies both engines must agree on a win.
+        draw_score (int): Score below which a game is adjudicated as drawn.
+        draw_plies (int): Consecutive plies both engines must agree on a draw.
+        draw_after_ply (int): The first ply a draw can be adjudicated on.
+        max_plies (int): Games that reach this many plies are drawn.
+
+    """
+
+    win_score: int = 1000
+    win_plies: int = 6
+    draw_score: int = 10
+    draw_plies: int = 12
+    draw_after_ply: int = 80
+    max_plies: int = 400
+
+
+@dataclass(frozen=True, slots=True)
+class GameTask:
+    """A game to play.
+
+    Attributes:
+        game_id (int): The number of the game in the tournament.
+        opening (str): A FEN string or a list of moves from the starting position.
+        white (EngineConfig): The engine playing White.
+        black (EngineConfig): The engine playing Black.
+        adjudication (Adjudication): The rules to end the game early.
+
+    """
+
+    game_id: int
+    opening: str
+    white: EngineConfig
+    black: EngineConfig
+    adjudication: Adjudication
+
+
+@dataclass(frozen=True, slots=True)
+class GameRecord:
+    """The outcome of a played game.
+
+    Attributes:
+        game_id (int): The number of the game in the tournament.
+        opening (str): The opening the game started from.
+        white (str): The name of the engine playing White.
+        black (str): The name of the engine playing Black.
+        result (GameResult): The result of the game.
+        reason (str): Why the game ended.
+        plies (int): The number of plies played after the opening.
+        moves (list[str]): The moves played after the opening.
+
+    """
+
+    game_id: int
+    opening: str
+    white: str
+    black: str
+    result: GameResult
+    reason: str
+    plies: int
+    moves: list[str]
+
+
+class SPRT:
+    """Sequential probability ratio test on game results.
+
+    Tests H0: elo = elo0 against H1: elo = elo1 with the normal
+    approximation of the trinomial (win/draw/loss) model.
+
+    Attributes:
+        elo0 (float): The Elo difference of the null hypothesis.
+        elo1 (float): The Elo difference of the alternative hypothesis.
+        lower_bound (float): H0 is accepted once the LLR falls below it.
+        upper_bound (float): H1 is accepted once the LLR rises above it.
+        wins (int): Games won by the tested engine.
+        draws (int): Drawn games.
+        losses (int): Games lost by the tested engine.
+
+    """
+
+    def __init__(
+        self, elo0: float = 0.0, elo1: float = 10.0, alpha: float = 0.05, beta: float = 0.05
+    ):
+        self.elo0: float = elo0
+        self.elo1: float = elo1
+        self.lower_bound: float = math.log(beta / (1 - alpha))
+        self.upper_bound: float = math.log((1 - beta) / alpha)
+        self.wins: int = 0
+        self.draws: int = 0
+        self.losses: int = 0
+
+    def add(self, score: float) -> None:
+        """Adds a game result from the point of view of the tested engine.
+
+        Args:
+            score (float): 1 for a win, 0.5 for a draw and 0 for a loss.
+
+        """
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    @property
+    def games(self) -> int:
+        """The number of games played."""
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """The average score of the tested engine."""
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    @property
+    def llr(self) -> float:
+        """The log-likelihood ratio of H1 against H0."""
+        if not self.games:
+            return 0.0
+
+        wins, draws, losses = float(self.wins), float(self.draws), float(self.losses)
+
+        # regularise one-sided results, e.g. only wins, which have no variance
+        if not wins or not draws or not losses:
+            wins, draws, losses = wins + 0.5, draws + 0.5, losses + 0.5
+
+        games = wins + draws + losses
+        score = (wins + draws / 2) / games
+        variance = (wins + draws / 4) / games - score**2
+        score0, score1 = _expected_score(self.elo0), _expected_score(self.elo1)
+
+        return (score1 - score0) * (2 * score - score0 - score1) / (2 * variance / games)
+
+    @property
+    def decision(self) -> str | None:
+        """'H1' or 'H0' once the test is decided. None otherwise."""
+        if (llr := self.llr) >= self.upper_bound:
+            return "H1"
+
+        if llr <= self.lower_bound:
+            return "H0"
+
+        return None
+
+    def elo(self) -> tuple[float, float]:
+        """Estimates the Elo difference with a 95% confidence margin.
+
+        Returns:
+            tuple[float, float]: The estimated Elo difference and its margin.
+
+        """
+        if not self.games:
+            return 0.0, math.inf
+
+        variance = max((self.wins + self.draws / 4) / self.games - self.score**2, 0.0)
+        margin = 1.96 * math.sqrt(variance / self.games)
+        low, high = _elo(self.score - margin), _elo(self.score + margin)
+
+        return _elo(self.score), (high - low) / 2
+
+
+@dataclass(slots=True)
+class TournamentSummary:
+    """Summary of a finished tournament.
+
+    Attributes:
+        games (int): The number of games played.
+        wins (int): Games won by the tested engine.
+        draws (int): Drawn games.
+        losses (int): Games lost by the tested engine.
+        elo (float): The estimated Elo difference.
+        elo_margin (float): The 95% confidence margin of the Elo difference.
+        llr (float): The final log-likelihood ratio.
+        decision (str | None): 'H1', 'H0' or None if the test is undecided.
+
+    """
+
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    elo: float
+    elo_margin: float
+    llr: float
+    decision: str | None
+
+
+def load_openings(path: str | Path) -> list[str]:
+    """Loads openings from a file.
+
+    Every non-empty line that does not start with '#' is an opening: either
+    a FEN string or a space separated list of moves from the starting position.
+
+    Args:
+        path (str | Path): The path of the file.
+
+    Returns:
+        list[str]: The openings.
+
+    """
+    with open(path) as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+
+def play_game(task: GameTask) -> GameRecord:
+    """Plays a game between two engines.
+
+    Args:
+        task (GameTask): The game to play.
+
+    Returns:
+        GameRecord: The outcome of the game.
+
+    """
+    game = GameState(*_setup_opening(task.opening), task.adjudication)
+    engines = {Colour.WHITE: task.white, Colour.BLACK: task.black}
+    searchers = {
+        colour: Searcher(hash_size=config.hash_size) for colour, config in engines.items()
+    }
+
+    while (outcome := game.draw_by_rule() or game.known_result()) is None:
+        search = searchers[game.turn].search(game.board, game.turn, engines[game.turn].limits)
+
+        if search.best_move is None:
+            outcome = game.no_legal_moves()
+            break
+
+        if (outcome := game.adjudicate(search.score)) is not None:
+            break
+
+        game.play(search.best_move)
+
+    result, reason = outcome
+
+    return GameRecord(
+        task.game_id,
+        task.opening,
+        task.white.name,
+        task.black.name,
+        result,
+        reason,
+        len(game.moves),
+        game.moves,
+    )
+
+
+class GameState:
+    """State of a game needed to apply the draw and adjudication rules.
+
+    Attributes:
+        board (Board): The board.
+        turn (Colour): The colour of the player to move.
+        rules (Adjudication): The rules to end the game early.
+        moves (list[str]): The moves played after the opening.
+
+    """
+
+    def __init__(self, board: Board, turn: Colour, rules: Adjudication):
+        self.board: Board = board
+        self.turn: Colour = turn
+        self.rules: Adjudication = rules
+        self.moves: list[str] = []
+        self._repetitions: Counter[int] = Counter([zobrist_key(board, turn)])
+        self._halfmove_clock: int = 0
+        self._win_streak: int = 0
+        self._draw_streak: int = 0
+
+    def play(self, move: str) -> None:
+        """Plays a legal move and updates the rule counters.
+
+        Args:
+            move (str): The move in the notation of Board.legal_moves.
+
+        """
+        self._halfmove_clock = (
+            0 if _is_irreversible(self.board, move) else self._halfmove_clock + 1
+        )
+        self.board.apply_move(move, self.turn)
+        self.moves.append(move)
+        self.turn = ~self.turn
+        self._repetitions[zobrist_key(self.board, self.turn)] += 1
+
+    def draw_by_rule(self) -> tuple[GameResult, str] | None:
+        """Checks threefold repetition, the fifty-move rule and the ply limit.
+
+        Returns:
+            tuple[GameResult, str] | None: The result and the reason. None if
+                the game goes on.
+
+        """
+        if self._repetitions[zobrist_key(self.board, self.turn)] >= 3:
+            return GameResult.DRAW, "threefold repetition"
+
+        if self._halfmove_clock >= 100:
+            return GameResult.DRAW, "fifty-move rule"
+
+        if len(self.moves) >= self.rules.max_plies:
+            return GameResult.DRAW, "max plies"
+
+        return None
+
+    def known_result(self) -> tuple[GameResult, str] | None:
+        """Checks whether the material alone decides the game.
+
+        Returns:
+            tuple[GameResult, str] | None: The result and the reason. None if
+                the game goes on.
+
+        """
+        if (result := _known_result(self.board, self.turn)) is None:
+            return None
+
+        return result, "material"
+
+    def no_legal_moves(self) -> tuple[GameResult, str]:
+        """The result of the game when the player to move has no legal moves.
+
+        Returns:
+            tuple[GameResult, str]: The result and the reason.
+
+        """
+        if self.board._king_checked(self.turn):
+            return _win_for(~self.turn), "checkmate"
+
+        return GameResult.DRAW, "stalemate"
+
+    def adjudicate(self, score: int) -> tuple[GameResult, str] | None:
+        """Adjudicates the game on the score of the engine to move.
+
+        A game is won once both engines agree on a winning score for enough
+        consecutive plies, and drawn once they agree on an even score.
+
+        Args:
+            score (int): The score from the point of view of the player to move.
+
+        Returns:
+            tuple[GameResult, str] | None: The result and the reason. None if
+                the game goes on.
+
+        """
+        white_score = score if self.turn == Colour.WHITE else -score
+        self._win_streak = _streak(self._win_streak, white_score, self.rules.win_score)
+        self._draw_streak = (
+            self._draw_streak + 1 if abs(white_score) <= self.rules.draw_score else 0
+        )
+
+        if abs(self._win_streak) >= self.rules.win_plies:
+            winner = Colour.WHITE if self._win_streak > 0 else Colour.BLACK
+            return _win_for(winner), "score"
+
+        if (
+            self._draw_streak >= self.rules.draw_plies
+            and len(self.moves) >= self.rules.draw_after_ply
+        ):
+            return GameResult.DRAW, "score"
+
+        return None
+
+
+def run_tournament(
+    tested: EngineConfig,
+    baseline: EngineConfig,
+    openings: list[str],
+    output: str | Path,
+    *,
+    max_games: int = 1000,
+    workers: int | None = None,
+    sprt: SPRT | None = None,
+    adjudication: Adjudication | None = None,
+    pgn: str | Path | None = None,
+) -> TournamentSummary:
+    """Plays games between two engines until the SPRT is decided.
+
+    Every opening is played twice with colours reversed. At most two games
+    per worker are queued at any time, so a decided test stops quickly.
+
+    Args:
+        tested (EngineConfig): The engine under test.
+        baseline (EngineConfig): The engine to compare against.
+        openings (list[str]): The openings to play.
+        output (str | Path): The JSON lines file to append results to.
+        max_games (int): The maximum number of games to play.
+        workers (int | None): The number of processes. Defaults to the CPU count.
+        sprt (SPRT | None): The test to run. Defaults to elo0=0, elo1=10.
+        adjudication (Adjudication | None): The rules to end games early.
+        pgn (str | Path | None): The PGN file to append the games to, if any.
+
+    Returns:
+        TournamentSummary: The summary of the tournament.
+
+    Raises:
+        ValueError: If there are no openings.
+
+    """
+    if not openings:
+        raise ValueError("No openings to play: the list of openings is empty.")
+
+    sprt = sprt or SPRT()
+    tasks = _game_tasks(tested, baseline, openings, max_games, adjudication or Adjudication())
+
+    workers = workers or os.cpu_count() or 1
+
+    with (
+        ProcessPoolExecutor(max_workers=workers) as executor,
+        open(output, "a") as file,
+        PGNWriter(pgn) if pgn is not None else nullcontext() as pgn_writer,
+    ):
+        max_pending = 2 * workers
+        pending: set[Future[GameRecord]] = set()
+
+        while True:
+            while sprt.decision is None and len(pending) < max_pending:
+                if (task := next(tasks, None)) is None:
+                    break
+                pending.add(executor.submit(play_game, task))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                game = future.result()
+                file.write(json.dumps(asdict(game)) + "\n")
+                file.flush()
+
+                if pgn_writer is not None:
+                    pgn_writer.write(pgn_game(game))
+                sprt.add(_score_for(game, tested.name))
+
+            if sprt.decision is not None:
+                for future in pending:
+                    future.cancel()
+                break
+
+    elo, margin = sprt.elo()
+
+    return TournamentSummary(
+        sprt.games, sprt.wins, sprt.draws, sprt.losses, elo, margin, sprt.llr, sprt.decision
+    )
+
+
+def pgn_game(game: GameRecord) -> PGNGame:
+    """Builds the PGN record of a played game.
+
+    Openings given as moves are part of the game's moves; games from a FEN
+    string start from that position.
+
+    Args:
+        game (GameRecord): The game.
+
+    Returns:
+        PGNGame: The game with its moves in SAN.
+
+    """
+    tags = {
+        "Event": "Tournament",
+        "Round": str(game.game_id + 1),
+        "White": game.white,
+        "Black": game.black,
+        "Termination": game.reason,
+    }
+
+    if "/" in game.opening:
+        board, turn = board_from_fen(game.opening)
+        return game_from_moves(game.moves, game.result, tags, board=board, turn=turn)
+
+    return game_from_moves(game.opening.split() + game.moves, game.result, tags)
+
+
+def _game_tasks(
+    tested: EngineConfig,
+    baseline: EngineConfig,
+    openings: list[str],
+    max_games: int,
+    adjudication: Adjudication,
+) -> Iterator[GameTask]:
+    """Generates games, playing every opening with both colours.
+
+    Args:
+        tested (EngineConfig): The engine under test.
+        baseline (EngineConfig): The engine to compare against.
+        openings (list[str]): The openings to play.
+        max_games (int): The number of games to generate.
+        adjudication (Adjudication): The rules to end games early.
+
+    Yields:
+        GameTask: The next game to play.
+
+    """
+    for game_id in range(max_games):
+        opening = openings[game_id // 2 % len(openings)]
+        white, black = (tested, baseline) if game_id % 2 == 0 else (baseline, tested)
+        yield GameTask(game_id, opening, white, black, adjudication)
+
+
+def _setup_opening(opening: str) -> tuple[Board, Colour]:
+    """Sets up the position of an opening.
+
+    Args:
+        opening (str): A FEN string or a list of moves from the starting position.
+
+    Returns:
+        tuple[Board, Colour]: The board and the colour of the player to move.
+
+    Raises:
+        ValueError: If the opening is invalid.
+
+    """
+    if "/" in opening:
+        return board_from_fen(opening)
+
+    board, turn = Board(), Colour.WHITE
+
+    for move in opening.split():
+        if not board.is_legal_move(move, turn):
+            raise ValueError(f"Illegal move in opening {opening!r}: {move}")
+
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return board, turn
+
+
+def _known_result(board: Board, turn: Colour) -> GameResult | None:
+    """Adjudicates positions whose result is known from the material alone.
+
+    Draws: no pawns and no side with more than a single minor piece.
+    Wins: a bare King against a Queen or a Rook and nothing else, unless
+    the bare King is to move and stalemated or can take the piece.
+
+    Args:
+        board (Board): The board.
+        turn (Colour): The colour of the player to move.
+
+    Returns:
+        GameResult | None: The result. None if the material does not decide it.
+
+    """
+    material: dict[Colour, list[type]] = {Colour.WHITE: [], Colour.BLACK: []}
+
+    for row in board.state:
+        for piece in row:
+            if piece is not None and not isinstance(piece, King):
+                material[piece.colour].append(type(piece))
+
+    if any(Pawn in pieces for pieces in material.values()):
+        return None
+
+    if all(set(pieces) <= {Knight, Bishop} and len(pieces) <= 1 for pieces in material.values()):
+        return GameResult.DRAW
+
+    for colour in Colour:
+        if not material[~colour] and material[colour] in ([Queen], [Rook]):
+            return None if turn != colour and _bare_king_holds(board, turn) else _win_for(colour)
+
+    return None
+
+
+def _bare_king_holds(board: Board, colour: Colour) -> bool:
+    """Checks whether a bare King to move is stalemated or can take the piece left against it.
+
+    Args:
+        board (Board): The board.
+        colour (Colour): The colour of the bare King.
+
+    Returns:
+        bool: Whether the game is not won yet by the other player.
+
+    """
+    files = "abcdefgh"
+    targets = {
+        f"{files[file_]}{rank + 1}"
+        for rank, row in enumerate(board.state)
+        for file_, piece in enumerate(row)
+        if piece is not None and piece.colour != colour and not isinstance(piece, King)
+    }
+    moves = board.legal_moves(colour)
+
+    return not moves or any(move[2:4] in targets for move in moves)
+
+
+def _is_irreversible(board: Board, move: str) -> bool:
+    """Checks whether a move resets the fifty-move counter.
+
+    Args:
+        board (Board): The board before the move.
+        move (str): The move in the notation of Board.legal_moves.
+
+    Returns:
+        bool: Whether the move is a pawn move or a capture.
+
+    """
+    if move in {"o-o", "o-o-o"}:
+        return False
+
+    files = "abcdefgh"
+    piece = board.state[int(move[1]) - 1][files.index(move[0])]
+    target = board.state[int(move[3]) - 1][files.index(move[2])]
+
+    return isinstance(piece, Pawn) or target is not None
+
+
+def _streak(streak: int, white_score: int, threshold: int) -> int:
+    """Updates a signed count of consecutive plies beyond a score threshold.
+
+    Args:
+        streak (int): The current streak, positive while White is winning.
+        white_score (int): The score from White's point of view.
+        threshold (int): The score threshold.
+
+    Returns:
+        int: The updated streak.
+
+    """
+    if white_score >= threshold:
+        return max(streak, 0) + 1
+
+    if white_score <= -threshold:
+        return min(streak, 0) - 1
+
+    return 0
+
+
+def _win_for(colour: Colour) -> GameResult:
+    """The result of a game won by a player."""
+    return GameResult.WHITE_WINS if colour == Colour.WHITE else GameResult.BLACK_WINS
+
+
+def _score_for(game: GameRecord, name: str) -> float:
+    """The score of an engine in a game: 1 for a win, 0.5 for a draw, 0 for a loss."""
+    if game.result == GameResult.DRAW:
+        return 0.5
+
+    winner = game.white if game.result == GameResult.WHITE_WINS else game.black
+    return 1.0 if winner == name else 0.0
+
+
+def _expected_score(elo: float) -> float:
+    """The expected score of a player with a given Elo advantage."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def _elo(score: float) -> float:
+    """The Elo difference corresponding to an expected score."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def main() -> None:
+    """Runs a tournament from the command line."""
+    parser = argparse.ArgumentParser(description="Engine-vs-engine tournament with SPRT.")
+    parser.add_argument("openings", type=Path, help="file with one FEN or move list per line")
+    parser.add_argument("--output", type=Path, default=Path("tournament.jsonl"))
+    parser.add_argument("--pgn", type=Path, default=None, help="PGN file to append games to")
+    parser.add_argument("--games", type=int, default=1000, help="maximum number of games")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    parser.add_argument("--tested-depth", type=int, default=2)
+    parser.add_argument("--baseline-depth", type=int, default=1)
+    parser.add_argument("--movetime", type=float, default=None, help="seconds per move")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    summary = run_tournament(
+        EngineConfig("tested", SearchLimits(depth=args.tested_depth, movetime=args.movetime)),
+        EngineConfig("baseline", SearchLimits(depth=args.baseline_depth, movetime=args.movetime)),
+        load_openings(args.openings),
+        args.output,
+        max_games=args.games,
+        workers=args.workers,
+        sprt=SPRT(args.elo0, args.elo1, args.alpha, args.beta),
+        pgn=args.pgn,
+    )
+
+    print(
+        f"Games: {summary.games} (+{summary.wins} ={summary.draws} -{summary.losses})",
+        f"Elo: {summary.elo:.1f} +/- {summary.elo_margin:.1f}",
+        f"LLR: {summary.llr:.2f} Decision: {summary.decision or 'undecided'}",
+        sep="\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""This module provides a UCI front end for the engine.
+
+Run it with `python -m chess.uci`. The engine reads commands on the main thread
+and searches on a worker thread, so commands like 'stop' and 'isready' are
+answered while a search is running.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from copy import deepcopy
+from enum import StrEnum
+from itertools import pairwise
+from typing import TYPE_CHECKING, override
+
+from chess.board import Board
+from chess.book import OpeningBook
+from chess.colour_and_aliases import Colour
+from chess.engine import MATE_SCORE, SearchController, Searcher, SearchLimits, allocate_time
+from chess.engine.search import MAX_DEPTH
+from chess.fen import board_from_fen
+from chess.pieces import King
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import TextIO
+
+    from chess.engine import SearchResult
+
+_STARTPOS = "startpos"
+
+
+class _UCICommand(StrEnum):
+    """Enum class for UCI commands."""
+
+    UCI = "uci"
+    IS_READY = "isready"
+    SET_OPTION = "setoption"
+    NEW_GAME = "ucinewgame"
+    POSITION = "position"
+    GO = "go"
+    STOP = "stop"
+    QUIT = "quit"
+    UNKNOWN = "unknown"  # Default value for unsupported commands
+
+    @classmethod
+    @override
+    def _missing_(cls, value: object) -> _UCICommand:
+        return cls.UNKNOWN
+
+
+class UCIEngine:
+    """Speaks the UCI protocol on top of the engine search.
+
+    Attributes:
+        searcher (Searcher): The engine search.
+        board (Board): The current position.
+        turn (Colour): The colour of the player to move in the current position.
+        threads (int): The number of search threads. The search is single-threaded.
+        book (OpeningBook | None): The opening book whose moves are played
+            without searching.
+
+    """
+
+    def __init__(self, output: TextIO | None = None, searcher: Searcher | None = None):
+        self.searcher: Searcher = searcher or Searcher()
+        self.board: Board = Board()
+        self.turn: Colour = Colour.WHITE
+        self.threads: int = 1
+        self.book: OpeningBook | None = None
+        self._output: TextIO = output or sys.stdout
+        self._output_lock: threading.Lock = threading.Lock()
+        self._base: str = _STARTPOS
+        self._moves: list[str] = []
+        self._search_thread: threading.Thread | None = None
+        self._controller: SearchController | None = None
+        self._infinite: bool = False
+        self._stop_requested: threading.Event = threading.Event()
+        self._handlers: dict[_UCICommand, Callable[[list[str]], None]] = {
+            _UCICommand.UCI: self._uci,
+            _UCICommand.IS_READY: lambda _: self._send("readyok"),
+            _UCICommand.SET_OPTION: self._set_option,
+            _UCICommand.NEW_GAME: self._new_game,
+            _UCICommand.POSITION: self._position,
+            _UCICommand.GO: self._go,
+            _UCICommand.STOP: lambda _: self.stop(),
+        }
+
+    def run(self, input_stream: TextIO | None = None) -> None:
+        """Reads and handles commands until 'quit' or the end of the input.
+
+        Args:
+            input_stream (TextIO | None): The stream to read commands from.
+                Defaults to the standard input.
+
+        """
+        for line in input_stream or sys.stdin:
+            if not self.handle(line):
+                return
+
+        self.wait()
+
+    def handle(self, line: str) -> bool:
+        """Handles a single command.
+
+        Args:
+            line (str): The command line.
+
+        Returns:
+            bool: False if the engine has to quit. True otherwise.
+
+        """
+        if not (tokens := line.split()):
+            return True
+
+        if (command := _UCICommand(tokens[0])) == _UCICommand.QUIT:
+            self.stop()
+            return False
+
+        if (handler := self._handlers.get(command)) is None:
+            self._send(f"info string unknown command {tokens[0]}")
+            return True
+
+        handler(tokens[1:])
+        return True
+
+    def stop(self) -> None:
+        """Stops the running search and waits for its best move to be sent."""
+        self._stop_requested.set()
+
+        if self._controller is not None:
+            self._controller.stop()
+
+        self.wait()
+
+    def wait(self) -> None:
+        """Waits for the running search to finish. An infinite search is stopped."""
+        if self._search_thread is None:
+            return
+
+        if self._infinite:
+            self._stop_requested.set()
+
+            if self._controller is not None:
+                self._controller.stop()
+
+        self._search_thread.join()
+        self._search_thread = None
+
+    def _uci(self, _: list[str]) -> None:
+        """Identifies the engine and lists its options."""
+        self._send("id name chessgame")
+        self._send("id author vldryz")
+        self._send(f"option name Hash type spin default {self.searcher.hash_size} min 1 max 4096")
+        self._send("option name Threads type spin default 1 min 1 max 1")
+        self._send("option name Book type string default <empty>")
+        self._send("uciok")
+
+    def _set_option(self, args: list[str]) -> None:
+        """Handles 'setoption name <name> value <value>'."""
+        if "name" not in args or "value" not in args:
+            self._send("info string setoption needs a name and a value")
+            return
+
+        name = " ".join(args[args.index("name") + 1 : args.index("value")]).lower()
+        value = " ".join(args[args.index("value") + 1 :])
+
+        if name == "book":
+            self._set_book(value)
+
+        elif not value.isdigit():
+            self._send(f"info string invalid value {value}")
+
+        elif name == "hash":
+            self.searcher.resize_hash(max(int(value), 1))
+
+        elif name == "threads":
+            if int(value) != 1:
+                self._send("info string the search is single-threaded, Threads set to 1")
+            self.threads = 1
+
+        else:
+            self._send(f"info string unknown option {name}")
+
+    def _set_book(self, path: str) -> None:
+        """Opens the opening book at a path. '<empty>' turns the book off."""
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+
+        if path in {"", "<empty>"}:
+            return
+
+        try:
+            self.book = OpeningBook(path)
+
+        except (OSError, ValueError) as error:
+            self._send(f"info string cannot open book: {error}")
+
+    def _new_game(self, _: list[str]) -> None:
+        """Forgets everything about the previous game."""
+        self.stop()
+        self.searcher.clear_hash()
+        self._set_position(_STARTPOS, [])
+
+    def _position(self, args: list[str]) -> None:
+        """Handles 'position [startpos | fen <fen>] moves <moves>'."""
+        moves_index = args.index("moves") if "moves" in args else len(args)
+        moves = args[moves_index + 1 :]
+
+        if args[:1] == [_STARTPOS]:
+            base = _STARTPOS
+
+        elif args[:1] == ["fen"]:
+            base = " ".join(args[1:moves_index])
+
+        else:
+            self._send("info string position needs startpos or fen")
+            return
+
+        try:
+            self._set_position(base, moves)
+
+        except ValueError as error:
+            self._send(f"info string invalid position: {error}")
+            self._set_position(_STARTPOS, [])
+
+    def _set_position(self, base: str, moves: list[str]) -> None:
+        """Sets up a position, reusing the current board when the moves extend it.
+
+        GUIs send the whole game with every 'position' command. When the base
+        position is the same and the moves start with the moves already played,
+        only the new moves are played instead of replaying the whole game.
+
+        Args:
+            base (str): 'startpos' or a FEN string.
+            moves (list[str]): The moves to play from the base position.
+
+        Raises:
+            ValueError: If the FEN string is invalid.
+
+        """
+        if base != self._base or moves[: len(self._moves)] != self._moves:
+            board, turn = (Board(), Colour.WHITE) if base == _STARTPOS else board_from_fen(base)
+            self.board, self.turn, self._base, self._moves = board, turn, base, []
+
+        for move in moves[len(self._moves) :]:
+            board_move = self._from_uci(move)
+
+            if not self.board.is_legal_move(board_move, self.turn):
+                self._send(f"info string illegal move {move}")
+                return
+
+            self.board.apply_move(board_move, self.turn)
+            self.turn = ~self.turn
+            self._moves.append(move)
+
+    def _go(self, args: list[str]) -> None:
+        """Handles 'go' and starts the search on a worker thread."""
+        self.stop()
+
+        limits = self._parse_go(args)
+
+        if not limits.infinite and (move := self._book_move()) is not None:
+            self._send(f"bestmove {self._to_uci(move, self.turn)}")
+            return
+
+        self._infinite = limits.infinite or (
+            limits.depth is None and allocate_time(limits, self.turn) is None
+        )
+        self._stop_requested.clear()
+        self._controller = SearchController(
+            allocate_time(limits, self.turn), self.searcher.check_every
+        )
+        self._search_thread = threading.Thread(
+            target=self._search,
+            args=(deepcopy(self.board), self.turn, limits, self._controller),
+            daemon=True,
+        )
+        self._search_thread.start()
+
+    def _book_move(self) -> str | None:
+        """Picks a legal move of the current position from the book, if there is one."""
+        if self.book is None:
+            return None
+
+        move = self.book.weighted_move(self.board, self.turn)
+        return move if move is not None and self.board.is_legal_move(move, self.turn) else None
+
+    def _search(
+        self, board: Board, turn: Colour, limits: SearchLimits, controller: SearchController
+    ) -> None:
+        """Runs a search and sends the best move.
+
+        Args:
+            board (Board): The position to search.
+            turn (Colour): The colour of the player to move.
+            limits (SearchLimits): The limits of the search.
+            controller (SearchController): The controller to stop the search with.
+
+        """
+        result = self.searcher.search(
+            board, turn, limits, controller, on_iteration=lambda info: self._send_info(info, turn)
+        )
+
+        # an infinite search reports its best move only once it is stopped
+        if limits.infinite:
+            self._stop_requested.wait()
+
+        move = self._to_uci(result.best_move, turn) if result.best_move else "0000"
+        self._send(f"bestmove {move}")
+
+    def _send_info(self, result: SearchResult, turn: Colour) -> None:
+        """Sends the result of a completed iteration."""
+        if abs(result.score) >= MATE_SCORE - MAX_DEPTH:
+            plies = MATE_SCORE - abs(result.score)
+            score = f"mate {(plies + 1) // 2 * (1 if result.score > 0 else -1)}"
+        else:
+            score = f"cp {result.score}"
+
+        pv = self._to_uci(result.best_move, turn) if result.best_move else ""
+        self._send(
+            f"info depth {result.depth} score {score} nodes {result.nodes}"
+            f" time {int(result.elapsed * 1000)} pv {pv}"
+        )
+
+    def _from_uci(self, move: str) -> str:
+        """Converts a UCI move to the notation of the board, e.g. 'e1g1' to 'o-o'."""
+        files = "abcdefgh"
+        if len(move) == 4 and move[0] in files and move[2] in files and move[1] in "18":
+            piece = self.board.state[int(move[1]) - 1][files.index(move[0])]
+
+            if isinstance(piece, King) and move[0] == "e" and move[2] in "cg":
+                return "o-o" if move[2] == "g" else "o-o-o"
+
+        return move
+
+    @staticmethod
+    def _to_uci(move: str, turn: Colour) -> str:
+        """Converts a move in the notation of the board to a UCI move."""
+        rank = "1" if turn == Colour.WHITE else "8"
+
+        if move == "o-o":
+            return f"e{rank}g{rank}"
+
+        if move == "o-o-o":
+            return f"e{rank}c{rank}"
+
+        return move
+
+    @staticmethod
+    def _parse_go(args: list[str]) -> SearchLimits:
+        """Parses the arguments of 'go' into search limits. Times are given in ms."""
+        values: dict[str, int] = {}
+
+        for name, value in pairwise(args):
+            if value.lstrip("-").isdigit():
+                values[name] = int(value)
+
+        def seconds(name: str) -> float | None:
+            return values[name] / 1000 if name in values else None
+
+        return SearchLimits(
+            depth=values.get("depth"),
+            movetime=seconds("movetime"),
+            white_time=seconds("wtime"),
+            black_time=seconds("btime"),
+            white_increment=seconds("winc") or 0.0,
+            black_increment=seconds("binc") or 0.0,
+            moves_to_go=values.get("movestogo"),
+            infinite="infinite" in args,
+        )
+
+    def _send(self, line: str) -> None:
+        """Writes a line to the output. Safe to call from any thread."""
+        with self._output_lock:
+            self._output.write(line + "\n")
+            self._output.flush()
+
+
+def main() -> None:
+    """Runs the UCI engine on the standard input and output."""
+    UCIEngine().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""This module provides Zobrist hashing of chess positions."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from chess.colour_and_aliases import Colour
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+if TYPE_CHECKING:
+    from chess.board import Board
+
+_random = random.Random(0x5EED)
+
+_PIECE_INDEX: dict[type, int] = {Pawn: 0, Knight: 1, Bishop: 2, Rook: 3, Queen: 4, King: 5}
+
+# one key per piece type, colour and square
+_PIECE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+_CASTLING_KEYS = {right: _random.getrandbits(64) for right in "KQkq"}
+_EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+_BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+
+
+def zobrist_key(board: Board, turn: Colour) -> int:
+    """Computes the 64-bit Zobrist key of a position.
+
+    Positions with the same pieces, player to move, castling rights
+    and en passant file have the same key.
+
+    Args:
+        board (Board): The board.
+        turn (Colour): The colour of the player to move.
+
+    Returns:
+        int: The Zobrist key.
+
+    """
+    key = 0
+
+    for rank, row in enumerate(board.state):
+        for file_, piece in enumerate(row):
+            if piece is None:
+                continue
+
+            kind = _PIECE_INDEX[type(piece)] * 2 + (piece.colour == Colour.BLACK)
+            key ^= _PIECE_KEYS[kind][rank * 8 + file_]
+
+            if piece is board.en_passant_pawn:
+                key ^= _EN_PASSANT_KEYS[file_]
+
+    for right in board.castling_rights().replace("-", ""):
+        key ^= _CASTLING_KEYS[right]
+
+    if turn == Colour.BLACK:
+        key ^= _BLACK_TO_MOVE_KEY
+
+    return key
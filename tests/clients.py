@@ -0,0 +1,66 @@
+"""This module provides the clients the tests of the game servers connect with."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Protocol
+
+type Client = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+type Connect = Callable[[], Awaitable[Client]]
+
+
+class Transport(asyncio.WriteTransport):
+    """A transport with a given number of bytes waiting to be sent."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.backlog = 0
+
+    def get_write_buffer_size(self) -> int:
+        return self.backlog
+
+
+class Writer:
+    """A client without a connection, keeping the lines sent to it."""
+
+    def __init__(self) -> None:
+        self.transport = Transport()
+        self.lines: list[bytes] = []
+
+    def write(self, data: bytes, /) -> None:
+        self.lines.append(data)
+
+
+class _Server(Protocol):
+    """A game server listening for clients, e.g. a GameServer or a ShardedServer."""
+
+    async def start(self, host: str = ..., port: int = ...) -> asyncio.Server:
+        """Starts listening for clients."""
+
+
+async def request(client: Client, command: str) -> str:
+    """Sends a command and reads the line replied to it."""
+    reader, writer = client
+    writer.write(f"{command}\n".encode())
+
+    return (await reader.readline()).decode().strip()
+
+
+async def with_clients(games: _Server, test: Callable[[Connect], Awaitable[None]]) -> None:
+    """Runs a test with a function connecting clients to a server, closing them after it."""
+    server = await games.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    clients: list[Client] = []
+
+    async def connect() -> Client:
+        clients.append(await asyncio.open_connection("127.0.0.1", port))
+        return clients[-1]
+
+    async with server:
+        try:
+            await test(connect)
+
+        finally:
+            # the server waits for its connections to close
+            for _, writer in clients:
+                writer.close()
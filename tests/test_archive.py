@@ -0,0 +1,133 @@
+"""This module provides tests for the binary game archive."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from chess.archive import (
+    ArchiveWriter,
+    GameArchive,
+    _pack_pgn_game,
+    decode_move,
+    encode_move,
+    pack_game,
+    write_archive,
+)
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.ingest import ingest
+from chess.pgn import PGNGame, PGNWriter, ReplayStats
+
+FEN = "4k3/P7/8/8/8/8/8/R3K2R w KQ - 0 1"
+
+
+@pytest.mark.parametrize("fen", [None, FEN, "r3k2r/1P6/8/8/8/8/8/4K3 b kq - 0 1"])
+def test_move_encoding(fen: str | None) -> None:
+    board, turn = board_from_fen(fen) if fen else (Board(), Colour.WHITE)
+
+    for colour in (turn, ~turn):
+        moves = board.legal_moves(colour)
+
+        assert [decode_move(encode_move(move)) for move in moves] == moves
+        assert all(0 <= encode_move(move) < 2**16 for move in moves)
+
+
+def test_write_and_read(tmp_path: Path) -> None:
+    path = tmp_path / "games.bin"
+    games = [
+        (["e2e4", "e7e5", "g1f3"], "1-0", None),
+        ([], "*", None),
+        (["a7a8q", "e8d7", "o-o"], "1/2-1/2", FEN),
+        (["e2e4"] * 500, "0-1", "8/8/8/8/8/8/8/K6k w - - 0 1"),
+    ]
+
+    assert write_archive((pack_game(*game) for game in games), path) == 4
+
+    with GameArchive(path) as archive:
+        assert len(archive) == 4
+        assert [(game.moves, game.result, game.fen) for game in archive] == games
+        assert len(archive[3]) == 500
+        assert archive[-2].moves == ["a7a8q", "e8d7", "o-o"]
+
+
+def test_failed_write_keeps_the_archive(tmp_path: Path) -> None:
+    path = tmp_path / "games.bin"
+    write_archive([pack_game(["e2e4"], "1-0")] * 3, path)
+
+    def records() -> Iterator[bytes]:
+        yield pack_game(["d2d4"], "0-1")
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError, match="interrupted"):
+        write_archive(records(), path)
+
+    with GameArchive(path) as archive:
+        assert [game.moves for game in archive] == [["e2e4"]] * 3
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_empty_archive(tmp_path: Path) -> None:
+    path = tmp_path / "games.bin"
+    ArchiveWriter(path).close()
+
+    with GameArchive(path) as archive:
+        assert len(archive) == 0
+        assert list(archive) == []
+
+
+def test_archive_is_compact(tmp_path: Path) -> None:
+    path = tmp_path / "games.bin"
+    moves = ["g1f3", "g8f6", "f3g1", "f6g8"] * 20
+
+    write_archive([pack_game(moves)], path)
+
+    # the header and the moves, padded for the index, the index and the trailer
+    assert path.stat().st_size == 4 + 2 * len(moves) + 4 + 8 + 16
+
+
+def test_pgn_game(tmp_path: Path) -> None:
+    path = tmp_path / "games.bin"
+    write_archive([pack_game(["a7a8q", "e8d7"], "1-0", FEN)], path)
+
+    with GameArchive(path) as archive:
+        game = archive[0].pgn_game({"Event": "Test"})
+
+    assert game == PGNGame({"Event": "Test", "SetUp": "1", "FEN": FEN}, ["a8=Q+", "Kd7"], "1-0")
+
+
+def test_pgn_round_trip(tmp_path: Path) -> None:
+    pgn, path = tmp_path / "games.pgn", tmp_path / "games.bin"
+    with PGNWriter(pgn) as writer:
+        writer.write(PGNGame({"Event": "First"}, ["e4", "e5", "Nf3"], "1-0"))
+        writer.write(PGNGame({"SetUp": "1", "FEN": FEN}, ["a8=Q+", "Kd7", "O-O"], "1/2-1/2"))
+        writer.write(PGNGame(moves=["e5"]))
+    stats = ReplayStats()
+
+    write_archive(ingest(pgn, _pack_pgn_game, workers=1, stats=stats), path)
+
+    with GameArchive(path) as archive:
+        assert [game.pgn_game().moves for game in archive] == [
+            ["e4", "e5", "Nf3"],
+            ["a8=Q+", "Kd7", "O-O"],
+        ]
+        assert archive[1].pgn_game().tags["FEN"] == FEN
+    assert stats.errors == 1
+
+
+def test_invalid_games() -> None:
+    with pytest.raises(ValueError, match="limited"):
+        pack_game(["e2e4"] * 2**16)
+
+    with pytest.raises(ValueError, match="Unknown result"):
+        pack_game([], "2-0")
+
+
+@pytest.mark.parametrize("data", [b"short", b"\x00" * 40])
+def test_invalid_file(tmp_path: Path, data: bytes) -> None:
+    path = tmp_path / "games.bin"
+    path.write_bytes(data)
+
+    with pytest.raises(ValueError, match="not a game archive"):
+        GameArchive(path)
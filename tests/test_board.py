@@ -1,14 +1,28 @@
 """This module provides tests for the Board class."""
 
 import pytest
-from pytest import CaptureFixture, MonkeyPatch
+from pytest import CaptureFixture
 
 from chess import Chess
-from chess.board import Board, MoveOutcome, _PromotionOption, _PromotionPiece
+from chess.board import (
+    Board,
+    MoveError,
+    MoveOutcome,
+    MoveRejection,
+    _PromotionOption,
+    _PromotionPiece,
+)
 from chess.colour_and_aliases import Colour, Square
+from chess.fen import board_to_fen
+from chess.pieces import King, Pawn, Queen, Rook
 from chess.pieces.piece_interface import Piece
 
 
+def _position(board: Board) -> tuple[str, tuple[bool, ...], Pawn | None]:
+    """The pieces, whether they moved and the pawn that can be captured en passant."""
+    return board_to_fen(board, Colour.WHITE), board.snapshot().moved, board.en_passant_pawn
+
+
 class TestDefaultBoard:
     """This class provides tests for the default board state.
 
@@ -330,22 +344,28 @@ class TestDefaultBoard:
 
         capfd.readouterr()  # clear stdout
 
-    @pytest.mark.parametrize("colour, expected", [(Colour.WHITE, (0, 4)), (Colour.BLACK, (7, 4))])
-    def test_find_king(self, colour: Colour, expected: Square) -> None:
+    @pytest.mark.parametrize("colour", [Colour.WHITE, Colour.BLACK])
+    def test_legal_moves(self, colour: Colour) -> None:
+        """Test that there are 20 legal moves on move 1 and the state is not altered."""
         board = Board()
-        assert board._find_king(colour) == expected
+        moves = board.legal_moves(colour)
 
-    def test_request_pawn_promotion_options(
-        self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
-    ) -> None:
-        # mimic user inputs
-        inputs = iter(["h", "p", "help", "q"])
-        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+        assert len(moves) == len(set(moves)) == 20
+        assert ("e2e4" if colour == Colour.WHITE else "e7e5") in moves
+        assert board.state == Board().state
 
+    def test_apply_move(self) -> None:
         board = Board()
-        assert board._request_pawn_promotion_option() == _PromotionOption.QUEEN
+        board.apply_move("e2e4", Colour.WHITE)
 
-        capfd.readouterr()  # clear stdout
+        assert board.state[1][4] is None
+        assert isinstance(board.state[3][4], Pawn)
+        assert board.en_passant_pawn is board.state[3][4]
+
+    @pytest.mark.parametrize("colour, expected", [(Colour.WHITE, (0, 4)), (Colour.BLACK, (7, 4))])
+    def test_find_king(self, colour: Colour, expected: Square) -> None:
+        board = Board()
+        assert board._find_king(colour) == expected
 
     @pytest.mark.parametrize(
         "notation, expected",
@@ -506,7 +526,6 @@ class TestBoardOne:
     def test_pawn_promotion(
         self,
         game_one: Chess,
-        monkeypatch: MonkeyPatch,
         capfd: CaptureFixture[str],
         end_square_raw: str,
         end_square: Square,
@@ -520,11 +539,9 @@ class TestBoardOne:
             The black king is in check after h7g8 capture and promotion
                 to either a Queen or Rook.
         """
-        monkeypatch.setattr("builtins.input", lambda _: user_input)
-
         board = game_one.board
 
-        assert board.make_move(f"h7{end_square_raw}", Colour.WHITE) in {
+        assert board.make_move(f"h7{end_square_raw}{user_input}", Colour.WHITE) in {
             MoveOutcome.SUCCESS,
             MoveOutcome.CHECK,
         }
@@ -544,6 +561,128 @@ class TestBoardOne:
 
         capfd.readouterr()  # clear stdout
 
+    @pytest.mark.parametrize(
+        "move, error",
+        [
+            ("h7g8", MoveError.PROMOTION_REQUIRED),
+            ("h7h8", MoveError.PROMOTION_REQUIRED),
+            ("h7g8k", MoveError.INVALID_NOTATION),
+            ("h7g8p", MoveError.INVALID_NOTATION),
+            ("e5e6q", MoveError.INVALID_PROMOTION),
+            ("h7g7q", MoveError.ILLEGAL_MOVE),
+        ],
+    )
+    def test_promotion_is_part_of_the_move(
+        self, game_one: Chess, capfd: CaptureFixture[str], move: str, error: MoveError
+    ) -> None:
+        board = game_one.board
+        state = [row.copy() for row in board.state]
+
+        rejection = board.attempt_move(move, Colour.WHITE)
+
+        assert isinstance(rejection, MoveRejection)
+        assert rejection.error == error
+        assert board.state == state
+        assert capfd.readouterr().out == ""
+
+    def test_promotion_without_piece_raises(self, game_one: Chess) -> None:
+        with pytest.raises(ValueError, match="promote"):
+            game_one.board._play_piece_move((6, 7), (7, 7))
+
+        assert isinstance(game_one.board.state[6][7], Pawn)
+
+    def test_legal_moves(self, game_one: Chess) -> None:
+        white_moves = game_one.board.legal_moves(Colour.WHITE)
+        black_moves = game_one.board.legal_moves(Colour.BLACK)
+
+        assert {"o-o", "e5f6", "h7g8q", "h7h8n"}.issubset(white_moves)
+        assert "o-o-o" not in white_moves
+        assert {"o-o-o", "g8d5"}.issubset(black_moves)
+        assert {"o-o", "e8f7", "d7d5"}.isdisjoint(black_moves)
+
+    @pytest.mark.parametrize(
+        "move, square", [("o-o", (0, 6)), ("e5f6", (5, 5)), ("h7g8r", (7, 6)), ("d5d7", (6, 3))]
+    )
+    def test_apply_move_does_not_print_or_prompt(
+        self, game_one: Chess, capfd: CaptureFixture[str], move: str, square: Square
+    ) -> None:
+        board = game_one.board
+        board.apply_move(move, Colour.WHITE)
+
+        piece = board.state[square[0]][square[1]]
+        assert piece is not None
+        assert piece.colour == Colour.WHITE
+        assert piece.moved is True
+        assert capfd.readouterr().out == ""
+
+    def test_castling_clears_en_passant(self, game_one: Chess) -> None:
+        board = game_one.board
+        board.apply_move("o-o", Colour.WHITE)
+
+        assert board.en_passant_pawn is None
+
+    def test_black_pawn_promotes(self, game_one: Chess) -> None:
+        board = game_one.board
+        board.state[1][0] = Pawn(Colour.BLACK)
+        board.apply_move("a2b1q", Colour.BLACK)
+
+        assert isinstance(board.state[0][1], Queen)
+        assert board.state[0][1].colour == Colour.BLACK
+
+    @pytest.mark.parametrize("colour", [Colour.WHITE, Colour.BLACK])
+    def test_take_back_restores_the_board(self, game_one: Chess, colour: Colour) -> None:
+        board = game_one.board
+        position = _position(board)
+
+        # castling, en passant, captures and promotions among them
+        for move in board.legal_moves(colour):
+            record = board.play(move, colour)
+            assert record.move == move
+            assert _position(board) != position
+
+            board.take_back(record)
+            assert _position(board) == position
+
+    def test_play_records_the_move(self, game_one: Chess) -> None:
+        board = game_one.board
+        pawn = board.en_passant_pawn
+
+        record = board.play("e5f6", Colour.WHITE)
+        assert record.captured is pawn and record.captured_square == (4, 5)
+        assert record.en_passant_pawn is pawn
+
+        record = board.play("o-o-o", Colour.BLACK)
+        assert isinstance(record.piece, King) and record.end == (7, 2)
+        assert record.captured is None and record.piece_moved is False
+
+        record = board.play("h7g8q", Colour.WHITE)
+        assert isinstance(record.promotion, Queen)
+        assert isinstance(record.captured, Piece)
+
+    def test_restore(self, game_one: Chess) -> None:
+        board = game_one.board
+        snapshot, position = board.snapshot(), _position(board)
+
+        for move, colour in (("o-o", Colour.WHITE), ("o-o-o", Colour.BLACK)):
+            board.apply_move(move, colour)
+
+        board.restore(snapshot)
+        assert _position(board) == position
+        assert board.castling_rights() == "Kq"
+
+    def test_cannot_short_castle_into_check(self, capfd: CaptureFixture[str]) -> None:
+        board = Board()
+        board.state = [[None] * 8 for _ in range(8)]
+        board.state[0][4], board.state[0][7] = King(Colour.WHITE), Rook(Colour.WHITE)
+        board.state[7][4], board.state[7][6] = King(Colour.BLACK), Rook(Colour.BLACK)
+
+        assert board._short_castle(Colour.WHITE) is False
+        assert "o-o" not in board.legal_moves(Colour.WHITE)
+        assert isinstance(board.state[0][4], King)
+        assert board.state[0][6] is None
+
+        capfd.readouterr()  # clear stdout
+
 
 class TestBoardTwo:
     """Test BoardTwo test board."""
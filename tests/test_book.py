@@ -0,0 +1,139 @@
+"""This module provides tests for the opening books."""
+
+import io
+import random
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from chess.board import Board
+from chess.book import ENTRY, BookEntry, OpeningBook, _book_entries, build_book
+from chess.colour_and_aliases import Colour
+from chess.pgn import read_games
+from chess.polyglot import polyglot_key
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 1/2-1/2
+
+[Result "0-1"]
+
+1. d4 d5 0-1
+
+[Result "1-0"]
+
+1. e4 e5 2. Qh5 Kxh5 1-0
+"""
+
+
+@pytest.fixture
+def book_path(tmp_path: Path) -> Path:
+    """Pytest fixture for a book built from a few games."""
+    path = tmp_path / "book.bin"
+    build_book(read_games(io.StringIO(PGN)), path)
+
+    return path
+
+
+class TestBuildBook:
+    """Test building books from games."""
+
+    def test_stats(self, tmp_path: Path) -> None:
+        stats = build_book(read_games(io.StringIO(PGN)), tmp_path / "book.bin")
+
+        assert (stats.games, stats.errors) == (4, 1)
+        assert stats.entries == 9
+        assert stats.positions == 6
+
+    def test_entries_are_sorted_by_key(self, book_path: Path) -> None:
+        data = book_path.read_bytes()
+        keys = [ENTRY.unpack_from(data, offset)[0] for offset in range(0, len(data), ENTRY.size)]
+
+        assert len(data) == 9 * ENTRY.size
+        assert keys == sorted(keys)
+
+    def test_plies_and_min_count(self, tmp_path: Path) -> None:
+        path = tmp_path / "book.bin"
+        stats = build_book(read_games(io.StringIO(PGN)), path, plies=1, min_count=2)
+
+        assert stats.entries == 1
+        with OpeningBook(path) as book:
+            assert book.entries(Board(), Colour.WHITE) == [BookEntry("e2e4", 5, 3)]
+
+    def test_weights_are_scaled(self) -> None:
+        moves = {1: defaultdict(lambda: [0, 0], {2: [200_000, 100_000], 3: [1, 1], 4: [0, 1]})}
+
+        assert _book_entries(moves, min_count=1) == [
+            (1, 2, 2**16 - 1, 100_000),
+            (1, 3, 1, 1),
+            (1, 4, 0, 1),
+        ]
+
+
+class TestOpeningBook:
+    """Test probing books."""
+
+    def test_entries(self, book_path: Path) -> None:
+        with OpeningBook(book_path) as book:
+            assert len(book) == 9
+            assert book.entries(Board(), Colour.WHITE) == [
+                BookEntry("e2e4", 5, 3),
+                BookEntry("d2d4", 0, 1),
+            ]
+
+    def test_entries_after_moves(self, book_path: Path) -> None:
+        board = Board()
+        board.apply_move("e2e4", Colour.WHITE)
+
+        with OpeningBook(book_path) as book:
+            assert book.entries(board, Colour.BLACK) == [
+                BookEntry("c7c5", 1, 1),
+                BookEntry("e7e5", 0, 2),
+            ]
+
+    def test_best_move(self, book_path: Path) -> None:
+        with OpeningBook(book_path) as book:
+            assert book.best_move(Board(), Colour.WHITE) == "e2e4"
+
+    def test_weighted_move_skips_zero_weights(self, book_path: Path) -> None:
+        board = Board()
+        board.apply_move("e2e4", Colour.WHITE)
+        rng = random.Random(0)
+
+        with OpeningBook(book_path) as book:
+            assert {book.weighted_move(board, Colour.BLACK, rng) for _ in range(20)} == {"c7c5"}
+
+    def test_position_not_in_book(self, book_path: Path) -> None:
+        board = Board()
+        board.apply_move("a2a3", Colour.WHITE)
+
+        with OpeningBook(book_path) as book:
+            assert book.entries(board, Colour.BLACK) == []
+            assert book.best_move(board, Colour.BLACK) is None
+            assert book.weighted_move(board, Colour.BLACK) is None
+
+    def test_reads_foreign_books(self, tmp_path: Path) -> None:
+        path = tmp_path / "book.bin"
+        key = polyglot_key(Board(), Colour.WHITE)
+        # g1f3 with weight 3 and an unused learn value, next to an unrelated key
+        path.write_bytes(ENTRY.pack(key, 0o0625, 3, 0) + ENTRY.pack(key + 1, 0o1434, 1, 0))
+
+        with OpeningBook(path) as book:
+            assert book.entries(Board(), Colour.WHITE) == [BookEntry("g1f3", 3, 0)]
+
+    def test_empty_book(self, tmp_path: Path) -> None:
+        (path := tmp_path / "book.bin").write_bytes(b"")
+
+        with OpeningBook(path) as book:
+            assert book.entries(Board(), Colour.WHITE) == []
+
+    def test_invalid_book(self, tmp_path: Path) -> None:
+        (path := tmp_path / "book.bin").write_bytes(b"not a book")
+
+        with pytest.raises(ValueError, match="not an opening book"):
+            OpeningBook(path)
@@ -0,0 +1,105 @@
+"""This module provides tests for the broadcasting of games to spectators."""
+
+import pytest
+
+from chess import Chess
+from chess.broadcast import Broadcaster, changed_squares, describe, encode_delta, encode_snapshot
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from tests.clients import Writer
+
+FEN = "r3k3/8/8/8/3p4/8/4P3/4K2R w Kq - 0 1"
+
+
+@pytest.mark.parametrize(
+    "moves, delta",
+    [
+        (["e2e4"], "e2-,e4P"),
+        (["o-o"], "e1-,g1K,h1-,f1R"),
+        (["e2e4", "d4e3"], "d4-,e3p,e4-"),
+        (["e2e4", "o-o-o"], "e8-,c8k,a8-,d8r"),
+    ],
+)
+def test_deltas(moves: list[str], delta: str) -> None:
+    board, turn = board_from_fen(FEN)
+    game = Chess(board, turn=turn)
+
+    for move in moves:
+        assert game.push(move).ok
+
+    assert game.last_move is not None
+    assert encode_delta("g1", game, changed_squares(game.last_move)) == (
+        f"delta g1 {len(moves)} {delta} ongoing *\n".encode()
+    )
+
+
+def test_snapshot_and_status_change() -> None:
+    game = Chess()
+    assert game.last_move is None
+    game.resign()
+
+    assert encode_delta("g1", game, []) == b"delta g1 0 - resignation 0-1\n"
+    assert encode_snapshot("g1", game) == (f"snapshot {describe('g1', game)}\n".encode())
+    assert describe("g1", game) == (
+        "g1 0 rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 resignation 0-1"
+    )
+    assert game.turn == Colour.WHITE
+
+
+def test_slow_spectators() -> None:
+    spectators = Broadcaster(max_backlog=100)
+    fast, slow, other = Writer(), Writer(), Writer()
+    snapshots: list[int] = []
+
+    def snapshot() -> bytes:
+        snapshots.append(1)
+        return b"snapshot\n"
+
+    for spectator in (fast, slow):
+        spectators.subscribe("g1", spectator)
+    spectators.subscribe("g2", other)
+
+    spectators.publish("g1", b"delta 1\n", snapshot)
+    slow.transport.backlog = 200
+    spectators.publish("g1", b"delta 2\n", snapshot)
+    spectators.publish("g1", b"delta 3\n", snapshot)
+
+    # once caught up, a slow spectator gets a snapshot instead of the deltas it missed
+    slow.transport.backlog = 0
+    spectators.publish("g1", b"delta 4\n", snapshot)
+    spectators.publish("g1", b"delta 5\n", snapshot)
+
+    assert fast.lines == [b"delta %d\n" % ply for ply in range(1, 6)]
+    assert slow.lines == [b"delta 1\n", b"snapshot\n", b"delta 5\n"]
+    assert (other.lines, spectators.skipped, len(snapshots)) == ([], 2, 1)
+
+    # every delta is encoded once for all the spectators
+    assert fast.lines[-1] is slow.lines[-1]
+
+    spectators.unsubscribe("g1", fast)
+    spectators.unsubscribe_all(slow)
+    spectators.publish("g1", b"delta 6\n", snapshot)
+    assert (len(fast.lines), len(slow.lines)) == (5, 3)
+
+
+def test_slow_spectator_catches_up_without_a_delta() -> None:
+    spectators = Broadcaster(max_backlog=100)
+    slow = Writer()
+    spectators.subscribe("g1", slow)
+    snapshots: dict[str, bytes | None] = {"g1": None}
+
+    # the last delta of the game is missed
+    slow.transport.backlog = 200
+    spectators.publish("g1", b"delta 1 checkmate\n", lambda: b"snapshot\n")
+    spectators.catch_up(snapshots.get)
+    assert slow.lines == []
+
+    # a game that cannot be read is tried again later
+    slow.transport.backlog = 0
+    spectators.catch_up(snapshots.get)
+    assert slow.lines == []
+
+    snapshots["g1"] = b"snapshot 1 checkmate\n"
+    spectators.catch_up(snapshots.get)
+    spectators.catch_up(snapshots.get)
+    assert slow.lines == [b"snapshot 1 checkmate\n"]
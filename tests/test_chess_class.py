@@ -1,99 +1,226 @@
 """This module provides tests for the Chess class."""
 
-import os
-from tempfile import TemporaryDirectory
+import random
 
 import pytest
-from pytest import CaptureFixture, MonkeyPatch
-from pytest_mock import MockerFixture
+from pytest import CaptureFixture
 
 from chess import Chess
-from chess.board import MoveOutcome
+from chess.board import Board, MoveError, MoveOutcome
+from chess.chess_class import GameStatus, MoveResult
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen, board_to_fen
+from chess.pieces import Rook
 
+FEN = "rnbqkbnr/pppp1ppp/8/4p3/6P1/5P2/PPPPP2P/RNBQKBNR b KQkq g3 0 1"
 
-class TestDefaultChess:
-    """Test the default chess game."""
 
-    def test_move_history_is_saved_to_file(
-        self, mocker: MockerFixture, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
-    ) -> None:
-        """Test func that saves the move history."""
-        mocker.patch(
-            "chess.board.Board.make_move",
-            side_effect=[MoveOutcome.SUCCESS, MoveOutcome.SUCCESS, MoveOutcome.CHECKMATE],
-        )
+def _random_moves(plies: int) -> list[str]:
+    """Plays a game of random moves."""
+    rng, board, turn, moves = random.Random(0), Board(), Colour.WHITE, []
 
-        with TemporaryDirectory() as temp_dir:
-            inputs = iter(
-                [
-                    "e2e4",
-                    "e7e5",
-                    "b1c3",
-                    "save move history",
-                    "help",
-                    "nonsense",
-                    f"{temp_dir}/test.txt",
-                    "no",
-                ]
-            )
-            monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-
-            filename = os.path.join(temp_dir, "test.txt")
-
-            with pytest.raises(SystemExit):
-                Chess().play()
-
-            capfd.readouterr()  # clear stdout
-
-            assert os.path.exists(filename)
-            with open(filename) as f:
-                assert f.read() == "1. e2e4; 1. e7e5\n2. b1c3"
-
-    def test_game_ended_in_checkmate_prompts_option_to_continue(
-        self, mocker: MockerFixture, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
-    ) -> None:
-        mocker.patch("chess.board.Board.make_move", return_value=MoveOutcome.CHECKMATE)
-        after_match_spy = mocker.patch(
-            "chess.chess_class.Chess._after_match", wraps=Chess()._after_match
-        )
+    for _ in range(plies):
+        moves.append(move := rng.choice(board.legal_moves(turn)))
+        board.apply_move(move, turn)
+        turn = ~turn
+
+    return moves
+
+
+def _fens(moves: list[str]) -> list[str]:
+    """The FEN of the positions of a game, from the start to the end."""
+    board, turn = Board(), Colour.WHITE
+    fens = [board_to_fen(board, turn)]
+
+    for move in moves:
+        board.apply_move(move, turn)
+        turn = ~turn
+        fens.append(board_to_fen(board, turn))
+
+    return fens
+
+
+MOVES = _random_moves(80)
+
+
+class TestChess:
+    """Test the headless game API."""
 
-        inputs = iter(["e2e4", "help", "no"])
-        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    def test_push(self, capfd: CaptureFixture[str]) -> None:
+        game = Chess()
 
-        with pytest.raises(SystemExit) as pytest_wrapped_e:
-            Chess().play()
+        assert game.push("e2e4") == MoveResult(MoveOutcome.SUCCESS, "e2e4")
+        assert (game.turn, game.move_number) == (Colour.BLACK, 1)
 
-        capfd.readouterr()  # clear stdout
+        assert game.push("e7e5").ok
+        assert (game.turn, game.move_number) == (Colour.WHITE, 2)
+        assert game.move_history == ["e2e4", "e7e5"]
+        assert capfd.readouterr().out == ""
 
-        after_match_spy.assert_called_once()
-        assert pytest_wrapped_e.type is SystemExit
-        assert pytest_wrapped_e.value.code == 0
+    @pytest.mark.parametrize(
+        "move, error",
+        [
+            ("e2e5", MoveError.ILLEGAL_MOVE),
+            ("e7e5", MoveError.WRONG_TURN),
+            ("e3e4", MoveError.NO_PIECE),
+            ("nonsense", MoveError.INVALID_NOTATION),
+            ("o-o", MoveError.CASTLING_BLOCKED),
+        ],
+    )
+    def test_rejected_moves(self, move: str, error: MoveError) -> None:
+        game = Chess()
+        result = game.push(move)
 
-    def test_exit(self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]) -> None:
-        """Test that the program exits with code 0 when the user inputs 'exit'."""
-        monkeypatch.setattr("builtins.input", lambda _: "exit")
+        assert not result.ok
+        assert result.outcome == MoveOutcome.FAILURE
+        assert result.rejection is not None and result.rejection.error == error
+        assert result.rejection.message.startswith("Invalid Move")
+        assert (game.turn, game.move_history) == (Colour.WHITE, [])
 
-        with pytest.raises(SystemExit) as pytest_wrapped_e:
-            Chess().play()
+    def test_checkmate(self) -> None:
+        game = Chess()
 
-        capfd.readouterr()  # clear stdout
+        for move in ("f2f3", "e7e5", "g2g4"):
+            game.push(move)
 
-        assert pytest_wrapped_e.type is SystemExit
-        assert pytest_wrapped_e.value.code == 0
+        assert game.push("d8h4").outcome == MoveOutcome.CHECKMATE
+        assert (game.status, game.result, game.is_over) == (GameStatus.CHECKMATE, "0-1", True)
+        assert game.legal_moves() == []
 
-    def test_moves_are_processed_correctly(
-        self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
-    ) -> None:
-        """Test that moves are processed correctly."""
-        chess = Chess()
+        result = game.push("a2a3")
+        assert result.rejection is not None and result.rejection.error == MoveError.GAME_OVER
+        assert len(game.move_history) == 4
 
-        inputs = iter(["f2f3", "e7e5", "g2g4", "d8h4", "no"])
-        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    def test_stalemate(self) -> None:
+        board, turn = board_from_fen("7k/8/6Q1/8/8/8/8/K7 w - - 0 1")
+        game = Chess(board, turn=turn)
 
-        with pytest.raises(SystemExit) as pytest_wrapped_e:
-            chess.play()
+        assert game.push("g6f7").outcome == MoveOutcome.STALEMATE
+        assert (game.status, game.result) == (GameStatus.STALEMATE, "1/2-1/2")
 
-        capfd.readouterr()  # clear stdout
+    def test_resign_and_draw(self) -> None:
+        game = Chess()
+        game.push("e2e4")
+        game.resign()
 
-        assert pytest_wrapped_e.type is SystemExit
-        assert pytest_wrapped_e.value.code == 0
+        assert (game.status, game.result) == (GameStatus.RESIGNATION, "1-0")
+        with pytest.raises(ValueError, match="over"):
+            game.agree_draw()
+
+        game = Chess()
+        game.resign(Colour.WHITE)
+        assert game.result == "0-1"
+
+        game = Chess()
+        game.agree_draw()
+        assert (game.status, game.result) == (GameStatus.AGREED_DRAW, "1/2-1/2")
+
+    def test_promotion(self, game_one: Chess) -> None:
+        result = game_one.push("h7g8")
+        assert result.rejection is not None
+        assert result.rejection.error == MoveError.PROMOTION_REQUIRED
+
+        assert game_one.push("h7g8", promotion="r") == MoveResult(MoveOutcome.CHECK, "h7g8r")
+        assert game_one.move_history == ["h7g8r"]
+        assert isinstance(game_one.board.state[7][6], Rook)
+
+    def test_legal_moves(self) -> None:
+        game = Chess()
+
+        assert len(game.legal_moves()) == 20
+        game.push("e2e4")
+        assert "e7e5" in game.legal_moves()
+        assert "e2e4" not in game.legal_moves()
+
+    def test_undo(self) -> None:
+        game = Chess()
+
+        for move in ("f2f3", "e7e5", "g2g4", "d8h4"):
+            game.push(move)
+
+        record = game.undo()
+        assert record.move == "d8h4"
+        assert (game.status, game.result, game.turn, game.move_number) == (
+            GameStatus.ONGOING,
+            "*",
+            Colour.BLACK,
+            2,
+        )
+        assert game.move_history == ["f2f3", "e7e5", "g2g4"]
+        assert board_to_fen(game.board, game.turn) == FEN
+
+        # the move taken back is replaced by a new one
+        assert game.push("b8c6").ok
+        assert game.line == ["f2f3", "e7e5", "g2g4", "b8c6"]
+
+        game = Chess()
+        with pytest.raises(ValueError, match="no move"):
+            game.undo()
+
+    def test_seek(self) -> None:
+        game = Chess.from_moves(MOVES)
+        assert (game.ply, game.move_number, game.turn) == (len(MOVES), 41, Colour.WHITE)
+        fens = _fens(MOVES)
+
+        # long seeks start from the saved positions
+        for ply in (0, 79, 33, 31, 64, 65, 1, 80, 40):
+            game.seek(ply)
+
+            assert game.ply == ply
+            assert board_to_fen(game.board, game.turn) == fens[ply]
+            assert game.move_history == MOVES[:ply]
+            assert game.move_number == 1 + ply // 2
+            assert game.line == MOVES
+
+        with pytest.raises(ValueError, match="between 0 and 80"):
+            game.seek(81)
+
+    def test_seek_to_the_end(self) -> None:
+        game = Chess.from_moves(["f2f3", "e7e5", "g2g4", "d8h4"])
+        assert (game.status, game.result) == (GameStatus.CHECKMATE, "0-1")
+
+        game.seek(2)
+        assert not game.is_over
+
+        game.seek(4)
+        assert (game.status, game.result) == (GameStatus.CHECKMATE, "0-1")
+        assert [record.move for record in game.moves] == game.move_history
+
+    def test_seek_keeps_an_ending_without_a_move(self) -> None:
+        game = Chess.from_moves(["e2e4", "e7e5", "g1f3"])
+        game.seek(2)
+        game.resign()
+
+        game.seek(game.ply)
+        assert (game.status, game.result) == (GameStatus.RESIGNATION, "0-1")
+
+        # the game is in progress away from the position it ended in
+        game.seek(1)
+        assert not game.is_over
+        game.seek(3)
+        assert not game.is_over
+        game.seek(2)
+        assert (game.status, game.result) == (GameStatus.RESIGNATION, "0-1")
+
+        # a new move replaces the ending
+        game.seek(1)
+        assert game.push("d7d5").ok
+        game.seek(1)
+        game.seek(2)
+        assert not game.is_over
+
+    def test_reset(self) -> None:
+        game = Chess.from_moves(MOVES)
+        board = game.board
+        game.resign()
+
+        game.reset()
+        assert game.board is board
+        assert board_to_fen(board, game.turn) == game.start_fen
+        assert (game.ply, game.line, game.move_number, game.status) == (
+            0,
+            [],
+            1,
+            GameStatus.ONGOING,
+        )
+        assert game.push("e2e4").ok
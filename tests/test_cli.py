@@ -0,0 +1,183 @@
+"""This module provides tests for the console interface."""
+
+import inspect
+import os
+from datetime import date
+from tempfile import TemporaryDirectory
+
+import pytest
+from pytest import CaptureFixture, MonkeyPatch
+from pytest_mock import MockerFixture
+
+from chess import Chess
+from chess.board import MoveOutcome
+from chess.cli import Shell
+from chess.pieces import Knight
+
+
+class TestShell:
+    """Test a game played on the console."""
+
+    def test_move_history_is_saved_to_file(
+        self, mocker: MockerFixture, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
+    ) -> None:
+        """Test func that saves the move history."""
+        mocker.patch(
+            "chess.board.Board.move_outcome",
+            side_effect=[MoveOutcome.SUCCESS, MoveOutcome.SUCCESS, MoveOutcome.CHECKMATE],
+        )
+
+        with TemporaryDirectory() as temp_dir:
+            inputs = iter(
+                [
+                    "e2e4",
+                    "e7e5",
+                    "b1c3",
+                    "save move history",
+                    "help",
+                    "nonsense",
+                    f"{temp_dir}/test.txt",
+                    f"{temp_dir}/test.pgn",
+                    "no",
+                ]
+            )
+            monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+            filename = os.path.join(temp_dir, "test.pgn")
+
+            with pytest.raises(SystemExit):
+                Shell().play()
+
+            capfd.readouterr()  # clear stdout
+
+            assert os.path.exists(filename)
+            with open(filename) as f:
+                assert f.read() == (
+                    '[Event "Casual game"]\n'
+                    '[Site "?"]\n'
+                    f'[Date "{date.today():%Y.%m.%d}"]\n'
+                    '[Round "-"]\n'
+                    '[White "?"]\n'
+                    '[Black "?"]\n'
+                    '[Result "1-0"]\n'
+                    "\n"
+                    "1. e4 e5 2. Nc3 1-0\n"
+                    "\n"
+                )
+
+    def test_game_ended_in_checkmate_prompts_option_to_continue(
+        self, mocker: MockerFixture, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
+    ) -> None:
+        mocker.patch("chess.board.Board.move_outcome", return_value=MoveOutcome.CHECKMATE)
+        after_match_spy = mocker.patch("chess.cli.Shell._after_match", wraps=Shell()._after_match)
+
+        inputs = iter(["e2e4", "help", "no"])
+        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            Shell().play()
+
+        capfd.readouterr()  # clear stdout
+
+        after_match_spy.assert_called_once()
+        assert pytest_wrapped_e.type is SystemExit
+        assert pytest_wrapped_e.value.code == 0
+
+    def test_exit(self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]) -> None:
+        """Test that the program exits with code 0 when the user inputs 'exit'."""
+        monkeypatch.setattr("builtins.input", lambda _: "exit")
+
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            Shell().play()
+
+        capfd.readouterr()  # clear stdout
+
+        assert pytest_wrapped_e.type is SystemExit
+        assert pytest_wrapped_e.value.code == 0
+
+    def test_moves_are_processed_correctly(
+        self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
+    ) -> None:
+        """Test that moves are processed correctly."""
+        shell = Shell()
+
+        inputs = iter(["f2f3", "e7e5", "g2g4", "d8h4", "no"])
+        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            shell.play()
+
+        capfd.readouterr()  # clear stdout
+
+        assert pytest_wrapped_e.type is SystemExit
+        assert pytest_wrapped_e.value.code == 0
+
+    def test_rejected_move_prints_the_reason(
+        self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
+    ) -> None:
+        inputs = iter(["e2e5", "e7e5", "exit"])
+        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+        with pytest.raises(SystemExit):
+            Shell().play()
+
+        output = capfd.readouterr().out
+        assert "Invalid Move: Pawn cannot move to e5." in output
+        assert "Invalid Move: It is White's turn." in output
+
+    def test_request_promotion(self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]) -> None:
+        inputs = iter(["h", "p", "help", "q"])
+        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+        assert Shell._request_promotion() == "q"
+
+        capfd.readouterr()  # clear stdout
+
+    def test_promotion_is_asked_for_when_the_move_lacks_it(
+        self, game_one: Chess, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
+    ) -> None:
+        inputs = iter(["h7h8", "n", "exit"])
+        monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+        with pytest.raises(SystemExit):
+            Shell(game_one).play()
+
+        capfd.readouterr()  # clear stdout
+
+        assert game_one.move_history == ["h7h8n"]
+        assert isinstance(game_one.board.state[7][7], Knight)
+
+    def test_session_of_games_reuses_the_game(
+        self, monkeypatch: MonkeyPatch, capfd: CaptureFixture[str]
+    ) -> None:
+        shell = Shell()
+        board, pieces = (
+            shell.game.board,
+            [piece for row in shell.game.board.state for piece in row],
+        )
+
+        games = [["f2f3", "e7e5", "g2g4", "d8h4", "yes"], ["e2e4", "reset"], ["resign", "yes"]]
+        inputs = iter([*(move for _ in range(100) for game in games for move in game), "exit"])
+        depths = set()
+
+        def request(_prompt: str) -> str:
+            depths.add(len(inspect.stack(0)))
+            return next(inputs)
+
+        monkeypatch.setattr("builtins.input", request)
+
+        with pytest.raises(SystemExit):
+            shell.play()
+
+        capfd.readouterr()  # clear stdout
+
+        # every game was played in the same frames, by the same game on the same board
+        assert len(depths) <= 3
+        assert shell.game.board is board
+        assert all(
+            piece is saved
+            for piece, saved in zip(
+                (piece for row in board.state for piece in row), pieces, strict=True
+            )
+        )
+        assert shell.game.move_history == []
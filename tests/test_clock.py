@@ -0,0 +1,152 @@
+"""This module provides tests for the chess clocks."""
+
+import pytest
+
+from chess import Chess
+from chess.board import MoveError
+from chess.chess_class import GameStatus
+from chess.clock import ChessClock, FlagScheduler, IncrementMode, TimeControl
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+
+SECOND = 1_000_000_000
+
+
+class _Timer:
+    """A monotonic time moved forward by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "mode, spent, remaining",
+    [
+        # 10 s and a 3 s increment, moves of 2 s and of 5 s
+        (IncrementMode.FISCHER, (2, 5), (11, 9)),
+        (IncrementMode.BRONSTEIN, (2, 5), (10, 8)),
+        (IncrementMode.DELAY, (2, 5), (10, 8)),
+    ],
+)
+def test_increments(
+    mode: IncrementMode, spent: tuple[int, int], remaining: tuple[int, int]
+) -> None:
+    timer = _Timer()
+    clock = ChessClock(TimeControl(10, 3, mode), timer)
+
+    # the first move is not timed
+    clock.press(Colour.WHITE)
+    assert clock.running == Colour.BLACK
+
+    for seconds, left in zip(spent, remaining, strict=True):
+        timer.now += seconds * SECOND
+        clock.press(Colour.BLACK)
+        assert clock.remaining(Colour.BLACK) == left * SECOND
+
+        clock.press(Colour.WHITE)
+
+    assert clock.remaining(Colour.WHITE) == 10 * SECOND + (
+        6 * SECOND if mode == IncrementMode.FISCHER else 0
+    )
+
+
+def test_delay_and_deadline() -> None:
+    timer = _Timer()
+    clock = ChessClock(TimeControl(1, 2, IncrementMode.DELAY), timer)
+    clock.press(Colour.WHITE)
+
+    timer.now = 2 * SECOND
+    assert clock.remaining(Colour.BLACK) == SECOND
+    assert clock.deadline_ns() == 3 * SECOND
+
+    timer.now = 3 * SECOND
+    assert clock.flagged(Colour.BLACK)
+
+    clock.stop()
+    assert (clock.running, clock.deadline_ns(), clock.remaining(Colour.BLACK)) == (None, None, 0)
+
+
+def test_time_control() -> None:
+    assert TimeControl.parse("300+2") == TimeControl(300, 2)
+    assert str(TimeControl.parse("60")) == "60"
+    assert str(TimeControl(180, 2, IncrementMode.DELAY)) == "180+2"
+
+    with pytest.raises(ValueError, match="Invalid time control"):
+        TimeControl.parse("0+1")
+
+
+@pytest.mark.parametrize(
+    "fen, moves, result",
+    [
+        (None, ["e2e4", "e7e5", "g1f3"], "1-0"),
+        # Black flags with a lone King against a Knight
+        ("4k3/8/8/8/8/8/8/3NK3 w - - 0 1", ["d1c3"], "1/2-1/2"),
+    ],
+)
+def test_time_forfeit(fen: str | None, moves: list[str], result: str) -> None:
+    timer = _Timer()
+    board, turn = board_from_fen(fen) if fen else (None, Colour.WHITE)
+    game = Chess(board, turn=turn, clock=ChessClock(TimeControl(5), timer))
+
+    for move in moves:
+        assert game.push(move).ok
+
+    timer.now += 4 * SECOND
+    assert not game.check_time()
+
+    timer.now += SECOND
+    result_of_move = game.push("e8e7")
+    assert result_of_move.rejection is not None
+    assert result_of_move.rejection.error == MoveError.GAME_OVER
+    assert (game.status, game.result) == (GameStatus.TIME_FORFEIT, result)
+    assert game.clock is not None and game.clock.running is None
+    assert game.pgn_game().tags["TimeControl"] == "5"
+
+
+def test_clock_runs_for_the_player_to_move_after_undo() -> None:
+    timer = _Timer()
+    game = Chess(clock=ChessClock(TimeControl(10), timer))
+    assert game.push("e2e4").ok
+    timer.now += SECOND
+    assert game.push("e7e5").ok
+
+    # the time White spent before the undo still counts
+    timer.now += 2 * SECOND
+    game.undo()
+    assert game.clock is not None and game.clock.running == Colour.BLACK
+    assert game.clock.remaining(Colour.WHITE) == 8 * SECOND
+
+    timer.now += 20 * SECOND
+    assert game.check_time()
+    assert (game.status, game.result) == (GameStatus.TIME_FORFEIT, "1-0")
+
+    # seek hands the clock over too
+    game = Chess(clock=ChessClock(TimeControl(10), timer))
+    for move in ("e2e4", "e7e5", "g1f3"):
+        assert game.push(move).ok
+    game.seek(2)
+    assert game.clock is not None and game.clock.running == Colour.WHITE
+
+
+def test_scheduler() -> None:
+    flags: FlagScheduler[str] = FlagScheduler()
+    flags.schedule("a", 30)
+    flags.schedule("b", 10)
+    flags.schedule("c", 20)
+
+    # replaced and cancelled deadlines are skipped
+    flags.schedule("b", 40)
+    flags.schedule("c", None)
+
+    assert (len(flags), flags.next_deadline()) == (2, 30)
+    assert flags.pop_due(35) == ["a"]
+    assert flags.pop_due(100) == ["b"]
+    assert flags.next_deadline() is None
+
+    for deadline in range(1_000):
+        flags.schedule("a", deadline)
+    assert len(flags._heap) < 200
+    assert flags.pop_due(10_000) == ["a"]
@@ -0,0 +1,56 @@
+"""This module provides tests for the encoding of positions and moves."""
+
+import numpy as np
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine.encoding import (
+    ENCODED_SIZE,
+    PIECE_PLANES,
+    POLICY_SIZE,
+    decode_planes,
+    encode_castling,
+    encode_position,
+    move_index,
+)
+from chess.fen import board_from_fen
+from chess.pieces import King, Pawn
+
+
+def test_encode_starting_position() -> None:
+    encoded = encode_position(Board(), Colour.WHITE)
+    planes = decode_planes(encoded)
+
+    assert encoded.shape == (ENCODED_SIZE,)
+    assert planes.sum() == 32
+    assert planes[PIECE_PLANES[Pawn], 1].all()
+    assert planes[PIECE_PLANES[King], 0, 4]
+    assert planes[PIECE_PLANES[Pawn] + len(PIECE_PLANES), 6].all()
+
+
+def test_encoding_is_from_the_point_of_view_of_the_player_to_move() -> None:
+    board = Board()
+
+    # the starting position looks the same to both players
+    assert (encode_position(board, Colour.WHITE) == encode_position(board, Colour.BLACK)).all()
+
+
+def test_decode_batch() -> None:
+    batch = np.stack([encode_position(Board(), Colour.WHITE)] * 3)
+
+    assert decode_planes(batch).shape == (3, 12, 8, 8)
+
+
+def test_encode_castling() -> None:
+    board, turn = board_from_fen("r3k2r/8/8/8/8/8/8/R3K2R b Kq - 0 1")
+
+    assert encode_castling(board, turn) == 0b0110
+    assert encode_castling(board, ~turn) == 0b1001
+
+
+def test_move_index() -> None:
+    assert move_index("e2e4", Colour.WHITE) == 12 * 64 + 28
+    assert move_index("e7e5", Colour.BLACK) == 12 * 64 + 28
+    assert move_index("o-o", Colour.BLACK) == move_index("e1g1", Colour.WHITE)
+    assert move_index("e7e8q", Colour.WHITE) == move_index("e7e8", Colour.WHITE)
+    assert 0 <= move_index("h8a1", Colour.WHITE) < POLICY_SIZE
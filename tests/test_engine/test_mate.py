@@ -0,0 +1,47 @@
+"""This module provides tests for the mate solver."""
+
+import pytest
+
+from chess.engine import MateSolver
+from chess.fen import board_from_fen
+
+BACK_RANK = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+TWO_ROOKS = "6k1/5ppp/8/8/8/8/5PPP/3RR1K1 w - - 0 1"
+QUEEN_SACRIFICE = "r5k1/5ppp/8/8/8/8/4QPPP/4R1K1 w - - 0 1"
+QUIET_KEY_MOVE = "7k/8/5K2/8/8/8/8/6R1 w - - 0 1"
+
+
+class TestMateSolver:
+    """Test finding forced mates."""
+
+    def test_mate_in_one(self) -> None:
+        board, turn = board_from_fen(BACK_RANK)
+
+        assert MateSolver().solve(board, turn, 1) == {"a1a8": 1}
+
+    def test_reports_every_mating_move(self) -> None:
+        board, turn = board_from_fen(TWO_ROOKS)
+
+        assert MateSolver().solve(board, turn, 2) == {"d1d8": 1, "e1e8": 1}
+
+    def test_mate_in_two_against_every_defence(self) -> None:
+        board, turn = board_from_fen(QUEEN_SACRIFICE)
+        solver = MateSolver()
+
+        assert solver.solve(board, turn, 2) == {"e2e8": 2}
+        assert solver.mate_in(board, turn, 3) == 2
+        assert solver.mate_in(board, turn, 1) is None
+
+    def test_board_is_not_modified(self) -> None:
+        board, turn = board_from_fen(QUEEN_SACRIFICE)
+        MateSolver().solve(board, turn, 2)
+
+        assert board.state == board_from_fen(QUEEN_SACRIFICE)[0].state
+
+    @pytest.mark.parametrize(("checks_only", "mates"), [(True, False), (False, True)])
+    def test_quiet_moves_are_only_tried_when_asked(self, checks_only: bool, mates: bool) -> None:
+        # the quiet Kf7 first, then Rh1 mates
+        board, turn = board_from_fen(QUIET_KEY_MOVE)
+        solver = MateSolver(checks_only=checks_only)
+
+        assert (solver.mate_in(board, turn, 2) == 2) is mates
@@ -0,0 +1,70 @@
+"""This module provides tests for the neural network evaluation."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine import Searcher, SearchLimits
+from chess.engine.encoding import encode_position
+from chess.engine.nn import INPUT_SIZE, MLPEvaluator
+
+
+def positions() -> list[tuple[Board, Colour]]:
+    board = Board()
+    after_e4 = Board()
+    after_e4.apply_move("e2e4", Colour.WHITE)
+
+    return [(board, Colour.WHITE), (after_e4, Colour.BLACK), (board, Colour.BLACK)]
+
+
+class TestMLPEvaluator:
+    """Test the multilayer perceptron evaluation."""
+
+    def test_batch_matches_single_evaluations(self) -> None:
+        evaluator = MLPEvaluator.random((16, 8), seed=1)
+
+        assert evaluator.evaluate_batch(positions()) == [
+            evaluator.evaluate(board, colour) for board, colour in positions()
+        ]
+
+    def test_forward_computes_the_network(self) -> None:
+        evaluator = MLPEvaluator.random((4,), seed=2)
+        encoded = np.stack([encode_position(board, colour) for board, colour in positions()])
+        inputs = np.unpackbits(encoded, axis=-1).astype(np.float64)
+
+        hidden = np.maximum(inputs @ evaluator.weights[0] + evaluator.biases[0], 0)
+        expected = (hidden @ evaluator.weights[1] + evaluator.biases[1])[:, 0]
+
+        assert evaluator.forward(encoded) == pytest.approx(expected, rel=1e-4, abs=1e-3)
+
+    def test_empty_batch(self) -> None:
+        assert MLPEvaluator.random((4,)).evaluate_batch([]) == []
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        evaluator = MLPEvaluator.random((8, 4), seed=3)
+        evaluator.save(tmp_path / "network.npz")
+        loaded = MLPEvaluator.load(tmp_path / "network.npz")
+
+        assert loaded.evaluate_batch(positions()) == evaluator.evaluate_batch(positions())
+
+    @pytest.mark.parametrize(
+        ("weights", "biases"),
+        [
+            ([np.zeros((INPUT_SIZE, 1))], []),
+            ([np.zeros((10, 1))], [np.zeros(1)]),
+            ([np.zeros((INPUT_SIZE, 2))], [np.zeros(2)]),
+        ],
+    )
+    def test_invalid_layers(self, weights: list[np.ndarray], biases: list[np.ndarray]) -> None:
+        with pytest.raises(ValueError):
+            MLPEvaluator(weights, biases)
+
+    def test_search_with_network(self) -> None:
+        result = Searcher(evaluator=MLPEvaluator.random((8,))).search(
+            Board(), Colour.WHITE, SearchLimits(depth=2)
+        )
+
+        assert result.best_move in Board().legal_moves(Colour.WHITE)
@@ -0,0 +1,93 @@
+"""This module provides tests for the incrementally updated network evaluation."""
+
+from copy import deepcopy
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine import Searcher, SearchLimits
+from chess.engine.nnue import NNUEEvaluator
+from chess.fen import board_from_fen
+
+
+@pytest.fixture
+def evaluator() -> NNUEEvaluator:
+    return NNUEEvaluator.random(hidden=32, seed=1)
+
+
+def play_and_compare(evaluator: NNUEEvaluator, fen: str, moves: list[str]) -> None:
+    """Plays moves with incremental updates, checking them against full recomputation."""
+    board, turn = board_from_fen(fen)
+    evaluator.reset(board)
+    history = [evaluator.accumulator]
+
+    for move in moves:
+        evaluator.push(board, move, turn)
+        board = deepcopy(board)
+        board.apply_move(move, turn)
+        turn = ~turn
+
+        assert (evaluator.accumulator == evaluator.accumulate(board)).all()
+        history.append(evaluator.accumulator)
+
+    for accumulator in history[-2::-1]:
+        evaluator.pop()
+        assert (evaluator.accumulator == accumulator).all()
+
+
+class TestNNUEEvaluator:
+    """Test the incremental updates of the accumulators."""
+
+    def test_quiet_moves_and_captures(self, evaluator: NNUEEvaluator) -> None:
+        play_and_compare(
+            evaluator,
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            ["e2e4", "d7d5", "e4d5", "d8d5", "b1c3", "d5a2"],
+        )
+
+    def test_castling(self, evaluator: NNUEEvaluator) -> None:
+        play_and_compare(evaluator, "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", ["o-o", "o-o-o"])
+
+    def test_en_passant(self, evaluator: NNUEEvaluator) -> None:
+        play_and_compare(evaluator, "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", ["e5d6"])
+
+    def test_promotion(self, evaluator: NNUEEvaluator) -> None:
+        play_and_compare(
+            evaluator, "1r2k3/P6P/8/8/8/8/8/4K3 w - - 0 1", ["a7b8n", "e8e7", "h7h8q"]
+        )
+
+    def test_evaluate_matches_full_recomputation(self, evaluator: NNUEEvaluator) -> None:
+        board = Board()
+        evaluator.reset(board)
+        evaluator.push(board, "g1f3", Colour.WHITE)
+        board.apply_move("g1f3", Colour.WHITE)
+
+        assert (
+            evaluator.evaluate(board, Colour.BLACK)
+            == evaluator.evaluate_batch([(board, Colour.BLACK)])[0]
+        )
+
+    def test_search_leaves_the_stack_empty(self, evaluator: NNUEEvaluator) -> None:
+        board = Board()
+        result = Searcher(evaluator=evaluator).search(board, Colour.WHITE, SearchLimits(depth=2))
+
+        assert result.best_move in board.legal_moves(Colour.WHITE)
+        assert (evaluator.accumulator == evaluator.accumulate(board)).all()
+
+    def test_save_and_load(self, evaluator: NNUEEvaluator, tmp_path: Path) -> None:
+        evaluator.save(tmp_path / "network.npz")
+        loaded = NNUEEvaluator.load(tmp_path / "network.npz")
+
+        assert (loaded.feature_weights == evaluator.feature_weights).all()
+        assert loaded.evaluate_batch([(Board(), Colour.WHITE)]) == evaluator.evaluate_batch(
+            [(Board(), Colour.WHITE)]
+        )
+
+    def test_invalid_layers(self) -> None:
+        with pytest.raises(ValueError):
+            NNUEEvaluator(
+                np.zeros((10, 4), np.int16), np.zeros(4, np.int16), np.zeros(8, np.int16)
+            )
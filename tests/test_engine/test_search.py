@@ -0,0 +1,122 @@
+"""This module provides tests for the engine search."""
+
+import asyncio
+import threading
+from collections.abc import Sequence
+from typing import ClassVar, override
+
+import pytest
+from pytest_mock import MockerFixture
+
+from chess import Chess
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.engine import MATE_SCORE, MaterialEvaluator, Searcher, SearchLimits
+
+
+class BatchedMaterialEvaluator(MaterialEvaluator):
+    """Material evaluation that records the size of every batch."""
+
+    batched: ClassVar[bool] = True
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    @override
+    def evaluate_batch(self, positions: Sequence[tuple[Board, Colour]]) -> list[int]:
+        self.batch_sizes.append(len(positions))
+        return super().evaluate_batch(positions)
+
+
+class TestSearcher:
+    """Test the iterative deepening search."""
+
+    def test_finds_mate_in_one(self, game_two: Chess) -> None:
+        board = game_two.board
+        board.apply_move("f7g8", Colour.BLACK)
+        board.apply_move("a2a3", Colour.WHITE)
+
+        result = Searcher().search(board, Colour.BLACK, SearchLimits(depth=2))
+
+        assert result.best_move == "f2h2"
+        assert result.score == MATE_SCORE - 1
+
+    def test_captures_hanging_queen(self, game_one: Chess) -> None:
+        result = Searcher().search(game_one.board, Colour.BLACK, SearchLimits(depth=1))
+
+        assert result.best_move == "g8d5"
+        assert result.depth == 1
+
+    def test_search_does_not_modify_the_board(self) -> None:
+        board = Board()
+        Searcher().search(board, Colour.WHITE, SearchLimits(depth=1))
+
+        assert board.state == Board().state
+
+    def test_no_legal_moves_returns_no_move(self, game_two: Chess) -> None:
+        board = game_two.board
+        for move, turn in [("f7g8", Colour.BLACK), ("a2a3", Colour.WHITE), ("f2h2", Colour.BLACK)]:
+            board.apply_move(move, turn)
+
+        result = Searcher().search(board, Colour.WHITE, SearchLimits(depth=3))
+
+        assert result.best_move is None
+        assert result.score == -MATE_SCORE
+
+    def test_movetime_is_respected(self) -> None:
+        result = Searcher().search(Board(), Colour.WHITE, SearchLimits(movetime=0.3))
+
+        assert result.best_move in Board().legal_moves(Colour.WHITE)
+        assert result.elapsed < 0.5
+
+    def test_expired_deadline_still_returns_a_legal_move(self) -> None:
+        result = Searcher(check_every=1).search(Board(), Colour.WHITE, SearchLimits(movetime=0.0))
+
+        assert result.best_move in Board().legal_moves(Colour.WHITE)
+        assert result.depth == 0
+
+    def test_stop_from_another_thread(self) -> None:
+        searcher = Searcher()
+        timer = threading.Timer(0.2, searcher.stop)
+        timer.start()
+
+        result = searcher.search(Board(), Colour.WHITE, SearchLimits(infinite=True))
+        timer.join()
+
+        assert result.best_move in Board().legal_moves(Colour.WHITE)
+        assert result.elapsed < 1.0
+
+    def test_cancelling_async_search_stops_it(self) -> None:
+        searcher = Searcher()
+
+        async def cancel_search() -> None:
+            task = asyncio.create_task(
+                searcher.search_async(Board(), Colour.WHITE, SearchLimits(infinite=True))
+            )
+            await asyncio.sleep(0.1)
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_search())
+
+
+class TestLeafBatching:
+    """Test evaluating the leaves below a node in a single batch."""
+
+    def test_batched_search_finds_the_same_move(self, game_one: Chess) -> None:
+        evaluator = BatchedMaterialEvaluator()
+        limits = SearchLimits(depth=2)
+
+        batched = Searcher(evaluator=evaluator).search(game_one.board, Colour.BLACK, limits)
+        plain = Searcher().search(game_one.board, Colour.BLACK, limits)
+
+        assert (batched.best_move, batched.score) == (plain.best_move, plain.score)
+        assert max(evaluator.batch_sizes) > 1
+
+    def test_unbatched_evaluator_is_called_per_leaf(self, mocker: MockerFixture) -> None:
+        evaluate_batch = mocker.spy(MaterialEvaluator, "evaluate_batch")
+        Searcher().search(Board(), Colour.WHITE, SearchLimits(depth=2))
+
+        evaluate_batch.assert_not_called()
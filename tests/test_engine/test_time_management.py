@@ -0,0 +1,79 @@
+"""This module provides tests for the engine time management."""
+
+import time
+
+import pytest
+
+from chess.colour_and_aliases import Colour
+from chess.engine import SearchController, SearchLimits, TimeBudget, allocate_time
+
+
+class TestAllocateTime:
+    """Test time allocation from the limits of a search."""
+
+    def test_infinite_search_has_no_budget(self) -> None:
+        assert allocate_time(SearchLimits(infinite=True, white_time=10), Colour.WHITE) is None
+
+    def test_depth_only_search_has_no_budget(self) -> None:
+        assert allocate_time(SearchLimits(depth=3), Colour.WHITE) is None
+
+    def test_movetime_is_used_as_is_minus_overhead(self) -> None:
+        budget = allocate_time(SearchLimits(movetime=1.0), Colour.BLACK, move_overhead=0.1)
+        assert budget == TimeBudget(soft=0.9, hard=0.9)
+
+    @pytest.mark.parametrize(
+        "remaining, increment, moves_to_go",
+        [(60.0, 0.0, None), (3.0, 2.0, None), (1.0, 0.0, 1), (0.01, 0.0, None), (300.0, 5.0, 40)],
+    )
+    def test_clock_budget_never_exceeds_remaining_time(
+        self, remaining: float, increment: float, moves_to_go: int | None
+    ) -> None:
+        limits = SearchLimits(
+            black_time=remaining, black_increment=increment, moves_to_go=moves_to_go
+        )
+        budget = allocate_time(limits, Colour.BLACK, move_overhead=0.05)
+
+        assert budget is not None
+        assert 0 <= budget.soft <= budget.hard <= max(remaining - 0.05, 0)
+
+    def test_clock_of_the_player_to_move_is_used(self) -> None:
+        limits = SearchLimits(white_time=100.0, black_time=1.0)
+        white, black = allocate_time(limits, Colour.WHITE), allocate_time(limits, Colour.BLACK)
+
+        assert white is not None
+        assert black is not None
+        assert white.hard > black.hard
+
+
+class TestSearchController:
+    """Test the controller that stops a search."""
+
+    @pytest.mark.parametrize("check_every, expected", [(1, 1), (3, 4), (4, 4), (100, 128)])
+    def test_check_interval_is_rounded_to_power_of_two(
+        self, check_every: int, expected: int
+    ) -> None:
+        assert SearchController(check_every=check_every).check_every == expected
+
+    def test_stop_is_only_noticed_on_check_nodes(self) -> None:
+        controller = SearchController(check_every=4)
+        controller.stop()
+
+        assert controller.should_abort(3) is False
+        assert controller.should_abort(4) is True
+
+    def test_hard_deadline_aborts_search(self) -> None:
+        controller = SearchController(TimeBudget(soft=0.0, hard=0.0), check_every=1)
+
+        assert controller.can_start_iteration() is False
+        assert controller.should_abort(1) is True
+        assert controller.stopped is True
+
+    def test_unlimited_search_runs_until_stopped(self) -> None:
+        controller = SearchController(check_every=1)
+        time.sleep(0.01)
+
+        assert controller.can_start_iteration() is True
+        assert controller.should_abort(1) is False
+
+        controller.stop()
+        assert controller.can_start_iteration() is False
@@ -0,0 +1,96 @@
+"""This module provides tests for the position index."""
+
+from pathlib import Path
+
+import pytest
+
+from chess.archive import pack_game, write_archive
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.explorer import MoveStats, PositionIndex, build_index
+from chess.fen import board_from_fen
+
+FEN = "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+
+GAMES = [
+    (["g1f3", "g8f6", "b1c3"], "1-0", None),
+    (["b1c3", "g8f6", "g1f3", "e7e5"], "0-1", None),
+    (["g1f3", "d7d5"], "1/2-1/2", None),
+    (["e2e4"], "*", None),
+    (["e2e4", "e8d7"], "1-0", FEN),
+    (["e2e4"], "1-0", "not a position"),
+]
+
+
+@pytest.fixture(scope="module", params=[1, 2])
+def index(tmp_path_factory: pytest.TempPathFactory, request: pytest.FixtureRequest) -> Path:
+    directory = tmp_path_factory.mktemp("explorer")
+    archive, path = directory / "games.bin", directory / "index.bin"
+    write_archive((pack_game(*game) for game in GAMES), archive)
+
+    # tiny runs, so that the runs of several workers are merged
+    stats = build_index(archive, path, workers=request.param, run_size=2)
+
+    assert (stats.games, stats.errors, stats.positions) == (6, 1, 17)
+    return path
+
+
+def test_games(index: Path) -> None:
+    board, turn = Board(), Colour.WHITE
+
+    with PositionIndex(index) as positions:
+        assert len(positions) == 17
+        assert positions.games(board, turn) == [(0, 0), (1, 0), (2, 0), (3, 0)]
+        assert positions.games(board, turn, limit=2) == [(0, 0), (1, 0)]
+
+        # both move orders transpose to the same position
+        for move in ("g1f3", "g8f6", "b1c3"):
+            board.apply_move(move, turn)
+            turn = ~turn
+
+        assert positions.games(board, turn) == [(0, 3), (1, 3)]
+        assert positions.games(*board_from_fen(FEN)) == [(4, 0)]
+        assert positions.games(*board_from_fen("8/8/8/8/8/8/8/K6k w - - 0 1")) == []
+
+
+def test_moves(index: Path) -> None:
+    board, turn = Board(), Colour.WHITE
+
+    with PositionIndex(index) as positions:
+        assert positions.moves(board, turn) == [
+            MoveStats("g1f3", 2, 1, 1, 0),
+            MoveStats("b1c3", 1, 0, 0, 1),
+            MoveStats("e2e4", 1, 0, 0, 0),
+        ]
+
+        board.apply_move("g1f3", turn)
+        assert positions.moves(board, ~turn) == [
+            MoveStats("d7d5", 1, 0, 1, 0),
+            MoveStats("g8f6", 1, 1, 0, 0),
+        ]
+
+
+def test_plies(tmp_path: Path) -> None:
+    archive, path = tmp_path / "games.bin", tmp_path / "index.bin"
+    write_archive((pack_game(*game) for game in GAMES[:3]), archive)
+
+    stats = build_index(archive, path, plies=1, workers=1)
+
+    assert (stats.positions, stats.moves) == (6, 2)
+    with PositionIndex(path) as positions:
+        assert positions.moves(Board(), Colour.WHITE) == [
+            MoveStats("g1f3", 2, 1, 1, 0),
+            MoveStats("b1c3", 1, 0, 0, 1),
+        ]
+
+
+def test_not_an_index(tmp_path: Path) -> None:
+    path = tmp_path / "index.bin"
+
+    path.write_bytes(b"CHPI")
+    with pytest.raises(ValueError, match="too short"):
+        PositionIndex(path)
+
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="not a position index"):
+        PositionIndex(path)
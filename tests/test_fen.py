@@ -0,0 +1,85 @@
+"""This module provides tests for FEN conversion."""
+
+import pytest
+
+from chess import Chess
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import STARTING_FEN, board_from_fen, board_to_fen
+from chess.pieces import King, Pawn, Rook
+
+
+class TestFen:
+    """Test conversion between boards and FEN strings."""
+
+    def test_starting_position(self) -> None:
+        board, turn = board_from_fen(STARTING_FEN)
+
+        assert board.state == Board().state
+        assert turn == Colour.WHITE
+        assert board_to_fen(Board(), Colour.WHITE) == STARTING_FEN
+
+    @pytest.mark.parametrize(
+        "fen",
+        [
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+            "r3k3/8/8/8/8/8/8/4K2R w Kq - 5 40",
+            "8/8/8/3k4/8/8/8/4K3 b - - 0 70",
+            "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+        ],
+    )
+    def test_round_trip(self, fen: str) -> None:
+        board, turn = board_from_fen(fen)
+        halfmove_clock, fullmove_number = map(int, fen.split()[4:])
+
+        assert board_to_fen(board, turn, halfmove_clock, fullmove_number) == fen
+
+    def test_castling_rights_set_moved_flags(self) -> None:
+        board, _ = board_from_fen("r3k2r/8/8/8/8/8/8/R3K2R w Kq - 0 1")
+
+        assert isinstance(board.state[0][4], King)
+        assert board.state[0][4].moved is False
+        assert isinstance(board.state[0][0], Rook)
+        assert board.state[0][0].moved is True
+        assert "o-o" in board.legal_moves(Colour.WHITE)
+        assert "o-o-o" not in board.legal_moves(Colour.WHITE)
+        assert "o-o-o" in board.legal_moves(Colour.BLACK)
+
+    def test_en_passant_pawn(self) -> None:
+        board, turn = board_from_fen(
+            "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+        )
+
+        assert board.en_passant_pawn is board.state[4][5]
+        assert "e5f6" in board.legal_moves(turn)
+        assert "e5d6" not in board.legal_moves(turn)
+
+    def test_pawns_off_their_starting_rank_have_moved(self) -> None:
+        board, _ = board_from_fen("4k3/8/8/8/8/P7/1P6/4K3 w - - 0 1")
+
+        assert isinstance(board.state[2][0], Pawn)
+        assert board.state[2][0].moved is True
+        assert isinstance(board.state[1][1], Pawn)
+        assert board.state[1][1].moved is False
+
+    def test_fixture_position(self, game_one: Chess) -> None:
+        assert board_to_fen(game_one.board, Colour.WHITE, 0, 15) == (
+            "r3k1b1/3p3P/8/3QPp2/8/2N5/2P2P1P/4K2R w Kq f6 0 15"
+        )
+
+    @pytest.mark.parametrize(
+        "fen",
+        [
+            "",
+            "8/8/8/8/8/8/8/8 w - - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN1 w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e3 0 1",
+        ],
+    )
+    def test_invalid_fen_raises_value_error(self, fen: str) -> None:
+        with pytest.raises(ValueError):
+            board_from_fen(fen)
@@ -0,0 +1,76 @@
+"""This module provides tests for the parallel PGN ingestion."""
+
+import random
+from collections import Counter
+from itertools import pairwise
+from pathlib import Path
+
+import pytest
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.ingest import game_ranges, ingest
+from chess.pgn import PGNGame, PGNWriter, ReplayStats, game_from_moves
+
+
+def first_moves(game: PGNGame, moves: list[str]) -> tuple[str, list[str]]:
+    return game.tags["Round"], moves[:2]
+
+
+@pytest.fixture(scope="module")
+def pgn_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("ingest") / "games.pgn"
+    rng = random.Random(0)
+
+    with PGNWriter(path) as writer:
+        for round_ in range(40):
+            board, turn, moves = Board(), Colour.WHITE, []
+            for _ in range(rng.randint(1, 12)):
+                moves.append(move := rng.choice(board.legal_moves(turn)))
+                board.apply_move(move, turn)
+                turn = ~turn
+
+            game = game_from_moves(moves, tags={"Round": str(round_)})
+            if round_ % 10 == 9:
+                game.moves.append("Qxe8")
+            writer.write(game)
+
+    return path
+
+
+def test_game_ranges(pgn_file: Path) -> None:
+    ranges = game_ranges(pgn_file, chunk_size=500)
+    data = pgn_file.read_bytes()
+
+    assert len(ranges) > 5
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in pairwise(ranges))
+    assert all(data[start : start + 7] == b"[Event " for start, _ in ranges)
+
+
+def test_game_ranges_of_an_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.pgn"
+    path.touch()
+
+    assert game_ranges(path) == []
+
+
+def test_ingest_in_order(pgn_file: Path) -> None:
+    stats = ReplayStats()
+
+    results = list(ingest(pgn_file, first_moves, workers=2, chunk_size=500, stats=stats))
+
+    assert [round_ for round_, _ in results] == [
+        str(round_) for round_ in range(40) if round_ % 10 != 9
+    ]
+    assert (stats.games, stats.errors) == (40, 4)
+    assert stats.positions > 0
+    assert stats.elapsed > 0
+
+
+def test_ingest_unordered(pgn_file: Path) -> None:
+    ordered = ingest(pgn_file, first_moves, workers=1)
+    unordered = ingest(pgn_file, first_moves, workers=2, chunk_size=500, ordered=False)
+
+    assert Counter(map(repr, unordered)) == Counter(map(repr, ordered))
@@ -0,0 +1,88 @@
+"""This module provides tests for the load-testing harness."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from chess.loadtest import (
+    LatencyHistogram,
+    LoadGame,
+    pgn_games,
+    random_games,
+    run_against_server,
+    run_in_process,
+)
+from chess.server import GameServer
+
+PGN = """[Result "0-1"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+
+[FEN "7k/8/5K2/8/8/8/8/Q7 w - - 0 1"]
+[Result "1/2-1/2"]
+
+1. Qa8+ Kh7 2. Qf8 1/2-1/2
+"""
+
+
+def test_histogram() -> None:
+    histogram = LatencyHistogram()
+    for latency_ns in (1_000, 1_000, 1_000, 50_000):
+        histogram.record(latency_ns)
+
+    # a percentile is the upper bound of its bucket, within 2 ** (1 / 4)
+    assert 1_000 <= histogram.percentile(50) <= 1_000 * 2 ** (1 / 4)
+    assert histogram.percentile(99) == 50_000
+    assert LatencyHistogram().percentile(50) == 0.0
+
+    stats = histogram.to_dict()
+    assert (stats["count"], stats["mean"], stats["max"]) == (4, 13.2, 50.0)
+    assert stats["buckets"] == [[1.0, 3], [55.1, 1]]
+
+
+def test_in_process(tmp_path: Path) -> None:
+    (path := tmp_path / "games.pgn").write_text(PGN)
+    games = pgn_games(path)
+
+    assert games[0] == LoadGame(["f2f3", "e7e5", "g2g4", "d8h4"])
+    assert games[1].start_fen is not None
+
+    report = json.loads(run_in_process(games, concurrency=1).to_json())
+    assert (report["target"], report["games"], report["moves"]) == ("in-process", 2, 7)
+    assert {outcome: stats["count"] for outcome, stats in report["latency_us"].items()} == {
+        "all": 7,
+        "success": 4,
+        "check": 1,
+        "checkmate": 1,
+        "stalemate": 1,
+    }
+
+
+def test_random_games() -> None:
+    games = random_games(5, 40, seed=1)
+    assert games == random_games(5, 40, seed=1)
+    assert all(len(game.moves) <= 40 for game in games)
+
+    report = run_in_process(games, concurrency=2)
+    assert (report.games, report.moves) == (5, sum(len(game.moves) for game in games))
+    assert "failure" not in report.latencies
+
+
+def test_against_server(tmp_path: Path) -> None:
+    (path := tmp_path / "games.pgn").write_text(PGN)
+
+    async def run() -> None:
+        async with GameServer(workers=0) as hosted:
+            server = await hosted.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            async with server:
+                # the game from a FEN is skipped, and a game may be played twice
+                games = pgn_games(path) + pgn_games(path, count=1)
+                report = await run_against_server(games, port=port, connections=2)
+
+        assert (report.games, report.moves) == (2, 8)
+        assert report.latencies["checkmate"].count == 2
+        assert json.loads(report.to_json())["target"] == f"127.0.0.1:{port}"
+
+    asyncio.run(run())
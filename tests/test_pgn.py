@@ -0,0 +1,211 @@
+"""This module provides tests for reading PGN files."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.pgn import (
+    Line,
+    PGNGame,
+    PGNWriter,
+    ReplayStats,
+    format_game,
+    game_from_moves,
+    read_games,
+    replay,
+    replay_games,
+)
+
+PGN = """[Event "Casual game"]
+[White "Alice"]
+[Black "Bob \\"the Bold\\""]
+[Result "1-0"]
+
+1. e4 {best by test} e5 2. Nf3 (2. f4 exf4 (2... d5)) 2... Nc6 $1 3. Bb5 ; Ruy Lopez
+a6 1-0
+
+[Event "Second game"]
+[Result "*"]
+
+1. d4 d5 *
+"""
+
+
+def test_read_games() -> None:
+    games = list(read_games(io.StringIO(PGN)))
+
+    assert games == [
+        PGNGame(
+            {"Event": "Casual game", "White": "Alice", "Black": 'Bob "the Bold"', "Result": "1-0"},
+            ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"],
+            "1-0",
+            comments={0: "best by test", 4: "Ruy Lopez"},
+            nags={3: [1]},
+            variations={2: [Line(["f4", "exf4"], variations={1: [Line(["d5"])]})]},
+        ),
+        PGNGame({"Event": "Second game", "Result": "*"}, ["d4", "d5"], "*"),
+    ]
+
+
+def test_game_without_tags() -> None:
+    assert list(read_games(io.StringIO("1. e4 e5 1/2-1/2\n"))) == [
+        PGNGame({}, ["e4", "e5"], "1/2-1/2")
+    ]
+
+
+def test_castling_with_zeros() -> None:
+    assert list(read_games(io.StringIO("4. 0-0 Nf6 5. d4 0-0-0+ 0-1\n"))) == [
+        PGNGame({}, ["O-O", "Nf6", "d4", "O-O-O+"], "0-1")
+    ]
+
+
+def test_multiline_comments_and_escapes() -> None:
+    pgn = (
+        "% an escaped line\n"
+        '[Event "Test"]\n'
+        "\n"
+        "{A comment\n"
+        '[Event "not a tag"] over lines} 1.e4 {one} {two} 1... e5\n'
+        "2. Nf3 ( 2. Nc3 {inner\n"
+        "comment} Nc6 ) 2... Nc6 *\n"
+    )
+
+    (game,) = read_games(io.StringIO(pgn))
+
+    assert game.tags == {"Event": "Test"}
+    assert game.moves == ["e4", "e5", "Nf3", "Nc6"]
+    assert game.comments == {-1: 'A comment [Event "not a tag"] over lines', 0: "one two"}
+    assert game.variations == {2: [Line(["Nc3", "Nc6"], comments={0: "inner comment"})]}
+
+
+def test_games_without_results_end_at_the_next_tags() -> None:
+    pgn = '[Event "First"]\n[Result "0-1"]\n\n1. f3 e5\n\n[Event "Second"]\n\n1. e4\n'
+
+    games = list(read_games(io.StringIO(pgn)))
+
+    assert [(game.tags["Event"], game.moves, game.result) for game in games] == [
+        ("First", ["f3", "e5"], "0-1"),
+        ("Second", ["e4"], "*"),
+    ]
+
+
+def test_read_games_is_incremental() -> None:
+    lines = iter(PGN.splitlines(keepends=True))
+    games = read_games(lines)
+
+    assert next(games).tags["Event"] == "Casual game"
+    # the second game has not been read yet
+    assert next(lines) == "\n"
+    assert next(lines).startswith('[Event "Second game"]')
+
+
+def test_replay() -> None:
+    game = PGNGame(moves=["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "O-O"])
+
+    positions = [(turn, move) for _, turn, move in replay(game)]
+
+    assert positions == [
+        (Colour.WHITE, "e2e4"),
+        (Colour.BLACK, "e7e5"),
+        (Colour.WHITE, "g1f3"),
+        (Colour.BLACK, "b8c6"),
+        (Colour.WHITE, "f1b5"),
+        (Colour.BLACK, "a7a6"),
+        (Colour.WHITE, "o-o"),
+    ]
+
+
+def test_replay_from_fen(capsys: pytest.CaptureFixture[str]) -> None:
+    game = PGNGame({"FEN": "4k3/P7/8/8/8/8/8/4K3 w - - 0 1"}, ["a8=Q+", "Kd7"])
+
+    boards = [(board, move) for board, _, move in replay(game)]
+
+    assert [move for _, move in boards] == ["a7a8q", "e8d7"]
+    assert isinstance(boards[0][0], Board)
+    assert capsys.readouterr().out == ""
+
+
+def test_replay_invalid_move() -> None:
+    with pytest.raises(ValueError, match="Illegal move"):
+        list(replay(PGNGame(moves=["e4", "e4"])))
+
+
+def test_replay_games_counts_errors() -> None:
+    games = [
+        PGNGame(moves=["e4", "e5"]),
+        PGNGame(moves=["e4", "Ke7"]),
+        PGNGame({"FEN": "not a position"}),
+        PGNGame(moves=["d4"]),
+    ]
+    stats = ReplayStats()
+
+    replayed = list(replay_games(games, stats))
+
+    assert [moves for _, moves in replayed] == [["e2e4", "e7e5"], ["d2d4"]]
+    assert (stats.games, stats.errors, stats.positions) == (4, 2, 3)
+    assert stats.games_per_second > 0
+
+
+def test_format_game() -> None:
+    game = PGNGame(
+        {"White": "Alice", "Black": 'Bob "the Bold"', "ECO": "C20"}, ["e4", "e5"], "1-0"
+    )
+
+    assert format_game(game) == (
+        '[Event "?"]\n'
+        '[Site "?"]\n'
+        '[Date "????.??.??"]\n'
+        '[Round "?"]\n'
+        '[White "Alice"]\n'
+        '[Black "Bob \\"the Bold\\""]\n'
+        '[Result "1-0"]\n'
+        '[ECO "C20"]\n'
+        "\n"
+        "1. e4 e5 1-0\n"
+    )
+
+
+def test_long_games_are_wrapped() -> None:
+    game = PGNGame(moves=["Nf3", "Nf6", "Ng1", "Ng8"] * 20)
+    movetext = format_game(game).split("\n\n")[1]
+
+    assert max(len(line) for line in movetext.splitlines()) <= 80
+    assert movetext.split() == format_game(game).split("\n\n")[1].split()
+    assert movetext.endswith("40. Ng1 Ng8 *\n")
+
+
+def test_game_from_moves() -> None:
+    game = game_from_moves(["f2f3", "e7e5", "g2g4", "d8h4"], "0-1", {"Event": "Test"})
+
+    assert game == PGNGame({"Event": "Test"}, ["f3", "e5", "g4", "Qh4#"], "0-1")
+
+
+def test_game_from_position_with_black_to_move() -> None:
+    fen = "4k3/8/8/8/8/8/4P3/4K3 b - - 0 12"
+    board, turn = board_from_fen(fen)
+    game = game_from_moves(["e8d7", "e2e4"], board=board, turn=turn)
+
+    assert game.tags == {"SetUp": "1", "FEN": fen.replace("0 12", "0 1")}
+    assert format_game(game).endswith("\n1... Kd7 2. e4 *\n")
+
+
+def test_writer_appends_games(tmp_path: Path) -> None:
+    path = tmp_path / "games.pgn"
+    games = [PGNGame({"Round": str(number)}, ["d4", "d5"], "1/2-1/2") for number in range(3)]
+
+    with PGNWriter(path) as writer:
+        writer.write(games[0])
+        writer.write(games[1])
+    with PGNWriter(path) as writer:
+        writer.write(games[2])
+
+    with open(path) as file:
+        read = list(read_games(file))
+
+    assert writer.games == 1
+    assert [game.tags["Round"] for game in read] == ["0", "1", "2"]
+    assert all(game.moves == ["d4", "d5"] for game in read)
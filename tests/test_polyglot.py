@@ -0,0 +1,54 @@
+"""This module provides tests for the Polyglot keys and move encoding."""
+
+import pytest
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.polyglot import decode_move, encode_move, polyglot_key
+
+
+class TestPolyglotKey:
+    """Test the keys against the values published with the Polyglot format."""
+
+    @pytest.mark.parametrize(
+        ("moves", "key"),
+        [
+            ([], 0x463B96181691FC9C),
+            (["e2e4"], 0x823C9B50FD114196),
+            (["e2e4", "d7d5"], 0x0756B94461C50FB0),
+            (["e2e4", "d7d5", "e4e5"], 0x662FAFB965DB29D4),
+            (["e2e4", "d7d5", "e4e5", "f7f5"], 0x22A48B5A8E47FF78),
+            (["e2e4", "d7d5", "e4e5", "f7f5", "e1e2"], 0x652A607CA3F242C1),
+            (["e2e4", "d7d5", "e4e5", "f7f5", "e1e2", "e8f7"], 0x00FDD303C946BDD9),
+            (["a2a4", "b7b5", "h2h4", "b5b4", "c2c4"], 0x3C8123EA7B067637),
+            (["a2a4", "b7b5", "h2h4", "b5b4", "c2c4", "b4c3", "a1a3"], 0x5C3F9B829B279560),
+        ],
+    )
+    def test_published_keys(self, moves: list[str], key: int) -> None:
+        board, turn = Board(), Colour.WHITE
+        for move in moves:
+            board.apply_move(move, turn)
+            turn = ~turn
+
+        assert polyglot_key(board, turn) == key
+
+
+class TestMoveEncoding:
+    """Test encoding and decoding book moves."""
+
+    @pytest.mark.parametrize(
+        ("fen", "move", "encoded"),
+        [
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "e2e4", 0o1434),
+            ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "o-o", 0o0407),
+            ("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1", "o-o-o", 0o7470),
+            ("8/P6k/8/8/8/8/8/K7 w - - 0 1", "a7a8q", 4 << 12 | 0o6070),
+            ("8/P6k/8/8/8/8/8/K7 w - - 0 1", "a7a8n", 1 << 12 | 0o6070),
+        ],
+    )
+    def test_round_trip(self, fen: str, move: str, encoded: int) -> None:
+        board, turn = board_from_fen(fen)
+
+        assert encode_move(move, turn) == encoded
+        assert decode_move(encoded, board) == move
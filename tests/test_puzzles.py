@@ -0,0 +1,51 @@
+"""This module provides tests for the puzzle validation."""
+
+from pathlib import Path
+
+import pytest
+
+from chess.puzzles import Puzzle, load_puzzles, solve_puzzle, validate_puzzles
+
+UNIQUE = "r5k1/5ppp/8/8/8/8/4QPPP/4R1K1 w - - 0 1"
+AMBIGUOUS = "6k1/5ppp/8/8/8/8/5PPP/3RR1K1 w - - 0 1"
+
+
+def test_load_puzzles(tmp_path: Path) -> None:
+    path = tmp_path / "puzzles.txt"
+    path.write_text(f"# mates\n{UNIQUE}; 2\n\n{AMBIGUOUS}\n")
+
+    assert load_puzzles(path, default_moves=1) == [
+        Puzzle(UNIQUE, 2, f"{path}:2"),
+        Puzzle(AMBIGUOUS, 1, f"{path}:4"),
+    ]
+
+
+def test_load_puzzles_with_invalid_moves(tmp_path: Path) -> None:
+    path = tmp_path / "puzzles.txt"
+    path.write_text(f"{UNIQUE}; two\n")
+
+    with pytest.raises(ValueError, match="invalid number of moves"):
+        load_puzzles(path)
+
+
+def test_solve_puzzle() -> None:
+    report = solve_puzzle(Puzzle(UNIQUE, 2))
+
+    assert report.solutions == {"e2e8": 2}
+    assert report.unique
+    assert report.nodes > 0
+
+
+def test_invalid_fen_is_reported() -> None:
+    report = solve_puzzle(Puzzle("not a fen", 2))
+
+    assert report.error is not None
+    assert not report.unique
+
+
+def test_validate_puzzles_keeps_the_order() -> None:
+    puzzles = [Puzzle(UNIQUE, 2), Puzzle(AMBIGUOUS, 1), Puzzle(UNIQUE, 1)]
+    reports = list(validate_puzzles(puzzles, workers=2))
+
+    assert [report.puzzle for report in reports] == puzzles
+    assert [report.unique for report in reports] == [True, False, False]
@@ -0,0 +1,146 @@
+"""This module provides tests for the SAN conversion."""
+
+import random
+from copy import deepcopy
+
+import pytest
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.san import move_to_san, parse_san
+
+
+class TestParseSAN:
+    """Test converting SAN moves to the notation of the board."""
+
+    @pytest.mark.parametrize(
+        ("fen", "san", "move"),
+        [
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "e4", "e2e4"),
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "Nf3", "g1f3"),
+            ("rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1", "Nc6", "b8c6"),
+            ("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "O-O", "o-o"),
+            ("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "0-0-0+", "o-o-o"),
+            ("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "Rab1", "a1b1"),
+            ("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "Rhf1", "h1f1"),
+            ("4k3/8/8/R7/8/8/8/R3K3 w Q - 0 1", "R1a3", "a1a3"),
+            ("4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1", "dxe6e.p.", "d5e6"),
+            ("4k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a8=Q+", "a7a8q"),
+            ("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1", "axb8N", "a7b8n"),
+        ],
+    )
+    def test_parse_san(self, fen: str, san: str, move: str) -> None:
+        board, turn = board_from_fen(fen)
+
+        assert parse_san(board, san, turn) == move
+
+    @pytest.mark.parametrize(
+        ("san", "message"),
+        [
+            ("Qd4", "Illegal"),
+            ("Ke2e4", "Illegal"),
+            ("e9", "Invalid"),
+            ("O-O", "Illegal"),
+            ("xyz", "Invalid"),
+        ],
+    )
+    def test_invalid_moves(self, san: str, message: str) -> None:
+        with pytest.raises(ValueError, match=message):
+            parse_san(Board(), san, Colour.WHITE)
+
+    @pytest.mark.parametrize(
+        ("fen", "san"),
+        [
+            # the knight is pinned to the King
+            ("4k3/4r3/8/8/8/8/4N3/4K3 w - - 0 1", "Nc3"),
+            # the King is in check and the move does not stop it
+            ("4k3/4r3/8/8/8/8/8/R3K3 w - - 0 1", "Ra2"),
+            # a double check can only be answered with a King move
+            ("4k3/4r3/8/8/1b6/8/8/R3K3 w - - 0 1", "Re1"),
+            # the King cannot step back along the line of the checking rook
+            ("4k3/4r3/8/8/8/8/4K3/8 w - - 0 1", "Ke1"),
+            # capturing en passant would expose the King along the rank
+            ("8/8/8/K2Pp2r/8/8/8/4k3 w - e6 0 1", "dxe6"),
+        ],
+    )
+    def test_illegal_moves(self, fen: str, san: str) -> None:
+        board, turn = board_from_fen(fen)
+
+        with pytest.raises(ValueError, match="Illegal"):
+            parse_san(board, san, turn)
+
+    @pytest.mark.parametrize(
+        ("fen", "san", "move"),
+        [
+            # a pinned piece can move along the pin
+            ("4k3/4r3/8/8/8/8/4R3/4K3 w - - 0 1", "Rxe7+", "e2e7"),
+            # a pinned knight does not make the other knight's move ambiguous
+            ("4k3/4r3/8/5N2/8/8/4N3/4K3 w - - 0 1", "Nd4", "f5d4"),
+            # blocking a check
+            ("4k3/4r3/8/8/8/8/8/3RK3 w - - 0 1", "Kd2", "e1d2"),
+            ("4k3/4r3/8/8/8/8/R7/4K3 w - - 0 1", "Re2", "a2e2"),
+        ],
+    )
+    def test_pins_and_checks(self, fen: str, san: str, move: str) -> None:
+        board, turn = board_from_fen(fen)
+
+        assert parse_san(board, san, turn) == move
+
+    def test_ambiguous_move(self) -> None:
+        board, turn = board_from_fen("4k3/8/8/8/8/8/4K3/R6R w - - 0 1")
+
+        with pytest.raises(ValueError, match="Ambiguous"):
+            parse_san(board, "Rd1", turn)
+
+
+class TestMoveToSAN:
+    """Test converting moves to SAN."""
+
+    @pytest.mark.parametrize(
+        ("fen", "move", "san"),
+        [
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "e2e4", "e4"),
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "g1f3", "Nf3"),
+            ("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "o-o", "O-O"),
+            ("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "o-o-o", "O-O-O"),
+            ("4k3/8/8/8/8/8/4K3/R6R w - - 0 1", "a1d1", "Rad1"),
+            ("4k3/8/8/R7/8/8/8/R3K3 w Q - 0 1", "a1a3", "R1a3"),
+            ("k7/8/8/8/8/2Q1Q3/8/2Q1K3 w - - 0 1", "c3d2", "Qc3d2"),
+            ("4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1", "d5e6", "dxe6"),
+            ("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7b8q", "axb8=Q+"),
+            ("4k3/8/8/8/8/8/3r4/4K3 w - - 0 1", "e1d2", "Kxd2"),
+            ("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", "a1a8", "Ra8#"),
+        ],
+    )
+    def test_move_to_san(self, fen: str, move: str, san: str) -> None:
+        board, turn = board_from_fen(fen)
+
+        assert move_to_san(board, move, turn) == san
+        assert parse_san(board, san, turn) == move
+
+
+def test_round_trip_in_random_games() -> None:
+    """Check every legal move of random games against a search of all legal moves."""
+    rng = random.Random(0)
+
+    for _ in range(5):
+        board, turn = Board(), Colour.WHITE
+
+        for _ in range(50):
+            if not (moves := board.legal_moves(turn)):
+                break
+
+            for move in moves:
+                san = move_to_san(board, move, turn)
+                child = deepcopy(board)
+                child.apply_move(move, turn)
+
+                assert parse_san(board, san, turn) == move
+                assert san.endswith(("+", "#")) == child._king_checked(~turn)
+                assert san.endswith("#") == (
+                    child._king_checked(~turn) and not child.legal_moves(~turn)
+                )
+
+            board.apply_move(rng.choice(moves), turn)
+            turn = ~turn
@@ -0,0 +1,98 @@
+"""This module provides tests for the self-play data generation."""
+
+import random
+from pathlib import Path
+
+import numpy as np
+
+from chess.engine import Searcher, SearchLimits
+from chess.selfplay import (
+    SAMPLE_DTYPE,
+    SelfPlayConfig,
+    ShardWriter,
+    generate_selfplay,
+    load_samples,
+    play_selfplay_game,
+    run_worker,
+)
+from chess.tournament import Adjudication
+
+SHORT_GAMES = Adjudication(max_plies=16)
+
+
+def samples(count: int) -> np.ndarray:
+    records = np.zeros(count, dtype=SAMPLE_DTYPE)
+    records["policy"] = np.arange(count)
+    return records
+
+
+class TestShardWriter:
+    """Test streaming samples into shards."""
+
+    def test_rotates_shards(self, tmp_path: Path) -> None:
+        writer = ShardWriter(tmp_path, "worker000", shard_size=4)
+        writer.write(samples(10))
+        writer.commit()
+        writer.close()
+
+        assert sorted(path.name for path in tmp_path.glob("*.npy")) == [
+            "worker000-00000.npy",
+            "worker000-00001.npy",
+            "worker000-00002.npy",
+        ]
+        assert [len(shard) for shard in load_samples(tmp_path)] == [4, 4, 2]
+        assert np.concatenate(list(load_samples(tmp_path)))["policy"].tolist() == list(range(10))
+
+    def test_uncommitted_samples_are_dropped_on_resume(self, tmp_path: Path) -> None:
+        writer = ShardWriter(tmp_path, "worker000", shard_size=4)
+        writer.write(samples(3))
+        writer.commit()
+        writer.write(samples(5))  # lost in a crash before the commit
+        writer.close()
+
+        resumed = ShardWriter(tmp_path, "worker000", shard_size=4)
+        resumed.write(samples(2))
+        resumed.commit()
+        resumed.close()
+
+        policies = np.concatenate(list(load_samples(tmp_path)))["policy"].tolist()
+        assert policies == [0, 1, 2, 0, 1]
+        assert (resumed.games, resumed.positions) == (2, 5)
+
+
+def test_play_selfplay_game() -> None:
+    config = SelfPlayConfig(Path(), random_plies=4, adjudication=SHORT_GAMES)
+    records = play_selfplay_game(config, Searcher(), random.Random(0))
+
+    assert 0 < len(records) <= 12
+    assert set(records["result"].tolist()) <= {-1, 0, 1}
+
+
+def test_run_worker_resumes(tmp_path: Path) -> None:
+    config = SelfPlayConfig(
+        tmp_path, games_per_worker=1, limits=SearchLimits(depth=1), adjudication=SHORT_GAMES
+    )
+    first = run_worker(config, 0)
+
+    assert first.games == 1
+    assert first.positions > 0
+    assert first.positions_per_second > 0
+
+    more = SelfPlayConfig(
+        tmp_path, games_per_worker=2, limits=SearchLimits(depth=1), adjudication=SHORT_GAMES
+    )
+    second = run_worker(more, 0)
+
+    assert second.games == 1
+    total = sum(len(shard) for shard in load_samples(tmp_path))
+    assert total == first.positions + second.positions
+
+
+def test_generate_selfplay(tmp_path: Path) -> None:
+    config = SelfPlayConfig(tmp_path, games_per_worker=1, adjudication=SHORT_GAMES)
+    stats = generate_selfplay(config, workers=2)
+
+    assert [worker.worker_id for worker in stats] == [0, 1]
+    assert sum(len(shard) for shard in load_samples(tmp_path)) == sum(
+        worker.positions for worker in stats
+    )
@@ -0,0 +1,245 @@
+"""This module provides tests for the game server."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, MutableMapping
+from functools import partial
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from chess.board import Board, MoveOutcome
+from chess.chess_class import Chess
+from chess.colour_and_aliases import Colour
+from chess.server import GameServer
+from chess.sessions import SessionStore
+from chess.tablebase import Tablebases
+from tests.clients import Connect, Writer, request, with_clients
+
+
+def _run(
+    test: Callable[[GameServer, Connect], Awaitable[None]],
+    store: MutableMapping[str, Chess] | None = None,
+) -> None:
+    """Runs a test with a server and a function connecting clients to it."""
+
+    async def run() -> None:
+        async with GameServer(workers=1, store=store) as games:
+            await with_clients(games, partial(test, games))
+
+    asyncio.run(run())
+
+
+def test_game() -> None:
+    async def test(games: GameServer, connect: Connect) -> None:
+        white, black = await connect(), await connect()
+
+        assert await request(white, "new g1") == "ok g1"
+        assert await request(black, "new g1") == "error g1 game exists"
+        assert await request(white, "join g1 white") == "ok g1 white"
+        assert await request(black, "join g1 white") == "error g1 seat taken"
+        assert await request(black, "join g1 black") == "ok g1 black"
+
+        assert await request(black, "move g1 e7e5") == "error g1 not your turn"
+        assert await request(white, "move g1 e2e5") == "error g1 illegal move"
+        assert await request(white, "move g1 f2f3") == "ok g1 f2f3 success *"
+        assert (await black[0].readline()).decode() == "played g1 f2f3 success *\n"
+
+        for player, opponent, move in ((black, white, "e7e5"), (white, black, "g2g4")):
+            await request(player, f"move g1 {move}")
+            assert (await opponent[0].readline()).startswith(f"played g1 {move}".encode())
+
+        assert await request(black, "move g1 d8h4") == "ok g1 d8h4 checkmate 0-1"
+        assert await white[0].readline() == b"played g1 d8h4 checkmate 0-1\n"
+        assert await request(white, "move g1 a2a3") == "error g1 game over"
+        assert games.games["g1"].move_history == ["f2f3", "e7e5", "g2g4", "d8h4"]
+
+        reply = await request(white, "state g1")
+        assert reply.startswith("ok g1 rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w")
+        assert reply.endswith(" checkmate 0-1")
+
+    _run(test)
+
+
+@pytest.mark.parametrize(
+    "command, reply",
+    [
+        ("", "error - unknown command"),
+        ("castle g1", "error - unknown command"),
+        ("move", "error - no game"),
+        ("move g2 e2e4", "error g2 unknown game"),
+        ("join g1 red", "error g1 unknown colour"),
+        ("move g1", "error g1 no move"),
+        ("move g1 e3e4", "error g1 no piece"),
+    ],
+)
+def test_errors(command: str, reply: str) -> None:
+    async def test(_games: GameServer, connect: Connect) -> None:
+        client = await connect()
+        await request(client, "new g1")
+        await request(client, "join g1 white")
+
+        assert await request(client, command) == reply
+
+    _run(test)
+
+
+def test_resign_and_disconnect() -> None:
+    async def test(games: GameServer, connect: Connect) -> None:
+        client = await connect()
+        await request(client, "new g1")
+        await request(client, "join g1 white")
+        await request(client, "join g1 black")
+        await request(client, "move g1 e2e4")
+
+        client[1].write(b"quit\n")
+        assert await client[0].readline() == b""
+
+        # the seats of a client are freed once it leaves
+        other = await connect()
+        assert await request(other, "join g1 black") == "ok g1 black"
+        assert await request(other, "resign g1") == "ok g1 resign resignation 1-0"
+        assert games.games["g1"].turn == Colour.BLACK
+
+    _run(test)
+
+
+def test_session_store(tmp_path: Path) -> None:
+    async def test(_games: GameServer, connect: Connect) -> None:
+        client = await connect()
+
+        for game_id in ("g1", "g2"):
+            await request(client, f"new {game_id}")
+            await request(client, f"join {game_id} white")
+            await request(client, f"join {game_id} black")
+
+        # each move restores its game from disk and evicts the other one
+        for move in ("e2e4", "e7e5", "g1f3"):
+            for game_id in ("g1", "g2"):
+                assert await request(client, f"move {game_id} {move}") == (
+                    f"ok {game_id} {move} success *"
+                )
+
+        assert store.restores == 6
+
+    with SessionStore(tmp_path / "sessions", capacity=1) as store:
+        _run(test, store)
+
+    with SessionStore(tmp_path / "sessions") as store:
+        assert store["g2"].move_history == ["e2e4", "e7e5", "g1f3"]
+
+
+def test_flag_fall() -> None:
+    async def test(games: GameServer, connect: Connect) -> None:
+        white, black = await connect(), await connect()
+
+        assert await request(white, "new g1 0.2+0.1 delay") == "ok g1"
+        assert await request(white, "new g2 5+x") == "error g2 invalid time control"
+        await request(white, "join g1 white")
+        await request(black, "join g1 black")
+
+        # the first move starts the clock of Black, who never moves, after a delay
+        await request(white, "move g1 e2e4")
+        await black[0].readline()
+
+        assert (await request(white, "state g1")).endswith(" ongoing * 200 200")
+
+        for player in (white, black):
+            line = await asyncio.wait_for(player[0].readline(), 5)
+            assert line == b"played g1 flag time-forfeit 1-0\n"
+
+        assert games.games["g1"].result == "1-0"
+
+    _run(test)
+
+
+def test_spectators() -> None:
+    async def test(_games: GameServer, connect: Connect) -> None:
+        player, early = await connect(), await connect()
+        await request(player, "new g1")
+        await request(player, "join g1 white")
+        await request(player, "join g1 black")
+
+        assert await request(early, "watch g1") == (
+            "ok g1 0 rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 ongoing *"
+        )
+        assert await request(early, "watch g2") == "error g2 unknown game"
+
+        await request(player, "move g1 e2e4")
+        assert await early[0].readline() == b"delta g1 1 e2-,e4P ongoing *\n"
+
+        # a late spectator starts from a snapshot
+        late = await connect()
+        assert (await request(late, "watch g1")).startswith("ok g1 1 rnbqkbnr/pppppppp/8/8/4P3")
+
+        await request(player, "move g1 e7e5")
+        for spectator in (early, late):
+            assert await spectator[0].readline() == b"delta g1 2 e7-,e5p ongoing *\n"
+
+        assert await request(early, "unwatch g1") == "ok g1"
+        await request(player, "resign g1")
+        assert await late[0].readline() == b"delta g1 2 - resignation 0-1\n"
+        # the next line of the former spectator is the reply to its next command
+        assert (await request(early, "state g1")).startswith("ok g1")
+
+    _run(test)
+
+
+def test_commands_wait_for_a_pending_move(mocker: MockerFixture) -> None:
+    move_outcome = Board.move_outcome
+
+    def slow_move_outcome(
+        board: Board, colour: Colour, *, tablebases: Tablebases | None = None
+    ) -> MoveOutcome:
+        time.sleep(0.2)
+        return move_outcome(board, colour, tablebases=tablebases)
+
+    mocker.patch.object(Board, "move_outcome", slow_move_outcome)
+
+    async def run() -> None:
+        async with GameServer(workers=1) as games:
+            client = Writer()
+            for command in ("new g1", "join g1 white", "join g1 black"):
+                await games.execute(client, command.split())
+
+            move = asyncio.create_task(games.execute(client, ["move", "g1", "e2e4"]))
+            await asyncio.sleep(0.05)
+
+            # the game is changed by the move, which turns it over to Black
+            for command in ("resign", "state", "watch", "move"):
+                assert await games.execute(client, [command, "g1", "e7e5"]) == (
+                    "error g1 move pending"
+                )
+
+            assert await move == "ok g1 e2e4 success *"
+            assert await games.execute(client, ["resign", "g1"]) == "ok g1 resign resignation 1-0"
+
+    asyncio.run(run())
+
+
+def test_slow_spectator_gets_the_final_state() -> None:
+    async def run() -> None:
+        async with GameServer(workers=0) as games:
+            player, spectator = Writer(), Writer()
+            for command in ("new g1", "join g1 white", "join g1 black"):
+                await games.execute(player, command.split())
+            await games.execute(spectator, ["watch", "g1"])
+
+            for move in ("f2f3", "e7e5", "g2g4"):
+                await games.execute(player, ["move", "g1", move])
+
+            # the spectator misses the mate, which no delta follows
+            spectator.transport.backlog = 10**9
+            assert await games.execute(player, ["move", "g1", "d8h4"]) == (
+                "ok g1 d8h4 checkmate 0-1"
+            )
+            spectator.transport.backlog = 0
+            await asyncio.sleep(0.3)
+
+            assert spectator.lines[3:] == [
+                b"snapshot g1 4 rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 0 3"
+                b" checkmate 0-1\n"
+            ]
+
+    asyncio.run(run())
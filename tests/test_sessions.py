@@ -0,0 +1,149 @@
+"""This module provides tests for the session store."""
+
+from pathlib import Path
+
+import pytest
+
+from chess.chess_class import Chess, GameStatus
+from chess.clock import ChessClock, IncrementMode, TimeControl
+from chess.colour_and_aliases import Colour
+from chess.fen import STARTING_FEN, board_from_fen, board_to_fen
+from chess.sessions import SessionStore, pack_session, unpack_session
+
+FEN = "4k3/P7/8/8/8/8/8/R3K2R w KQ - 0 1"
+
+
+def _game(moves: list[str], fen: str | None = None) -> Chess:
+    board, turn = board_from_fen(fen) if fen else (None, Colour.WHITE)
+    game = Chess(board, turn=turn)
+
+    for move in moves:
+        assert game.push(move).ok
+
+    return game
+
+
+@pytest.mark.parametrize(
+    "moves, fen",
+    [
+        ([], None),
+        (["e2e4", "e7e5", "g1f3"], None),
+        (["f2f3", "e7e5", "g2g4", "d8h4"], None),
+        (["a7a8q", "e8d7", "o-o"], FEN),
+    ],
+)
+def test_round_trip(moves: list[str], fen: str | None) -> None:
+    game = _game(moves, fen)
+    restored = unpack_session(pack_session(game))
+
+    assert board_to_fen(restored.board, restored.turn) == board_to_fen(game.board, game.turn)
+    assert restored.move_history == game.move_history
+    assert restored.move_number == game.move_number
+    assert (restored.status, restored.result) == (game.status, game.result)
+    assert restored.start_fen == game.start_fen
+    assert restored.pgn_game().moves == game.pgn_game().moves
+
+    # the restored game goes on as the original would
+    assert restored.legal_moves() == game.legal_moves()
+
+
+def test_round_trip_of_a_resignation() -> None:
+    game = _game(["e2e4", "e7e5"])
+    game.resign()
+    restored = unpack_session(pack_session(game))
+    assert (restored.status, restored.result) == (GameStatus.RESIGNATION, "0-1")
+
+    # the resignation is kept by the restored game
+    restored.seek(restored.ply)
+    assert (restored.status, restored.result) == (GameStatus.RESIGNATION, "0-1")
+
+
+def test_eviction_and_restore(tmp_path: Path) -> None:
+    with SessionStore(tmp_path / "sessions", capacity=2) as store:
+        for game_id in ("a", "b", "c"):
+            store[game_id] = Chess()
+
+        assert (store.in_memory, len(store), store.evictions) == (2, 3, 1)
+        assert "a" in store
+        assert set(store) == {"a", "b", "c"}
+
+        store["a"].push("e2e4")
+        store["a"].resign()
+
+        # restoring 'a' evicted 'b', the least recently used
+        assert (store.evictions, store.restores) == (2, 1)
+
+        del store["b"]
+        assert "b" not in store
+
+        with pytest.raises(KeyError):
+            store["b"]
+
+        store.flush()
+        assert (store.in_memory, len(store), store.evictions) == (0, 2, 4)
+
+    with SessionStore(tmp_path / "sessions") as store:
+        assert set(store) == {"a", "c"}
+        assert store["a"].move_history == ["e2e4"]
+        assert store["a"].status == GameStatus.RESIGNATION
+
+
+def test_checkpoint_keeps_the_games_in_memory(tmp_path: Path) -> None:
+    with SessionStore(tmp_path / "sessions", capacity=2) as store:
+        for game_id in ("a", "b", "c"):
+            store[game_id] = Chess()
+        store["b"].push("e2e4")
+
+        store.checkpoint()
+        assert (store.in_memory, len(store), store.evictions) == (2, 3, 1)
+        assert sorted(store) == ["a", "b", "c"]
+
+        # the game in memory is the one that counts, not its copy on disk
+        store["b"].push("e7e5")
+        with SessionStore(tmp_path / "sessions") as saved:
+            assert saved["b"].move_history == ["e2e4"]
+            assert saved.in_memory == 1
+
+        # a game read back keeps its copy on disk, which is not counted twice
+        assert store["a"].move_history == []
+        assert (store.restores, len(store)) == (1, 3)
+
+        del store["b"]
+        assert (len(store), sorted(store)) == (2, ["a", "c"])
+
+    with SessionStore(tmp_path / "sessions") as store:
+        assert sorted(store) == ["a", "c"]
+
+
+def test_invalid_capacity(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="positive"):
+        SessionStore(tmp_path / "sessions", capacity=0)
+
+
+def test_round_trip_keeps_the_moves_taken_back() -> None:
+    game = _game(["e2e4", "e7e5", "g1f3", "b8c6"])
+    game.seek(1)
+
+    restored = unpack_session(pack_session(game))
+    assert (restored.ply, restored.line) == (1, game.line)
+
+    restored.undo()
+    assert board_to_fen(restored.board, restored.turn) == STARTING_FEN
+
+
+def test_round_trip_keeps_the_clocks() -> None:
+    clock = ChessClock(TimeControl(60, 1, IncrementMode.BRONSTEIN))
+    game = Chess(clock=clock)
+    for move in ("e2e4", "e7e5"):
+        game.push(move)
+
+    restored = unpack_session(pack_session(game))
+    assert restored.clock is not None
+    assert restored.clock.control == clock.control
+    assert restored.clock.running == Colour.WHITE
+
+    # the clock of White kept running while the game was stored
+    assert abs(clock.remaining(Colour.WHITE) - restored.clock.remaining(Colour.WHITE)) < 10**7
+    assert restored.clock.remaining(Colour.BLACK) == clock.remaining(Colour.BLACK)
+
+    assert unpack_session(pack_session(Chess())).clock is None
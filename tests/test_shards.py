@@ -0,0 +1,119 @@
+"""This module provides tests for the sharded game server."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+from pathlib import Path
+
+from chess.sessions import SessionStore
+from chess.shards import ShardedServer, shard_of
+from tests.clients import Connect, request, with_clients
+
+
+def _run(
+    test: Callable[[ShardedServer, Connect], Awaitable[None]],
+    store: Path | None = None,
+    checkpoint: float = 60.0,
+) -> None:
+    """Runs a test with a server of two shards and a function connecting clients to it."""
+
+    async def run() -> None:
+        async with ShardedServer(2, store, checkpoint=checkpoint) as games:
+            await with_clients(games, partial(test, games))
+
+    asyncio.run(run())
+
+
+def test_games_on_both_shards() -> None:
+    # g1 and g4 are owned by different shards
+    assert (shard_of("g1", 2), shard_of("g4", 2)) == (1, 0)
+
+    async def test(_games: ShardedServer, connect: Connect) -> None:
+        white, black = await connect(), await connect()
+
+        for game_id in ("g1", "g4"):
+            assert await request(white, f"new {game_id}") == f"ok {game_id}"
+            assert await request(white, f"join {game_id} white") == f"ok {game_id} white"
+            assert await request(black, f"join {game_id} black") == f"ok {game_id} black"
+
+            assert await request(white, f"move {game_id} f2f3") == f"ok {game_id} f2f3 success *"
+            assert await black[0].readline() == f"played {game_id} f2f3 success *\n".encode()
+
+        assert await request(black, "move g4 e7e5") == "ok g4 e7e5 success *"
+        assert await white[0].readline() == b"played g4 e7e5 success *\n"
+        assert await request(black, "move g1 e7e5") == "ok g1 e7e5 success *"
+        assert await white[0].readline() == b"played g1 e7e5 success *\n"
+        assert await request(black, "move g1 d7d5") == "error g1 not your turn"
+
+        assert await request(white, "") == "error - unknown command"
+        assert await request(white, "move") == "error - no game"
+        assert (await request(white, "state g4")).startswith(
+            "ok g4 rnbqkbnr/pppp1ppp/8/4p3/8/5P2/PPPPP1PP/RNBQKBNR w"
+        )
+
+        # the seats of a client are freed on every shard once it leaves
+        black[1].write(b"quit\n")
+        assert await black[0].readline() == b""
+
+        other = await connect()
+        for game_id in ("g1", "g4"):
+            assert await request(other, f"join {game_id} black") == f"ok {game_id} black"
+
+    _run(test)
+
+
+def test_checkpoints(tmp_path: Path) -> None:
+    async def test(_games: ShardedServer, connect: Connect) -> None:
+        client = await connect()
+        await request(client, "new g1")
+        await request(client, "join g1 white")
+        await request(client, "move g1 e2e4")
+
+        # the game is written to disk while the server runs
+        await asyncio.sleep(0.5)
+        with SessionStore(tmp_path / "shard-1.db") as store:
+            assert store["g1"].move_history == ["e2e4"]
+
+    _run(test, tmp_path, checkpoint=0.1)
+
+    async def restarted(_games: ShardedServer, connect: Connect) -> None:
+        client = await connect()
+        assert (await request(client, "state g1")).startswith(
+            "ok g1 rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b"
+        )
+
+    _run(restarted, tmp_path)
+
+
+def test_slow_spectator_is_resynced() -> None:
+    async def test(games: ShardedServer, connect: Connect) -> None:
+        white, black, spectator = await connect(), await connect(), await connect()
+        await request(white, "new g4")
+        await request(white, "join g4 white")
+        await request(black, "join g4 black")
+        assert (await request(spectator, "watch g4")).startswith("ok g4 0 ")
+        assert await request(spectator, "resync g4") == "error - unknown command"
+
+        # every connection has more bytes waiting than allowed, so the delta is skipped
+        games.max_backlog = -1
+        await request(white, "move g4 e2e4")
+        assert games.skipped == 1
+
+        # once caught up, the spectator gets a snapshot instead of the deltas it missed
+        games.max_backlog = 64 * 1024
+        await request(black, "move g4 e7e5")
+        assert await spectator[0].readline() == (
+            b"snapshot g4 2 rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR"
+            b" w KQkq e6 0 2 ongoing *\n"
+        )
+
+        await request(white, "move g4 g1f3")
+        assert await spectator[0].readline() == b"delta g4 3 g1-,f3N ongoing *\n"
+
+        # a missed resignation is sent once caught up, though no delta follows
+        games.max_backlog = -1
+        await request(black, "resign g4")
+        games.max_backlog = 64 * 1024
+        assert (await spectator[0].readline()).endswith(b" resignation 1-0\n")
+
+    _run(test)
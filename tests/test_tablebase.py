@@ -0,0 +1,140 @@
+"""This module provides tests for the endgame tablebases."""
+
+from collections.abc import Iterator
+from copy import deepcopy
+from pathlib import Path
+
+import pytest
+
+from chess.board import MoveOutcome
+from chess.engine import MATE_SCORE, Searcher, SearchLimits
+from chess.fen import board_from_fen
+from chess.tablebase import Tablebase, TablebaseResult, Tablebases, generate_tablebases
+
+
+@pytest.fixture(scope="module")
+def tablebase_directory(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    directory = tmp_path_factory.mktemp("tablebases")
+    generate_tablebases(directory, workers=2)
+
+    return directory
+
+
+@pytest.fixture
+def tablebases(tablebase_directory: Path) -> Iterator[Tablebases]:
+    with Tablebases(tablebase_directory) as tablebases:
+        yield tablebases
+
+
+def probe(tablebases: Tablebases, fen: str) -> TablebaseResult | None:
+    board, turn = board_from_fen(fen)
+    return tablebases.probe(board, turn)
+
+
+class TestGeneration:
+    """Test the tables against known properties of the endgames."""
+
+    @pytest.mark.parametrize(("name", "longest"), [("KQK", 19), ("KRK", 31), ("KPK", 55)])
+    def test_longest_mate(self, tablebase_directory: Path, name: str, longest: int) -> None:
+        table = Tablebase(tablebase_directory / f"{name}.tb")
+        white_to_move = [table.value(index) for index in range(64**3)]
+        table.close()
+
+        assert max(white_to_move) == longest
+
+    def test_kpk_wins(self, tablebase_directory: Path) -> None:
+        table = Tablebase(tablebase_directory / "KPK.tb")
+        wins = sum(table.value(index) > 0 for index in range(64**3))
+        table.close()
+
+        assert wins == 124_960
+
+    def test_invalid_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "KQK.tb"
+        path.write_bytes(b"not a table")
+
+        with pytest.raises(ValueError, match="not a tablebase file"):
+            Tablebase(path)
+
+    def test_unsupported_table(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unsupported"):
+            generate_tablebases(tmp_path, ("KBNK",))
+
+
+class TestProbe:
+    """Test probing positions."""
+
+    @pytest.mark.parametrize(
+        ("fen", "expected"),
+        [
+            ("7k/8/5K2/8/8/8/8/6Q1 w - - 0 1", TablebaseResult(1, 1)),
+            ("7k/6Q1/5K2/8/8/8/8/8 b - - 0 1", TablebaseResult(-1, 0)),
+            ("6k1/8/6K1/8/8/8/8/R7 w - - 0 1", TablebaseResult(1, 1)),
+            ("7k/6Q1/8/8/8/8/8/K7 b - - 0 1", TablebaseResult(0, None)),
+            ("7k/8/8/8/8/8/7P/7K w - - 0 1", TablebaseResult(0, None)),
+            ("8/8/8/8/8/1k6/P7/1K6 b - - 0 1", TablebaseResult(0, None)),
+            ("8/8/8/8/8/8/4P3/4K1k1 w - - 0 1", TablebaseResult(1, 23)),
+        ],
+    )
+    def test_probe(self, tablebases: Tablebases, fen: str, expected: TablebaseResult) -> None:
+        assert probe(tablebases, fen) == expected
+
+    def test_black_as_the_stronger_side(self, tablebases: Tablebases) -> None:
+        assert probe(tablebases, "6q1/8/8/8/8/5k2/8/7K b - - 0 1") == TablebaseResult(1, 1)
+        assert probe(tablebases, "8/8/8/8/8/5k2/6q1/7K w - - 0 1") == TablebaseResult(-1, 0)
+
+    @pytest.mark.parametrize(
+        "fen", ["8/8/4k3/8/8/8/8/4K3 w - - 0 1", "8/8/4k3/8/8/8/8/2B1K3 b - - 0 1"]
+    )
+    def test_insufficient_material(self, tablebases: Tablebases, fen: str) -> None:
+        assert probe(tablebases, fen) == TablebaseResult(0, None)
+
+    @pytest.mark.parametrize(
+        "fen",
+        [
+            "4k3/8/8/8/8/8/8/R3K3 w Q - 0 1",
+            "4k3/8/8/8/8/8/8/RR2K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/R3K2r w - - 0 1",
+        ],
+    )
+    def test_not_covered(self, tablebases: Tablebases, fen: str) -> None:
+        assert probe(tablebases, fen) is None
+
+    def test_missing_tables(self, tmp_path: Path) -> None:
+        with Tablebases(tmp_path) as tablebases:
+            assert tablebases.names == []
+            assert probe(tablebases, "6k1/8/6K1/8/8/8/8/R7 w - - 0 1") is None
+
+
+class TestGameEnd:
+    """Test ending games in known draws."""
+
+    def test_make_move_ends_known_draw(self, tablebases: Tablebases) -> None:
+        board, turn = board_from_fen("7k/8/8/8/8/8/8/K5Q1 w - - 0 1")
+
+        assert deepcopy(board).make_move("g1g7", turn) == MoveOutcome.CHECK
+        assert board.make_move("g1g7", turn, tablebases=tablebases) == MoveOutcome.DRAW
+        assert MoveOutcome.DRAW in MoveOutcome.GAME_OVER
+
+    def test_make_move_keeps_checkmate(self, tablebases: Tablebases) -> None:
+        board, turn = board_from_fen("7k/8/5K2/8/8/8/8/6Q1 w - - 0 1")
+
+        assert board.make_move("g1g7", turn, tablebases=tablebases) == MoveOutcome.CHECKMATE
+
+
+class TestSearch:
+    """Test probing the tables in the search."""
+
+    def test_search_scores_distance_to_mate(self, tablebases: Tablebases) -> None:
+        board, turn = board_from_fen("8/8/8/3k4/8/8/8/R3K3 w - - 0 1")
+        result = tablebases.probe(board, turn)
+        assert result is not None
+        assert result.dtm is not None
+
+        search = Searcher(tablebases=tablebases).search(board, turn, SearchLimits(depth=2))
+
+        assert search.score == MATE_SCORE - result.dtm
+        assert search.best_move is not None
+
+        board.apply_move(search.best_move, turn)
+        assert tablebases.probe(board, ~turn) == TablebaseResult(-1, result.dtm - 1)
@@ -0,0 +1,169 @@
+"""This module provides tests for the tournament runner."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from chess.engine import SearchLimits
+from chess.fen import board_from_fen
+from chess.pgn import format_game, read_games
+from chess.tournament import (
+    SPRT,
+    Adjudication,
+    EngineConfig,
+    GameResult,
+    GameTask,
+    _known_result,
+    load_openings,
+    pgn_game,
+    play_game,
+    run_tournament,
+)
+
+TESTED = EngineConfig("tested", SearchLimits(depth=2))
+BASELINE = EngineConfig("baseline", SearchLimits(depth=1))
+
+
+class TestSPRT:
+    """Test the sequential probability ratio test."""
+
+    def test_no_games_is_undecided(self) -> None:
+        sprt = SPRT()
+
+        assert sprt.llr == 0
+        assert sprt.decision is None
+
+    def test_many_wins_accept_h1(self) -> None:
+        sprt = SPRT(elo0=0, elo1=50)
+        for _ in range(60):
+            sprt.add(1)
+            sprt.add(0.5)
+
+        assert sprt.decision == "H1"
+        assert sprt.elo()[0] > 50
+
+    def test_many_losses_accept_h0(self) -> None:
+        sprt = SPRT(elo0=0, elo1=50)
+        for _ in range(60):
+            sprt.add(0)
+
+        assert sprt.decision == "H0"
+
+    def test_even_score_has_zero_elo(self) -> None:
+        sprt = SPRT()
+        for score in [1, 0, 0.5, 0.5]:
+            sprt.add(score)
+
+        elo, margin = sprt.elo()
+        assert elo == pytest.approx(0)
+        assert margin > 0
+
+
+class TestPlayGame:
+    """Test playing a single game."""
+
+    @pytest.mark.parametrize(
+        "fen, expected",
+        [
+            ("4k3/8/8/8/8/8/8/4K3 w - - 0 1", GameResult.DRAW),
+            ("4k3/8/8/8/8/8/8/3NK3 b - - 0 1", GameResult.DRAW),
+            ("4k3/8/8/8/8/8/8/3QK3 b - - 0 1", GameResult.WHITE_WINS),
+            ("3rk3/8/8/8/8/8/8/4K3 w - - 0 1", GameResult.BLACK_WINS),
+            ("4k3/4p3/8/8/8/8/8/4K3 w - - 0 1", None),
+            ("4k3/8/8/8/8/8/8/2BNK3 w - - 0 1", None),
+            # the bare King is stalemated, or takes the Queen
+            ("k7/8/1Q6/8/8/8/8/7K b - - 0 1", None),
+            ("k7/1Q6/8/8/8/8/8/7K b - - 0 1", None),
+            ("k7/1Q6/8/8/8/8/8/7K w - - 0 1", GameResult.WHITE_WINS),
+            ("k7/8/1R6/2K5/8/8/8/8 b - - 0 1", GameResult.WHITE_WINS),
+        ],
+    )
+    def test_known_result(self, fen: str, expected: GameResult | None) -> None:
+        board, turn = board_from_fen(fen)
+        assert _known_result(board, turn) == expected
+
+    def test_checkmate(self) -> None:
+        task = GameTask(
+            0, "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", TESTED, BASELINE, Adjudication()
+        )
+        game = play_game(task)
+
+        assert game.result == GameResult.WHITE_WINS
+        assert game.reason == "checkmate"
+        assert game.moves == ["a1a8"]
+
+    def test_pgn_game(self) -> None:
+        task = GameTask(
+            0, "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", TESTED, BASELINE, Adjudication()
+        )
+
+        assert format_game(pgn_game(play_game(task))) == (
+            '[Event "Tournament"]\n'
+            '[Site "?"]\n'
+            '[Date "????.??.??"]\n'
+            '[Round "1"]\n'
+            '[White "tested"]\n'
+            '[Black "baseline"]\n'
+            '[Result "1-0"]\n'
+            '[Termination "checkmate"]\n'
+            '[SetUp "1"]\n'
+            '[FEN "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"]\n'
+            "\n"
+            "1. Ra8# 1-0\n"
+        )
+
+    def test_opening_moves_are_played(self) -> None:
+        rules = Adjudication(max_plies=2)
+        game = play_game(GameTask(3, "e2e4 e7e5", TESTED, BASELINE, rules))
+
+        assert game.result == GameResult.DRAW
+        assert game.reason == "max plies"
+        assert game.plies == 2
+
+    def test_illegal_opening_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            play_game(GameTask(0, "e2e5", TESTED, BASELINE, Adjudication()))
+
+
+class TestRunTournament:
+    """Test running a whole tournament."""
+
+    def test_load_openings(self, tmp_path: Path) -> None:
+        path = tmp_path / "openings.txt"
+        path.write_text("# comment\ne2e4 e7e5\n\n4k3/8/8/8/8/8/8/3QK3 w - - 0 1\n")
+
+        assert load_openings(path) == ["e2e4 e7e5", "4k3/8/8/8/8/8/8/3QK3 w - - 0 1"]
+
+        path.write_text("# only a comment\n\n")
+        with pytest.raises(ValueError, match="No openings"):
+            run_tournament(TESTED, BASELINE, load_openings(path), tmp_path / "results.jsonl")
+
+    def test_results_are_written_and_test_stops_early(self, tmp_path: Path) -> None:
+        output, pgn = tmp_path / "results.jsonl", tmp_path / "games.pgn"
+
+        # White always wins, so the engines score evenly and H0 is accepted
+        summary = run_tournament(
+            TESTED,
+            BASELINE,
+            ["4k3/8/8/8/8/8/8/3QK3 w - - 0 1"],
+            output,
+            max_games=200,
+            workers=2,
+            sprt=SPRT(elo0=0, elo1=400),
+            pgn=pgn,
+        )
+
+        lines = output.read_text().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        assert summary.decision == "H0"
+        assert summary.games == len(lines) < 200
+        assert summary.draws == 0
+        assert {record["result"] for record in records} == {"1-0"}
+        assert abs(summary.elo) < 200
+
+        with open(pgn) as file:
+            games = list(read_games(file))
+        assert len(games) == summary.games
+        assert {game.result for game in games} == {"1-0"}
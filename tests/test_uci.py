@@ -0,0 +1,166 @@
+"""This module provides tests for the UCI front end."""
+
+import io
+import time
+from pathlib import Path
+
+import pytest
+
+from chess.board import Board
+from chess.book import build_book
+from chess.colour_and_aliases import Colour
+from chess.pgn import PGNGame
+from chess.uci import UCIEngine
+
+
+@pytest.fixture
+def output() -> io.StringIO:
+    """Pytest fixture for the output of the engine."""
+    return io.StringIO()
+
+
+@pytest.fixture
+def engine(output: io.StringIO) -> UCIEngine:
+    """Pytest fixture for a UCI engine writing to a string buffer."""
+    return UCIEngine(output)
+
+
+class TestUCIEngine:
+    """Test the UCI front end."""
+
+    def test_handshake(self, engine: UCIEngine, output: io.StringIO) -> None:
+        engine.handle("uci")
+        engine.handle("isready")
+
+        lines = output.getvalue().splitlines()
+        assert lines[0].startswith("id name")
+        assert any(line.startswith("option name Hash") for line in lines)
+        assert lines[-2:] == ["uciok", "readyok"]
+
+    def test_position_startpos_with_moves(self, engine: UCIEngine) -> None:
+        engine.handle("position startpos moves e2e4 e7e5 g1f3")
+
+        assert engine.turn == Colour.BLACK
+        assert engine.board.state[3][4] is not None
+        assert engine.board.state[2][5] is not None
+
+    def test_position_reuses_board_when_moves_extend_it(self, engine: UCIEngine) -> None:
+        engine.handle("position startpos moves e2e4 e7e5")
+        board = engine.board
+
+        engine.handle("position startpos moves e2e4 e7e5 g1f3 b8c6")
+
+        assert engine.board is board
+        assert engine.turn == Colour.WHITE
+
+    def test_position_is_rebuilt_after_takeback(self, engine: UCIEngine) -> None:
+        engine.handle("position startpos moves e2e4 e7e5")
+        board = engine.board
+
+        engine.handle("position startpos moves d2d4")
+
+        assert engine.board is not board
+        assert engine.board.state[3][3] is not None
+        assert engine.board.state[3][4] is None
+
+    def test_position_fen_with_castling_move(self, engine: UCIEngine) -> None:
+        engine.handle("position fen r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1 moves e1g1 e8c8")
+
+        assert engine.board.state[0][6] is not None
+        assert engine.board.state[0][5] is not None
+        assert engine.board.state[7][2] is not None
+        assert engine.board.state[7][3] is not None
+        assert engine.turn == Colour.WHITE
+
+    def test_illegal_move_is_reported(self, engine: UCIEngine, output: io.StringIO) -> None:
+        engine.handle("position startpos moves e2e5")
+
+        assert "illegal move e2e5" in output.getvalue()
+        assert engine.board.state == Board().state
+
+    def test_go_depth(self, engine: UCIEngine, output: io.StringIO) -> None:
+        engine.handle("position startpos moves e2e4")
+        engine.handle("go depth 1")
+        engine.wait()
+
+        lines = output.getvalue().splitlines()
+        assert lines[-2].startswith("info depth 1 score cp")
+        assert lines[-1].startswith("bestmove ")
+        assert engine.board.is_legal_move(lines[-1].split()[1], Colour.BLACK)
+
+    @pytest.mark.parametrize(
+        "move, turn, expected",
+        [
+            ("o-o", Colour.WHITE, "e1g1"),
+            ("o-o-o", Colour.WHITE, "e1c1"),
+            ("o-o", Colour.BLACK, "e8g8"),
+            ("o-o-o", Colour.BLACK, "e8c8"),
+            ("e7e8q", Colour.WHITE, "e7e8q"),
+        ],
+    )
+    def test_castles_are_sent_as_king_moves(
+        self, engine: UCIEngine, move: str, turn: Colour, expected: str
+    ) -> None:
+        assert engine._to_uci(move, turn) == expected
+
+    def test_isready_is_answered_during_infinite_search(
+        self, engine: UCIEngine, output: io.StringIO
+    ) -> None:
+        engine.handle("position startpos")
+        engine.handle("go infinite")
+        engine.handle("isready")
+
+        assert "readyok" in output.getvalue()
+        assert "bestmove" not in output.getvalue()
+
+        time.sleep(0.1)
+        engine.handle("stop")
+
+        assert output.getvalue().splitlines()[-1].startswith("bestmove ")
+
+    def test_go_with_clock(self, engine: UCIEngine, output: io.StringIO) -> None:
+        engine.handle("position startpos")
+        start = time.monotonic()
+        engine.handle("go wtime 2000 btime 2000 winc 0 binc 0")
+        engine.wait()
+
+        assert time.monotonic() - start < 1.0
+        assert output.getvalue().splitlines()[-1].startswith("bestmove ")
+
+    def test_setoption(self, engine: UCIEngine, output: io.StringIO) -> None:
+        engine.handle("setoption name Hash value 64")
+        engine.handle("setoption name Threads value 4")
+
+        assert engine.searcher.hash_size == 64
+        assert engine.threads == 1
+        assert "single-threaded" in output.getvalue()
+
+    def test_book_moves_are_played_without_search(
+        self, engine: UCIEngine, output: io.StringIO, tmp_path: Path
+    ) -> None:
+        build_book([PGNGame({}, ["e4", "e5", "Nf3"], "1/2-1/2")], tmp_path / "book.bin")
+        engine.handle(f"setoption name Book value {tmp_path / 'book.bin'}")
+        engine.handle("position startpos moves e2e4")
+        engine.handle("go depth 3")
+        engine.wait()
+
+        assert output.getvalue().splitlines() == ["bestmove e7e5"]
+
+        engine.handle("position startpos moves d2d4")
+        engine.handle("go depth 1")
+        engine.wait()
+
+        assert output.getvalue().splitlines()[-1].startswith("bestmove ")
+        assert "info depth 1" in output.getvalue()
+
+    def test_invalid_book(self, engine: UCIEngine, output: io.StringIO, tmp_path: Path) -> None:
+        engine.handle(f"setoption name Book value {tmp_path / 'missing.bin'}")
+
+        assert engine.book is None
+        assert "cannot open book" in output.getvalue()
+
+    def test_run_until_quit(self, output: io.StringIO) -> None:
+        engine = UCIEngine(output)
+        engine.run(io.StringIO("uci\nposition startpos\ngo depth 1\nquit\nisready\n"))
+
+        assert "readyok" not in output.getvalue()
@@ -0,0 +1,40 @@
+"""This module provides tests for Zobrist hashing."""
+
+from chess.board import Board
+from chess.colour_and_aliases import Colour
+from chess.fen import board_from_fen
+from chess.zobrist import zobrist_key
+
+
+class TestZobristKey:
+    """Test Zobrist keys of positions."""
+
+    def test_key_is_a_64_bit_integer(self) -> None:
+        assert 0 <= zobrist_key(Board(), Colour.WHITE) < 2**64
+
+    def test_player_to_move_changes_the_key(self) -> None:
+        assert zobrist_key(Board(), Colour.WHITE) != zobrist_key(Board(), Colour.BLACK)
+
+    def test_transpositions_have_the_same_key(self) -> None:
+        first, second = Board(), Board()
+
+        for move, turn in [("g1f3", Colour.WHITE), ("g8f6", Colour.BLACK), ("b1c3", Colour.WHITE)]:
+            first.apply_move(move, turn)
+
+        for move, turn in [("b1c3", Colour.WHITE), ("g8f6", Colour.BLACK), ("g1f3", Colour.WHITE)]:
+            second.apply_move(move, turn)
+
+        assert zobrist_key(first, Colour.BLACK) == zobrist_key(second, Colour.BLACK)
+
+    def test_castling_rights_and_en_passant_change_the_key(self) -> None:
+        keys = {
+            zobrist_key(*board_from_fen(fen))
+            for fen in [
+                "4k3/8/8/8/4P3/8/8/R3K2R b KQ - 0 1",
+                "4k3/8/8/8/4P3/8/8/R3K2R b K - 0 1",
+                "4k3/8/8/8/4P3/8/8/R3K2R b - - 0 1",
+                "4k3/8/8/8/4P3/8/8/R3K2R b - e3 0 1",
+            ]
+        }
+
+        assert len(keys) == 4